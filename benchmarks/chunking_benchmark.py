@@ -0,0 +1,210 @@
+"""
+청크 분할 방식 비교 벤치마크 (CHUNKING_MODE=recursive vs syntax)
+
+로컬 소스 디렉토리의 파일을 GitHub 에서 받은 것처럼 ParsedCode 로 만들어 실제 수집 노드(load_documents, split_documents)로
+나눈 뒤, 방식별로 다음을 비교합니다. 모드는 모듈 로드 시점의 환경 변수이므로 방식마다 새 프로세스에서 실행합니다.
+
+    chunks                    청크 수 (= 임베딩 입력 수 = 가설 질문 생성 호출 수)
+    embedded_chars / tokens   임베딩에 들어가는 전체 글자 수와 추정 토큰 수 (겹침/중복 포함)
+    chunk_chars.{p50,p95,max} 청크 크기 분포
+    intact_definitions        청크 크기보다 작은 Python 함수/클래스/메서드 중 한 청크 안에 온전히 들어간 비율
+    split_seconds             문서 로드 + 분할 시간
+
+사용법:
+    python -m benchmarks.chunking_benchmark                                     # 이 저장소와 langchain_core 소스
+    python -m benchmarks.chunking_benchmark --paths ~/src/project --output bench_chunking.json
+"""
+
+import argparse
+import ast
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Any, Dict, List
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MODES = ("recursive", "syntax")
+
+
+def _default_paths() -> List[str]:
+    import langchain_core
+
+    return [os.path.join(ROOT, "src"), os.path.dirname(langchain_core.__file__)]
+
+
+def collect_files(paths: List[str]) -> List[Dict[str, str]]:
+    """언어를 판별할 수 있는 텍스트 파일을 모읍니다."""
+    from src.utils.language_registry import UNKNOWN_LANGUAGE, resolve_language
+
+    files = []
+    for base in paths:
+        for directory, dirnames, filenames in os.walk(base):
+            dirnames[:] = sorted(name for name in dirnames if not name.startswith(".") and name != "__pycache__")
+            for filename in sorted(filenames):
+                full_path = os.path.join(directory, filename)
+                try:
+                    with open(full_path, encoding="utf-8") as f:
+                        text = f.read()
+                except (UnicodeDecodeError, OSError):
+                    continue
+                if not text.strip() or resolve_language(filename, head=text[:256]) == UNKNOWN_LANGUAGE:
+                    continue
+                files.append({"path": os.path.relpath(full_path, os.path.dirname(base)), "text": text})
+    return files
+
+
+def _definitions(text: str, max_chars: int) -> List[str]:
+    """청크 하나에 들어갈 수 있는 크기의 Python 함수/클래스/메서드 소스"""
+    try:
+        tree = ast.parse(text)
+    except (SyntaxError, ValueError):
+        return []
+    lines = text.splitlines(keepends=True)
+    sources = []
+    for node in ast.walk(tree):
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+            source = "".join(lines[node.lineno - 1:node.end_lineno]).strip()
+            if source and len(source) <= max_chars:
+                sources.append(source)
+    return sources
+
+
+def run_worker(config: Dict[str, Any]) -> Dict[str, Any]:
+    """(자식 프로세스) 현재 CHUNKING_MODE 로 파일을 로드/분할하고 통계를 계산합니다."""
+    import numpy as np
+
+    from src.models.git_repository import ParsedCode, RepositoryInfo
+    from src.llm_workflows.state import RepositoryToVectorDBState
+    from src.llm_workflows.nodes.code_loader import load_documents
+    from src.llm_workflows.nodes.code_splitter import split_documents
+    from src.utils.language_registry import get_spec
+    from src.utils.rate_budget import estimate_tokens
+
+    with open(config["files_path"], encoding="utf-8") as f:
+        files = json.load(f)
+    parsed = [
+        ParsedCode(
+            path=item["path"],
+            name=os.path.basename(item["path"]),
+            type="file",
+            text=item["text"],
+            metadata={
+                "repo_url": "https://github.com/bench/chunking",
+                "ref": "main",
+                "extension": os.path.splitext(item["path"])[1].lstrip(".").lower(),
+                "file_size": len(item["text"].encode("utf-8")),
+            },
+        )
+        for item in files
+    ]
+
+    start = time.perf_counter()
+    state = RepositoryToVectorDBState(repo_info=RepositoryInfo(repo_url="https://github.com/bench/chunking"))
+    state.documents_by_language = load_documents(parsed)
+    state = split_documents(state)
+    seconds = time.perf_counter() - start
+
+    chunks_by_file: Dict[str, List[str]] = {}
+    for chunk in state.split_documents:
+        chunks_by_file.setdefault(chunk.metadata.get("file_path", ""), []).append(chunk.page_content)
+
+    definitions = intact = 0
+    max_chars = get_spec("PYTHON").chunk_size
+    for item in files:
+        if not item["path"].endswith(".py"):
+            continue
+        file_chunks = chunks_by_file.get(item["path"], [])
+        for source in _definitions(item["text"], max_chars):
+            definitions += 1
+            intact += any(source in chunk for chunk in file_chunks)
+
+    sizes = np.asarray([len(chunk.page_content) for chunk in state.split_documents] or [0])
+    return {
+        "files": len(files),
+        "documents": sum(len(documents) for documents in state.documents_by_language.values()),
+        "chunks": len(state.split_documents),
+        "embedded_chars": int(sizes.sum()),
+        "embedded_tokens_estimate": estimate_tokens(chunk.page_content for chunk in state.split_documents),
+        "chunk_chars": {
+            "p50": int(np.percentile(sizes, 50)),
+            "p95": int(np.percentile(sizes, 95)),
+            "max": int(sizes.max()),
+        },
+        "intact_definitions": round(intact / definitions, 3) if definitions else None,
+        "split_seconds": round(seconds, 3),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="청크 분할 방식 비교 벤치마크")
+    parser.add_argument("--paths", nargs="+", default=None, help="소스 디렉토리 (기본값: src 와 langchain_core)")
+    parser.add_argument("--modes", nargs="+", default=list(MODES), choices=MODES)
+    parser.add_argument("--output", help="결과 JSON 저장 경로")
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        with open(args.worker, encoding="utf-8") as f:
+            config = json.load(f)
+        result = run_worker(config)
+        with open(config["result_path"], "w", encoding="utf-8") as f:
+            json.dump(result, f)
+        return
+
+    files = collect_files(args.paths or _default_paths())
+    workdir = tempfile.mkdtemp(prefix="chunking_bench_")
+    files_path = os.path.join(workdir, "files.json")
+    with open(files_path, "w", encoding="utf-8") as f:
+        json.dump(files, f)
+    print(f"{len(files)}개 파일", file=sys.stderr)
+
+    results: Dict[str, Dict[str, Any]] = {}
+    for mode in args.modes:
+        config = {"files_path": files_path, "result_path": os.path.join(workdir, f"{mode}.json")}
+        config_path = os.path.join(workdir, f"{mode}_config.json")
+        with open(config_path, "w", encoding="utf-8") as f:
+            json.dump(config, f)
+        env = {
+            **os.environ,
+            "PYTHONPATH": ROOT + os.pathsep + os.environ.get("PYTHONPATH", ""),
+            "CHUNKING_MODE": mode,
+            # 분할 캐시가 결과에 섞이지 않도록 블롭 저장소를 끔
+            "BLOB_STORE_ENABLED": "false",
+        }
+        completed = subprocess.run(
+            [sys.executable, "-m", "benchmarks.chunking_benchmark", "--worker", config_path],
+            cwd=ROOT, env=env, capture_output=True, text=True,
+        )
+        if completed.returncode != 0:
+            print(completed.stderr[-4000:], file=sys.stderr)
+            raise RuntimeError(f"worker 실패: mode={mode}")
+        with open(config["result_path"], encoding="utf-8") as f:
+            results[mode] = json.load(f)
+        result = results[mode]
+        print(
+            f"[{mode}] chunks={result['chunks']} embedded_tokens~{result['embedded_tokens_estimate']} "
+            f"p50={result['chunk_chars']['p50']} p95={result['chunk_chars']['p95']} "
+            f"intact_definitions={result['intact_definitions']} split={result['split_seconds']}s",
+            file=sys.stderr,
+        )
+
+    report: Dict[str, Any] = {"files": len(files), "results": results}
+    if "recursive" in results and "syntax" in results:
+        baseline, syntax = results["recursive"], results["syntax"]
+        report["reduction"] = {
+            "chunks": round(1 - syntax["chunks"] / baseline["chunks"], 3) if baseline["chunks"] else None,
+            "embedded_tokens": round(
+                1 - syntax["embedded_tokens_estimate"] / baseline["embedded_tokens_estimate"], 3
+            ) if baseline["embedded_tokens_estimate"] else None,
+        }
+    print(json.dumps(report, indent=2))
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
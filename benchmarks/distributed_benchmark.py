@@ -0,0 +1,174 @@
+"""
+분산 수집 작업자 수별 처리량 벤치마크
+
+로컬 GitHub API 대역(benchmarks.fake_github), OpenAI 대역(benchmarks.fake_openai)과 작업자 수마다 새 Chroma 서버
+(`chroma run`)를 띄우고, `python -m src.llm_workflows.distributed_ingest run` 을 그대로 실행해 측정합니다.
+원격 API 지연 시간을 주면 단일 프로세스 수집이 네트워크 대기에 묶이는 상황을 흉내낼 수 있습니다.
+
+측정 항목 (작업자 수별):
+    seconds                 샤드 등록부터 마무리까지 전체 시간 (작업자 프로세스 시작 포함)
+    files_per_sec           수집 처리량
+    speedup                 작업자 1개 대비 속도
+    shards / attempts       샤드 수, 재시도와 중복 실행을 포함한 샤드 처리 횟수
+    index_vectors           수집 후 code_documents 컬렉션의 벡터 수 (작업자 수와 관계없이 같아야 함)
+
+사용법:
+    python -m benchmarks.distributed_benchmark --files 400 --workers 1 2 4 --github-latency-ms 20 --chat-latency-ms 200
+"""
+
+import argparse
+import json
+import os
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Any, Dict, List
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _start_chroma(path: str, port: int) -> subprocess.Popen:
+    import requests
+
+    process = subprocess.Popen(
+        ["chroma", "run", "--path", path, "--host", "127.0.0.1", "--port", str(port)],
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, cwd=os.path.dirname(path),
+        env={**os.environ, "ANONYMIZED_TELEMETRY": "False"},
+    )
+    deadline = time.time() + 60
+    while time.time() < deadline:
+        try:
+            requests.get(f"http://127.0.0.1:{port}/api/v1/heartbeat", timeout=1).raise_for_status()
+            return process
+        except Exception:
+            if process.poll() is not None:
+                raise RuntimeError("Chroma 서버를 시작하지 못했습니다.")
+            time.sleep(0.2)
+    process.terminate()
+    raise RuntimeError("Chroma 서버가 응답하지 않습니다.")
+
+
+def _count_vectors(port: int) -> int:
+    import chromadb
+
+    client = chromadb.HttpClient(host="127.0.0.1", port=port)
+    return client.get_collection("code_documents").count()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="분산 수집 작업자 수별 처리량 벤치마크")
+    parser.add_argument("--files", type=int, default=400, help="저장소 파일 수")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4], help="작업자 프로세스 수")
+    parser.add_argument("--shards-per-worker", type=int, default=4)
+    parser.add_argument("--functions-per-file", type=int, default=8)
+    parser.add_argument("--files-per-dir", type=int, default=20)
+    parser.add_argument("--github-latency-ms", type=float, default=20.0)
+    parser.add_argument("--embedding-latency-ms", type=float, default=50.0)
+    parser.add_argument("--chat-latency-ms", type=float, default=200.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="결과 JSON 저장 경로")
+    args = parser.parse_args()
+
+    from benchmarks.fake_github import FakeGitHubServer, RepoSpec
+    from benchmarks.fake_openai import FakeOpenAIServer
+    from benchmarks.pipeline_benchmark import _tiktoken_available
+
+    github = FakeGitHubServer(latency=args.github_latency_ms / 1000).start()
+    openai = FakeOpenAIServer(
+        embedding_latency=args.embedding_latency_ms / 1000, chat_latency=args.chat_latency_ms / 1000
+    ).start()
+    repo_name = f"monorepo-{args.files}-{args.seed}"
+    github.add_repo("bench", repo_name, RepoSpec(
+        files=args.files, functions_per_file=args.functions_per_file, files_per_dir=args.files_per_dir, seed=args.seed
+    ))
+    tiktoken_available = _tiktoken_available()
+
+    results: List[Dict[str, Any]] = []
+    try:
+        for workers in args.workers:
+            workdir = tempfile.mkdtemp(prefix=f"distributed_bench_{workers}_")
+            port = _free_port()
+            chroma = _start_chroma(os.path.join(workdir, "chroma_server"), port)
+            output_path = os.path.join(workdir, "report.json")
+            env = {
+                **os.environ,
+                "PYTHONPATH": ROOT + os.pathsep + os.environ.get("PYTHONPATH", ""),
+                "GITHUB_API_BASE": github.base_url,
+                "GITHUB_TOKEN": "benchmark",
+                "OPENAI_API_BASE": openai.base_url,
+                "OPENAI_API_KEY": "benchmark",
+                "CHROMA_MODE": "http",
+                "CHROMA_HOST": "127.0.0.1",
+                "CHROMA_PORT": str(port),
+                "VECTOR_DB_PATH": os.path.join(workdir, "db"),
+                "BLOB_STORE_PATH": os.path.join(workdir, "db", "blob_store.sqlite3"),
+                "INGEST_STATE_PATH": os.path.join(workdir, "db", "ingest_state.sqlite3"),
+                "WORK_QUEUE_PATH": os.path.join(workdir, "db", "work_queue.sqlite3"),
+                "DISTRIBUTED_SHARDS_PER_WORKER": str(args.shards_per_worker),
+                "WORKER_POLL_SECONDS": "0.2",
+                # 작업자 수로 나눈 전체 한도가 처리량을 정하지 않도록 대역 서버에는 한도를 두지 않음
+                "GITHUB_REQUESTS_PER_HOUR": "0",
+                "OPENAI_TOKENS_PER_MINUTE": "0",
+                "ANONYMIZED_TELEMETRY": "False",
+                "EMBEDDING_CHECK_CTX_LENGTH": "true" if tiktoken_available else "false",
+            }
+            print(f"[workers={workers}] {args.files} files ...", file=sys.stderr, flush=True)
+            try:
+                completed = subprocess.run(
+                    [sys.executable, "-m", "src.llm_workflows.distributed_ingest", "run",
+                     f"https://github.com/bench/{repo_name}", "--workers", str(workers), "--output", output_path],
+                    cwd=ROOT, env=env, capture_output=True, text=True,
+                )
+                if completed.returncode != 0:
+                    print(completed.stderr[-4000:], file=sys.stderr)
+                    raise RuntimeError(f"분산 수집 실패: workers={workers}")
+                with open(output_path, encoding="utf-8") as f:
+                    report = json.load(f)
+                index_vectors = _count_vectors(port)
+            finally:
+                chroma.terminate()
+                chroma.wait()
+                shutil.rmtree(workdir, ignore_errors=True)
+
+            result = {
+                "workers": workers,
+                "seconds": report["seconds"],
+                "files": report["files"],
+                "chunks": report["chunks"],
+                "files_per_sec": round(report["files"] / report["seconds"], 2) if report["seconds"] else None,
+                "shards": report["shards"],
+                "attempts": report["attempts"],
+                "index_vectors": index_vectors,
+            }
+            results.append(result)
+            print(
+                f"[workers={workers}] {result['seconds']}s files/s={result['files_per_sec']} "
+                f"shards={result['shards']} attempts={result['attempts']} index_vectors={index_vectors}",
+                file=sys.stderr,
+            )
+    finally:
+        github.stop()
+        openai.stop()
+
+    baseline = results[0]["seconds"] if results else None
+    for result in results:
+        result["speedup"] = round(baseline / result["seconds"], 2) if baseline and result["seconds"] else None
+
+    report = {"args": vars(args), "results": results}
+    print(json.dumps(report, indent=2))
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
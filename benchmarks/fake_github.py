@@ -0,0 +1,449 @@
+"""
+벤치마크용 로컬 GitHub REST / GraphQL API 대역
+
+GitHubRepositoryUtils 가 사용하는 엔드포인트만 구현합니다.
+    GET /repos/{owner}/{repo}                     기본 브랜치, 크기(KB)
+    GET /orgs/{owner}/repos, /users/{owner}/repos 소유자의 저장소 목록 (page, per_page)
+    GET /repos/{owner}/{repo}/contents/{path}     디렉토리 목록 / 파일(base64)
+    GET /raw/{owner}/{repo}/{path}                큰 파일의 download_url
+    POST /graphql                                 repository.object(expression: "branch:path") 의 Blob 필드
+                                                  (text byteSize isBinary isTruncated) 와 rateLimit
+
+저장소 내용은 RepoSpec(파일 수, 언어 비율, 시드)으로 결정적으로 생성되므로
+같은 설정이면 항상 같은 파일, 같은 blob SHA 가 나옵니다.
+
+사용 예:
+    server = FakeGitHubServer()
+    server.add_repo("bench", "repo-200", RepoSpec(files=200))
+    server.start()
+    os.environ["GITHUB_API_BASE"] = server.base_url
+"""
+
+import base64
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, unquote, urlparse
+
+# 생성 코드에 사용하는 어휘 (질의 생성에도 같은 어휘를 사용)
+VOCABULARY: Tuple[str, ...] = (
+    "user", "account", "session", "token", "cache", "index", "vector", "query", "repository", "branch",
+    "commit", "file", "chunk", "parser", "splitter", "embedding", "metric", "request", "response", "config",
+    "logger", "graph", "node", "state", "document", "metadata", "store", "queue", "worker", "schedule",
+    "retry", "deadline", "stream", "buffer", "encoder", "decoder", "payload", "header", "router", "handler",
+)
+
+# js 는 esprima, java/go 는 tree_sitter 파서 패키지가 설치된 환경에서만 파싱되므로 기본 구성에서는 제외
+DEFAULT_LANGUAGE_MIX: Dict[str, float] = {"py": 0.7, "md": 0.3}
+
+# 이 크기를 넘는 파일은 실제 GitHub 처럼 content 없이 download_url 만 돌려줌
+INLINE_CONTENT_LIMIT: int = 1024 * 1024
+
+# 이 크기를 넘는 blob 은 실제 GitHub GraphQL 처럼 text 를 잘라서(isTruncated) 돌려줌
+GRAPHQL_TEXT_LIMIT: int = 512 * 1024
+
+# GraphQL 쿼리의 object 별칭: f0: object(expression: $e0)
+_GRAPHQL_OBJECT = re.compile(r"(\w+)\s*:\s*object\s*\(\s*expression\s*:\s*\$(\w+)\s*\)")
+
+
+@dataclass
+class RepoSpec:
+    """
+    생성할 저장소 설정
+
+    Args:
+        files: 파일 수
+        language_mix: 확장자별 비율
+        functions_per_file: 파일당 함수 수 (파일 크기 조절)
+        files_per_dir: 디렉토리당 파일 수
+        binary_files: 추가할 바이너리 파일(.dat) 수
+        cross_references: Python 파일마다 앞서 만든 다른 파일의 함수를 import 해 호출하는 수
+        seed: 난수 시드
+    """
+    files: int = 100
+    language_mix: Dict[str, float] = field(default_factory=lambda: dict(DEFAULT_LANGUAGE_MIX))
+    functions_per_file: int = 8
+    files_per_dir: int = 20
+    binary_files: int = 0
+    cross_references: int = 0
+    seed: int = 0
+
+
+def _words(rng: random.Random, count: int) -> List[str]:
+    return [rng.choice(VOCABULARY) for _ in range(count)]
+
+
+def _python_source(rng: random.Random, functions: int) -> str:
+    lines = ["import os", "import json", ""]
+    for _ in range(functions):
+        a, b, c = _words(rng, 3)
+        lines += [
+            f"def {a}_{b}_{c}({a}, {b}=None):",
+            f'    """{a} {b} 를 {c} 로 변환합니다."""',
+            f"    result = {{'{a}': {a}, '{b}': {b}}}",
+            f"    for item in {a} or []:",
+            f"        if item.get('{c}'):",
+            f"            result['{c}'] = item['{c}']",
+            f"    return json.dumps(result)",
+            "",
+        ]
+    return "\n".join(lines)
+
+
+def _javascript_source(rng: random.Random, functions: int) -> str:
+    lines = ["'use strict';", ""]
+    for _ in range(functions):
+        a, b, c = _words(rng, 3)
+        lines += [
+            f"// {a} {b} {c}",
+            f"function {a}{b.title()}{c.title()}({a}, {b}) {{",
+            f"  const {c} = {{ ...{a}, {b} }};",
+            f"  if (!{c}.{a}) {{",
+            f"    throw new Error('{a} missing');",
+            "  }",
+            f"  return {c};",
+            "}",
+            "",
+        ]
+    return "\n".join(lines)
+
+
+def _java_source(rng: random.Random, functions: int) -> str:
+    a, b = _words(rng, 2)
+    lines = [f"package com.bench.{a};", "", f"public class {a.title()}{b.title()} {{"]
+    for _ in range(functions):
+        x, y, z = _words(rng, 3)
+        lines += [
+            f"    /** {x} {y} {z} */",
+            f"    public String {x}{y.title()}(String {z}) {{",
+            f"        if ({z} == null) {{",
+            f'            return "{x}";',
+            "        }",
+            f'        return {z} + "{y}";',
+            "    }",
+            "",
+        ]
+    lines.append("}")
+    return "\n".join(lines)
+
+
+def _go_source(rng: random.Random, functions: int) -> str:
+    lines = [f"package {rng.choice(VOCABULARY)}", "", 'import "fmt"', ""]
+    for _ in range(functions):
+        a, b, c = _words(rng, 3)
+        lines += [
+            f"// {a.title()}{b.title()} handles {c}",
+            f"func {a.title()}{b.title()}({c} string) (string, error) {{",
+            f'    if {c} == "" {{',
+            f'        return "", fmt.Errorf("{a} empty")',
+            "    }",
+            f'    return fmt.Sprintf("%s-{b}", {c}), nil',
+            "}",
+            "",
+        ]
+    return "\n".join(lines)
+
+
+def _markdown_source(rng: random.Random, functions: int) -> str:
+    lines = [f"# {' '.join(_words(rng, 3)).title()}", ""]
+    for _ in range(functions):
+        lines += [f"## {' '.join(_words(rng, 2)).title()}", "", " ".join(_words(rng, 40)) + ".", ""]
+    return "\n".join(lines)
+
+
+GENERATORS = {
+    "py": _python_source,
+    "js": _javascript_source,
+    "java": _java_source,
+    "go": _go_source,
+    "md": _markdown_source,
+}
+
+
+def generate_repo(spec: RepoSpec) -> Dict[str, bytes]:
+    """
+    RepoSpec 으로 저장소 파일을 생성합니다.
+
+    Returns:
+        Dict[str, bytes]: 파일 경로 → 내용
+    """
+    rng = random.Random(spec.seed)
+    extensions = [ext for ext in spec.language_mix if ext in GENERATORS]
+    weights = [spec.language_mix[ext] for ext in extensions]
+
+    files: Dict[str, bytes] = {}
+    for index in range(spec.files):
+        ext = rng.choices(extensions, weights=weights)[0]
+        directory = f"pkg{index // spec.files_per_dir}/{rng.choice(VOCABULARY)}"
+        path = f"{directory}/{rng.choice(VOCABULARY)}_{index}.{ext}"
+        files[path] = GENERATORS[ext](rng, spec.functions_per_file).encode("utf-8")
+    if spec.cross_references:
+        _add_cross_references(files, spec)
+    for index in range(spec.binary_files):
+        files[f"assets/{rng.choice(VOCABULARY)}_{index}.dat"] = b"\0" + rng.randbytes(rng.randint(256, 4096))
+    return files
+
+
+def _add_cross_references(files: Dict[str, bytes], spec: RepoSpec) -> None:
+    """
+    Python 파일마다 앞서 생성한 다른 파일의 함수를 cross_references 개 골라 import 하고, 임의의 함수 안에서 호출하게 바꿉니다.
+    (기존 생성 결과가 바뀌지 않도록 별도 난수 생성기 사용)
+    """
+    rng = random.Random(spec.seed + 1)
+    defined: List[Tuple[str, str]] = []
+    for path in list(files):
+        if not path.endswith(".py"):
+            continue
+        text = files[path].decode("utf-8")
+        names = re.findall(r"^def (\w+)", text, re.M)
+        if defined:
+            blocks = text.split("\n\ndef ")
+            imports = []
+            for module, name in rng.sample(defined, min(spec.cross_references, len(defined))):
+                imports.append(f"from {module} import {name}")
+                index = rng.randrange(1, len(blocks)) if len(blocks) > 1 else 0
+                blocks[index] = blocks[index].replace(
+                    "    return json.dumps(result)", f"    result['{name}'] = {name}(result)\n    return json.dumps(result)", 1
+                )
+            text = "\n".join(imports) + "\n" + "\n\ndef ".join(blocks)
+            files[path] = text.encode("utf-8")
+        module = path[:-len(".py")].replace("/", ".")
+        defined.extend((module, name) for name in names)
+
+
+def git_blob_sha(content: bytes) -> str:
+    """git 과 같은 방식의 blob SHA"""
+    return hashlib.sha1(b"blob %d\0" % len(content) + content).hexdigest()
+
+
+class _Repository:
+    def __init__(self, files: Dict[str, bytes], branch: str):
+        self.files = files
+        self.branch = branch
+        self.shas = {path: git_blob_sha(content) for path, content in files.items()}
+        # 파일 내용이 같으면 같은 값 (실제 커밋 SHA 대신 사용)
+        self.commit_sha = hashlib.sha1("".join(sorted(self.shas.values())).encode("ascii")).hexdigest()
+        # 디렉토리 → 직계 자식 (이름, 유형)
+        self.children: Dict[str, Dict[str, str]] = {"": {}}
+        for path in files:
+            parts = path.split("/")
+            for depth in range(len(parts)):
+                parent = "/".join(parts[:depth])
+                child = "/".join(parts[:depth + 1])
+                self.children.setdefault(parent, {})[child] = "file" if depth == len(parts) - 1 else "dir"
+                if depth < len(parts) - 1:
+                    self.children.setdefault(child, {})
+
+
+class FakeGitHubServer:
+    """
+    생성된 저장소를 제공하는 로컬 GitHub API 서버 (백그라운드 스레드)
+
+    Args:
+        host: 바인딩 주소
+        port: 포트 (0 이면 임의 포트)
+        latency: 응답마다 추가할 지연 시간(초), 네트워크 왕복 흉내
+        graphql_points: 시간 창마다 쓸 수 있는 GraphQL 포인트 (None 이면 무제한, 쿼리당 1 포인트)
+        graphql_reset_seconds: GraphQL 포인트가 초기화되는 시간 창(초)
+    """
+    def __init__(
+        self, host: str = "127.0.0.1", port: int = 0, latency: float = 0.0,
+        graphql_points: Optional[int] = None, graphql_reset_seconds: float = 60.0,
+    ):
+        self.latency = latency
+        self.graphql_points = graphql_points
+        self.graphql_reset_seconds = graphql_reset_seconds
+        self.repositories: Dict[Tuple[str, str], _Repository] = {}
+        self.request_count = 0
+        self.graphql_request_count = 0
+        self.response_bytes = 0
+        self._graphql_used = 0
+        self._graphql_reset_at = 0.0
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def add_repo(self, owner: str, name: str, spec: RepoSpec, branch: str = "main") -> Dict[str, bytes]:
+        """저장소를 생성해 등록하고 파일 목록을 반환합니다."""
+        files = generate_repo(spec)
+        self.repositories[(owner, name)] = _Repository(files, branch)
+        return files
+
+    def start(self) -> "FakeGitHubServer":
+        self._thread = threading.Thread(target=self._server.serve_forever, name="fake-github", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                with server._lock:
+                    server.request_count += 1
+                if server.latency:
+                    threading.Event().wait(server.latency)
+
+                parsed = urlparse(self.path)
+                parts = [unquote(part) for part in parsed.path.strip("/").split("/")]
+                if len(parts) >= 3 and parts[0] == "raw":
+                    return self._raw(parts[1], parts[2], "/".join(parts[3:]))
+                if len(parts) == 3 and parts[0] in ("orgs", "users") and parts[2] == "repos":
+                    return self._list_repos(parts[1], parse_qs(parsed.query))
+                if len(parts) >= 3 and parts[0] == "repos":
+                    repository = server.repositories.get((parts[1], parts[2]))
+                    if repository is None:
+                        return self._send(404, {"message": "Not Found"})
+                    if len(parts) == 3:
+                        return self._send(200, self._repo_entry(parts[1], parts[2], repository))
+                    if parts[3] == "contents":
+                        return self._contents(parts[1], parts[2], repository, "/".join(parts[4:]))
+                    if parts[3] == "commits" and len(parts) == 5 and parts[4] == repository.branch:
+                        return self._send(200, {"sha": repository.commit_sha})
+                self._send(404, {"message": "Not Found"})
+
+            def do_POST(self):
+                with server._lock:
+                    server.request_count += 1
+                if server.latency:
+                    threading.Event().wait(server.latency)
+                body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                if urlparse(self.path).path.rstrip("/") != "/graphql":
+                    return self._send(404, {"message": "Not Found"})
+                self._graphql(json.loads(body or b"{}"))
+
+            def _graphql(self, request: Dict[str, object]):
+                query = str(request.get("query", ""))
+                variables = request.get("variables") or {}
+                with server._lock:
+                    server.graphql_request_count += 1
+                    now = time.time()
+                    if now >= server._graphql_reset_at:
+                        server._graphql_used, server._graphql_reset_at = 0, now + server.graphql_reset_seconds
+                    limited = server.graphql_points is not None and server._graphql_used >= server.graphql_points
+                    if not limited:
+                        server._graphql_used += 1
+                    remaining = None if server.graphql_points is None else max(server.graphql_points - server._graphql_used, 0)
+                    reset_at = server._graphql_reset_at
+                rate_limit = {
+                    "cost": 1,
+                    "remaining": 5000 if remaining is None else remaining,
+                    "resetAt": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(reset_at + 1)),
+                }
+                if limited:
+                    # 실제 GitHub 처럼 HTTP 200 에 RATE_LIMITED 오류로 알림
+                    return self._send(200, {
+                        "data": None,
+                        "errors": [{"type": "RATE_LIMITED", "message": "API rate limit exceeded"}],
+                    }, headers={"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": str(int(reset_at) + 1)})
+
+                repository = server.repositories.get((variables.get("owner"), variables.get("name")))
+                data: Dict[str, object] = {"rateLimit": rate_limit, "repository": None}
+                if repository is not None:
+                    objects: Dict[str, object] = {}
+                    for alias, variable in _GRAPHQL_OBJECT.findall(query):
+                        branch, _, path = str(variables.get(variable, "")).partition(":")
+                        content = repository.files.get(path) if branch == repository.branch else None
+                        objects[alias] = None if content is None else self._blob(content)
+                    data["repository"] = objects
+                self._send(200, {"data": data})
+
+            def _blob(self, content: bytes) -> Dict[str, object]:
+                try:
+                    text = None if b"\0" in content else content.decode("utf-8")
+                except UnicodeDecodeError:
+                    text = None
+                truncated = text is not None and len(content) > GRAPHQL_TEXT_LIMIT
+                return {
+                    "byteSize": len(content),
+                    "isBinary": text is None,
+                    "isTruncated": truncated,
+                    "text": content[:GRAPHQL_TEXT_LIMIT].decode("utf-8", "ignore") if truncated else text,
+                }
+
+            def _repo_entry(self, owner: str, name: str, repository: _Repository) -> Dict[str, object]:
+                return {
+                    "name": name,
+                    "full_name": f"{owner}/{name}",
+                    "html_url": f"https://github.com/{owner}/{name}",
+                    "default_branch": repository.branch,
+                    "size": sum(len(content) for content in repository.files.values()) // 1024,
+                    "archived": False,
+                }
+
+            def _list_repos(self, owner: str, query: Dict[str, List[str]]):
+                names = sorted(name for repo_owner, name in server.repositories if repo_owner == owner)
+                if not names:
+                    return self._send(404, {"message": "Not Found"})
+                page = int(query.get("page", ["1"])[0])
+                per_page = int(query.get("per_page", ["30"])[0])
+                selected = names[(page - 1) * per_page:page * per_page]
+                self._send(200, [self._repo_entry(owner, name, server.repositories[(owner, name)]) for name in selected])
+
+            def _contents(self, owner: str, name: str, repository: _Repository, path: str):
+                if path in repository.children and path not in repository.files:
+                    listing = []
+                    for child, kind in sorted(repository.children[path].items()):
+                        entry = {"name": child.rsplit("/", 1)[-1], "path": child, "type": kind}
+                        if kind == "file":
+                            entry.update(sha=repository.shas[child], size=len(repository.files[child]))
+                        listing.append(entry)
+                    return self._send(200, listing)
+
+                content = repository.files.get(path)
+                if content is None:
+                    return self._send(404, {"message": "Not Found"})
+                data = {
+                    "name": path.rsplit("/", 1)[-1],
+                    "path": path,
+                    "type": "file",
+                    "sha": repository.shas[path],
+                    "size": len(content),
+                    "download_url": f"{server.base_url}/raw/{owner}/{name}/{path}",
+                }
+                if len(content) <= INLINE_CONTENT_LIMIT:
+                    data["encoding"] = "base64"
+                    data["content"] = base64.encodebytes(content).decode("ascii")
+                self._send(200, data)
+
+            def _raw(self, owner: str, name: str, path: str):
+                repository = server.repositories.get((owner, name))
+                content = repository.files.get(path) if repository else None
+                if content is None:
+                    return self._send(404, {"message": "Not Found"})
+                self._send(200, content, content_type="application/octet-stream")
+
+            def _send(self, status: int, body, content_type: str = "application/json", headers: Optional[Dict[str, str]] = None):
+                payload = body if isinstance(body, bytes) else json.dumps(body).encode("utf-8")
+                with server._lock:
+                    server.response_bytes += len(payload)
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(payload)))
+                for key, value in (headers or {}).items():
+                    self.send_header(key, value)
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
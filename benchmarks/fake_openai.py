@@ -0,0 +1,187 @@
+"""
+벤치마크용 결정적 OpenAI API 대역 (임베딩 / 채팅)
+
+langchain_openai 의 OpenAIEmbeddings, ChatOpenAI 가 호출하는 엔드포인트만 구현합니다.
+    POST /v1/embeddings         토큰(또는 단어) 해싱 기반 벡터. 같은 입력이면 항상 같은 벡터이고,
+                                단어가 겹치는 텍스트끼리 코사인 유사도가 높아 검색 결과가 의미를 가집니다.
+    POST /v1/chat/completions   function_call 로 코드에 등장하는 단어를 조합한 가설 질문을 돌려줍니다.
+
+OPENAI_API_BASE 환경 변수를 base_url 로 설정하면 코드 수정 없이 파이프라인이 이 서버를 사용합니다.
+"""
+
+import base64
+import functools
+import hashlib
+import json
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Union
+
+import numpy as np
+
+from benchmarks.fake_github import VOCABULARY
+
+WORD_PATTERN = re.compile(r"[A-Za-z_][A-Za-z0-9_]+")
+
+
+@functools.lru_cache(maxsize=1 << 16)
+def _feature_hash(feature: Union[int, str]) -> int:
+    return int.from_bytes(hashlib.blake2b(str(feature).encode("utf-8"), digest_size=8).digest(), "little")
+
+
+def fake_embedding(text_or_tokens: Union[str, List[int]], dimensions: int) -> np.ndarray:
+    """
+    해싱 트릭으로 결정적인 단위 벡터를 만듭니다.
+
+    Args:
+        text_or_tokens: 텍스트 또는 토큰 ID 목록 (OpenAIEmbeddings 는 기본적으로 토큰 ID 를 보냄)
+        dimensions: 벡터 차원
+    """
+    features = text_or_tokens if isinstance(text_or_tokens, list) else WORD_PATTERN.findall(text_or_tokens.lower())
+    vector = np.zeros(dimensions, dtype=np.float32)
+    for feature in features:
+        hashed = _feature_hash(feature)
+        vector[hashed % dimensions] += 1.0 if (hashed >> 32) & 1 else -1.0
+    norm = float(np.linalg.norm(vector))
+    if norm == 0:
+        vector[0], norm = 1.0, 1.0
+    return vector / norm
+
+
+def fake_questions(code: str, count: int = 3) -> List[str]:
+    """코드에 등장하는 어휘를 조합해 결정적인 가설 질문을 만듭니다."""
+    words = [word for word in WORD_PATTERN.findall(code.lower()) if word in VOCABULARY] or list(VOCABULARY[:3])
+    seed = _feature_hash(code)
+    questions = []
+    for index in range(count):
+        a = words[(seed + index * 7) % len(words)]
+        b = words[(seed // 3 + index * 13) % len(words)]
+        questions.append(f"How does the code handle {a} and {b}?")
+    return questions
+
+
+class FakeOpenAIServer:
+    """
+    OpenAI 호환 로컬 서버 (백그라운드 스레드)
+
+    Args:
+        host: 바인딩 주소
+        port: 포트 (0 이면 임의 포트)
+        embedding_latency: 임베딩 요청마다 추가할 지연 시간(초)
+        chat_latency: 채팅 요청마다 추가할 지연 시간(초)
+    """
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        embedding_latency: float = 0.0,
+        chat_latency: float = 0.0,
+    ):
+        self.embedding_latency = embedding_latency
+        self.chat_latency = chat_latency
+        self.counters: Dict[str, int] = {"embedding_requests": 0, "embedding_inputs": 0, "chat_requests": 0}
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), self._handler_class())
+        self._server.daemon_threads = True
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def start(self) -> "FakeOpenAIServer":
+        threading.Thread(target=self._server.serve_forever, name="fake-openai", daemon=True).start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _count(self, name: str, value: int = 1) -> None:
+        with self._lock:
+            self.counters[name] += value
+
+    def _embeddings(self, body: Dict[str, Any]) -> Dict[str, Any]:
+        inputs = body["input"]
+        if isinstance(inputs, str) or (inputs and isinstance(inputs[0], int)):
+            inputs = [inputs]
+        dimensions = int(body.get("dimensions") or 1536)
+        self._count("embedding_requests")
+        self._count("embedding_inputs", len(inputs))
+        if self.embedding_latency:
+            time.sleep(self.embedding_latency)
+
+        # openai 클라이언트는 기본적으로 base64(float32) 형식을 요청함
+        as_base64 = body.get("encoding_format") == "base64"
+
+        def encode(vector: np.ndarray):
+            return base64.b64encode(vector.astype(np.float32).tobytes()).decode("ascii") if as_base64 else vector.tolist()
+
+        tokens = sum(len(item) if isinstance(item, list) else len(item) // 4 for item in inputs)
+        return {
+            "object": "list",
+            "model": body.get("model", "fake-embedding"),
+            "data": [
+                {"object": "embedding", "index": index, "embedding": encode(fake_embedding(item, dimensions))}
+                for index, item in enumerate(inputs)
+            ],
+            "usage": {"prompt_tokens": tokens, "total_tokens": tokens},
+        }
+
+    def _chat(self, body: Dict[str, Any]) -> Dict[str, Any]:
+        self._count("chat_requests")
+        if self.chat_latency:
+            time.sleep(self.chat_latency)
+
+        prompt = "\n".join(str(message.get("content") or "") for message in body.get("messages", []))
+        message: Dict[str, Any] = {"role": "assistant", "content": None}
+        finish_reason = "stop"
+        functions = body.get("functions") or []
+        if functions:
+            message["function_call"] = {
+                "name": functions[0]["name"],
+                "arguments": json.dumps({"questions": fake_questions(prompt)}),
+            }
+            finish_reason = "function_call"
+        else:
+            message["content"] = " ".join(fake_questions(prompt))
+
+        prompt_tokens = len(prompt) // 4
+        return {
+            "id": f"chatcmpl-{_feature_hash(prompt):x}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body.get("model", "fake-chat"),
+            "choices": [{"index": 0, "message": message, "finish_reason": finish_reason}],
+            "usage": {"prompt_tokens": prompt_tokens, "completion_tokens": 30, "total_tokens": prompt_tokens + 30},
+        }
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                body = json.loads(self.rfile.read(length) or b"{}")
+                path = self.path.split("?")[0].rstrip("/")
+                response: Optional[Dict[str, Any]] = None
+                if path.endswith("/embeddings"):
+                    response = server._embeddings(body)
+                elif path.endswith("/chat/completions"):
+                    response = server._chat(body)
+
+                payload = json.dumps(response or {"error": {"message": "Not Found"}}).encode("utf-8")
+                self.send_response(200 if response else 404)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
@@ -0,0 +1,164 @@
+"""
+GitHub 파일 받기 방식(REST / GraphQL) 비교 벤치마크
+
+로컬 GitHub API 대역(benchmarks.fake_github)에 텍스트 파일과 바이너리 파일(.dat)이 섞인 저장소를 만들고,
+방식마다 빈 블롭 저장소를 가진 새 프로세스에서 파일 목록 조회와 fetch_files 를 실행합니다.
+두 방식이 같은 파일을 같은 내용으로 남기는지 함께 확인합니다.
+
+측정 항목 (GITHUB_FETCH_STRATEGY 별):
+    seconds             파일 목록 조회 + 내용 받기 시간
+    github_requests     GitHub 요청 수 (graphql_requests 는 그중 GraphQL 요청 수)
+    response_bytes      GitHub 응답 크기 합
+    kept_files          남은 텍스트 파일 수
+    identical_files     REST 결과와 경로/내용이 같은지
+
+사용법:
+    python -m benchmarks.fetch_benchmark --files 400 --binary-files 40 --github-latency-ms 20
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Any, Dict, List
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+STRATEGIES = ("rest", "graphql")
+
+
+def run_worker(config: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    (자식 프로세스) 파일 목록을 조회하고 내용을 받아 파일별 내용 해시를 돌려줍니다.
+    """
+    from src.utils.download_spool import read_spooled_text, remove
+    from src.utils.git_repository_utils import GitHubRepositoryUtils
+
+    start = time.perf_counter()
+    repo_info = GitHubRepositoryUtils.parse_repo_url(config["repo_url"])
+    files = GitHubRepositoryUtils.fetch_files(repo_info, GitHubRepositoryUtils.list_repo_files(repo_info))
+    seconds = time.perf_counter() - start
+
+    hashes = {}
+    for file in files:
+        text = read_spooled_text(file.spool_path) if file.spool_path else file.text
+        hashes[file.path] = hashlib.sha1(text.encode("utf-8")).hexdigest()
+        if file.spool_path:
+            remove(file.spool_path)
+    return {"seconds": round(seconds, 3), "hashes": hashes}
+
+
+def _run_child(config: Dict[str, Any], env: Dict[str, str], workdir: str) -> Dict[str, Any]:
+    config = {**config, "result_path": os.path.join(workdir, "result.json")}
+    config_path = os.path.join(workdir, "config.json")
+    with open(config_path, "w", encoding="utf-8") as f:
+        json.dump(config, f)
+    completed = subprocess.run(
+        [sys.executable, "-m", "benchmarks.fetch_benchmark", "--worker", config_path],
+        cwd=ROOT, env=env, capture_output=True, text=True,
+    )
+    if completed.returncode != 0:
+        print(completed.stderr[-4000:], file=sys.stderr)
+        raise RuntimeError(f"worker 실패: strategy={env['GITHUB_FETCH_STRATEGY']}")
+    with open(config["result_path"], encoding="utf-8") as f:
+        return json.load(f)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="GitHub 파일 받기 방식(REST / GraphQL) 비교 벤치마크")
+    parser.add_argument("--files", type=int, default=400, help="텍스트 파일 수")
+    parser.add_argument("--binary-files", type=int, default=40, help="바이너리 파일(.dat) 수")
+    parser.add_argument("--functions-per-file", type=int, default=8)
+    parser.add_argument("--github-latency-ms", type=float, default=20, help="GitHub 응답마다 추가할 지연 시간")
+    parser.add_argument("--batch-bytes", type=int, help="GRAPHQL_BATCH_BYTES")
+    parser.add_argument("--batch-max-files", type=int, help="GRAPHQL_BATCH_MAX_FILES")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="결과 JSON 저장 경로")
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        with open(args.worker, encoding="utf-8") as f:
+            config = json.load(f)
+        result = run_worker(config)
+        with open(config["result_path"], "w", encoding="utf-8") as f:
+            json.dump(result, f)
+        return
+
+    from benchmarks.fake_github import FakeGitHubServer, RepoSpec
+
+    github = FakeGitHubServer(latency=args.github_latency_ms / 1000).start()
+    repo_name = f"repo-{args.files}-{args.seed}"
+    github.add_repo("bench", repo_name, RepoSpec(
+        files=args.files, functions_per_file=args.functions_per_file, binary_files=args.binary_files, seed=args.seed,
+    ))
+
+    results: List[Dict[str, Any]] = []
+    baseline: Dict[str, str] = {}
+    try:
+        for strategy in STRATEGIES:
+            workdir = tempfile.mkdtemp(prefix=f"fetch_bench_{strategy}_")
+            env = {
+                **os.environ,
+                "PYTHONPATH": ROOT + os.pathsep + os.environ.get("PYTHONPATH", ""),
+                "GITHUB_API_BASE": github.base_url,
+                "GITHUB_TOKEN": "benchmark",
+                "GITHUB_FETCH_STRATEGY": strategy,
+                # 한도 대기 없이 요청 자체의 비용만 비교 (한도 소모량은 github_requests 로 확인)
+                "GITHUB_REQUESTS_PER_HOUR": "0",
+                "GITHUB_GRAPHQL_POINTS_PER_HOUR": "0",
+                "VECTOR_DB_PATH": workdir,
+                "BLOB_STORE_PATH": os.path.join(workdir, "blob_store.sqlite3"),
+            }
+            if args.batch_bytes:
+                env["GRAPHQL_BATCH_BYTES"] = str(args.batch_bytes)
+            if args.batch_max_files:
+                env["GRAPHQL_BATCH_MAX_FILES"] = str(args.batch_max_files)
+
+            print(f"[{strategy}] fetch ...", file=sys.stderr, flush=True)
+            requests_before, graphql_before, bytes_before = (
+                github.request_count, github.graphql_request_count, github.response_bytes
+            )
+            try:
+                fetched = _run_child({"repo_url": f"https://github.com/bench/{repo_name}"}, env, workdir)
+            finally:
+                shutil.rmtree(workdir, ignore_errors=True)
+
+            hashes = fetched["hashes"]
+            if strategy == "rest":
+                baseline = hashes
+            result = {
+                "strategy": strategy,
+                "files": args.files,
+                "binary_files": args.binary_files,
+                "seconds": fetched["seconds"],
+                "github_requests": github.request_count - requests_before,
+                "graphql_requests": github.graphql_request_count - graphql_before,
+                "response_bytes": github.response_bytes - bytes_before,
+                "kept_files": len(hashes),
+                "identical_files": hashes == baseline,
+            }
+            results.append(result)
+            print(
+                f"[{strategy}] {result['seconds']}s requests={result['github_requests']} "
+                f"(graphql {result['graphql_requests']}) bytes={result['response_bytes']} "
+                f"kept={result['kept_files']} identical={result['identical_files']}",
+                file=sys.stderr,
+            )
+    finally:
+        github.stop()
+
+    report = {"args": vars(args), "results": results}
+    print(json.dumps(report, indent=2))
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
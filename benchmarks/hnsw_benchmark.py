@@ -0,0 +1,152 @@
+"""
+Chroma HNSW 설정과 대량 적재 모드의 삽입 처리량 / 질의 지연 시간 / recall 측정
+
+합성 임베딩을 임시 디렉토리의 내장 Chroma 컬렉션에 넣으면서 (M, construction_ef) 조합과
+적재 방식(incremental: Chroma 기본 설정으로 EMBED_BATCH_SIZE 씩 upsert, bulk: ChromaUtils.bulk_load)별로
+삽입 시간을 재고, 만든 인덱스에서 search_ef 를 바꿔 가며 질의 지연 시간과 brute-force 대비 recall 을 측정합니다.
+임베딩 API 를 호출하지 않으므로 OPENAI_API_KEY 없이 실행할 수 있습니다.
+
+사용법:
+    python -m benchmarks.hnsw_benchmark --vectors 50000 --builds 16:100 32:200 --search-ef 10 50 100
+"""
+
+import argparse
+import contextlib
+import gc
+import json
+import shutil
+import tempfile
+import time
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+from langchain_core.embeddings import FakeEmbeddings
+
+from benchmarks.quantized_index_benchmark import _directory_bytes, _latency_summary, exact_top_k, make_synthetic_data
+
+
+def _parse_build(value: str) -> Tuple[int, int]:
+    m, construction_ef = value.split(":")
+    return int(m), int(construction_ef)
+
+
+def build_index(
+    directory: str,
+    vectors: np.ndarray,
+    mode: str,
+    m: int,
+    construction_ef: int,
+    insert_batch_size: int,
+):
+    """
+    합성 벡터로 컬렉션을 만들고 삽입 시간을 측정합니다.
+
+    Returns:
+        Tuple[Chroma, float, float]: (벡터 저장소, 전체 삽입 시간(초), 그중 finalize 시간(초))
+    """
+    from langchain_chroma import Chroma
+
+    from src.utils.chroma_utils import ChromaUtils
+
+    vectorstore = Chroma(
+        collection_name="hnsw_bench",
+        embedding_function=FakeEmbeddings(size=vectors.shape[1]),
+        persist_directory=directory,
+        collection_metadata={"hnsw:M": m, "hnsw:construction_ef": construction_ef},
+    )
+    ids = [str(row) for row in range(len(vectors))]
+
+    start = time.perf_counter()
+    finalize_started = start
+    with ChromaUtils.bulk_load(vectorstore) if mode == "bulk" else contextlib.nullcontext():
+        for offset in range(0, len(vectors), insert_batch_size):
+            vectorstore._collection.upsert(
+                ids=ids[offset:offset + insert_batch_size],
+                embeddings=vectors[offset:offset + insert_batch_size].tolist(),
+                documents=[""] * len(ids[offset:offset + insert_batch_size]),
+            )
+        finalize_started = time.perf_counter()
+    finished = time.perf_counter()
+    return vectorstore, finished - start, finished - finalize_started
+
+
+def measure_queries(vectorstore, queries: np.ndarray, truth: np.ndarray, k: int) -> Dict[str, Any]:
+    from src.utils.chroma_utils import ChromaUtils
+
+    latencies, hits = [], 0
+    for query, expected in zip(queries, truth):
+        start = time.perf_counter()
+        results = ChromaUtils.similarity_search_by_vectors(vectorstore, [query.tolist()], k=k)[0]
+        latencies.append(time.perf_counter() - start)
+        hits += len({int(doc.id) for doc, _ in results} & set(expected.tolist()))
+    return {"recall": round(hits / truth.size, 4), **_latency_summary(latencies)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Chroma HNSW 설정 / 대량 적재 모드 벤치마크")
+    parser.add_argument("--vectors", type=int, default=20000)
+    parser.add_argument("--dimensions", type=int, default=256)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=5)
+    parser.add_argument("--builds", type=_parse_build, nargs="+", default=[(16, 100), (32, 200)],
+                        help="M:construction_ef 조합")
+    parser.add_argument("--search-ef", type=int, nargs="+", default=[10, 50, 100])
+    parser.add_argument("--modes", nargs="+", default=["incremental", "bulk"], choices=["incremental", "bulk"])
+    parser.add_argument("--insert-batch-size", type=int, default=500,
+                        help="incremental 모드 upsert 크기 (bulk 는 EMBED_BULK_BATCH_SIZE)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="결과 JSON 저장 경로")
+    args = parser.parse_args()
+
+    from src.llm_workflows.nodes.embedder import EMBED_BULK_BATCH_SIZE
+    from src.utils.chroma_utils import BULK_LOAD_BATCH_SIZE, ChromaUtils
+
+    vectors, queries = make_synthetic_data(args.vectors, args.queries, args.dimensions, args.seed)
+    truth = exact_top_k(vectors, queries, args.k)
+
+    results: List[Dict[str, Any]] = []
+    for m, construction_ef in args.builds:
+        for mode in args.modes:
+            directory = tempfile.mkdtemp(prefix="hnsw_bench_")
+            try:
+                insert_batch_size = EMBED_BULK_BATCH_SIZE if mode == "bulk" else args.insert_batch_size
+                vectorstore, insert_seconds, finalize_seconds = build_index(
+                    directory, vectors, mode, m, construction_ef, insert_batch_size
+                )
+                build = {
+                    "mode": mode,
+                    "M": m,
+                    "construction_ef": construction_ef,
+                    "insert_batch_size": insert_batch_size,
+                    "insert_seconds": round(insert_seconds, 3),
+                    "finalize_seconds": round(finalize_seconds, 3),
+                    "vectors_per_second": round(len(vectors) / insert_seconds, 1),
+                    "index_bytes": _directory_bytes(directory),
+                }
+                for search_ef in args.search_ef:
+                    ChromaUtils._apply_hnsw_params(vectorstore, "hnsw_bench", {"hnsw:search_ef": search_ef})
+                    results.append({**build, "search_ef": search_ef, **measure_queries(vectorstore, queries, truth, args.k)})
+                    row = results[-1]
+                    print(f"{mode:<12} M={m:<3} construction_ef={construction_ef:<4} search_ef={search_ef:<4} "
+                          f"insert={row['vectors_per_second']:>8.1f} vec/s  recall@{args.k}={row['recall']:.3f}  "
+                          f"p50={row['p50_ms']}ms  p95={row['p95_ms']}ms")
+                del vectorstore
+                gc.collect()
+            finally:
+                shutil.rmtree(directory, ignore_errors=True)
+
+    report = {
+        "vectors": args.vectors,
+        "dimensions": args.dimensions,
+        "queries": args.queries,
+        "k": args.k,
+        "bulk_load_batch_size": BULK_LOAD_BATCH_SIZE,
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
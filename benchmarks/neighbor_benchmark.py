@@ -0,0 +1,244 @@
+"""
+이웃 그래프 확장 벤치마크
+
+로컬 GitHub API 대역(benchmarks.fake_github)에 다른 파일의 함수를 import 해 호출하는 Python 저장소를 만들고,
+OpenAI 대역(benchmarks.fake_openai)으로 수집한 뒤 질의마다 세 가지 방식을 비교합니다.
+질의는 다른 파일을 호출하는 파일의 코드 조각입니다. (해시 임베딩 대역은 의미 검색을 흉내내지 못하므로 코드 조각으로 히트를 보장)
+
+    plain       rag_to_context 한 번 (이웃 확장 없음)
+    follow_up   plain 결과 청크가 호출하는 다른 파일의 함수마다 rag_to_context("def <이름>") 를 추가로 호출 (에이전트의 후속 질의 흉내)
+                해시 임베딩은 이름만으로 정의를 잘 찾지 못하므로 follow_up 의 coverage 는 하한이고, calls 가 주요 비교 대상
+    expanded    rag_to_context(neighbors=N) 한 번
+
+측정 항목 (방식별, 질의 평균):
+    calls       rag_to_context 호출 수 (호출마다 질의 임베딩 요청 1번)
+    coverage    결과 청크가 호출하는 다른 파일 함수 중 정의 청크가 컨텍스트에 들어온 비율
+    tokens      반환한 컨텍스트 토큰 수 (follow_up 은 모든 호출의 합)
+    seconds     질의 하나를 처리한 시간
+
+사용법:
+    python -m benchmarks.neighbor_benchmark --files 200 --cross-references 2 --queries 30 --neighbors 4
+"""
+
+import argparse
+import json
+import os
+import random
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Any, Dict, List, Set
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+_IDENTIFIER = re.compile(r"[A-Za-z_]\w+")
+
+
+def _callees(documents: List[Any], defined: Dict[str, str]) -> Set[str]:
+    """검색 결과 코드 청크가 호출하는 다른 파일의 함수 이름"""
+    names = set()
+    for document in documents:
+        if document.metadata.get("retrieved_from") != "code_documents":
+            continue
+        path = document.metadata.get("file_path")
+        names.update(
+            name for name in _IDENTIFIER.findall(document.page_content)
+            if name in defined and defined[name] != path and f"{name}(" in document.page_content
+        )
+    return names
+
+
+def _covered(documents: List[Any], names: Set[str], defined: Dict[str, str]) -> Set[str]:
+    """컨텍스트에 정의 청크가 들어 있는 함수 이름"""
+    return {
+        name for name in names
+        if any(
+            document.metadata.get("file_path") == defined[name] and f"def {name}(" in document.page_content
+            for document in documents
+        )
+    }
+
+
+def run_worker(config: Dict[str, Any]) -> Dict[str, Any]:
+    """(자식 프로세스) 저장소를 수집하고 질의마다 plain / follow_up / expanded 를 측정합니다."""
+    from src.llm_workflows.graphs.rag_to_context_graph import get_rag_to_context_graph
+    from src.llm_workflows.mcp.tools import ingest_repository
+    from src.llm_workflows.state import RagToContextState
+    from src.models.git_repository import RepositoryInfo
+    from src.utils.neighbor_graph import NeighborGraph
+    from src.utils.token_utils import count_tokens
+
+    start = time.perf_counter()
+    ingest_repository(RepositoryInfo(repo_url=config["repo_url"]))
+    ingest_seconds = time.perf_counter() - start
+    edges = len(NeighborGraph().edges(config["repo_url"], "main"))
+
+    graph = get_rag_to_context_graph()
+    defined: Dict[str, str] = config["defined"]
+
+    def search(query: str, neighbors: int = 0) -> List[Any]:
+        return graph.invoke(RagToContextState(query=query, neighbors=neighbors))["retrieved_documents"]
+
+    def tokens(documents: List[Any]) -> int:
+        return sum(count_tokens(document.page_content) for document in documents)
+
+    search("warm up")
+    totals = {mode: {"calls": 0, "needed": 0, "covered": 0, "tokens": 0, "seconds": 0.0}
+              for mode in ("plain", "follow_up", "expanded")}
+    for query in config["queries"]:
+        start = time.perf_counter()
+        plain = search(query)
+        plain_seconds = time.perf_counter() - start
+        needed = _callees(plain, defined)
+        covered = _covered(plain, needed, defined)
+        totals["plain"].update(
+            calls=totals["plain"]["calls"] + 1, needed=totals["plain"]["needed"] + len(needed),
+            covered=totals["plain"]["covered"] + len(covered), tokens=totals["plain"]["tokens"] + tokens(plain),
+            seconds=totals["plain"]["seconds"] + plain_seconds,
+        )
+
+        follow_up = totals["follow_up"]
+        follow_up["calls"] += 1
+        follow_up["seconds"] += plain_seconds
+        follow_up["tokens"] += tokens(plain)
+        follow_up_covered = set(covered)
+        for name in sorted(needed - covered):
+            start = time.perf_counter()
+            documents = search(f"def {name}")
+            follow_up["seconds"] += time.perf_counter() - start
+            follow_up["calls"] += 1
+            follow_up["tokens"] += tokens(documents)
+            follow_up_covered |= _covered(documents, {name}, defined)
+        follow_up["needed"] += len(needed)
+        follow_up["covered"] += len(follow_up_covered)
+
+        start = time.perf_counter()
+        expanded = search(query, config["neighbors"])
+        expanded_totals = totals["expanded"]
+        expanded_totals["seconds"] += time.perf_counter() - start
+        expanded_totals["calls"] += 1
+        expanded_totals["needed"] += len(needed)
+        expanded_totals["covered"] += len(_covered(expanded, needed, defined))
+        expanded_totals["tokens"] += tokens(expanded)
+
+    queries = len(config["queries"])
+    modes = {
+        mode: {
+            "calls": round(values["calls"] / queries, 2),
+            "coverage": round(values["covered"] / values["needed"], 3) if values["needed"] else None,
+            "tokens": round(values["tokens"] / queries, 1),
+            "seconds": round(values["seconds"] / queries, 4),
+        }
+        for mode, values in totals.items()
+    }
+    return {
+        "ingest_seconds": round(ingest_seconds, 3),
+        "neighbor_edges": edges,
+        "callees_per_query": round(totals["plain"]["needed"] / queries, 2),
+        "modes": modes,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="이웃 그래프 확장 벤치마크")
+    parser.add_argument("--files", type=int, default=200, help="저장소 파일 수 (모두 Python)")
+    parser.add_argument("--cross-references", type=int, default=2, help="파일마다 다른 파일 함수를 호출하는 수")
+    parser.add_argument("--functions-per-file", type=int, default=2, help="파일당 함수 수 (기본값은 파일 하나가 청크 하나)")
+    parser.add_argument("--queries", type=int, default=30)
+    parser.add_argument("--neighbors", type=int, default=4, help="expanded 방식의 히트당 이웃 수")
+    parser.add_argument("--chunking-mode", default="syntax", help="CHUNKING_MODE")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="결과 JSON 저장 경로")
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        with open(args.worker, encoding="utf-8") as f:
+            config = json.load(f)
+        result = run_worker(config)
+        with open(config["result_path"], "w", encoding="utf-8") as f:
+            json.dump(result, f)
+        return
+
+    from benchmarks.fake_github import FakeGitHubServer, RepoSpec
+    from benchmarks.fake_openai import FakeOpenAIServer
+    from benchmarks.pipeline_benchmark import _tiktoken_available
+
+    github = FakeGitHubServer().start()
+    openai = FakeOpenAIServer().start()
+    repo_name = f"repo-{args.files}-{args.seed}"
+    files = github.add_repo("bench", repo_name, RepoSpec(
+        files=args.files, language_mix={"py": 1.0}, functions_per_file=args.functions_per_file,
+        cross_references=args.cross_references, seed=args.seed,
+    ))
+    defined: Dict[str, str] = {}
+    for path, content in files.items():
+        for name in re.findall(r"^def (\w+)", content.decode("utf-8"), re.M):
+            defined.setdefault(name, path)
+    # 다른 파일을 호출하는 파일의 함수 부분 (import 줄 제외)
+    callers = [
+        content.decode("utf-8").split("\n\ndef ", 1)[-1] for content in files.values()
+        if content.startswith(b"from ")
+    ]
+    queries = random.Random(args.seed).sample(callers, min(args.queries, len(callers)))
+
+    workdir = tempfile.mkdtemp(prefix="neighbor_bench_")
+    env = {
+        **os.environ,
+        "PYTHONPATH": ROOT + os.pathsep + os.environ.get("PYTHONPATH", ""),
+        "GITHUB_API_BASE": github.base_url,
+        "GITHUB_TOKEN": "benchmark",
+        "OPENAI_API_BASE": openai.base_url,
+        "OPENAI_API_KEY": "benchmark",
+        "ANONYMIZED_TELEMETRY": "False",
+        "EMBEDDING_CHECK_CTX_LENGTH": "true" if _tiktoken_available() else "false",
+        "CHUNKING_MODE": args.chunking_mode,
+        "VECTOR_DB_PATH": workdir,
+        "BLOB_STORE_PATH": os.path.join(workdir, "blob_store.sqlite3"),
+        "INGEST_STATE_PATH": os.path.join(workdir, "ingest_state.sqlite3"),
+        "NEIGHBOR_GRAPH_PATH": os.path.join(workdir, "neighbor_graph.sqlite3"),
+    }
+    config = {
+        "repo_url": f"https://github.com/bench/{repo_name}",
+        "queries": queries,
+        "neighbors": args.neighbors,
+        "defined": defined,
+        "result_path": os.path.join(workdir, "result.json"),
+    }
+    try:
+        config_path = os.path.join(workdir, "config.json")
+        with open(config_path, "w", encoding="utf-8") as f:
+            json.dump(config, f)
+        print("ingest + queries ...", file=sys.stderr, flush=True)
+        completed = subprocess.run(
+            [sys.executable, "-m", "benchmarks.neighbor_benchmark", "--worker", config_path],
+            cwd=ROOT, env=env, capture_output=True, text=True,
+        )
+        if completed.returncode != 0:
+            print(completed.stderr[-4000:], file=sys.stderr)
+            raise RuntimeError("worker 실패")
+        with open(config["result_path"], encoding="utf-8") as f:
+            result = json.load(f)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+        github.stop()
+        openai.stop()
+
+    for mode, values in result["modes"].items():
+        print(
+            f"[{mode}] calls={values['calls']} coverage={values['coverage']} "
+            f"tokens={values['tokens']} seconds={values['seconds']}",
+            file=sys.stderr,
+        )
+    report = {"args": vars(args), "result": result}
+    print(json.dumps(report, indent=2))
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,318 @@
+"""
+오프라인 수집/검색 파이프라인 벤치마크
+
+로컬 GitHub API 대역(benchmarks.fake_github)과 결정적 OpenAI 대역(benchmarks.fake_openai)을 띄우고,
+저장소 크기별로 새 프로세스에서 실제 그래프 노드를 순서대로 실행해 측정합니다.
+네트워크와 API 키 없이 실행되며 같은 설정이면 같은 데이터로 측정하므로 회귀 추적에 사용할 수 있습니다.
+
+측정 항목 (저장소 크기 / 벡터 저장소 백엔드별):
+    stages.{load,split,questions,embed}   단계별 wall time, 단계 중 최대 RSS(MB)
+    files_per_sec, chunks_per_sec          수집 처리량 (전체 수집 시간 기준)
+    query.{p50,p95,p99,mean}_ms            해당 인덱스 크기에서 rag_to_context 그래프 질의 지연 시간
+    requests                               대역 서버가 받은 GitHub/임베딩/채팅 요청 수
+
+사용법:
+    python -m benchmarks.pipeline_benchmark --sizes 50 200 800 --queries 100 --output bench_pipeline.json
+    python -m benchmarks.pipeline_benchmark --backends chroma quantized --language-mix py=0.5,go=0.5
+    python -m benchmarks.pipeline_benchmark --chat-latency-ms 300 --embedding-latency-ms 50  # 원격 API 지연 흉내
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterator, List
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+STAGES = ("load", "split", "questions", "embed")
+
+
+class RssSampler:
+    """
+    /proc/self/statm 을 주기적으로 읽어 단계별 최대 RSS 를 기록합니다.
+    /proc 이 없는 환경에서는 프로세스 전체 최대 RSS(getrusage)로 대체합니다.
+    """
+    def __init__(self, interval: float = 0.005):
+        self.interval = interval
+        self.peak = 0
+        self._page_size = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+        self._running = False
+
+    def current(self) -> int:
+        try:
+            with open("/proc/self/statm") as f:
+                return int(f.read().split()[1]) * self._page_size
+        except OSError:
+            import resource
+            return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+    def _run(self) -> None:
+        while self._running:
+            self.peak = max(self.peak, self.current())
+            time.sleep(self.interval)
+
+    @contextmanager
+    def stage(self, results: Dict[str, Any], name: str) -> Iterator[None]:
+        self.peak = self.current()
+        self._running = True
+        thread = threading.Thread(target=self._run, daemon=True)
+        thread.start()
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            self._running = False
+            thread.join()
+            self.peak = max(self.peak, self.current())
+            results[name] = {"seconds": round(elapsed, 4), "peak_rss_mb": round(self.peak / 1024 / 1024, 1)}
+
+
+def make_queries(count: int, seed: int) -> List[str]:
+    """생성 저장소 어휘로 결정적인 질의를 만듭니다."""
+    from benchmarks.fake_github import VOCABULARY
+
+    rng = random.Random(seed)
+    templates = (
+        "How is the {a} {b} handled?",
+        "Where do we convert {a} to {b}?",
+        "what happens when {a} is missing in {b}",
+        "{a} {b} error handling",
+    )
+    return [rng.choice(templates).format(a=rng.choice(VOCABULARY), b=rng.choice(VOCABULARY)) for _ in range(count)]
+
+
+def _percentiles(latencies: List[float]) -> Dict[str, float]:
+    import numpy as np
+
+    values = np.asarray(latencies) * 1000
+    return {
+        "count": len(latencies),
+        "p50_ms": round(float(np.percentile(values, 50)), 3),
+        "p95_ms": round(float(np.percentile(values, 95)), 3),
+        "p99_ms": round(float(np.percentile(values, 99)), 3),
+        "mean_ms": round(float(values.mean()), 3),
+    }
+
+
+def run_worker(config: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    (자식 프로세스) 그래프 노드를 순서대로 실행하며 단계별로 측정하고, 이어서 질의 지연 시간을 측정합니다.
+    환경 변수(GITHUB_API_BASE, OPENAI_API_BASE, VECTOR_DB_PATH 등)는 부모 프로세스가 설정합니다.
+    """
+    from src.models.git_repository import RepositoryInfo
+    from src.llm_workflows.state import RepositoryToVectorDBState, RagToContextState
+    from src.llm_workflows.nodes.code_loader import repo_to_documents
+    from src.llm_workflows.nodes.code_splitter import split_documents
+    from src.llm_workflows.nodes.hypothetical_question_create import hypothetical_question_create
+    from src.llm_workflows.nodes.embedder import add_documents
+    from src.llm_workflows.graphs.rag_to_context_graph import get_rag_to_context_graph
+    from src.utils.chroma_utils import ChromaUtils
+
+    sampler = RssSampler()
+    stages: Dict[str, Any] = {}
+    nodes = dict(zip(STAGES, (repo_to_documents, split_documents, hypothetical_question_create, add_documents)))
+
+    state = RepositoryToVectorDBState(repo_info=RepositoryInfo(repo_url=config["repo_url"]))
+    for name in STAGES:
+        with sampler.stage(stages, name):
+            state = nodes[name](state)
+
+    ingest_seconds = sum(stage["seconds"] for stage in stages.values())
+    documents = [doc for docs in state.documents_by_language.values() for doc in docs]
+    files = len({doc.metadata.get("file_path") or doc.metadata.get("source") for doc in documents})
+    chunks = len(state.split_documents)
+
+    code_vectorstore = ChromaUtils().get_code_documents_vectorstore()
+    index_vectors = len(code_vectorstore.get(include=[])["ids"])
+
+    graph = get_rag_to_context_graph()
+    queries = make_queries(config["queries"], config["seed"])
+    graph.invoke(RagToContextState(query=queries[0]))  # 클라이언트/그래프 초기화 제외
+    latencies, hits = [], 0
+    for query in queries:
+        start = time.perf_counter()
+        result = graph.invoke(RagToContextState(query=query))
+        latencies.append(time.perf_counter() - start)
+        hits += bool(result["retrieved_documents"])
+
+    return {
+        "files": files,
+        "documents": len(documents),
+        "chunks": chunks,
+        "questions": len(state.hypothetical_questions),
+        "index_vectors": index_vectors,
+        "stages": stages,
+        "ingest_seconds": round(ingest_seconds, 4),
+        "files_per_sec": round(files / ingest_seconds, 2) if ingest_seconds else None,
+        "chunks_per_sec": round(chunks / ingest_seconds, 2) if ingest_seconds else None,
+        "query": {**_percentiles(latencies), "hit_rate": round(hits / len(queries), 3)},
+    }
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], cwd=ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except Exception:
+        return ""
+
+
+def _tiktoken_available() -> bool:
+    try:
+        import tiktoken
+        tiktoken.get_encoding("cl100k_base")
+        return True
+    except Exception:
+        return False
+
+
+def _parse_mix(value: str) -> Dict[str, float]:
+    mix = {}
+    for item in value.split(","):
+        ext, _, weight = item.partition("=")
+        mix[ext.strip().lstrip(".")] = float(weight or 1)
+    return mix
+
+
+def main():
+    parser = argparse.ArgumentParser(description="오프라인 수집/검색 파이프라인 벤치마크")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[50, 200, 800], help="저장소 파일 수 (인덱스 크기)")
+    parser.add_argument("--backends", nargs="+", default=["chroma"], help="VECTOR_STORE_BACKEND 값")
+    parser.add_argument("--language-mix", type=_parse_mix, default=None, help="예: py=0.4,js=0.2,java=0.15,go=0.1,md=0.15 (기본값 py=0.7,md=0.3)")
+    parser.add_argument("--functions-per-file", type=int, default=8)
+    parser.add_argument("--queries", type=int, default=100)
+    parser.add_argument("--github-latency-ms", type=float, default=0.0)
+    parser.add_argument("--embedding-latency-ms", type=float, default=0.0)
+    parser.add_argument("--chat-latency-ms", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--keep", action="store_true", help="임시 벡터 저장소 디렉토리를 지우지 않음")
+    parser.add_argument("--output", help="결과 JSON 저장 경로")
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        with open(args.worker, encoding="utf-8") as f:
+            config = json.load(f)
+        result = run_worker(config)
+        with open(config["result_path"], "w", encoding="utf-8") as f:
+            json.dump(result, f)
+        return
+
+    from benchmarks.fake_github import FakeGitHubServer, RepoSpec
+    from benchmarks.fake_openai import FakeOpenAIServer
+
+    github = FakeGitHubServer(latency=args.github_latency_ms / 1000).start()
+    openai = FakeOpenAIServer(
+        embedding_latency=args.embedding_latency_ms / 1000, chat_latency=args.chat_latency_ms / 1000
+    ).start()
+
+    # 인코딩 파일을 받을 수 없는 오프라인 환경에서는 임베딩 입력 토큰 분할을 끄고 측정
+    tiktoken_available = _tiktoken_available()
+    if not tiktoken_available:
+        print("tiktoken cl100k_base 를 불러올 수 없어 EMBEDDING_CHECK_CTX_LENGTH=false 로 실행합니다.", file=sys.stderr)
+
+    results: List[Dict[str, Any]] = []
+    try:
+        for backend in args.backends:
+            for size in args.sizes:
+                spec = RepoSpec(files=size, functions_per_file=args.functions_per_file, seed=args.seed)
+                if args.language_mix:
+                    spec.language_mix = args.language_mix
+                repo_name = f"repo-{size}-{args.seed}"
+                github.add_repo("bench", repo_name, spec)
+
+                workdir = tempfile.mkdtemp(prefix=f"pipeline_bench_{backend}_{size}_")
+                config = {
+                    "repo_url": f"https://github.com/bench/{repo_name}",
+                    "queries": args.queries,
+                    "seed": args.seed,
+                    "result_path": os.path.join(workdir, "result.json"),
+                }
+                config_path = os.path.join(workdir, "config.json")
+                with open(config_path, "w", encoding="utf-8") as f:
+                    json.dump(config, f)
+
+                env = {
+                    **os.environ,
+                    "PYTHONPATH": ROOT + os.pathsep + os.environ.get("PYTHONPATH", ""),
+                    "GITHUB_API_BASE": github.base_url,
+                    "GITHUB_TOKEN": "benchmark",
+                    "OPENAI_API_BASE": openai.base_url,
+                    "OPENAI_API_KEY": "benchmark",
+                    "VECTOR_STORE_BACKEND": backend,
+                    "VECTOR_DB_PATH": os.path.join(workdir, "db"),
+                    "BLOB_STORE_PATH": os.path.join(workdir, "db", "blob_store.sqlite3"),
+                "INGEST_STATE_PATH": os.path.join(workdir, "db", "ingest_state.sqlite3"),
+                    "ANONYMIZED_TELEMETRY": "False",
+                    "EMBEDDING_CHECK_CTX_LENGTH": "true" if tiktoken_available else "false",
+                }
+                github_before, openai_before = github.request_count, dict(openai.counters)
+                print(f"[{backend}] {size} files ...", file=sys.stderr, flush=True)
+                completed = subprocess.run(
+                    [sys.executable, "-m", "benchmarks.pipeline_benchmark", "--worker", config_path],
+                    cwd=ROOT, env=env, capture_output=True, text=True,
+                )
+                if completed.returncode != 0:
+                    print(completed.stderr[-4000:], file=sys.stderr)
+                    raise RuntimeError(f"worker 실패: backend={backend}, size={size}")
+
+                with open(config["result_path"], encoding="utf-8") as f:
+                    result = json.load(f)
+                result = {
+                    "backend": backend,
+                    "repo_files": size,
+                    **result,
+                    "requests": {
+                        "github": github.request_count - github_before,
+                        **{name: openai.counters[name] - openai_before[name] for name in openai.counters},
+                    },
+                }
+                results.append(result)
+                if not args.keep:
+                    shutil.rmtree(workdir, ignore_errors=True)
+
+                stage_summary = "  ".join(
+                    f"{name}={result['stages'][name]['seconds']}s/{result['stages'][name]['peak_rss_mb']}MB"
+                    for name in STAGES
+                )
+                print(
+                    f"[{backend}] files={result['files']} chunks={result['chunks']} "
+                    f"files/s={result['files_per_sec']} chunks/s={result['chunks_per_sec']}  {stage_summary}  "
+                    f"query p50={result['query']['p50_ms']}ms p95={result['query']['p95_ms']}ms "
+                    f"p99={result['query']['p99_ms']}ms",
+                    file=sys.stderr,
+                )
+    finally:
+        github.stop()
+        openai.stop()
+
+    report = {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "git_commit": _git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "tiktoken": tiktoken_available,
+            "args": {key: value for key, value in vars(args).items() if key != "worker"},
+        },
+        "results": results,
+    }
+    print(json.dumps(report, indent=2))
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,226 @@
+"""
+양자화 로컬 인덱스(QuantizedVectorStore)와 기존 Chroma 경로의 recall / 지연 시간 비교
+
+기존 chroma_db 의 code_documents 컬렉션에 저장된 임베딩을 그대로 읽어 같은 데이터로 비교합니다.
+질의 벡터는 hypothetical_questions 컬렉션의 임베딩(실제 질의와 유사한 분포)을 표본으로 사용하며,
+정답은 원본 float32 벡터(전체 차원)에 대한 brute-force top-k 입니다.
+임베딩 API 를 호출하지 않으므로 OPENAI_API_KEY 없이 실행할 수 있습니다.
+
+사용법:
+    python -m benchmarks.quantized_index_benchmark --db chroma_db --queries 200 --k 5
+    python -m benchmarks.quantized_index_benchmark --synthetic 50000   # chroma_db 가 없을 때
+"""
+
+import argparse
+import json
+import os
+import shutil
+import tempfile
+import time
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+from langchain_core.embeddings import FakeEmbeddings
+
+from src.utils.quantized_vectorstore import QuantizedVectorStore
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return (vectors / norms).astype(np.float32)
+
+
+def load_chroma_data(db_path: str, n_queries: int, seed: int) -> Tuple[Any, np.ndarray, np.ndarray, List[str]]:
+    """chroma_db 에서 코드 벡터와 질의 벡터를 읽어옵니다."""
+    import chromadb
+
+    code_client = chromadb.PersistentClient(path=os.path.join(db_path, "code_documents"))
+    collection = code_client.get_collection("code_documents")
+    data = collection.get(include=["embeddings"])
+    vectors = np.asarray(data["embeddings"], dtype=np.float32)
+
+    rng = np.random.default_rng(seed)
+    try:
+        question_client = chromadb.PersistentClient(path=os.path.join(db_path, "hypothetical_questions"))
+        questions = question_client.get_collection("hypothetical_questions").get(include=["embeddings"])
+        query_pool = np.asarray(questions["embeddings"], dtype=np.float32)
+    except Exception:
+        query_pool = np.zeros((0, vectors.shape[1]), dtype=np.float32)
+
+    if len(query_pool) == 0:
+        # 질문 컬렉션이 없으면 코드 벡터에 잡음을 더해 질의로 사용
+        picks = vectors[rng.choice(len(vectors), size=n_queries)]
+        query_pool = picks + rng.normal(scale=0.02, size=picks.shape).astype(np.float32)
+
+    queries = query_pool[rng.choice(len(query_pool), size=min(n_queries, len(query_pool)), replace=False)]
+    return collection, vectors, queries, data["ids"]
+
+
+def make_synthetic_data(n_vectors: int, n_queries: int, dimensions: int, seed: int) -> Tuple[np.ndarray, np.ndarray]:
+    """클러스터 구조를 갖는 합성 임베딩을 생성합니다."""
+    rng = np.random.default_rng(seed)
+    centers = rng.normal(size=(max(1, n_vectors // 200), dimensions)).astype(np.float32)
+    assignments = rng.integers(0, len(centers), size=n_vectors)
+    vectors = centers[assignments] + rng.normal(scale=0.6, size=(n_vectors, dimensions)).astype(np.float32)
+    picks = vectors[rng.choice(n_vectors, size=n_queries)]
+    queries = picks + rng.normal(scale=0.4, size=picks.shape).astype(np.float32)
+    return _normalize(vectors), _normalize(queries)
+
+
+def build_ephemeral_chroma(vectors: np.ndarray) -> Tuple[Any, List[str]]:
+    """합성 데이터 비교용 인메모리 Chroma 컬렉션을 만듭니다."""
+    import chromadb
+
+    collection = chromadb.EphemeralClient().get_or_create_collection("quantized_bench")
+    ids = [str(row) for row in range(len(vectors))]
+    batch_size = 5000
+    for start in range(0, len(vectors), batch_size):
+        collection.add(ids=ids[start:start + batch_size], embeddings=vectors[start:start + batch_size].tolist())
+    return collection, ids
+
+
+def exact_top_k(vectors: np.ndarray, queries: np.ndarray, k: int) -> np.ndarray:
+    scores = queries @ vectors.T
+    return np.argsort(-scores, axis=1)[:, :k]
+
+
+def _latency_summary(latencies: List[float]) -> Dict[str, float]:
+    values = np.asarray(latencies) * 1000
+    return {
+        "p50_ms": round(float(np.percentile(values, 50)), 3),
+        "p95_ms": round(float(np.percentile(values, 95)), 3),
+        "mean_ms": round(float(values.mean()), 3),
+    }
+
+
+def _directory_bytes(path: str) -> int:
+    return sum(os.path.getsize(os.path.join(root, name)) for root, _, names in os.walk(path) for name in names)
+
+
+def bench_chroma(collection, ids: List[str], truth: np.ndarray, queries: np.ndarray, k: int) -> Dict[str, Any]:
+    id_to_row = {id_: row for row, id_ in enumerate(ids)}
+    latencies, hits = [], 0
+    for query, expected in zip(queries, truth):
+        start = time.perf_counter()
+        result = collection.query(query_embeddings=[query.tolist()], n_results=k, include=[])
+        latencies.append(time.perf_counter() - start)
+        found = {id_to_row[id_] for id_ in result["ids"][0]}
+        hits += len(found & set(expected.tolist()))
+    return {"backend": "chroma", "recall": round(hits / truth.size, 4), **_latency_summary(latencies)}
+
+
+def bench_quantized(
+    vectors: np.ndarray,
+    truth: np.ndarray,
+    queries: np.ndarray,
+    k: int,
+    dimensions: int,
+    quantization: str,
+    rerank_factor: int,
+) -> Dict[str, Any]:
+    directory = tempfile.mkdtemp(prefix="quantized_bench_")
+    try:
+        store = QuantizedVectorStore(
+            collection_name="bench",
+            embedding_function=FakeEmbeddings(size=vectors.shape[1]),
+            persist_directory=directory,
+            dimensions=dimensions,
+            quantization=quantization,
+            rerank_factor=rerank_factor,
+        )
+        ids = [str(row) for row in range(len(vectors))]
+        start = time.perf_counter()
+        store.add_embeddings([""] * len(vectors), vectors, ids=ids)
+        build_seconds = time.perf_counter() - start
+
+        # 디스크에서 다시 열어 메모리 매핑 상태로 측정
+        store = QuantizedVectorStore(
+            collection_name="bench",
+            embedding_function=FakeEmbeddings(size=vectors.shape[1]),
+            persist_directory=directory,
+            dimensions=dimensions,
+            quantization=quantization,
+            rerank_factor=rerank_factor,
+        )
+        store.similarity_search_by_vector_with_score(queries[0], k=k)
+
+        latencies, hits = [], 0
+        for query, expected in zip(queries, truth):
+            start = time.perf_counter()
+            results = store.similarity_search_by_vector_with_score(query, k=k)
+            latencies.append(time.perf_counter() - start)
+            found = {int(doc.id) for doc, _ in results}
+            hits += len(found & set(expected.tolist()))
+
+        return {
+            "backend": "quantized",
+            "dimensions": dimensions,
+            "quantization": quantization,
+            "rerank_factor": rerank_factor,
+            "recall": round(hits / truth.size, 4),
+            "build_seconds": round(build_seconds, 3),
+            "first_pass_bytes": store._quantized_vectors.nbytes,
+            "index_bytes": _directory_bytes(directory),
+            **_latency_summary(latencies),
+        }
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="양자화 인덱스 vs Chroma recall/latency 비교")
+    parser.add_argument("--db", default=os.getenv("VECTOR_DB_PATH", "chroma_db"), help="chroma_db 경로")
+    parser.add_argument("--synthetic", type=int, default=0, help="chroma_db 대신 사용할 합성 벡터 수")
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=5)
+    parser.add_argument("--dimensions", type=int, nargs="+", default=[1536, 512, 256])
+    parser.add_argument("--quantizations", nargs="+", default=["int8", "binary"])
+    parser.add_argument("--rerank-factors", type=int, nargs="+", default=[4, 10])
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="결과 JSON 저장 경로")
+    args = parser.parse_args()
+
+    results: List[Dict[str, Any]] = []
+    if args.synthetic:
+        vectors, queries = make_synthetic_data(args.synthetic, args.queries, max(args.dimensions), args.seed)
+        collection, ids = build_ephemeral_chroma(vectors)
+    else:
+        collection, vectors, queries, ids = load_chroma_data(args.db, args.queries, args.seed)
+        vectors, queries = _normalize(vectors), _normalize(queries)
+
+    truth = exact_top_k(vectors, queries, args.k)
+
+    results.append(bench_chroma(collection, ids, truth, queries, args.k))
+    if not args.synthetic:
+        results[-1]["index_bytes"] = _directory_bytes(os.path.join(args.db, "code_documents"))
+
+    for dimensions in args.dimensions:
+        if dimensions > vectors.shape[1]:
+            continue
+        for quantization in args.quantizations:
+            for rerank_factor in args.rerank_factors:
+                results.append(bench_quantized(vectors, truth, queries, args.k, dimensions, quantization, rerank_factor))
+
+    report = {
+        "vectors": int(len(vectors)),
+        "source_dimensions": int(vectors.shape[1]),
+        "queries": int(len(queries)),
+        "k": args.k,
+        "results": results,
+    }
+
+    for row in results:
+        label = row["backend"] if row["backend"] == "chroma" else (
+            f"quantized dim={row['dimensions']} {row['quantization']} x{row['rerank_factor']}"
+        )
+        print(f"{label:<40} recall@{args.k}={row['recall']:.3f}  p50={row['p50_ms']}ms  p95={row['p95_ms']}ms  "
+              f"size={row.get('index_bytes', 0) / 1024 / 1024:.1f}MB")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,167 @@
+"""
+검색 범위(저장소 / 언어 / 경로 접두사) 필터의 질의 지연 시간 측정
+
+여러 저장소·디렉토리에 흩어진 합성 청크를 Chroma(내장)와 양자화 저장소에 같은 메타데이터(scope_metadata)로 넣고,
+범위 없이 / 범위를 지정해 검색할 때의 p50/p95 지연 시간과 범위에 속한 문서 비율을 비교합니다.
+Chroma 는 기본 where 질의(chroma_where), 메타데이터 인덱스로 id 를 먼저 조회하는 검색(chroma_prefilter, 캐시 없이 / chroma_prefilter_cached)을 모두 측정합니다.
+임베딩 API 를 호출하지 않으므로 OPENAI_API_KEY 없이 실행할 수 있습니다.
+
+사용법:
+    python -m benchmarks.scope_filter_benchmark --vectors 50000 --queries 100 --output bench_scope.json
+"""
+
+import argparse
+import json
+import os
+import shutil
+import tempfile
+import time
+from typing import Any, Dict, List
+
+import numpy as np
+from langchain_core.embeddings import FakeEmbeddings
+
+from benchmarks.quantized_index_benchmark import _latency_summary, make_synthetic_data
+
+LANGUAGES = {"py": "PYTHON", "md": "MARKDOWN", "js": "JS", "go": "GO"}
+
+
+def make_metadatas(count: int, repos: int, seed: int) -> List[Dict[str, Any]]:
+    """저장소 / 최상위 디렉토리 / 하위 디렉토리 / 언어가 고르게 섞인 청크 메타데이터를 만듭니다."""
+    from src.utils.scope_filter import scope_metadata
+
+    rng = np.random.default_rng(seed)
+    extensions = list(LANGUAGES)
+    metadatas = []
+    for row in range(count):
+        repo_url = f"https://github.com/bench/repo{rng.integers(repos)}"
+        extension = extensions[rng.integers(len(extensions))]
+        file_path = f"pkg{rng.integers(10)}/module{rng.integers(10)}/file{rng.integers(20)}.{extension}"
+        metadatas.append({
+            "repo_url": repo_url,
+            "ref": "main",
+            "file_path": file_path,
+            "path": "/" + os.path.dirname(file_path),
+            "extension": extension,
+            "language": LANGUAGES[extension],
+            **scope_metadata(repo_url, file_path),
+        })
+    return metadatas
+
+
+def scopes() -> Dict[str, Any]:
+    from src.models.search_scope import SearchScope
+
+    return {
+        "none": None,
+        "repo": SearchScope(repo="bench/repo0"),
+        "language": SearchScope(language="python"),
+        "path_prefix": SearchScope(path_prefix="pkg3"),
+        "repo+path_prefix": SearchScope(repo="bench/repo0", path_prefix="pkg3/module7"),
+    }
+
+
+def measure(search, queries: np.ndarray, metadatas: List[Dict[str, Any]], k: int) -> Dict[str, Any]:
+    from src.utils.quantized_vectorstore import _match_where
+    from src.utils.scope_filter import build_scope_filter
+
+    report = {}
+    for name, scope in scopes().items():
+        where = build_scope_filter(scope)
+        in_scope = sum(1 for metadata in metadatas if _match_where(metadata, where))
+        search(queries[0], where)
+        latencies = []
+        for query in queries:
+            start = time.perf_counter()
+            search(query, where)
+            latencies.append(time.perf_counter() - start)
+        report[name] = {"filter": where, "scope_fraction": round(in_scope / len(metadatas), 4), **_latency_summary(latencies)}
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="검색 범위 필터 질의 지연 시간 벤치마크")
+    parser.add_argument("--vectors", type=int, default=50000)
+    parser.add_argument("--dimensions", type=int, default=256)
+    parser.add_argument("--repos", type=int, default=5)
+    parser.add_argument("--queries", type=int, default=100)
+    parser.add_argument("--k", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="결과 JSON 저장 경로")
+    args = parser.parse_args()
+
+    directory = tempfile.mkdtemp(prefix="scope_bench_")
+    # 메타데이터 인덱스 경로(VECTOR_DB_PATH)와 직접 조회 사용 여부가 src 모듈 import 시점에 정해지므로 먼저 설정
+    os.environ["VECTOR_DB_PATH"] = directory
+    os.environ["CHROMA_SQL_PREFILTER"] = "true"
+
+    from langchain_chroma import Chroma
+
+    from src.utils.chroma_utils import ChromaUtils
+    from src.utils.quantized_vectorstore import QuantizedVectorStore
+
+    try:
+        vectors, queries = make_synthetic_data(args.vectors, args.queries, args.dimensions, args.seed)
+        metadatas = make_metadatas(args.vectors, args.repos, args.seed)
+        ids = [str(row) for row in range(args.vectors)]
+        results: Dict[str, Any] = {}
+
+        chroma = Chroma(
+            collection_name="code_documents",
+            embedding_function=FakeEmbeddings(size=args.dimensions),
+            persist_directory=os.path.join(directory, "code_documents"),
+        )
+        for start in range(0, args.vectors, 5000):
+            chroma._collection.upsert(
+                ids=ids[start:start + 5000],
+                embeddings=vectors[start:start + 5000].tolist(),
+                documents=[""] * len(ids[start:start + 5000]),
+                metadatas=metadatas[start:start + 5000],
+            )
+        ChromaUtils._ensure_metadata_index("code_documents")
+
+        def chroma_where(query, where):
+            chroma._collection.query(query_embeddings=[query.tolist()], n_results=args.k, where=where)
+
+        def chroma_prefilter(query, where):
+            ChromaUtils._prefilter_cache.clear()
+            ChromaUtils.similarity_search_by_vectors(chroma, [query.tolist()], args.k, filter=where)
+
+        def search(vectorstore):
+            return lambda query, where: ChromaUtils.similarity_search_by_vectors(
+                vectorstore, [query.tolist()], args.k, filter=where
+            )
+
+        results["chroma_where"] = measure(chroma_where, queries, metadatas, args.k)
+        results["chroma_prefilter"] = measure(chroma_prefilter, queries, metadatas, args.k)
+        results["chroma_prefilter_cached"] = measure(search(chroma), queries, metadatas, args.k)
+
+        quantized = QuantizedVectorStore(
+            collection_name="code_documents",
+            embedding_function=FakeEmbeddings(size=args.dimensions),
+            persist_directory=os.path.join(directory, "quantized"),
+            dimensions=args.dimensions,
+        )
+        quantized.add_embeddings([""] * args.vectors, vectors, metadatas=metadatas, ids=ids)
+        results["quantized"] = measure(search(quantized), queries, metadatas, args.k)
+
+        for backend, report in results.items():
+            for name, row in report.items():
+                print(f"{backend:<24} {name:<18} scope={row['scope_fraction']:>7.2%}  "
+                      f"p50={row['p50_ms']:>8}ms  p95={row['p95_ms']:>8}ms")
+
+        if args.output:
+            with open(args.output, "w", encoding="utf-8") as f:
+                json.dump({
+                    "vectors": args.vectors,
+                    "dimensions": args.dimensions,
+                    "queries": args.queries,
+                    "k": args.k,
+                    "results": results,
+                }, f, indent=2)
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,201 @@
+"""
+인덱스 스냅샷 내보내기/불러오기 벤치마크
+
+로컬 GitHub API 대역(benchmarks.fake_github)과 OpenAI 대역(benchmarks.fake_openai)으로 저장소를 한 번 수집해
+스냅샷을 내보낸 뒤, 빈 벡터 저장소를 가진 새 프로세스(검색 복제본)에서 불러옵니다.
+복제본의 검색 결과가 수집한 인덱스와 같은지, 불러오는 동안 임베딩 요청이 없었는지 함께 확인합니다.
+
+측정 항목 (벡터 저장소 백엔드별):
+    ingest_seconds          원본 수집 시간 (비교용)
+    export_seconds          스냅샷 내보내기 시간
+    snapshot_bytes          스냅샷 파일 크기
+    load_seconds            복제본에서 load_snapshot 시간 / load_process_seconds 는 프로세스 시작·import 포함
+    load_embedding_requests 불러오는 동안 받은 임베딩 요청 수 (0 이어야 함)
+    identical_results       질의별 rag_to_context 결과가 원본과 같은 비율
+
+사용법:
+    python -m benchmarks.snapshot_benchmark --files 200 --queries 20 --backends chroma quantized
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Any, Dict, List
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _search(queries: List[str]) -> List[List[str]]:
+    """질의별 rag_to_context 결과 (문서 본문 해시 목록)"""
+    from src.llm_workflows.graphs.rag_to_context_graph import get_rag_to_context_graph
+    from src.llm_workflows.state import RagToContextState
+
+    graph = get_rag_to_context_graph()
+    results = []
+    for query in queries:
+        documents = graph.invoke(RagToContextState(query=query))["retrieved_documents"]
+        results.append([hashlib.sha1(document.page_content.encode("utf-8")).hexdigest() for document in documents])
+    return results
+
+
+def run_worker(config: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    (자식 프로세스) mode 에 따라 수집 후 내보내기(ingest), 스냅샷 불러오기(load), 검색(query) 중 하나를 실행합니다.
+    """
+    from benchmarks.pipeline_benchmark import make_queries
+
+    if config["mode"] == "ingest":
+        from src.llm_workflows.index_snapshot import export_snapshot
+        from src.llm_workflows.mcp.tools import ingest_repository
+        from src.models.git_repository import RepositoryInfo
+
+        start = time.perf_counter()
+        ingest_repository(RepositoryInfo(repo_url=config["repo_url"]))
+        ingest_seconds = time.perf_counter() - start
+        summary = export_snapshot(config["repo_url"], output=config["snapshot_dir"])
+        return {
+            "ingest_seconds": round(ingest_seconds, 3),
+            "snapshot": summary,
+            "results": _search(make_queries(config["queries"], config["seed"])),
+        }
+
+    if config["mode"] == "load":
+        from src.llm_workflows.index_snapshot import load_snapshot
+
+        return load_snapshot(config["snapshot_path"])
+
+    return {"results": _search(make_queries(config["queries"], config["seed"]))}
+
+
+def _run_child(config: Dict[str, Any], env: Dict[str, str], workdir: str) -> Dict[str, Any]:
+    config = {**config, "result_path": os.path.join(workdir, f"{config['mode']}_result.json")}
+    config_path = os.path.join(workdir, f"{config['mode']}_config.json")
+    with open(config_path, "w", encoding="utf-8") as f:
+        json.dump(config, f)
+    completed = subprocess.run(
+        [sys.executable, "-m", "benchmarks.snapshot_benchmark", "--worker", config_path],
+        cwd=ROOT, env=env, capture_output=True, text=True,
+    )
+    if completed.returncode != 0:
+        print(completed.stderr[-4000:], file=sys.stderr)
+        raise RuntimeError(f"worker 실패: mode={config['mode']}")
+    with open(config["result_path"], encoding="utf-8") as f:
+        return json.load(f)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="인덱스 스냅샷 내보내기/불러오기 벤치마크")
+    parser.add_argument("--files", type=int, default=200, help="저장소 파일 수")
+    parser.add_argument("--backends", nargs="+", default=["chroma"], help="VECTOR_STORE_BACKEND 값")
+    parser.add_argument("--functions-per-file", type=int, default=8)
+    parser.add_argument("--queries", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="결과 JSON 저장 경로")
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        with open(args.worker, encoding="utf-8") as f:
+            config = json.load(f)
+        result = run_worker(config)
+        with open(config["result_path"], "w", encoding="utf-8") as f:
+            json.dump(result, f)
+        return
+
+    from benchmarks.fake_github import FakeGitHubServer, RepoSpec
+    from benchmarks.fake_openai import FakeOpenAIServer
+    from benchmarks.pipeline_benchmark import _tiktoken_available
+
+    github = FakeGitHubServer().start()
+    openai = FakeOpenAIServer().start()
+    repo_name = f"repo-{args.files}-{args.seed}"
+    github.add_repo("bench", repo_name, RepoSpec(files=args.files, functions_per_file=args.functions_per_file, seed=args.seed))
+    tiktoken_available = _tiktoken_available()
+
+    results: List[Dict[str, Any]] = []
+    try:
+        for backend in args.backends:
+            workdir = tempfile.mkdtemp(prefix=f"snapshot_bench_{backend}_")
+            base_env = {
+                **os.environ,
+                "PYTHONPATH": ROOT + os.pathsep + os.environ.get("PYTHONPATH", ""),
+                "GITHUB_API_BASE": github.base_url,
+                "GITHUB_TOKEN": "benchmark",
+                "OPENAI_API_BASE": openai.base_url,
+                "OPENAI_API_KEY": "benchmark",
+                "VECTOR_STORE_BACKEND": backend,
+                "ANONYMIZED_TELEMETRY": "False",
+                "EMBEDDING_CHECK_CTX_LENGTH": "true" if tiktoken_available else "false",
+            }
+
+            def env_for(name: str) -> Dict[str, str]:
+                db = os.path.join(workdir, name)
+                return {
+                    **base_env,
+                    "VECTOR_DB_PATH": db,
+                    "BLOB_STORE_PATH": os.path.join(db, "blob_store.sqlite3"),
+                    "INGEST_STATE_PATH": os.path.join(db, "ingest_state.sqlite3"),
+                }
+
+            config = {
+                "repo_url": f"https://github.com/bench/{repo_name}",
+                "queries": args.queries,
+                "seed": args.seed,
+                "snapshot_dir": os.path.join(workdir, "snapshots"),
+            }
+            try:
+                print(f"[{backend}] ingest + export ...", file=sys.stderr, flush=True)
+                source = _run_child({**config, "mode": "ingest"}, env_for("source"), workdir)
+                snapshot = source["snapshot"]
+
+                print(f"[{backend}] load on replica ...", file=sys.stderr, flush=True)
+                embedding_before = openai.counters["embedding_requests"]
+                start = time.perf_counter()
+                loaded = _run_child({**config, "mode": "load", "snapshot_path": snapshot["path"]}, env_for("replica"), workdir)
+                load_process_seconds = time.perf_counter() - start
+                load_embedding_requests = openai.counters["embedding_requests"] - embedding_before
+
+                replica = _run_child({**config, "mode": "query"}, env_for("replica"), workdir)
+            finally:
+                shutil.rmtree(workdir, ignore_errors=True)
+
+            identical = sum(a == b for a, b in zip(source["results"], replica["results"]))
+            result = {
+                "backend": backend,
+                "files": args.files,
+                "vectors": {name: counts["count"] for name, counts in snapshot["collections"].items()},
+                "ingest_seconds": source["ingest_seconds"],
+                "export_seconds": snapshot["seconds"],
+                "snapshot_bytes": snapshot["bytes"],
+                "load_seconds": loaded["seconds"],
+                "load_process_seconds": round(load_process_seconds, 3),
+                "load_embedding_requests": load_embedding_requests,
+                "identical_results": round(identical / len(source["results"]), 3) if source["results"] else None,
+            }
+            results.append(result)
+            print(
+                f"[{backend}] ingest={result['ingest_seconds']}s export={result['export_seconds']}s "
+                f"size={result['snapshot_bytes']}B load={result['load_seconds']}s "
+                f"(process {result['load_process_seconds']}s, embedding requests {load_embedding_requests}) "
+                f"identical={result['identical_results']}",
+                file=sys.stderr,
+            )
+    finally:
+        github.stop()
+        openai.stop()
+
+    report = {"args": vars(args), "results": results}
+    print(json.dumps(report, indent=2))
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,319 @@
+"""
+SSE MCP 서버 동시 접속 부하 테스트
+
+가상 클라이언트마다 MCP SSE 세션을 하나씩 열고, 단계별로 동시 클라이언트 수를 늘리며
+rag_to_context(질의)와 repo_to_rag(수집) 호출을 섞어 보냅니다.
+단계마다 도구별 처리량(ops/s), 지연 시간(p50/p95/p99/max), 오류율을 JSON 으로 기록합니다.
+
+기본값은 로컬 GitHub/OpenAI 대역(benchmarks.fake_github, benchmarks.fake_openai)을 띄우고
+main.py 를 FASTMCP_TRANSPORT=sse 로 실행해 측정합니다. (네트워크, API 키 불필요)
+--url 을 지정하면 이미 실행 중인 서버를 대상으로 측정합니다.
+
+사용법:
+    python -m benchmarks.sse_load_test --concurrency 1 4 16 32 --stage-seconds 20 --ingest-ratio 0.05
+    python -m benchmarks.sse_load_test --chat-latency-ms 300 --embedding-latency-ms 80 --output load.json
+    python -m benchmarks.sse_load_test --url http://localhost:8000/sse --query-only
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@dataclass
+class OperationStats:
+    latencies: List[float] = field(default_factory=list)
+    errors: int = 0
+    error_samples: List[str] = field(default_factory=list)
+
+    def record(self, latency: float, error: Optional[str]) -> None:
+        self.latencies.append(latency)
+        if error is not None:
+            self.errors += 1
+            if len(self.error_samples) < 5:
+                self.error_samples.append(error[:300])
+
+    def summary(self, duration: float) -> Dict[str, Any]:
+        values = sorted(self.latencies)
+        count = len(values)
+
+        def percentile(q: float) -> Optional[float]:
+            if not values:
+                return None
+            return round(values[min(count - 1, int(q * count))] * 1000, 2)
+
+        return {
+            "count": count,
+            "throughput_ops": round(count / duration, 3) if duration else 0.0,
+            "error_rate": round(self.errors / count, 4) if count else 0.0,
+            "p50_ms": percentile(0.50),
+            "p95_ms": percentile(0.95),
+            "p99_ms": percentile(0.99),
+            "max_ms": round(values[-1] * 1000, 2) if values else None,
+            "error_samples": self.error_samples,
+        }
+
+
+class LoadTest:
+    """
+    동시 클라이언트 단계별 부하 생성기
+
+    Args:
+        url: MCP SSE 엔드포인트 (예: http://localhost:8000/sse)
+        queries: 질의 목록
+        ingest_repos: repo_to_rag 에 사용할 저장소 URL 목록
+        ingest_ratio: 요청 중 repo_to_rag 비율 (0~1)
+        think_time: 클라이언트별 요청 간 대기 시간(초)
+        request_timeout: 도구 호출 타임아웃(초)
+    """
+    def __init__(
+        self,
+        url: str,
+        queries: List[str],
+        ingest_repos: List[str],
+        ingest_ratio: float,
+        think_time: float,
+        request_timeout: float,
+        seed: int = 0,
+    ):
+        self.url = url
+        self.queries = queries
+        self.ingest_repos = ingest_repos
+        self.ingest_ratio = ingest_ratio if ingest_repos else 0.0
+        self.think_time = think_time
+        self.request_timeout = request_timeout
+        self.rng = random.Random(seed)
+
+    async def _client(self, stats: Dict[str, OperationStats], deadline: float) -> None:
+        from mcp import ClientSession
+        from mcp.client.sse import sse_client
+
+        try:
+            async with sse_client(self.url, timeout=self.request_timeout, sse_read_timeout=self.request_timeout) as (read, write):
+                async with ClientSession(read, write) as session:
+                    await session.initialize()
+                    while time.perf_counter() < deadline:
+                        if self.rng.random() < self.ingest_ratio:
+                            tool, arguments = "repo_to_rag", {"repo_url": self.rng.choice(self.ingest_repos)}
+                        else:
+                            tool, arguments = "rag_to_context", {"query": self.rng.choice(self.queries)}
+
+                        start, error = time.perf_counter(), None
+                        try:
+                            result = await asyncio.wait_for(
+                                session.call_tool(tool, arguments), timeout=self.request_timeout
+                            )
+                            if result.isError:
+                                error = " ".join(getattr(item, "text", "") for item in result.content) or "isError"
+                        except Exception as e:
+                            error = f"{type(e).__name__}: {e}"
+                        stats[tool].record(time.perf_counter() - start, error)
+
+                        if self.think_time:
+                            await asyncio.sleep(self.think_time)
+        except Exception as e:
+            # 세션 연결 실패도 오류로 집계
+            stats["connect"].record(0.0, f"{type(e).__name__}: {e}")
+
+    async def run_stage(self, concurrency: int, seconds: float) -> Dict[str, Any]:
+        stats = {name: OperationStats() for name in ("rag_to_context", "repo_to_rag", "connect")}
+        start = time.perf_counter()
+        deadline = start + seconds
+        await asyncio.gather(*(self._client(stats, deadline) for _ in range(concurrency)))
+        # 마지막 요청은 deadline 이후에 끝날 수 있으므로 실제 경과 시간으로 처리량 계산
+        duration = time.perf_counter() - start
+
+        total = sum(len(stat.latencies) for name, stat in stats.items() if name != "connect")
+        errors = sum(stat.errors for stat in stats.values())
+        return {
+            "concurrency": concurrency,
+            "duration_seconds": round(duration, 3),
+            "throughput_ops": round(total / duration, 3) if duration else 0.0,
+            "error_rate": round(errors / max(total, 1), 4),
+            "tools": {
+                name: stat.summary(duration) for name, stat in stats.items()
+                if stat.latencies or name != "connect"
+            },
+        }
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def _wait_for_server(url: str, timeout: float) -> None:
+    from mcp import ClientSession
+    from mcp.client.sse import sse_client
+
+    deadline = time.perf_counter() + timeout
+    while True:
+        try:
+            async with sse_client(url, timeout=2) as (read, write):
+                async with ClientSession(read, write) as session:
+                    await session.initialize()
+                    return
+        except Exception:
+            if time.perf_counter() > deadline:
+                raise TimeoutError(f"MCP 서버가 {timeout}초 안에 응답하지 않습니다: {url}")
+            await asyncio.sleep(0.5)
+
+
+async def _seed_index(url: str, repo_url: str, timeout: float) -> None:
+    """질의 대상 인덱스를 만들기 위해 측정 전에 저장소 하나를 수집합니다."""
+    from mcp import ClientSession
+    from mcp.client.sse import sse_client
+
+    async with sse_client(url, timeout=timeout, sse_read_timeout=timeout) as (read, write):
+        async with ClientSession(read, write) as session:
+            await session.initialize()
+            result = await session.call_tool("repo_to_rag", {"repo_url": repo_url})
+            if result.isError:
+                raise RuntimeError(f"초기 수집 실패: {result.content}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="SSE MCP 서버 동시 접속 부하 테스트")
+    parser.add_argument("--url", help="이미 실행 중인 서버의 SSE URL (미지정 시 대역 백엔드로 로컬 서버 실행)")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 2, 4, 8, 16])
+    parser.add_argument("--stage-seconds", type=float, default=15.0)
+    parser.add_argument("--ingest-ratio", type=float, default=0.05, help="요청 중 repo_to_rag 비율")
+    parser.add_argument("--query-only", action="store_true", help="repo_to_rag 호출 없이 질의만 전송")
+    parser.add_argument("--ingest-repos", nargs="*", help="repo_to_rag 대상 URL (--url 사용 시)")
+    parser.add_argument("--seed-files", type=int, default=200, help="측정 전 수집할 저장소 파일 수 (로컬 서버)")
+    parser.add_argument("--ingest-files", type=int, default=30, help="부하 중 수집할 저장소 파일 수 (로컬 서버)")
+    parser.add_argument("--think-time-ms", type=float, default=0.0)
+    parser.add_argument("--request-timeout", type=float, default=300.0)
+    parser.add_argument("--github-latency-ms", type=float, default=0.0)
+    parser.add_argument("--embedding-latency-ms", type=float, default=0.0)
+    parser.add_argument("--chat-latency-ms", type=float, default=0.0)
+    parser.add_argument("--backend", default="chroma", help="VECTOR_STORE_BACKEND (로컬 서버)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="결과 JSON 저장 경로")
+    args = parser.parse_args()
+
+    from benchmarks.pipeline_benchmark import make_queries
+
+    server_process: Optional[subprocess.Popen] = None
+    stand_ins = []
+    workdir: Optional[str] = None
+    url = args.url
+    ingest_repos = [] if args.query_only else list(args.ingest_repos or [])
+
+    try:
+        if url is None:
+            from benchmarks.fake_github import FakeGitHubServer, RepoSpec
+            from benchmarks.fake_openai import FakeOpenAIServer
+            from benchmarks.pipeline_benchmark import _tiktoken_available
+
+            github = FakeGitHubServer(latency=args.github_latency_ms / 1000).start()
+            openai = FakeOpenAIServer(
+                embedding_latency=args.embedding_latency_ms / 1000, chat_latency=args.chat_latency_ms / 1000
+            ).start()
+            stand_ins = [github, openai]
+
+            github.add_repo("bench", "seed", RepoSpec(files=args.seed_files, seed=args.seed))
+            if not args.query_only:
+                for index in range(4):
+                    github.add_repo("bench", f"ingest-{index}", RepoSpec(files=args.ingest_files, seed=args.seed + index + 1))
+                    ingest_repos.append(f"https://github.com/bench/ingest-{index}")
+
+            workdir = tempfile.mkdtemp(prefix="sse_load_test_")
+            port = _free_port()
+            env = {
+                **os.environ,
+                "FASTMCP_TRANSPORT": "sse",
+                "FASTMCP_HOST": "127.0.0.1",
+                "FASTMCP_PORT": str(port),
+                "FASTMCP_LOG_LEVEL": "WARNING",
+                "GITHUB_API_BASE": github.base_url,
+                "GITHUB_TOKEN": "benchmark",
+                "OPENAI_API_BASE": openai.base_url,
+                "OPENAI_API_KEY": "benchmark",
+                "VECTOR_STORE_BACKEND": args.backend,
+                "VECTOR_DB_PATH": os.path.join(workdir, "db"),
+                "BLOB_STORE_PATH": os.path.join(workdir, "db", "blob_store.sqlite3"),
+                "INGEST_STATE_PATH": os.path.join(workdir, "db", "ingest_state.sqlite3"),
+                "ANONYMIZED_TELEMETRY": "False",
+                "EMBEDDING_CHECK_CTX_LENGTH": "true" if _tiktoken_available() else "false",
+            }
+            server_log = open(os.path.join(workdir, "server.log"), "w")
+            server_process = subprocess.Popen(
+                [sys.executable, os.path.join(ROOT, "main.py")],
+                cwd=ROOT, env=env, stdout=server_log, stderr=subprocess.STDOUT,
+            )
+            url = f"http://127.0.0.1:{port}/sse"
+            asyncio.run(_wait_for_server(url, timeout=60))
+            print(f"서버 시작: {url}, 초기 수집 {args.seed_files}개 파일 ...", file=sys.stderr, flush=True)
+            asyncio.run(_seed_index(url, "https://github.com/bench/seed", args.request_timeout))
+
+        load_test = LoadTest(
+            url=url,
+            queries=make_queries(500, args.seed),
+            ingest_repos=ingest_repos,
+            ingest_ratio=0.0 if args.query_only else args.ingest_ratio,
+            think_time=args.think_time_ms / 1000,
+            request_timeout=args.request_timeout,
+            seed=args.seed,
+        )
+
+        stages: List[Dict[str, Any]] = []
+        for concurrency in args.concurrency:
+            stage = asyncio.run(load_test.run_stage(concurrency, args.stage_seconds))
+            stages.append(stage)
+            query = stage["tools"]["rag_to_context"]
+            print(
+                f"concurrency={concurrency:<4} throughput={stage['throughput_ops']} ops/s  "
+                f"error_rate={stage['error_rate']}  query p50={query['p50_ms']}ms p95={query['p95_ms']}ms "
+                f"p99={query['p99_ms']}ms  ingest n={stage['tools']['repo_to_rag']['count']}",
+                file=sys.stderr, flush=True,
+            )
+    finally:
+        if server_process is not None:
+            server_process.terminate()
+            try:
+                server_process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                server_process.kill()
+        for stand_in in stand_ins:
+            stand_in.stop()
+        if workdir:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    # 오류율 1% 이하, 질의 p95 가 가장 낮은 단계 대비 3배 이내인 최대 동시 클라이언트 수
+    baseline = min((s["tools"]["rag_to_context"]["p95_ms"] or float("inf")) for s in stages)
+    sustainable = [
+        s["concurrency"] for s in stages
+        if s["error_rate"] <= 0.01 and (s["tools"]["rag_to_context"]["p95_ms"] or float("inf")) <= baseline * 3
+    ]
+    report = {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "url": args.url or "local (stub backends)",
+            "args": vars(args),
+        },
+        "max_sustainable_concurrency": max(sustainable) if sustainable else None,
+        "stages": stages,
+    }
+    print(json.dumps(report, indent=2))
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
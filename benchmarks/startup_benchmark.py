@@ -0,0 +1,131 @@
+"""
+MCP 서버 시작 시간 / 첫 요청 지연 측정
+
+측정 항목:
+    import_seconds      새 프로세스에서 main 모듈 import + create_mcp_app() 까지 걸린 시간
+    handshake_seconds   stdio 로 서버를 띄워 MCP initialize + tools/list 응답까지 걸린 시간
+    cold_setup_seconds  첫 도구 호출이 부담하던 그래프 컴파일/클라이언트 생성 시간 (warm_up)
+    warm_setup_seconds  같은 프로세스에서 두 번째 호출 시 같은 작업의 시간 (캐시 재사용)
+    first_query_seconds --query 지정 시 rag_to_context 실제 호출 시간 (OPENAI_API_KEY 필요)
+
+각 항목은 --runs 번 새 프로세스에서 측정하며 결과를 JSON 으로 출력합니다.
+
+사용법:
+    python -m benchmarks.startup_benchmark --runs 5
+    python -m benchmarks.startup_benchmark --query "이 저장소의 주요 기능은?" --output startup.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from typing import Any, Dict, List, Optional
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+IMPORT_SNIPPET = """
+import time
+start = time.perf_counter()
+import main
+main.create_mcp_app()
+print(time.perf_counter() - start)
+"""
+
+SETUP_SNIPPET = """
+import json, time
+from src.llm_workflows.mcp.tools import warm_up
+start = time.perf_counter()
+warm_up()
+cold = time.perf_counter() - start
+start = time.perf_counter()
+warm_up()
+warm = time.perf_counter() - start
+print(json.dumps({"cold": cold, "warm": warm}))
+"""
+
+QUERY_SNIPPET = """
+import asyncio, sys, time
+from src.llm_workflows.mcp.tools import rag_to_context
+start = time.perf_counter()
+asyncio.run(rag_to_context(sys.argv[1]))
+print(time.perf_counter() - start)
+"""
+
+
+def _child_env() -> Dict[str, str]:
+    env = dict(os.environ)
+    env.setdefault("OPENAI_API_KEY", "benchmark")
+    env["WARMUP_ON_STARTUP"] = "false"
+    env["PYTHONPATH"] = ROOT + os.pathsep + env.get("PYTHONPATH", "")
+    return env
+
+
+def _run_snippet(snippet: str, *args: str) -> str:
+    completed = subprocess.run(
+        [sys.executable, "-c", snippet, *args],
+        cwd=ROOT, env=_child_env(), capture_output=True, text=True, check=True,
+    )
+    return completed.stdout.strip().splitlines()[-1]
+
+
+async def _handshake_once() -> float:
+    from mcp import ClientSession, StdioServerParameters
+    from mcp.client.stdio import stdio_client
+
+    params = StdioServerParameters(
+        command=sys.executable,
+        args=[os.path.join(ROOT, "main.py")],
+        env={**_child_env(), "FASTMCP_TRANSPORT": "stdio"},
+        cwd=ROOT,
+    )
+    start = time.perf_counter()
+    async with stdio_client(params) as (read, write):
+        async with ClientSession(read, write) as session:
+            await session.initialize()
+            await session.list_tools()
+            return time.perf_counter() - start
+
+
+def _summary(values: List[float]) -> Dict[str, float]:
+    return {
+        "min": round(min(values), 4),
+        "median": round(statistics.median(values), 4),
+        "max": round(max(values), 4),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="MCP 서버 시작 시간 측정")
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--skip-handshake", action="store_true", help="stdio 핸드셰이크 측정 생략")
+    parser.add_argument("--query", help="rag_to_context 첫 호출 시간 측정용 질의 (OPENAI_API_KEY 필요)")
+    parser.add_argument("--output", help="결과 JSON 저장 경로")
+    args = parser.parse_args()
+
+    report: Dict[str, Any] = {"runs": args.runs}
+
+    report["import_seconds"] = _summary([float(_run_snippet(IMPORT_SNIPPET)) for _ in range(args.runs)])
+
+    if not args.skip_handshake:
+        report["handshake_seconds"] = _summary([asyncio.run(_handshake_once()) for _ in range(args.runs)])
+
+    setups = [json.loads(_run_snippet(SETUP_SNIPPET)) for _ in range(args.runs)]
+    report["cold_setup_seconds"] = _summary([setup["cold"] for setup in setups])
+    report["warm_setup_seconds"] = _summary([setup["warm"] for setup in setups])
+
+    query: Optional[str] = args.query
+    if query and os.getenv("OPENAI_API_KEY"):
+        report["first_query_seconds"] = _summary([float(_run_snippet(QUERY_SNIPPET, query)) for _ in range(args.runs)])
+
+    print(json.dumps(report, indent=2))
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -8,10 +8,12 @@ GitHub 저장소 분석 및 RAG 기반 질문 응답 기능을 제공합니다.
 import logging
 import sys
 import os
+import threading
 from typing import Dict, Any, List
 from dotenv import load_dotenv
 from mcp.server.fastmcp import FastMCP
-from src.mcp.tools import repo_to_rag, rag_to_context
+from src.llm_workflows.mcp.tools import repo_to_rag, repo_to_rag_batch, rag_to_context, rag_to_context_batch, compact_vectordb, get_metrics, warm_up
+from src.config.metrics_config import Metrics
 
 # 환경 변수 로드
 load_dotenv()
@@ -21,6 +23,11 @@ github_token = os.getenv("GITHUB_TOKEN")
 if not github_token:
     print("경고: GITHUB_TOKEN 환경 변수가 설정되지 않았습니다. GitHub API 요청이 제한될 수 있습니다.")
 
+# 서버 시작 후 백그라운드에서 그래프 컴파일/클라이언트 생성을 미리 수행할지 여부
+WARMUP_ON_STARTUP: bool = os.getenv("WARMUP_ON_STARTUP", "true").lower() == "true"
+# 서버 시작 시 불러올 인덱스 스냅샷 파일 또는 디렉토리 (쉼표 구분, src.llm_workflows.index_snapshot)
+INDEX_SNAPSHOTS: str = os.getenv("INDEX_SNAPSHOTS", "")
+
 # 로깅 설정
 logging.basicConfig(
     level=logging.INFO,
@@ -68,11 +75,40 @@ def create_mcp_app(
 
     # 도구 등록 - 데코레이터 방식 대신 직접 등록 방식 사용
     mcp.add_tool(repo_to_rag)
+    mcp.add_tool(repo_to_rag_batch)
     mcp.add_tool(rag_to_context)
+    mcp.add_tool(rag_to_context_batch)
+    mcp.add_tool(compact_vectordb)
+    mcp.add_tool(get_metrics)
 
     return mcp
 
 
+def _warm_up_in_background() -> None:
+    """첫 도구 호출 전에 무거운 초기화를 끝내도록 데몬 스레드에서 warm_up 을 실행합니다."""
+    def run():
+        try:
+            warm_up()
+            logger.info("워밍업 완료")
+        except Exception as e:
+            # 워밍업 실패는 서버 실행을 막지 않음 (첫 도구 호출 시 다시 초기화)
+            logger.warning(f"워밍업 중 오류 발생: {str(e)}")
+
+    threading.Thread(target=run, name="warm-up", daemon=True).start()
+
+
+def _load_snapshots_in_background() -> None:
+    """INDEX_SNAPSHOTS 에 지정한 인덱스 스냅샷을 데몬 스레드에서 불러옵니다. (임베딩 API 호출 없음)"""
+    def run():
+        from src.llm_workflows.index_snapshot import load_configured_snapshots
+
+        results = load_configured_snapshots(INDEX_SNAPSHOTS)
+        failed = [result["path"] for result in results if result["status"] == "failed"]
+        logger.info(f"인덱스 스냅샷 {len(results) - len(failed)}개 불러옴" + (f", 실패: {', '.join(failed)}" if failed else ""))
+
+    threading.Thread(target=run, name="snapshot-load", daemon=True).start()
+
+
 def main():
     """애플리케이션 시작점"""
     try:
@@ -81,16 +117,28 @@ def main():
 
         # MCP 서버 생성 및 실행
         app = create_mcp_app()
+
+        if WARMUP_ON_STARTUP:
+            _warm_up_in_background()
+        if INDEX_SNAPSHOTS:
+            _load_snapshots_in_background()
+
+        # 메트릭 엔드포인트 (METRICS_ENABLED=true 일 때만 실행)
+        metrics = Metrics()
+        if metrics.enabled:
+            metrics.start_http_server()
+            logger.info(f"메트릭 엔드포인트: http://{os.getenv('METRICS_HOST', '0.0.0.0')}:{os.getenv('METRICS_PORT', '9100')}/metrics")
         
-        # 환경 변수에서 전송 방식을 가져오거나 기본값으로 "sse" 사용
-        transport = os.getenv("FASTMCP_TRANSPORT", "sse")
+        # 환경 변수에서 전송 방식을 가져오거나 기본값으로 "stdio" 사용 (MCP 클라이언트가 main.py 를 직접 실행하는 경우)
+        # 서버/Docker 배포에서만 FASTMCP_TRANSPORT=sse 로 설정
+        transport = os.getenv("FASTMCP_TRANSPORT", "stdio")
         host = os.getenv("FASTMCP_HOST", "localhost")
         port = os.getenv("FASTMCP_PORT", "8000")
         debug = os.getenv("FASTMCP_DEBUG", "false").lower() == "true"
         
         # 서버 실행
         logger.info(f"MCP {host}:{port} 서버를 {transport} 모드로 실행합니다. 디버그 모드: {debug}")
-        app.run()
+        app.run(transport=transport)
     except Exception as e:
         logger.error(f"MCP 서버 실행 중 오류 발생: {str(e)}", exc_info=True)
         sys.exit(1)
@@ -1,42 +1,166 @@
+import atexit
+import itertools
+import json
 import os
 import logging
-from typing import Optional
+import queue
+import threading
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, Dict, Optional
+
+# 로그 레벨 (지정하지 않으면 ENV=dev 일 때 DEBUG, 그 외 INFO)
+LOG_LEVEL: str = os.getenv("LOG_LEVEL", "DEBUG" if os.getenv("ENV") == "dev" else "INFO").upper()
+# 출력 형식: text (기존 형식 + key=value 필드) | json (한 줄에 JSON 객체 하나)
+LOG_FORMAT: str = os.getenv("LOG_FORMAT", "text").lower()
+# true 이면 호출 스레드는 큐에 넣기만 하고 출력(포맷, 쓰기)은 별도 스레드에서 수행
+LOG_ASYNC: bool = os.getenv("LOG_ASYNC", "true").lower() == "true"
+# 파일/문서 단위처럼 반복되는 이벤트는 N 번에 한 번만 기록 (1 이면 모두 기록)
+LOG_SAMPLE_EVERY: int = max(int(os.getenv("LOG_SAMPLE_EVERY", "100")), 1)
+
+
+def _format_value(value: Any) -> str:
+    text = str(value)
+    if not text or any(char.isspace() or char in '="' for char in text):
+        return json.dumps(text, ensure_ascii=False)
+    return text
+
+
+class _TextFormatter(logging.Formatter):
+    """'시각 [레벨] 메시지 key=value ...' 형식"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        line = super().format(record)
+        fields: Dict[str, Any] = getattr(record, "fields", None) or {}
+        if not fields:
+            return line
+        message, newline, rest = line.partition("\n")
+        pairs = " ".join(f"{key}={_format_value(value)}" for key, value in fields.items())
+        return f"{message} {pairs}{newline}{rest}"
+
+
+class _JsonFormatter(logging.Formatter):
+    """한 줄에 JSON 객체 하나 (time, level, message, 필드, exc_info)"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        payload: Dict[str, Any] = {
+            "time": self.formatTime(record),
+            "level": record.levelname,
+            "message": record.getMessage(),
+            "thread": record.threadName,
+        }
+        payload.update(getattr(record, "fields", None) or {})
+        if record.exc_info:
+            payload["exc_info"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            payload["exc_info"] = record.exc_text
+        return json.dumps(payload, ensure_ascii=False, default=str)
+
+
+class _DeferredQueueHandler(QueueHandler):
+    """
+    메시지 인자만 호출 시점 값으로 확정하고 시각/필드 포맷과 쓰기는 리스너 스레드에 맡기는 QueueHandler
+    (기본 QueueHandler.prepare 는 호출 스레드에서 전체 포맷을 수행함)
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info and not record.exc_text:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+        # 트레이스백 객체가 프레임을 붙잡지 않도록 텍스트만 남김
+        record.exc_info = None
+        return record
+
 
 class Logger:
+    """
+    프로세스 전역 로거
+
+    메시지는 f-string 대신 %-형식 인자로 넘기면 해당 레벨이 꺼져 있을 때 포맷하지 않습니다.
+        logger.debug("문서 로드: %s", path, chunks=3)   # chunks=3 은 key=value(또는 JSON) 필드로 출력
+    값을 만드는 비용 자체가 큰 경우 is_enabled_for / debug_enabled 로 먼저 확인하고,
+    파일/문서마다 반복되는 이벤트는 sample(key) 가 True 일 때만 기록합니다.
+    LOG_ASYNC=true(기본값)이면 출력은 큐를 거쳐 별도 스레드에서 수행되어 호출 스레드가 I/O 를 기다리지 않습니다.
+    """
     _instance: Optional['Logger'] = None
+    _init_lock = threading.Lock()
 
     def __new__(cls):
         if cls._instance is None:
-            cls._instance = super().__new__(cls)
-            cls._instance.logger = logging.getLogger("MyLogger")
-
-            if not cls._instance.logger.hasHandlers():
-                # StreamHandler
-                formatter = logging.Formatter('%(asctime)s [%(levelname)s] %(message)s')
-                stream_handler = logging.StreamHandler()
-                stream_handler.setFormatter(formatter)
-
-                cls._instance.logger.addHandler(stream_handler)
-                if os.getenv("ENV") == "dev":
-                    cls._instance.logger.setLevel(logging.DEBUG)
-                else:
-                    cls._instance.logger.setLevel(logging.INFO)
+            with cls._init_lock:
+                if cls._instance is None:
+                    instance = super().__new__(cls)
+                    instance.logger = logging.getLogger("MyLogger")
+                    instance._listener: Optional[QueueListener] = None
+                    instance._samples: Dict[str, "itertools.count"] = {}
+                    instance._dev = os.getenv("ENV") == "dev"
+                    if not instance.logger.hasHandlers():
+                        instance._configure()
+                    cls._instance = instance
         return cls._instance
 
     def __init__(self):
         pass
 
-    def info(self, value: str):
-        self.logger.info(f"{value}",)
+    def _configure(self) -> None:
+        formatter = _JsonFormatter() if LOG_FORMAT == "json" else _TextFormatter('%(asctime)s [%(levelname)s] %(message)s')
+        stream_handler = logging.StreamHandler()
+        stream_handler.setFormatter(formatter)
 
-    def debug(self, value: str):
-        self.logger.debug(f"{value}")
+        if LOG_ASYNC:
+            log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+            self._listener = QueueListener(log_queue, stream_handler, respect_handler_level=True)
+            self._listener.start()
+            # 종료 시 큐에 남은 로그를 모두 출력
+            atexit.register(self._listener.stop)
+            self.logger.addHandler(_DeferredQueueHandler(log_queue))
+        else:
+            self.logger.addHandler(stream_handler)
 
-    def warning(self, value: str):
-        self.logger.warning(f"{value}")
+        self.logger.setLevel(getattr(logging, LOG_LEVEL, logging.INFO))
+        # 루트 로거(main.py 의 basicConfig)로 전파되어 같은 로그가 두 번 출력되지 않도록 함
+        self.logger.propagate = False
 
-    def error(self, value: str):
-        if os.getenv("ENV") == "dev":
-            self.logger.error(f"{value}", exc_info=True)
-        else:
-            self.logger.error(f"{value}")
\ No newline at end of file
+    def is_enabled_for(self, level: int) -> bool:
+        """해당 레벨의 로그가 출력되는지 여부 (값을 만드는 비용이 큰 로그 앞에서 확인)"""
+        return self.logger.isEnabledFor(level)
+
+    @property
+    def debug_enabled(self) -> bool:
+        return self.logger.isEnabledFor(logging.DEBUG)
+
+    def sample(self, key: str, every: Optional[int] = None) -> bool:
+        """
+        반복되는 이벤트를 key 별로 every 번에 한 번만 기록하도록 판단합니다. (첫 번째, every+1 번째, ...)
+
+        Args:
+            key: 이벤트 종류
+            every: 기록 간격 (기본값 LOG_SAMPLE_EVERY)
+
+        Returns:
+            bool: 이번 이벤트를 기록해야 하면 True
+        """
+        counter = self._samples.get(key)
+        if counter is None:
+            counter = self._samples.setdefault(key, itertools.count())
+        # itertools.count 의 next 는 GIL 아래에서 원자적
+        return next(counter) % (every or LOG_SAMPLE_EVERY) == 0
+
+    def _log(self, level: int, msg: str, args: tuple, fields: Dict[str, Any], exc_info: Any = None) -> None:
+        if not self.logger.isEnabledFor(level):
+            return
+        self.logger.log(level, msg, *args, exc_info=exc_info, extra={"fields": fields} if fields else None,
+                        stacklevel=3)
+
+    def info(self, msg: str, *args: Any, **fields: Any):
+        self._log(logging.INFO, msg, args, fields)
+
+    def debug(self, msg: str, *args: Any, **fields: Any):
+        self._log(logging.DEBUG, msg, args, fields)
+
+    def warning(self, msg: str, *args: Any, **fields: Any):
+        self._log(logging.WARNING, msg, args, fields)
+
+    def error(self, msg: str, *args: Any, exc_info: Optional[bool] = None, **fields: Any):
+        # exc_info 를 지정하지 않으면 ENV=dev 일 때만 트레이스백 포함
+        self._log(logging.ERROR, msg, args, fields, exc_info=self._dev if exc_info is None else exc_info)
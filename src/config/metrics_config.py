@@ -0,0 +1,214 @@
+import functools
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+# 메트릭 설정
+METRICS_ENABLED: bool = os.getenv("METRICS_ENABLED", "false").lower() == "true"
+METRICS_HOST: str = os.getenv("METRICS_HOST", "0.0.0.0")
+METRICS_PORT: int = int(os.getenv("METRICS_PORT", "9100"))
+METRICS_PREFIX: str = "gitctx_"
+
+# 지연 시간 히스토그램 버킷 (초)
+DEFAULT_BUCKETS: Tuple[float, ...] = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0
+)
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+class Metrics:
+    """
+    프로세스 전역 메트릭 수집기 (카운터, 히스토그램)
+
+    METRICS_ENABLED=false(기본값)이면 모든 기록 메서드가 즉시 반환하고,
+    instrument_node 는 노드 함수를 감싸지 않고 그대로 돌려주므로 오버헤드가 거의 없습니다.
+    수집된 값은 Prometheus 텍스트 형식(render_prometheus)이나 dict(snapshot)로 조회합니다.
+    """
+    _instance: Optional['Metrics'] = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+            cls._instance.enabled = METRICS_ENABLED
+            cls._instance._lock = threading.Lock()
+            cls._instance._counters: Dict[str, Dict[LabelKey, float]] = {}
+            cls._instance._histograms: Dict[str, Dict[LabelKey, List[float]]] = {}
+            cls._instance._help: Dict[str, str] = {}
+            cls._instance._server: Optional[ThreadingHTTPServer] = None
+        return cls._instance
+
+    def __init__(self):
+        pass
+
+    @staticmethod
+    def _label_key(labels: Dict[str, Any]) -> LabelKey:
+        return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+    def inc(self, name: str, value: float = 1, description: str = "", **labels: Any) -> None:
+        """카운터를 증가시킵니다."""
+        if not self.enabled:
+            return
+        key = self._label_key(labels)
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0) + value
+            if description:
+                self._help.setdefault(name, description)
+
+    def observe(self, name: str, value: float, description: str = "", **labels: Any) -> None:
+        """히스토그램에 관측값을 기록합니다."""
+        if not self.enabled:
+            return
+        key = self._label_key(labels)
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            # [버킷별 개수..., +Inf 개수, 합계]
+            values = series.get(key)
+            if values is None:
+                values = series[key] = [0] * (len(DEFAULT_BUCKETS) + 1) + [0.0]
+            values[bisect_left(DEFAULT_BUCKETS, value)] += 1
+            values[-1] += value
+            if description:
+                self._help.setdefault(name, description)
+
+    @contextmanager
+    def timer(self, name: str, **labels: Any) -> Iterator[None]:
+        """
+        블록의 wall time 을 {name}_seconds 히스토그램에, CPU time 을 {name}_cpu_seconds_total 카운터에 기록합니다.
+        """
+        if not self.enabled:
+            yield
+            return
+        wall_start, cpu_start = time.perf_counter(), time.process_time()
+        try:
+            yield
+        finally:
+            self.observe(f"{name}_seconds", time.perf_counter() - wall_start, **labels)
+            self.inc(f"{name}_cpu_seconds_total", time.process_time() - cpu_start, **labels)
+
+    def instrument_node(self, graph: str) -> Callable[[Callable], Callable]:
+        """
+        LangGraph 노드 함수의 실행 시간과 호출 수를 기록하는 데코레이터를 반환합니다.
+
+        Args:
+            graph: 그래프 이름 (메트릭 label)
+        """
+        def decorator(func: Callable) -> Callable:
+            if not self.enabled:
+                return func
+
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                status = "error"
+                try:
+                    with self.timer("node", graph=graph, node=func.__name__):
+                        result = func(*args, **kwargs)
+                    status = "ok"
+                    return result
+                finally:
+                    self.inc("node_calls_total", graph=graph, node=func.__name__, status=status)
+            return wrapper
+        return decorator
+
+    def snapshot(self) -> Dict[str, Any]:
+        """현재 메트릭 값을 dict 로 반환합니다."""
+        with self._lock:
+            counters = {
+                name: [{"labels": dict(key), "value": value} for key, value in series.items()]
+                for name, series in self._counters.items()
+            }
+            histograms = {}
+            for name, series in self._histograms.items():
+                histograms[name] = []
+                for key, values in series.items():
+                    count = sum(values[:-1])
+                    histograms[name].append({
+                        "labels": dict(key),
+                        "count": count,
+                        "sum": values[-1],
+                        "p50": self._quantile(values, 0.5),
+                        "p95": self._quantile(values, 0.95),
+                        "p99": self._quantile(values, 0.99),
+                    })
+        return {"enabled": self.enabled, "counters": counters, "histograms": histograms}
+
+    @staticmethod
+    def _quantile(values: List[float], q: float) -> Optional[float]:
+        """버킷 상한값 기준의 근사 분위수"""
+        count = sum(values[:-1])
+        if count == 0:
+            return None
+        rank, seen = q * count, 0
+        for index, bucket_count in enumerate(values[:-1]):
+            seen += bucket_count
+            if seen >= rank:
+                return DEFAULT_BUCKETS[index] if index < len(DEFAULT_BUCKETS) else float("inf")
+        return float("inf")
+
+    @staticmethod
+    def _format_labels(key: LabelKey, extra: Optional[Tuple[str, str]] = None) -> str:
+        pairs = list(key) + ([extra] if extra else [])
+        if not pairs:
+            return ""
+        escaped = []
+        for name, value in pairs:
+            value = value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+            escaped.append(f'{name}="{value}"')
+        return "{" + ",".join(escaped) + "}"
+
+    def render_prometheus(self) -> str:
+        """Prometheus 텍스트 노출 형식으로 메트릭을 렌더링합니다."""
+        lines: List[str] = []
+        with self._lock:
+            for name, series in sorted(self._counters.items()):
+                metric = METRICS_PREFIX + name
+                if name in self._help:
+                    lines.append(f"# HELP {metric} {self._help[name]}")
+                lines.append(f"# TYPE {metric} counter")
+                for key, value in series.items():
+                    lines.append(f"{metric}{self._format_labels(key)} {value}")
+
+            for name, series in sorted(self._histograms.items()):
+                metric = METRICS_PREFIX + name
+                if name in self._help:
+                    lines.append(f"# HELP {metric} {self._help[name]}")
+                lines.append(f"# TYPE {metric} histogram")
+                for key, values in series.items():
+                    cumulative = 0
+                    for bound, bucket_count in zip(DEFAULT_BUCKETS + (float("inf"),), values[:-1]):
+                        cumulative += bucket_count
+                        le = "+Inf" if bound == float("inf") else repr(bound)
+                        lines.append(f"{metric}_bucket{self._format_labels(key, ('le', le))} {cumulative}")
+                    lines.append(f"{metric}_sum{self._format_labels(key)} {values[-1]}")
+                    lines.append(f"{metric}_count{self._format_labels(key)} {cumulative}")
+        return "\n".join(lines) + "\n"
+
+    def start_http_server(self, host: str = METRICS_HOST, port: int = METRICS_PORT) -> None:
+        """/metrics 엔드포인트를 제공하는 HTTP 서버를 백그라운드 스레드로 실행합니다."""
+        if not self.enabled or self._server is not None:
+            return
+
+        metrics = self
+
+        class MetricsHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] != "/metrics":
+                    self.send_error(404)
+                    return
+                body = metrics.render_prometheus().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._server = ThreadingHTTPServer((host, port), MetricsHandler)
+        threading.Thread(target=self._server.serve_forever, name="metrics-http", daemon=True).start()
@@ -2,22 +2,31 @@ from typing import Iterator, Optional, List
 
 from langchain_core.document_loaders import Blob
 from langchain_core.document_loaders import BlobLoader
+from src.config.log_config import Logger
+from src.config.metrics_config import Metrics
 from src.models.git_repository import ParsedCode
+from src.utils.language_registry import resolve_language
+from src.utils.scope_filter import scope_metadata
 
 import mimetypes
 
+logger = Logger()
+metrics = Metrics()
+
 
 class GitHubBlobLoader(BlobLoader):
     """GitHub 파일을 로드하는 BlobLoader"""
     
-    def __init__(self, parsed_codes: List[ParsedCode]):
+    def __init__(self, parsed_codes: List[ParsedCode], failures: Optional[List[str]] = None):
         """
         GitHub Blob Loader 초기화
         
         Args:
             parsed_code: 파일 내용
+            failures: 읽지 못한 파일을 기록할 목록 (이전 문서 정리를 건너뛰는 데 사용)
         """
         self.parsed_codes = parsed_codes
+        self.failures = failures
     
     def yield_blobs(self) -> Iterator[Blob]:
         """
@@ -31,10 +40,18 @@ class GitHubBlobLoader(BlobLoader):
         """
         for parsed_code in self.parsed_codes:
             path = parsed_code.path
-            content = parsed_code.text
-            
-            if not path or content is None:
-                return
+            if not path:
+                continue
+            # 임시 파일에 저장된 큰 파일은 파서에 넘기기 직전에 읽어 한 번에 한 파일만 메모리에 올림
+            try:
+                content = parsed_code.read_text()
+            except (OSError, UnicodeDecodeError) as e:
+                # 파일 하나를 읽지 못해도 나머지 파일은 계속 로드
+                logger.warning(f"파일을 읽지 못해 건너뜁니다: {path} ({e})")
+                metrics.inc("load_skipped_files_total", reason=type(e).__name__)
+                if self.failures is not None:
+                    self.failures.append(f"load {path}: {e}")
+                continue
             
             # 파일 확장자 확인 및 MIME 타입 추측
             mimetype = mimetypes.guess_type(path)[0]
@@ -42,9 +59,16 @@ class GitHubBlobLoader(BlobLoader):
             # 메타데이터 구성
             metadata = {
                 'repo_url': parsed_code.metadata.repo_url,
+                'ref': parsed_code.metadata.ref,
+                'file_path': parsed_code.path,
                 'path': '/' + parsed_code.path.replace(f"/{parsed_code.name}", ""),
                 'filename': parsed_code.name,
-                'extension': parsed_code.metadata.extension
+                'extension': parsed_code.metadata.extension,
+                # 확장자가 없는 스크립트는 shebang 으로 판별
+                'language': resolve_language(parsed_code.name, parsed_code.metadata.extension, content[:256]),
+                'sha': parsed_code.metadata.sha,
+                # 검색 범위 필터용 (repo, dir_1 ~ dir_N)
+                **scope_metadata(parsed_code.metadata.repo_url, parsed_code.path)
                 # "file_size": len(content),
             }
             
@@ -2,40 +2,51 @@ from langchain_community.document_loaders.parsers import LanguageParser
 from langchain_core.documents import Document
 from langchain_core.document_loaders import Blob
 from typing import Iterator
+from src.utils.blob_store import BlobStore
+from src.utils.language_registry import get_parser, resolve_language
+from src.utils.syntax_chunker import CHUNKING_MODE
 
 class MultiLanguageParser(LanguageParser):
-    SUPPORTED_PARSER_LANGUAGES = {
-        'PYTHON': 'python',
-        'JS': 'js',
-        'TS': 'ts',
-        'JAVA': 'java',
-        'CPP': 'cpp',
-        'C': 'c',
-        'CSHARP': 'csharp',
-        'COBOL': 'cobol',
-        'ELIXIR': 'elixir',
-        'GO': 'go',
-        'KOTLIN': 'kotlin',
-        'LUA': 'lua',
-        'PERL': 'perl',
-        'RUBY': 'ruby',
-        'RUST': 'rust',
-        'SCALA': 'scala'
-    }
+    """blob 메타데이터의 language 로 언어별 파서(language_registry)를 골라 파싱하는 파서"""
 
     def __init__(self):
         super().__init__()
 
     def lazy_parse(self, blob: Blob) -> Iterator[Document]:
-        extension = blob.metadata.get("extension")
-        self.language = self.SUPPORTED_PARSER_LANGUAGES.get(extension)
-        documents = super().lazy_parse(blob)
+        language = blob.metadata.get("language") or resolve_language(blob.metadata.get("filename", ""),
+                                                                     blob.metadata.get("extension"))
+        # 언어별 파서는 프로세스 전체에서 공유 (self.language 를 바꾸지 않으므로 여러 스레드에서 사용해도 안전)
+        # syntax 분할 모드에서는 분할 단계가 파일 전체의 구문 트리를 사용하므로 파일을 나누지 않음
+        parser = get_parser(language) if CHUNKING_MODE != "syntax" else None
+        parser_language = parser.language if parser else None
+
+        # 같은 blob SHA 의 파싱 결과는 저장소/브랜치와 무관하게 재사용
+        sha = blob.metadata.get("sha")
+        cache_key = f"parse:{parser_language}:{self.parser_threshold}:{sha}"
+        cached = BlobStore().get_derived(cache_key) if sha else None
+        if cached is not None:
+            for item in cached:
+                yield Document(page_content=item["page_content"], metadata={**item["metadata"], **blob.metadata})
+            return
+
+        parsed = []
+        if parser is None:
+            documents = iter([Document(page_content=blob.as_string())])
+        else:
+            documents = parser.lazy_parse(blob)
         
         # 기존 메타데이터 보존하면서 GitHub 정보 추가
         for document in documents:
+            document.metadata.pop('source', None)
+            parsed.append({
+                "page_content": document.page_content,
+                "metadata": {key: value for key, value in document.metadata.items() if key not in blob.metadata},
+            })
             document.metadata.update({
                 **document.metadata,
                 **blob.metadata,
             })
-            document.metadata.pop('source')
-            yield document
\ No newline at end of file
+            yield document
+
+        if sha:
+            BlobStore().put_derived(cache_key, parsed)
@@ -0,0 +1,178 @@
+"""
+여러 GitHub 저장소(또는 조직 전체)를 한 번에 수집합니다.
+
+저장소는 크기가 작은 순서로 작업자 풀에 배정되어 첫 결과가 빨리 나오며, 모든 작업자가 GitHub 요청 한도와
+OpenAI 토큰 한도(src.utils.rate_budget)를 함께 사용합니다.
+
+사용법:
+    python -m src.llm_workflows.batch_ingest --org langchain-ai --workers 4 --output ingest_report.json
+    python -m src.llm_workflows.batch_ingest https://github.com/owner/a https://github.com/owner/b
+"""
+
+import argparse
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Callable, Dict, List, Optional
+
+from src.config.log_config import Logger
+from src.config.metrics_config import Metrics
+from src.models.git_repository import RepositoryInfo
+from src.models.ingest_status import RepoIngestStatus
+
+logger = Logger()
+metrics = Metrics()
+
+# 동시에 수집할 저장소 수
+INGEST_BATCH_WORKERS: int = int(os.getenv("INGEST_BATCH_WORKERS", "4"))
+
+
+def _resolve_repositories(
+    repo_urls: Optional[List[str]], org: Optional[str], statuses: Dict[str, RepoIngestStatus]
+) -> List[RepositoryInfo]:
+    """
+    수집 대상 저장소의 기본 브랜치와 크기를 조회합니다. 조회에 실패한 저장소는 failed 상태로 기록합니다.
+
+    Returns:
+        List[RepositoryInfo]: 중복을 제거한 저장소 정보 목록
+    """
+    from src.utils.git_repository_utils import GitHubRepositoryUtils
+
+    repositories: Dict[str, RepositoryInfo] = {}
+    if org:
+        for repo_info in GitHubRepositoryUtils.list_repositories(org):
+            repositories.setdefault(repo_info.repo_url.lower(), repo_info)
+
+    for repo_url in repo_urls or []:
+        try:
+            repo_info = GitHubRepositoryUtils.parse_repo_url(repo_url)
+        except Exception as e:
+            statuses[repo_url] = RepoIngestStatus(repo_url=repo_url, status="failed", error=str(e))
+            logger.warning(f"저장소 정보 조회 실패: {repo_url} ({e})")
+            continue
+        repositories.setdefault(repo_info.repo_url.lower(), repo_info)
+
+    return list(repositories.values())
+
+
+def ingest_repositories(
+    repo_urls: Optional[List[str]] = None,
+    org: Optional[str] = None,
+    max_workers: Optional[int] = None,
+    on_update: Optional[Callable[[RepoIngestStatus], None]] = None,
+) -> Dict[str, Any]:
+    """
+    여러 저장소를 작업자 풀로 수집합니다.
+
+    Args:
+        repo_urls: 저장소 URL 목록
+        org: 조직 또는 사용자 이름 (보관 처리되지 않은 모든 저장소를 수집)
+        max_workers: 동시에 수집할 저장소 수 (기본값 INGEST_BATCH_WORKERS)
+        on_update: 저장소 상태가 바뀔 때마다 호출할 함수
+
+    Returns:
+        Dict[str, Any]: 저장소별 상태와 요약 (succeeded, failed, seconds, first_result_seconds)
+    """
+    from src.llm_workflows.mcp.tools import ingest_repository
+
+    if not repo_urls and not org:
+        raise ValueError("repo_urls 또는 org 중 하나는 지정해야 합니다.")
+
+    started_at = time.perf_counter()
+    statuses: Dict[str, RepoIngestStatus] = {}
+    repositories = _resolve_repositories(repo_urls, org, statuses)
+    # 작은 저장소부터 처리해 첫 결과가 빨리 나오도록 함
+    repositories.sort(key=lambda repo_info: repo_info.size)
+    for repo_info in repositories:
+        statuses[repo_info.repo_url] = RepoIngestStatus(
+            repo_url=repo_info.repo_url, ref=repo_info.branch, size_kb=repo_info.size
+        )
+
+    lock = threading.Lock()
+    first_result_seconds: Optional[float] = None
+
+    def update(target: RepoIngestStatus, **changes: Any) -> None:
+        with lock:
+            for key, value in changes.items():
+                setattr(target, key, value)
+        if on_update is not None:
+            on_update(target.model_copy())
+
+    def run(repo_info: RepositoryInfo) -> None:
+        status = statuses[repo_info.repo_url]
+        update(status, status="running")
+        start = time.perf_counter()
+        try:
+            result = ingest_repository(repo_info)
+        except Exception as e:
+            update(status, status="failed", error=str(e), seconds=round(time.perf_counter() - start, 3))
+            raise
+        update(
+            status,
+            status="succeeded",
+            documents=sum(len(documents) for documents in result.documents_by_language.values()),
+            chunks=len(result.split_documents),
+            questions=len(result.hypothetical_questions),
+            seconds=round(time.perf_counter() - start, 3),
+        )
+
+    workers = max(1, min(max_workers or INGEST_BATCH_WORKERS, len(repositories) or 1))
+    logger.info(f"배치 수집 시작: 저장소 {len(repositories)}개, 작업자 {workers}개")
+    with metrics.timer("ingest", tool="repo_to_rag_batch"):
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="ingest") as pool:
+            futures = {pool.submit(run, repo_info): repo_info for repo_info in repositories}
+            for done, future in enumerate(as_completed(futures), start=1):
+                repo_info = futures[future]
+                status = statuses[repo_info.repo_url]
+                if future.exception() is not None:
+                    logger.error(f"[{done}/{len(futures)}] 수집 실패: {repo_info.repo_url} ({status.error})")
+                    continue
+                if first_result_seconds is None:
+                    first_result_seconds = round(time.perf_counter() - started_at, 3)
+                logger.info(
+                    f"[{done}/{len(futures)}] 수집 완료: {repo_info.repo_url} "
+                    f"(문서 {status.documents}개, 청크 {status.chunks}개, {status.seconds}초)"
+                )
+
+    results = [status.model_dump() for status in statuses.values()]
+    metrics.inc("batch_ingest_repos_total", sum(1 for row in results if row["status"] == "succeeded"), result="succeeded")
+    metrics.inc("batch_ingest_repos_total", sum(1 for row in results if row["status"] == "failed"), result="failed")
+    return {
+        "repositories": results,
+        "succeeded": sum(1 for row in results if row["status"] == "succeeded"),
+        "failed": sum(1 for row in results if row["status"] == "failed"),
+        "seconds": round(time.perf_counter() - started_at, 3),
+        "first_result_seconds": first_result_seconds,
+    }
+
+
+def main():
+    from dotenv import load_dotenv
+
+    load_dotenv()
+    parser = argparse.ArgumentParser(description="여러 GitHub 저장소 배치 수집")
+    parser.add_argument("repo_urls", nargs="*", help="저장소 URL 목록")
+    parser.add_argument("--org", help="조직 또는 사용자 이름 (모든 저장소 수집)")
+    parser.add_argument("--workers", type=int, default=INGEST_BATCH_WORKERS, help="동시에 수집할 저장소 수")
+    parser.add_argument("--output", help="결과 JSON 저장 경로")
+    args = parser.parse_args()
+    if not args.repo_urls and not args.org:
+        parser.error("저장소 URL 또는 --org 를 지정하세요.")
+
+    report = ingest_repositories(args.repo_urls, org=args.org, max_workers=args.workers)
+    for row in report["repositories"]:
+        print(f"{row['status']:<10} {row['repo_url']:<60} documents={row['documents']:<6} chunks={row['chunks']:<7} "
+              f"seconds={row['seconds']}" + (f"  error={row['error']}" if row["error"] else ""))
+    print(f"성공 {report['succeeded']}개, 실패 {report['failed']}개, 전체 {report['seconds']}초, "
+          f"첫 결과 {report['first_result_seconds']}초")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+    raise SystemExit(1 if report["failed"] else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,544 @@
+"""
+큰 저장소 하나를 여러 작업자 프로세스(여러 호스트 포함)로 나눠 수집합니다.
+
+조정자(coordinator)가 저장소 파일 목록을 디렉토리 단위로 묶어 크기가 고른 샤드로 나누고 작업 큐(src.utils.work_queue)에
+넣으면, 작업자는 샤드를 하나씩 임대해 파일 받기 → 파싱 → 분할 → 가설 질문 생성 → 임베딩/upsert 를 수행합니다.
+모든 샤드가 끝나면 조정자가 이번 수집에 없는 이전 청크를 한 번에 정리하고, 저장된 전체 청크로 이웃 그래프를 만듭니다.
+
+- 작업자가 죽거나 멈추면 임대가 만료되어 다른 작업자가 샤드를 다시 처리합니다.
+- 실패한 샤드는 WORK_MAX_ATTEMPTS 번까지 재시도합니다.
+- 대기열이 빈 뒤에도 오래 걸리는 샤드는 쉬는 작업자가 중복 실행합니다.
+- 청크/질문 ID 가 내용으로 정해지는 upsert 이므로 샤드를 다시 처리해도 결과가 같습니다.
+
+작업자들은 같은 벡터 저장소에 써야 하므로 작업자가 둘 이상이면 Chroma 서버(CHROMA_MODE=http)가 필요합니다.
+
+사용법:
+    # 한 호스트에서 작업자 4개로 수집
+    python -m src.llm_workflows.distributed_ingest run https://github.com/owner/monorepo --workers 4
+
+    # 여러 호스트: 조정자가 샤드를 넣고, 각 호스트에서 작업자를 띄운 뒤 (같은 WORK_QUEUE_PATH / Chroma 서버)
+    python -m src.llm_workflows.distributed_ingest enqueue https://github.com/owner/monorepo --shards 64
+    python -m src.llm_workflows.distributed_ingest worker --processes 8
+    python -m src.llm_workflows.distributed_ingest finalize https://github.com/owner/monorepo
+"""
+
+import argparse
+import heapq
+import json
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+from collections import defaultdict
+from typing import Any, Dict, List, Optional
+
+from src.config.log_config import Logger
+from src.config.metrics_config import Metrics
+from src.utils.work_queue import DONE, FAILED, PENDING, RUNNING, WORK_LEASE_SECONDS, WorkQueue
+
+logger = Logger()
+metrics = Metrics()
+
+# 로컬 작업자 프로세스 수
+DISTRIBUTED_WORKERS: int = int(os.getenv("DISTRIBUTED_WORKERS", "4"))
+# 작업자당 샤드 수 (샤드가 작을수록 부하가 고르고 재시도 비용이 작지만 샤드마다 파서/벡터 저장소 초기화 비용이 듦)
+DISTRIBUTED_SHARDS_PER_WORKER: int = int(os.getenv("DISTRIBUTED_SHARDS_PER_WORKER", "4"))
+# 샤드 크기를 계산할 때 파일마다 더하는 바이트 수 (작은 파일도 요청 한 번의 지연 시간이 듦)
+SHARD_FILE_OVERHEAD_BYTES: int = 4096
+# 대기열이 비었지만 다른 작업자가 처리 중일 때 다시 확인하는 간격 (초)
+WORKER_POLL_SECONDS: float = float(os.getenv("WORKER_POLL_SECONDS", "2"))
+
+
+def _job_id(repo_info) -> str:
+    from src.utils.ingest_progress import IngestProgress
+
+    return IngestProgress.job_id(repo_info.repo_url, repo_info.branch)
+
+
+def _weight(item: Dict[str, Any]) -> int:
+    return int(item.get("size", 0)) + SHARD_FILE_OVERHEAD_BYTES
+
+
+def plan_shards(files: List[Dict[str, Any]], shard_count: int) -> List[List[Dict[str, Any]]]:
+    """
+    파일 목록을 크기가 고른 샤드로 나눕니다.
+    목표 크기(전체 / shard_count)보다 작은 디렉토리 트리는 통째로 한 묶음으로 두고, 큰 디렉토리는 하위 디렉토리와
+    직속 파일 묶음으로 나눈 뒤, 큰 묶음부터 가장 가벼운 샤드에 배정합니다. (같은 디렉토리의 파일은 되도록 같은 샤드)
+
+    Args:
+        files: 파일 항목 목록 (path, size)
+        shard_count: 샤드 수
+
+    Returns:
+        List[List[Dict[str, Any]]]: 큰 샤드부터 정렬한 샤드 목록 (빈 샤드 제외)
+    """
+    if not files:
+        return []
+    shard_count = max(1, min(shard_count, len(files)))
+    target = sum(_weight(item) for item in files) / shard_count
+
+    direct_files: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+    subdirs: Dict[str, set] = defaultdict(set)
+    for item in files:
+        directory = os.path.dirname(item["path"])
+        direct_files[directory].append(item)
+        while directory:
+            parent = os.path.dirname(directory)
+            subdirs[parent].add(directory)
+            directory = parent
+
+    subtree_weight: Dict[str, int] = {}
+
+    def weigh(directory: str) -> int:
+        if directory not in subtree_weight:
+            subtree_weight[directory] = (
+                sum(_weight(item) for item in direct_files[directory])
+                + sum(weigh(child) for child in subdirs[directory])
+            )
+        return subtree_weight[directory]
+
+    def subtree_files(directory: str) -> List[Dict[str, Any]]:
+        collected = list(direct_files[directory])
+        for child in sorted(subdirs[directory]):
+            collected.extend(subtree_files(child))
+        return collected
+
+    groups: List[List[Dict[str, Any]]] = []
+    stack = [""]
+    while stack:
+        directory = stack.pop()
+        if weigh(directory) <= target:
+            groups.append(subtree_files(directory))
+            continue
+        # 직속 파일은 목표 크기 단위로 나눔 (파일이 많은 평평한 디렉토리)
+        group: List[Dict[str, Any]] = []
+        group_weight = 0
+        for item in sorted(direct_files[directory], key=lambda entry: entry["path"]):
+            if group and group_weight + _weight(item) > target:
+                groups.append(group)
+                group, group_weight = [], 0
+            group.append(item)
+            group_weight += _weight(item)
+        if group:
+            groups.append(group)
+        stack.extend(sorted(subdirs[directory]))
+
+    # 큰 묶음부터 가장 가벼운 샤드에 배정 (LPT)
+    heap = [(0, index) for index in range(shard_count)]
+    shards: List[List[Dict[str, Any]]] = [[] for _ in range(shard_count)]
+    for group in sorted(groups, key=lambda entries: -sum(_weight(item) for item in entries)):
+        load, index = heapq.heappop(heap)
+        shards[index].extend(group)
+        heapq.heappush(heap, (load + sum(_weight(item) for item in group), index))
+
+    # 큰 샤드를 먼저 처리해야 마지막에 큰 샤드 하나만 남아 기다리는 시간이 줄어듦
+    return sorted(
+        (shard for shard in shards if shard), key=lambda shard: -sum(_weight(item) for item in shard)
+    )
+
+
+def enqueue_repository(repo_url: str, shard_count: Optional[int] = None, queue: Optional[WorkQueue] = None) -> str:
+    """
+    저장소 파일 목록을 샤드로 나눠 작업 큐에 넣습니다.
+    같은 저장소/브랜치의 작업이 큐에 남아 있으면 새로 나누지 않고 이어서 처리합니다. (실패한 샤드는 다시 대기열로)
+
+    Args:
+        repo_url: GitHub 저장소 URL
+        shard_count: 샤드 수 (기본값 DISTRIBUTED_WORKERS * DISTRIBUTED_SHARDS_PER_WORKER)
+        queue: 작업 큐 (기본값 WORK_QUEUE_PATH)
+
+    Returns:
+        str: 작업 묶음 ID
+    """
+    from src.utils.git_repository_utils import GitHubRepositoryUtils
+
+    queue = queue or WorkQueue()
+    repo_info = GitHubRepositoryUtils.parse_repo_url(repo_url)
+    job_id = _job_id(repo_info)
+
+    stats = queue.stats(job_id)
+    if any(stats.values()):
+        retried = queue.retry_failed(job_id)
+        logger.info(f"큐에 남은 작업을 이어서 처리합니다: {job_id} ({stats}, 실패 샤드 {retried}개 재시도)")
+        return job_id
+
+    files = GitHubRepositoryUtils.list_repo_files(repo_info)
+    shards = plan_shards(files, shard_count or DISTRIBUTED_WORKERS * DISTRIBUTED_SHARDS_PER_WORKER)
+    queue.enqueue(job_id, [
+        {
+            "repo_info": repo_info.model_dump(),
+            "shard": index,
+            "bytes": sum(int(item.get("size", 0)) for item in shard),
+            "files": [{"path": item["path"], "sha": item.get("sha", ""), "size": item.get("size", 0)} for item in shard],
+        }
+        for index, shard in enumerate(shards)
+    ])
+    metrics.inc("distributed_shards_total", len(shards))
+    logger.info(f"샤드 {len(shards)}개 등록: {job_id} (파일 {len(files)}개)")
+    return job_id
+
+
+def process_shard(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    샤드 하나를 수집합니다. (파일 받기 → 파싱 → 분할 → 가설 질문 생성 → upsert, 이전 청크는 삭제하지 않음)
+
+    Args:
+        payload: enqueue_repository 가 만든 샤드 내용
+
+    Returns:
+        Dict[str, Any]: 파일/청크/질문 수와 저장한 ID 목록 (finalize 에서 이전 청크 정리에 사용)
+    """
+    from src.llm_workflows.state import RepositoryToVectorDBState
+    from src.llm_workflows.nodes.code_loader import load_documents
+    from src.llm_workflows.nodes.code_splitter import split_documents
+    from src.llm_workflows.nodes.embedder import upsert_documents
+    from src.llm_workflows.nodes.hypothetical_question_create import hypothetical_question_create
+    from src.models.git_repository import RepositoryInfo
+    from src.utils import download_spool
+    from src.utils.git_repository_utils import GitHubRepositoryUtils
+
+    repo_info = RepositoryInfo.model_validate(payload["repo_info"])
+    parsed_code_list = GitHubRepositoryUtils.fetch_files(repo_info, payload["files"])
+    failures: List[str] = []
+    try:
+        documents = load_documents(parsed_code_list, failures)
+    finally:
+        for parsed_code in parsed_code_list:
+            download_spool.remove(parsed_code.spool_path)
+
+    state = RepositoryToVectorDBState(repo_info=repo_info, documents_by_language=documents, failures=failures)
+    state = split_documents(state)
+    state = hypothetical_question_create(state)
+    code_ids, question_ids = upsert_documents(state) if state.split_documents else ([], [])
+    return {
+        "files": len(parsed_code_list),
+        "chunks": len(state.split_documents),
+        "questions": len(state.hypothetical_questions),
+        "code_ids": code_ids,
+        "question_ids": question_ids,
+        "failures": state.failures,
+    }
+
+
+class _Heartbeat:
+    """샤드를 처리하는 동안 백그라운드 스레드에서 임대를 연장합니다."""
+
+    def __init__(self, queue: WorkQueue, task_id: int, worker_id: str):
+        self._queue = queue
+        self._task_id = task_id
+        self._worker_id = worker_id
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._run, name=f"heartbeat-{task_id}", daemon=True)
+
+    def _run(self) -> None:
+        while not self._stopped.wait(WORK_LEASE_SECONDS / 3):
+            try:
+                if not self._queue.heartbeat(self._task_id, self._worker_id):
+                    # 중복 실행한 다른 작업자가 먼저 끝냈거나 임대를 잃음 (결과가 같으므로 끝까지 처리)
+                    logger.info("샤드 임대를 더 이상 갖고 있지 않습니다: task=%s", self._task_id)
+                    return
+            except Exception as e:
+                logger.warning(f"heartbeat 실패: task={self._task_id} ({e})")
+
+    def __enter__(self) -> "_Heartbeat":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._stopped.set()
+        self._thread.join()
+
+
+def run_worker(
+    job_id: Optional[str] = None,
+    worker_id: Optional[str] = None,
+    queue: Optional[WorkQueue] = None,
+    wait: bool = False,
+) -> Dict[str, int]:
+    """
+    작업 큐에서 샤드를 가져와 처리합니다.
+    대기열이 비어도 다른 작업자가 처리 중인 샤드가 있으면 재시도/중복 실행에 대비해 기다립니다.
+
+    Args:
+        job_id: 이 작업 묶음의 샤드만 처리 (None 이면 모든 작업)
+        worker_id: 작업자 ID (기본값 호스트명:PID)
+        queue: 작업 큐 (기본값 WORK_QUEUE_PATH)
+        wait: True 이면 처리할 작업이 없어도 종료하지 않고 새 작업을 기다림
+
+    Returns:
+        Dict[str, int]: 처리한(succeeded) / 실패한(failed) 샤드 수
+    """
+    queue = queue or WorkQueue()
+    worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}"
+    summary = {"succeeded": 0, "failed": 0}
+    logger.info(f"작업자 시작: {worker_id} (job={job_id or '*'})")
+
+    while True:
+        claimed = queue.claim(worker_id, job_id)
+        if claimed is None:
+            stats = queue.stats(job_id)
+            if not wait and not stats[PENDING] and not stats[RUNNING]:
+                break
+            time.sleep(WORKER_POLL_SECONDS)
+            continue
+
+        task_id, payload = claimed
+        start = time.perf_counter()
+        try:
+            with _Heartbeat(queue, task_id, worker_id), metrics.timer("distributed_shard"):
+                result = process_shard(payload)
+        except Exception as e:
+            logger.error(f"샤드 처리 실패: task={task_id}, shard={payload.get('shard')} ({e})")
+            queue.fail(task_id, worker_id, str(e))
+            summary["failed"] += 1
+            continue
+
+        queue.complete(task_id, worker_id, result)
+        summary["succeeded"] += 1
+        logger.info(
+            f"샤드 {payload.get('shard')} 완료: 파일 {result['files']}개, 청크 {result['chunks']}개 "
+            f"({time.perf_counter() - start:.2f}초, worker={worker_id})"
+        )
+
+    logger.info(f"작업자 종료: {worker_id} (처리 {summary['succeeded']}개, 실패 {summary['failed']}개)")
+    return summary
+
+
+def finalize(job_id: str, queue: Optional[WorkQueue] = None) -> Dict[str, Any]:
+    """
+    모든 샤드가 끝난 작업을 마무리합니다. 이번 수집에 없는 이전 청크를 삭제하고, 샤드마다 일부 파일만 봤으므로
+    저장된 전체 코드 청크로 이웃 그래프를 다시 만든 뒤 큐와 진행 기록을 정리합니다.
+
+    Args:
+        job_id: 작업 묶음 ID
+        queue: 작업 큐 (기본값 WORK_QUEUE_PATH)
+
+    Returns:
+        Dict[str, Any]: 샤드/파일/청크/질문 수, 삭제한 이전 문서 수, 이웃 그래프 간선 수, 시도 횟수, 로드/분할 실패 항목
+
+    Raises:
+        RuntimeError: 끝나지 않았거나 실패한 샤드가 있는 경우 (큐는 그대로 남아 다시 실행하면 이어서 처리)
+    """
+    from src.llm_workflows.nodes.embedder import delete_stale_documents
+    from src.models.git_repository import RepositoryInfo
+    from src.utils.ingest_progress import IngestProgress
+    from src.utils.neighbor_graph import build_from_vectorstore
+
+    queue = queue or WorkQueue()
+    tasks = queue.tasks(job_id)
+    unfinished = [task for task in tasks if task["status"] != DONE]
+    if unfinished:
+        failed = [task for task in unfinished if task["status"] == FAILED]
+        raise RuntimeError(
+            f"끝나지 않은 샤드 {len(unfinished)}개 (실패 {len(failed)}개)"
+            + (f": {failed[0]['error']}" if failed else "")
+        )
+
+    report: Dict[str, Any] = {
+        "job_id": job_id,
+        "shards": len(tasks),
+        "attempts": sum(task["attempts"] for task in tasks),
+        "files": sum(task["result"]["files"] for task in tasks),
+        "chunks": sum(task["result"]["chunks"] for task in tasks),
+        "questions": sum(task["result"]["questions"] for task in tasks),
+        "removed_code": 0,
+        "removed_questions": 0,
+        "neighbor_edges": 0,
+    }
+    if tasks:
+        repo_info = RepositoryInfo.model_validate(tasks[0]["payload"]["repo_info"])
+        code_ids = [id_ for task in tasks for id_ in task["result"]["code_ids"]]
+        question_ids = [id_ for task in tasks for id_ in task["result"]["question_ids"]]
+        report["failures"] = [failure for task in tasks for failure in task["result"].get("failures", [])]
+        # 로드/분할에 실패한 샤드가 있으면 단일 프로세스 수집과 같이 이전 문서를 지우지 않음
+        # (실패 없이 청크가 하나도 없으면 저장소/참조의 이전 문서를 모두 삭제)
+        if report["failures"]:
+            logger.warning(f"로드/분할 실패 {len(report['failures'])}건이 있어 이전 문서를 정리하지 않습니다.")
+        else:
+            report["removed_code"], report["removed_questions"] = delete_stale_documents(
+                repo_info, code_ids, question_ids
+            )
+        report["neighbor_edges"] = build_from_vectorstore(repo_info.repo_url, repo_info.branch)
+        IngestProgress().clear(_job_id(repo_info))
+
+    queue.clear(job_id)
+    logger.info(
+        f"분산 수집 완료: {job_id} (샤드 {report['shards']}개, 청크 {report['chunks']}개, "
+        f"이전 문서 삭제: 코드 {report['removed_code']}개, 가설 질문 {report['removed_questions']}개)"
+    )
+    return report
+
+
+def _worker_env(processes: int) -> Dict[str, str]:
+    """
+    로컬 작업자 프로세스 환경 변수. 요청/토큰 한도는 프로세스마다 따로 적용되므로 작업자 수로 나눠 전체 한도를 지킵니다.
+    """
+    from src.utils import rate_budget
+
+    env = dict(os.environ)
+    for name in (
+        "GITHUB_REQUESTS_PER_HOUR", "GITHUB_REQUEST_BURST",
+        "GITHUB_GRAPHQL_POINTS_PER_HOUR", "GITHUB_GRAPHQL_BURST",
+        "OPENAI_TOKENS_PER_MINUTE", "OPENAI_TOKEN_BURST",
+    ):
+        value = getattr(rate_budget, name)
+        if value > 0:
+            env[name] = str(max(value // processes, 1))
+    return env
+
+
+def spawn_workers(
+    processes: int, job_id: Optional[str] = None, queue_path: Optional[str] = None, wait: bool = False
+) -> List[subprocess.Popen]:
+    """
+    로컬 작업자 프로세스를 띄웁니다.
+
+    Args:
+        processes: 작업자 프로세스 수
+        job_id: 이 작업 묶음의 샤드만 처리
+        queue_path: 작업 큐 경로
+        wait: 작업이 없어도 종료하지 않고 기다림
+
+    Returns:
+        List[subprocess.Popen]: 작업자 프로세스 목록
+    """
+    command = [sys.executable, "-m", "src.llm_workflows.distributed_ingest", "worker"]
+    if job_id:
+        command += ["--job", job_id]
+    if queue_path:
+        command += ["--queue", queue_path]
+    if wait:
+        command.append("--wait")
+    env = _worker_env(processes)
+    return [subprocess.Popen(command, env=env) for _ in range(processes)]
+
+
+def _check_shared_vectorstore(processes: int) -> None:
+    from src.utils.chroma_utils import CHROMA_MODE, VECTOR_STORE_BACKEND
+
+    if processes > 1 and (VECTOR_STORE_BACKEND != "chroma" or CHROMA_MODE != "http"):
+        raise ValueError(
+            "작업자가 둘 이상이면 모든 작업자가 같은 Chroma 서버에 써야 합니다. "
+            "(VECTOR_STORE_BACKEND=chroma, CHROMA_MODE=http)"
+        )
+
+
+def ingest_distributed(
+    repo_url: str,
+    workers: Optional[int] = None,
+    shard_count: Optional[int] = None,
+    queue_path: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    저장소를 샤드로 나누고 로컬 작업자 프로세스로 수집한 뒤 마무리합니다.
+    다른 호스트에서 같은 큐로 띄운 작업자도 함께 샤드를 처리합니다. (workers=0 이면 원격 작업자만 사용)
+
+    Args:
+        repo_url: GitHub 저장소 URL
+        workers: 로컬 작업자 프로세스 수 (기본값 DISTRIBUTED_WORKERS)
+        shard_count: 샤드 수 (기본값 작업자 수 * DISTRIBUTED_SHARDS_PER_WORKER)
+        queue_path: 작업 큐 경로 (기본값 WORK_QUEUE_PATH)
+
+    Returns:
+        Dict[str, Any]: finalize 결과와 전체 처리 시간(seconds)
+    """
+    workers = DISTRIBUTED_WORKERS if workers is None else workers
+    _check_shared_vectorstore(workers)
+
+    started_at = time.perf_counter()
+    queue = WorkQueue(queue_path)
+    job_id = enqueue_repository(
+        repo_url, shard_count or max(workers, 1) * DISTRIBUTED_SHARDS_PER_WORKER, queue=queue
+    )
+
+    with metrics.timer("ingest", tool="distributed_ingest"):
+        processes = spawn_workers(workers, job_id, queue.path) if workers else []
+        last_stats = None
+        while True:
+            stats = queue.stats(job_id)
+            if not stats[PENDING] and not stats[RUNNING]:
+                break
+            if processes and all(process.poll() is not None for process in processes):
+                # 로컬 작업자가 모두 비정상 종료됨: 남은 샤드는 조정자가 직접 처리 (만료된 임대 회수 포함)
+                logger.warning(f"로컬 작업자가 모두 종료되어 남은 샤드를 직접 처리합니다: {stats}")
+                run_worker(job_id, queue=queue)
+                continue
+            if stats != last_stats:
+                logger.info(
+                    "분산 수집 진행: 완료 %d, 처리 중 %d, 대기 %d, 실패 %d",
+                    stats[DONE], stats[RUNNING], stats[PENDING], stats[FAILED],
+                )
+                last_stats = stats
+            time.sleep(WORKER_POLL_SECONDS)
+
+        for process in processes:
+            process.wait()
+        report = finalize(job_id, queue=queue)
+
+    report["workers"] = workers
+    report["seconds"] = round(time.perf_counter() - started_at, 3)
+    return report
+
+
+def main():
+    from dotenv import load_dotenv
+
+    load_dotenv()
+    parser = argparse.ArgumentParser(description="저장소 하나를 여러 작업자로 나눠 수집")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="샤드 등록, 로컬 작업자 실행, 마무리")
+    run.add_argument("repo_url")
+    run.add_argument("--workers", type=int, default=DISTRIBUTED_WORKERS, help="로컬 작업자 프로세스 수")
+    run.add_argument("--shards", type=int, help="샤드 수")
+    run.add_argument("--output", help="결과 JSON 저장 경로")
+
+    enqueue = commands.add_parser("enqueue", help="샤드만 등록")
+    enqueue.add_argument("repo_url")
+    enqueue.add_argument("--shards", type=int, help="샤드 수")
+
+    worker = commands.add_parser("worker", help="작업자 실행")
+    worker.add_argument("--job", help="이 작업 묶음의 샤드만 처리")
+    worker.add_argument("--processes", type=int, default=1, help="작업자 프로세스 수")
+    worker.add_argument("--wait", action="store_true", help="작업이 없어도 종료하지 않고 기다림")
+
+    finish = commands.add_parser("finalize", help="모든 샤드가 끝나면 이전 청크 정리")
+    finish.add_argument("repo_url")
+
+    status = commands.add_parser("status", help="샤드 상태 조회")
+    status.add_argument("repo_url")
+
+    for subparser in (run, enqueue, worker, finish, status):
+        subparser.add_argument("--queue", help="작업 큐 경로 (기본값 WORK_QUEUE_PATH)")
+    args = parser.parse_args()
+    queue = WorkQueue(args.queue)
+
+    if args.command == "run":
+        report = ingest_distributed(args.repo_url, workers=args.workers, shard_count=args.shards, queue_path=args.queue)
+        print(json.dumps(report, indent=2, ensure_ascii=False))
+        if args.output:
+            with open(args.output, "w", encoding="utf-8") as f:
+                json.dump(report, f, indent=2, ensure_ascii=False)
+    elif args.command == "enqueue":
+        print(enqueue_repository(args.repo_url, args.shards, queue=queue))
+    elif args.command == "worker":
+        if args.processes > 1:
+            _check_shared_vectorstore(args.processes)
+            processes = spawn_workers(args.processes, args.job, args.queue, wait=args.wait)
+            raise SystemExit(max(process.wait() for process in processes))
+        summary = run_worker(args.job, queue=queue, wait=args.wait)
+        raise SystemExit(1 if summary["failed"] and not summary["succeeded"] else 0)
+    else:
+        from src.utils.git_repository_utils import GitHubRepositoryUtils
+
+        job_id = _job_id(GitHubRepositoryUtils.parse_repo_url(args.repo_url))
+        if args.command == "finalize":
+            print(json.dumps(finalize(job_id, queue=queue), indent=2, ensure_ascii=False))
+        else:
+            print(json.dumps({"job_id": job_id, **queue.stats(job_id)}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,17 +1,55 @@
+import functools
 from langgraph.graph import END, StateGraph, START
 from langgraph.graph.state import CompiledStateGraph
-from src.llm_workflows.state import RagToContextState
-from src.llm_workflows.nodes.retriever import search_documents
+from src.llm_workflows.state import RagToContextState, RagToContextBatchState
+from src.llm_workflows.nodes.retriever import search_documents, search_documents_batch
+from src.llm_workflows.nodes.context_assembler import assemble_context, assemble_context_batch
+from src.llm_workflows.nodes.neighbor_graph import expand_neighbors, expand_neighbors_batch
 from src.config.log_config import Logger
+from src.config.metrics_config import Metrics
 
 logger = Logger()
+metrics = Metrics()
 
 def create_rag_to_context_graph() -> CompiledStateGraph:
+    instrument = metrics.instrument_node("rag_to_context")
     workflow = StateGraph(RagToContextState)
     
-    workflow.add_node("검색", search_documents)
+    workflow.add_node("검색", instrument(search_documents))
+    workflow.add_node("이웃 확장", instrument(expand_neighbors))
+    workflow.add_node("컨텍스트 정리", instrument(assemble_context))
     
     workflow.add_edge(START, "검색")
-    workflow.add_edge("검색", END)
+    workflow.add_edge("검색", "이웃 확장")
+    workflow.add_edge("이웃 확장", "컨텍스트 정리")
+    workflow.add_edge("컨텍스트 정리", END)
     
     return workflow.compile()
+
+
+def create_rag_to_context_batch_graph() -> CompiledStateGraph:
+    instrument = metrics.instrument_node("rag_to_context")
+    workflow = StateGraph(RagToContextBatchState)
+
+    workflow.add_node("배치 검색", instrument(search_documents_batch))
+    workflow.add_node("이웃 확장", instrument(expand_neighbors_batch))
+    workflow.add_node("컨텍스트 정리", instrument(assemble_context_batch))
+
+    workflow.add_edge(START, "배치 검색")
+    workflow.add_edge("배치 검색", "이웃 확장")
+    workflow.add_edge("이웃 확장", "컨텍스트 정리")
+    workflow.add_edge("컨텍스트 정리", END)
+
+    return workflow.compile()
+
+
+@functools.lru_cache(maxsize=1)
+def get_rag_to_context_graph() -> CompiledStateGraph:
+    """프로세스 전체에서 재사용하는 컴파일된 그래프"""
+    return create_rag_to_context_graph()
+
+
+@functools.lru_cache(maxsize=1)
+def get_rag_to_context_batch_graph() -> CompiledStateGraph:
+    """프로세스 전체에서 재사용하는 컴파일된 그래프"""
+    return create_rag_to_context_batch_graph()
@@ -1,28 +1,46 @@
+import functools
 from langgraph.graph import END, StateGraph, START
 from langgraph.graph.state import CompiledStateGraph
 from src.llm_workflows.state import RepositoryToVectorDBState
 from src.llm_workflows.nodes.code_loader import repo_to_documents
 from src.llm_workflows.nodes.code_splitter import split_documents
-from src.llm_workflows.nodes.embedder import add_documents
+from src.llm_workflows.nodes.embedder import add_code_documents, add_documents
 from src.llm_workflows.nodes.hypothetical_question_create import hypothetical_question_create
+from src.llm_workflows.nodes.neighbor_graph import build_neighbor_graph
 from src.config.log_config import Logger
+from src.config.metrics_config import Metrics
+from src.utils.ingest_progress import get_checkpointer
 
 logger = Logger()
+metrics = Metrics()
 
 
-def create_repo_to_vectordb_graph() -> CompiledStateGraph:
+def create_repo_to_vectordb_graph(checkpointer=None) -> CompiledStateGraph:
+    instrument = metrics.instrument_node("repo_to_vectordb")
     workflow = StateGraph(RepositoryToVectorDBState)
 
-    workflow.add_node("저장소 로드", repo_to_documents)
-    workflow.add_node("문서 분할", split_documents)
-    workflow.add_node("문서 추가", add_documents)
-    workflow.add_node("가설 질문 생성", hypothetical_question_create)
+    workflow.add_node("저장소 로드", instrument(repo_to_documents))
+    workflow.add_node("문서 분할", instrument(split_documents))
+    workflow.add_node("코드 임베딩", instrument(add_code_documents))
+    workflow.add_node("이웃 그래프 생성", instrument(build_neighbor_graph))
+    workflow.add_node("문서 추가", instrument(add_documents))
+    workflow.add_node("가설 질문 생성", instrument(hypothetical_question_create))
 
     workflow.add_edge(START, "저장소 로드")
     workflow.add_edge("저장소 로드", "문서 분할")
-    workflow.add_edge("문서 분할", "가설 질문 생성")
+    # 코드 청크를 먼저 저장해 가설 질문을 만드는 동안에도 검색할 수 있게 함
+    workflow.add_edge("문서 분할", "코드 임베딩")
+    # 이웃 그래프는 저장된 코드 청크를 가리키므로 코드 임베딩 뒤에 교체
+    workflow.add_edge("코드 임베딩", "이웃 그래프 생성")
+    workflow.add_edge("이웃 그래프 생성", "가설 질문 생성")
     workflow.add_edge("가설 질문 생성", "문서 추가")
     workflow.add_edge("문서 추가", END)
 
-    return workflow.compile()
+    # 체크포인터가 있으면 노드가 끝날 때마다 상태를 저장하므로, 실패한 작업을 같은 thread_id 로 재개할 수 있음
+    return workflow.compile(checkpointer=checkpointer)
 
+
+@functools.lru_cache(maxsize=1)
+def get_repo_to_vectordb_graph() -> CompiledStateGraph:
+    """프로세스 전체에서 재사용하는 컴파일된 그래프 (수집 재개용 체크포인터 포함)"""
+    return create_repo_to_vectordb_graph(checkpointer=get_checkpointer())
@@ -0,0 +1,618 @@
+"""
+저장소 인덱스 스냅샷 내보내기 / 불러오기
+
+수집 호스트에서 만든 저장소 인덱스(코드 청크와 가설 질문의 벡터, 본문, 메타데이터)를 커밋 SHA 가 붙은 변경 불가능한
+파일 하나로 내보내고, 검색 호스트는 서버 시작 시(INDEX_SNAPSHOTS) 임베딩 API 호출 없이 불러옵니다.
+청크의 심볼 정보(symbols, 구문 단위 분할)와 위치 정보는 메타데이터에 들어 있으므로 함께 옮겨집니다.
+
+파일 구성 (리틀 엔디언, 각 구간은 SNAPSHOT_ALIGNMENT 바이트 경계에서 시작):
+    헤더 (32 bytes)   MAGIC(8) | 형식 버전 uint32 | 예약 uint32 | 매니페스트 위치 uint64 | 매니페스트 길이 uint64
+    구간              <collection>.vectors  float32 (count, dimensions) 행렬 (np.memmap 으로 복사 없이 읽음)
+                      <collection>.records  행별 {"id", "document", "metadata"} JSON lines
+                      neighbor_graph.edges  이웃 그래프 간선 {"source", "target", "kind", "weight"} JSON lines
+                                            (없는 스냅샷은 불러올 때 코드 청크로 다시 만듦)
+    매니페스트 (JSON) 저장소/참조/커밋 SHA, 임베딩 모델/차원, 컬렉션별 문서 수, 구간 위치, 구간 전체 sha256
+
+사용법:
+    python -m src.llm_workflows.index_snapshot export https://github.com/owner/repo --output snapshots/
+    python -m src.llm_workflows.index_snapshot load snapshots/owner__repo__main__1a2b3c4d5e6f.gcsnap
+    python -m src.llm_workflows.index_snapshot info snapshots/owner__repo__main__1a2b3c4d5e6f.gcsnap
+"""
+
+import argparse
+import glob
+import hashlib
+import json
+import mmap
+import os
+import struct
+import tempfile
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Any, BinaryIO, Dict, Iterable, Iterator, List, Optional, Tuple
+from urllib.parse import urlparse
+
+import numpy as np
+
+from src.config.log_config import Logger
+from src.config.metrics_config import Metrics
+
+logger = Logger()
+metrics = Metrics()
+
+SNAPSHOT_MAGIC: bytes = b"GCMFSNAP"
+SNAPSHOT_FORMAT_VERSION: int = 1
+SNAPSHOT_ALIGNMENT: int = 64
+SNAPSHOT_EXTENSION: str = ".gcsnap"
+_HEADER = struct.Struct("<8sIIQQ")
+
+# 내보낸 스냅샷을 저장할 기본 디렉토리
+SNAPSHOT_DIR: str = os.getenv("SNAPSHOT_DIR", "snapshots")
+# 서버 시작 시 불러올 스냅샷 파일 또는 디렉토리 (쉼표 구분, 디렉토리는 저장소/참조별 최신 스냅샷만)
+INDEX_SNAPSHOTS: str = os.getenv("INDEX_SNAPSHOTS", "")
+# 불러오기 전에 구간 sha256 을 검사할지 여부
+SNAPSHOT_VERIFY: bool = os.getenv("SNAPSHOT_VERIFY", "true").lower() == "true"
+# 벡터 저장소에 한 번에 upsert 할 문서 수
+SNAPSHOT_LOAD_BATCH_SIZE: int = int(os.getenv("SNAPSHOT_LOAD_BATCH_SIZE", "5000"))
+
+# 불러온 스냅샷 기록 파일 갱신 보호
+_registry_lock = threading.Lock()
+
+
+def _normalize_repo_url(repo_url: str) -> Tuple[str, str, str]:
+    """
+    저장소 URL 을 수집 시 메타데이터에 저장되는 형태로 정규화합니다. (GitHub API 를 호출하지 않음)
+
+    Returns:
+        Tuple[str, str, str]: (repo_url, owner, repo_name)
+    """
+    repo_url = repo_url.rstrip("/")
+    if repo_url.endswith(".git"):
+        repo_url = repo_url[:-4]
+    path_parts = urlparse(repo_url).path.strip("/").split("/")
+    if len(path_parts) < 2:
+        raise ValueError(f"잘못된 GitHub URL 형식: {repo_url}")
+    return repo_url, path_parts[0], path_parts[1]
+
+
+def snapshot_filename(owner: str, repo_name: str, ref: str, commit_sha: str) -> str:
+    """스냅샷 기본 파일 이름 (저장소, 참조, 커밋마다 하나)"""
+    safe_ref = ref.replace("/", "-")
+    return f"{owner}__{repo_name}__{safe_ref}__{commit_sha[:12]}{SNAPSHOT_EXTENSION}"
+
+
+class _SnapshotWriter:
+    """구간을 차례로 기록하고 마지막에 매니페스트와 헤더를 써서 원자적으로 파일을 만듭니다."""
+
+    def __init__(self, path: str):
+        self.path = path
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        fd, self._tmp_path = tempfile.mkstemp(prefix=".snapshot_", suffix=".tmp", dir=directory)
+        self._file: BinaryIO = os.fdopen(fd, "wb")
+        self._file.write(b"\0" * _HEADER.size)
+        self._digest = hashlib.sha256()
+        self.sections: Dict[str, Dict[str, Any]] = {}
+
+    def _write(self, data: bytes) -> None:
+        self._file.write(data)
+        self._digest.update(data)
+
+    def _align(self) -> None:
+        padding = -self._file.tell() % SNAPSHOT_ALIGNMENT
+        if padding:
+            self._write(b"\0" * padding)
+
+    def add_section(self, name: str, chunks: Iterable[bytes], **info: Any) -> Dict[str, Any]:
+        """
+        구간 하나를 기록합니다.
+
+        Args:
+            name: 구간 이름
+            chunks: 구간 내용 (바이트 조각)
+            info: 매니페스트에 함께 기록할 정보 (dtype, shape 등)
+
+        Returns:
+            Dict[str, Any]: 매니페스트의 구간 정보 (기록 후 정보를 덧붙일 수 있음)
+        """
+        self._align()
+        offset = self._file.tell()
+        for chunk in chunks:
+            self._write(chunk)
+        self.sections[name] = {"offset": offset, "length": self._file.tell() - offset, **info}
+        return self.sections[name]
+
+    def finish(self, manifest: Dict[str, Any]) -> Dict[str, Any]:
+        """매니페스트와 헤더를 기록하고 최종 경로로 옮깁니다."""
+        try:
+            self._align()
+            manifest = {**manifest, "sections": self.sections, "checksum": self._digest.hexdigest()}
+            payload = json.dumps(manifest, ensure_ascii=False).encode("utf-8")
+            manifest_offset = self._file.tell()
+            self._file.write(payload)
+            self._file.seek(0)
+            self._file.write(_HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_FORMAT_VERSION, 0, manifest_offset, len(payload)))
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self._file.close()
+            os.replace(self._tmp_path, self.path)
+            return manifest
+        except BaseException:
+            self.abort()
+            raise
+
+    def abort(self) -> None:
+        if not self._file.closed:
+            self._file.close()
+        if os.path.exists(self._tmp_path):
+            os.remove(self._tmp_path)
+
+
+class IndexSnapshot:
+    """
+    스냅샷 파일을 읽기 전용 메모리 매핑으로 엽니다.
+    벡터 구간은 np.memmap 으로 필요한 행만 페이지 단위로 읽으므로 파일 전체를 메모리에 올리지 않습니다.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as f:
+            header = f.read(_HEADER.size)
+            if len(header) < _HEADER.size:
+                raise ValueError(f"스냅샷 파일이 아닙니다: {path}")
+            magic, version, _, manifest_offset, manifest_length = _HEADER.unpack(header)
+            if magic != SNAPSHOT_MAGIC:
+                raise ValueError(f"스냅샷 파일이 아닙니다: {path}")
+            if version > SNAPSHOT_FORMAT_VERSION:
+                raise ValueError(f"지원하지 않는 스냅샷 형식 버전입니다: {version} (지원: {SNAPSHOT_FORMAT_VERSION} 이하)")
+            f.seek(manifest_offset)
+            self.manifest: Dict[str, Any] = json.loads(f.read(manifest_length).decode("utf-8"))
+            self._data_end = manifest_offset
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def __enter__(self) -> "IndexSnapshot":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._mmap.close()
+
+    def has_section(self, name: str) -> bool:
+        return name in self.manifest["sections"]
+
+    def section(self, name: str) -> bytes:
+        """구간 내용"""
+        info = self.manifest["sections"][name]
+        return self._mmap[info["offset"]:info["offset"] + info["length"]]
+
+    def vectors(self, collection_name: str) -> np.ndarray:
+        """컬렉션 벡터 행렬 (읽기 전용 메모리 매핑)"""
+        info = self.manifest["sections"][f"{collection_name}.vectors"]
+        shape = tuple(info["shape"])
+        if shape[0] == 0:
+            return np.zeros(shape, dtype=np.float32)
+        return np.memmap(self.path, dtype=info["dtype"], mode="r", offset=info["offset"], shape=shape)
+
+    def records(self, collection_name: str) -> Iterator[Dict[str, Any]]:
+        """컬렉션 문서를 벡터 행 순서대로 순회합니다. ({"id", "document", "metadata"})"""
+        info = self.manifest["sections"][f"{collection_name}.records"]
+        position, stop = info["offset"], info["offset"] + info["length"]
+        while position < stop:
+            end = self._mmap.find(b"\n", position, stop)
+            end = stop if end == -1 else end
+            if end > position:
+                yield json.loads(self._mmap[position:end])
+            position = end + 1
+
+    def verify(self) -> None:
+        """구간 전체 sha256 을 검사합니다."""
+        digest = hashlib.sha256()
+        for start in range(_HEADER.size, self._data_end, 1 << 24):
+            digest.update(self._mmap[start:min(start + (1 << 24), self._data_end)])
+        if digest.hexdigest() != self.manifest["checksum"]:
+            raise ValueError(f"스냅샷 파일이 손상되었습니다: {self.path}")
+
+
+def _registry_path() -> str:
+    from src.utils.chroma_utils import VECTOR_DB_PATH
+
+    return os.path.join(VECTOR_DB_PATH, "loaded_snapshots.json")
+
+
+def _read_registry() -> Dict[str, Dict[str, Any]]:
+    """이 벡터 저장소에 불러온 스냅샷 기록 (저장소@참조 → 체크섬, 커밋 SHA)"""
+    try:
+        with open(_registry_path(), encoding="utf-8") as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def _write_registry(key: str, entry: Dict[str, Any]) -> None:
+    with _registry_lock:
+        registry = _read_registry()
+        registry[key] = entry
+        path = _registry_path()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path + ".tmp", "w", encoding="utf-8") as f:
+            json.dump(registry, f, indent=2, ensure_ascii=False)
+        os.replace(path + ".tmp", path)
+
+
+def _stored_refs(vectorstore: Any, repo_url: str) -> List[str]:
+    """벡터 저장소에 있는 저장소 문서의 참조(브랜치) 목록"""
+    from src.utils.chroma_utils import ChromaUtils
+
+    refs = set()
+    for page in ChromaUtils._iter_entries(vectorstore, where={"repo_url": repo_url}, include=["metadatas"]):
+        refs.update((metadata or {}).get("ref", "") for metadata in page["metadatas"])
+    return sorted(refs)
+
+
+def _collection_chunks(
+    vectorstore: Any, repo_url: str, ref: str, records_file: BinaryIO, counts: Dict[str, int]
+) -> Iterator[bytes]:
+    """
+    컬렉션에서 저장소/참조 문서를 읽어 벡터 구간 바이트를 내보내고, 같은 순서로 문서 기록을 records_file 에 씁니다.
+    counts 에 문서 수(count)와 벡터 차원(dimensions)을 채웁니다.
+    """
+    from src.utils.chroma_utils import ChromaUtils
+
+    include = ["embeddings", "documents", "metadatas"]
+    for page in ChromaUtils._iter_entries(vectorstore, where={"repo_url": repo_url}, include=include):
+        rows = [
+            row for row, metadata in enumerate(page["metadatas"])
+            # ref 메타데이터가 없는 이전 버전 문서는 요청한 참조의 문서로 취급 (delete_stale_documents 와 같음)
+            if (metadata or {}).get("ref", ref) == ref
+        ]
+        if not rows:
+            continue
+        vectors = np.asarray([page["embeddings"][row] for row in rows], dtype="<f4")
+        counts["dimensions"] = vectors.shape[1]
+        counts["count"] += len(rows)
+        for row in rows:
+            records_file.write(json.dumps({
+                "id": page["ids"][row],
+                "document": page["documents"][row],
+                "metadata": page["metadatas"][row] or {},
+            }, ensure_ascii=False).encode("utf-8") + b"\n")
+        yield vectors.tobytes()
+
+
+def _read_chunks(file: BinaryIO, size: int = 1 << 20) -> Iterator[bytes]:
+    file.seek(0)
+    while True:
+        chunk = file.read(size)
+        if not chunk:
+            return
+        yield chunk
+
+
+def export_snapshot(
+    repo_url: str,
+    ref: Optional[str] = None,
+    commit_sha: Optional[str] = None,
+    output: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    수집된 저장소 인덱스를 스냅샷 파일로 내보냅니다.
+
+    Args:
+        repo_url: 저장소 URL
+        ref: 브랜치 (없으면 벡터 저장소에 있는 유일한 참조)
+        commit_sha: 인덱스의 커밋 SHA (없으면 GitHub 에서 ref 가 현재 가리키는 커밋을 조회)
+        output: 저장할 파일 또는 디렉토리 (기본값 SNAPSHOT_DIR, 디렉토리면 snapshot_filename 사용)
+
+    Returns:
+        Dict[str, Any]: 저장 경로, 크기, 컬렉션별 문서 수, 커밋 SHA, 체크섬
+
+    Raises:
+        ValueError: 수집된 문서가 없거나 참조를 정할 수 없는 경우
+    """
+    from src.models.git_repository import RepositoryInfo
+    from src.utils.chroma_utils import ChromaUtils, COLLECTION_NAMES, EMBEDDING_DIMENSIONS, EMBEDDING_MODEL
+    from src.utils.git_repository_utils import GitHubRepositoryUtils
+    from src.utils.neighbor_graph import NeighborGraph, edge_to_record
+
+    start = time.perf_counter()
+    repo_url, owner, repo_name = _normalize_repo_url(repo_url)
+    chroma_utils = ChromaUtils()
+    vectorstores = {
+        "code_documents": chroma_utils.get_code_documents_vectorstore(),
+        "hypothetical_questions": chroma_utils.get_hypothetical_questions_vectorstore(),
+    }
+
+    if ref is None:
+        refs = _stored_refs(vectorstores["code_documents"], repo_url)
+        if len(refs) != 1:
+            raise ValueError(
+                f"참조를 정할 수 없습니다: {repo_url} (저장된 참조: {', '.join(refs) or '없음'}), --ref 를 지정하세요."
+            )
+        ref = refs[0]
+    if commit_sha is None:
+        commit_sha = GitHubRepositoryUtils.get_commit_sha(
+            RepositoryInfo(repo_url=repo_url, owner=owner, repo_name=repo_name, branch=ref)
+        )
+
+    output = output or SNAPSHOT_DIR
+    path = output
+    if os.path.isdir(output) or not output.endswith(SNAPSHOT_EXTENSION):
+        path = os.path.join(output, snapshot_filename(owner, repo_name, ref, commit_sha))
+
+    writer = _SnapshotWriter(path)
+    collections: Dict[str, Dict[str, int]] = {}
+    try:
+        for collection_name in COLLECTION_NAMES:
+            counts = {"count": 0, "dimensions": EMBEDDING_DIMENSIONS}
+            with tempfile.TemporaryFile(dir=os.path.dirname(os.path.abspath(path))) as records_file:
+                section = writer.add_section(
+                    f"{collection_name}.vectors",
+                    _collection_chunks(vectorstores[collection_name], repo_url, ref, records_file, counts),
+                    dtype="<f4",
+                )
+                section["shape"] = [counts["count"], counts["dimensions"]]
+                writer.add_section(f"{collection_name}.records", _read_chunks(records_file), format="jsonl")
+            collections[collection_name] = counts
+
+        edges = NeighborGraph().edges(repo_url, ref)
+        writer.add_section(
+            "neighbor_graph.edges",
+            (json.dumps(edge_to_record(edge)).encode("utf-8") + b"\n" for edge in edges),
+            format="jsonl", count=len(edges),
+        )
+
+        if collections["code_documents"]["count"] == 0:
+            raise ValueError(f"수집된 문서가 없습니다: {repo_url} ({ref})")
+
+        manifest = writer.finish({
+            "format_version": SNAPSHOT_FORMAT_VERSION,
+            "repo_url": repo_url,
+            "ref": ref,
+            "commit_sha": commit_sha,
+            "embedding_model": EMBEDDING_MODEL,
+            "dimensions": collections["code_documents"]["dimensions"],
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "collections": {name: {"count": counts["count"]} for name, counts in collections.items()},
+        })
+    except BaseException:
+        writer.abort()
+        raise
+
+    summary = {
+        "path": path,
+        "bytes": os.path.getsize(path),
+        "repo_url": repo_url,
+        "ref": ref,
+        "commit_sha": commit_sha,
+        "checksum": manifest["checksum"],
+        "collections": manifest["collections"],
+        "seconds": round(time.perf_counter() - start, 3),
+    }
+    logger.info(
+        f"스냅샷 내보내기 완료: {path} ({summary['bytes']} bytes, 코드 {manifest['collections']['code_documents']['count']}개, "
+        f"가설 질문 {manifest['collections']['hypothetical_questions']['count']}개, {summary['seconds']}초)"
+    )
+    return summary
+
+
+def _load_collection(snapshot: IndexSnapshot, collection_name: str, vectorstore: Any, repo_url: str, ref: str) -> Tuple[int, int]:
+    """
+    스냅샷의 컬렉션 하나를 벡터 저장소에 upsert 하고, 스냅샷에 없는 같은 저장소/참조 문서를 삭제합니다.
+
+    Returns:
+        Tuple[int, int]: (불러온 문서 수, 삭제한 이전 문서 수)
+    """
+    from src.utils.chroma_utils import ChromaUtils
+    from src.utils.quantized_vectorstore import QuantizedVectorStore
+
+    vectors = snapshot.vectors(collection_name)
+    ids: List[str] = []
+    batch: List[Dict[str, Any]] = []
+
+    def flush() -> None:
+        start = len(ids) - len(batch)
+        ChromaUtils.upsert_embeddings(
+            vectorstore,
+            [record["id"] for record in batch],
+            np.asarray(vectors[start:start + len(batch)], dtype=np.float32),
+            [record["document"] for record in batch],
+            [record["metadata"] for record in batch],
+        )
+        batch.clear()
+
+    with ChromaUtils.bulk_load(vectorstore):
+        for record in snapshot.records(collection_name):
+            ids.append(record["id"])
+            batch.append(record)
+            if len(batch) >= SNAPSHOT_LOAD_BATCH_SIZE:
+                flush()
+        if batch:
+            flush()
+
+    removed = ChromaUtils.delete_stale_documents(vectorstore, repo_url, ref, ids)
+    if isinstance(vectorstore, QuantizedVectorStore):
+        vectorstore.persist()
+    return len(ids), removed
+
+
+def _load_neighbor_graph(snapshot: IndexSnapshot, repo_url: str, ref: str) -> int:
+    """
+    스냅샷의 이웃 그래프 간선으로 저장소/참조의 그래프를 바꿉니다. 간선 구간이 없는 스냅샷은 코드 청크로 다시 만듭니다.
+
+    Returns:
+        int: 저장한 간선 수
+    """
+    from langchain_core.documents import Document
+    from src.utils.neighbor_graph import NeighborGraph, build_edges
+
+    graph = NeighborGraph()
+    if not graph.enabled:
+        return 0
+    if snapshot.has_section("neighbor_graph.edges"):
+        edges = [
+            (record["source"], record["target"], record["kind"], record["weight"])
+            for record in map(json.loads, snapshot.section("neighbor_graph.edges").splitlines())
+        ]
+    else:
+        edges = build_edges([
+            Document(id=record["id"], page_content=record["document"], metadata={"chunk_id": record["id"], **record["metadata"]})
+            for record in snapshot.records("code_documents")
+        ])
+    return graph.replace(repo_url, ref, edges)
+
+
+def load_snapshot(path: str, verify: Optional[bool] = None, force: bool = False) -> Dict[str, Any]:
+    """
+    스냅샷을 설정된 벡터 저장소에 불러옵니다. 임베딩 API 를 호출하지 않습니다.
+    같은 저장소/참조의 기존 문서는 스냅샷 내용으로 바뀌고, 같은 스냅샷을 이미 불러왔으면 건너뜁니다.
+
+    Args:
+        path: 스냅샷 파일 경로
+        verify: 구간 sha256 검사 여부 (기본값 SNAPSHOT_VERIFY)
+        force: 이미 불러온 스냅샷도 다시 불러올지 여부
+
+    Returns:
+        Dict[str, Any]: 불러오기 결과 (status: loaded | unchanged, 컬렉션별 문서 수, 처리 시간)
+
+    Raises:
+        ValueError: 손상된 파일이거나 임베딩 모델/차원이 현재 설정과 다른 경우
+    """
+    from src.utils.chroma_utils import ChromaUtils, EMBEDDING_DIMENSIONS, EMBEDDING_MODEL
+
+    start = time.perf_counter()
+    with IndexSnapshot(path) as snapshot:
+        manifest = snapshot.manifest
+        repo_url, ref = manifest["repo_url"], manifest["ref"]
+        # 질의 임베딩과 같은 공간이어야 검색 결과가 의미 있음
+        if manifest["embedding_model"] != EMBEDDING_MODEL or manifest["dimensions"] != EMBEDDING_DIMENSIONS:
+            raise ValueError(
+                f"스냅샷 임베딩 설정이 다릅니다: {path} "
+                f"(스냅샷: {manifest['embedding_model']}/{manifest['dimensions']}, "
+                f"현재: {EMBEDDING_MODEL}/{EMBEDDING_DIMENSIONS})"
+            )
+
+        key = f"{repo_url}@{ref}"
+        summary = {"path": path, "repo_url": repo_url, "ref": ref, "commit_sha": manifest["commit_sha"]}
+        if not force and _read_registry().get(key, {}).get("checksum") == manifest["checksum"]:
+            logger.info(f"이미 불러온 스냅샷입니다: {path} ({key}, {manifest['commit_sha'][:12]})")
+            return {**summary, "status": "unchanged", "seconds": round(time.perf_counter() - start, 3)}
+
+        if SNAPSHOT_VERIFY if verify is None else verify:
+            snapshot.verify()
+
+        chroma_utils = ChromaUtils()
+        collections: Dict[str, Dict[str, int]] = {}
+        with metrics.timer("snapshot_load"):
+            for collection_name, vectorstore in (
+                ("code_documents", chroma_utils.get_code_documents_vectorstore()),
+                ("hypothetical_questions", chroma_utils.get_hypothetical_questions_vectorstore()),
+            ):
+                loaded, removed = _load_collection(snapshot, collection_name, vectorstore, repo_url, ref)
+                collections[collection_name] = {"count": loaded, "removed": removed}
+            neighbor_edges = _load_neighbor_graph(snapshot, repo_url, ref)
+
+    _write_registry(key, {
+        "checksum": manifest["checksum"],
+        "commit_sha": manifest["commit_sha"],
+        "path": os.path.abspath(path),
+        "loaded_at": datetime.now(timezone.utc).isoformat(),
+    })
+    summary = {
+        **summary, "status": "loaded", "collections": collections, "neighbor_edges": neighbor_edges,
+        "seconds": round(time.perf_counter() - start, 3),
+    }
+    logger.info(
+        f"스냅샷 불러오기 완료: {key} ({manifest['commit_sha'][:12]}, 코드 {collections['code_documents']['count']}개, "
+        f"가설 질문 {collections['hypothetical_questions']['count']}개, {summary['seconds']}초)"
+    )
+    return summary
+
+
+def load_configured_snapshots(
+    paths: Optional[str] = None, verify: Optional[bool] = None, force: bool = False
+) -> List[Dict[str, Any]]:
+    """
+    INDEX_SNAPSHOTS(또는 paths)에 지정한 스냅샷을 불러옵니다. 서버 시작 시 호출합니다.
+    디렉토리는 안의 모든 스냅샷 중 저장소/참조별로 가장 최근에 만든 것만 불러오고,
+    한 스냅샷이 실패해도 나머지는 계속 불러옵니다.
+
+    Args:
+        paths: 쉼표로 구분한 스냅샷 파일 또는 디렉토리 (기본값 INDEX_SNAPSHOTS)
+        verify, force: load_snapshot 과 같음
+
+    Returns:
+        List[Dict[str, Any]]: 스냅샷별 불러오기 결과 (실패 시 status=failed, error)
+    """
+    candidates: List[str] = []
+    for spec in (INDEX_SNAPSHOTS if paths is None else paths).split(","):
+        spec = spec.strip()
+        if not spec:
+            continue
+        if os.path.isdir(spec):
+            candidates.extend(sorted(glob.glob(os.path.join(spec, f"*{SNAPSHOT_EXTENSION}"))))
+        elif os.path.exists(spec):
+            candidates.append(spec)
+        else:
+            logger.warning(f"스냅샷을 찾을 수 없습니다: {spec}")
+
+    results: List[Dict[str, Any]] = []
+    latest: Dict[str, Tuple[str, str]] = {}
+    for path in candidates:
+        try:
+            with IndexSnapshot(path) as snapshot:
+                manifest = snapshot.manifest
+        except Exception as e:
+            logger.error(f"스냅샷을 읽을 수 없습니다: {path} ({e})")
+            results.append({"path": path, "status": "failed", "error": str(e)})
+            continue
+        key = f"{manifest['repo_url']}@{manifest['ref']}"
+        if key not in latest or manifest["created_at"] > latest[key][0]:
+            latest[key] = (manifest["created_at"], path)
+
+    for _, path in latest.values():
+        try:
+            results.append(load_snapshot(path, verify=verify, force=force))
+        except Exception as e:
+            logger.error(f"스냅샷 불러오기 실패: {path} ({e})")
+            results.append({"path": path, "status": "failed", "error": str(e)})
+    return results
+
+
+def main():
+    from dotenv import load_dotenv
+
+    load_dotenv()
+    parser = argparse.ArgumentParser(description="저장소 인덱스 스냅샷 내보내기 / 불러오기")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    export = commands.add_parser("export", help="수집된 저장소 인덱스를 스냅샷으로 내보내기")
+    export.add_argument("repo_url")
+    export.add_argument("--ref", help="브랜치 (기본값: 벡터 저장소에 있는 유일한 참조)")
+    export.add_argument("--commit-sha", help="인덱스의 커밋 SHA (기본값: GitHub 에서 ref 의 현재 커밋 조회)")
+    export.add_argument("--output", help=f"저장할 파일 또는 디렉토리 (기본값 {SNAPSHOT_DIR})")
+
+    load = commands.add_parser("load", help="스냅샷 파일 또는 디렉토리 불러오기")
+    load.add_argument("paths", nargs="+")
+    load.add_argument("--force", action="store_true", help="이미 불러온 스냅샷도 다시 불러옴")
+    load.add_argument("--no-verify", action="store_true", help="체크섬 검사 생략")
+
+    info = commands.add_parser("info", help="스냅샷 매니페스트 출력")
+    info.add_argument("path")
+    args = parser.parse_args()
+
+    if args.command == "export":
+        print(json.dumps(export_snapshot(args.repo_url, args.ref, args.commit_sha, args.output), indent=2, ensure_ascii=False))
+    elif args.command == "load":
+        results = load_configured_snapshots(",".join(args.paths), verify=False if args.no_verify else None, force=args.force)
+        print(json.dumps(results, indent=2, ensure_ascii=False))
+        raise SystemExit(1 if any(result["status"] == "failed" for result in results) else 0)
+    else:
+        with IndexSnapshot(args.path) as snapshot:
+            print(json.dumps(snapshot.manifest, indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,51 +1,381 @@
-from typing import List, Any, Union
-from langgraph.graph.state import CompiledStateGraph
-from langchain_core.documents import Document
-from src.models.git_repository import RepositoryInfo
-from src.llm_workflows.state import RepositoryToVectorDBState, RagToContextState
-from src.llm_workflows.graphs.repo_to_vectordb_graph import create_repo_to_vectordb_graph
-from src.llm_workflows.graphs.rag_to_context_graph import create_rag_to_context_graph
+import asyncio
+import contextlib
+import os
+import threading
+import time
+from typing import TYPE_CHECKING, Iterator, List, Any, Optional, Set, Union
+from mcp.server.fastmcp import Context
 from src.config.log_config import Logger
+from src.config.metrics_config import Metrics
+
+# LangChain/LangGraph/Chroma 는 import 비용이 커서 MCP 핸드셰이크가 늦어지므로 도구 호출 시점에 import 합니다.
+if TYPE_CHECKING:
+    from langgraph.graph.state import CompiledStateGraph
+    from langchain_core.documents import Document
+    from src.models.git_repository import RepositoryInfo
+    from src.llm_workflows.state import RepositoryToVectorDBState
+    from src.models.ingest_status import RepoIngestStatus
 
 
 logger = Logger()
+metrics = Metrics()
+
+# 진행 알림 최소 간격 (초, 단계가 끝날 때는 간격과 관계없이 보냄)
+MCP_PROGRESS_INTERVAL_SECONDS: float = float(os.getenv("MCP_PROGRESS_INTERVAL_SECONDS", "0.5"))
+
+# 이 프로세스에서 수집 중인 작업 ID (같은 저장소·브랜치를 동시에 수집하면 체크포인트 thread_id 를 공유하므로 막음)
+_active_jobs: Set[str] = set()
+_active_jobs_lock = threading.Lock()
 
+# 단계가 끝났을 때 클라이언트에 보내는 로그 메시지
+_STAGE_DONE_MESSAGES = {
+    "fetch": "파일 {total}개를 불러왔습니다.",
+    "split": "청크 {total}개로 분할했습니다.",
+    "embed_code": "코드 청크 {total}개를 저장했습니다. 가설 질문을 만드는 동안에도 rag_to_context 로 검색할 수 있습니다.",
+    "questions": "청크 {total}개의 가설 질문 생성을 마쳤습니다.",
+    "embed_questions": "가설 질문 {total}개를 저장했습니다.",
+}
 
-async def repo_to_rag(repo_url: str) -> RepositoryInfo:
+
+class _McpProgress:
+    """
+    수집 스레드의 report_progress 호출을 MCP 진행 알림(notifications/progress)과 로그 메시지로 바꿔 보냅니다.
+    알림은 MCP_PROGRESS_INTERVAL_SECONDS 간격으로 줄이고, 전체 진행률이 늘어날 때만 보냅니다.
+    """
+
+    def __init__(self, ctx: Context, loop: asyncio.AbstractEventLoop):
+        self._ctx = ctx
+        self._loop = loop
+        self._lock = threading.Lock()
+        self._last_sent = 0.0
+        self._last_progress = -1.0
+        self._finished_stages: Set[str] = set()
+
+    def __call__(self, stage: str, completed: int, total: int) -> None:
+        from src.utils.progress import PROGRESS_TOTAL, overall_progress
+
+        progress = overall_progress(stage, completed, total)
+        finished = completed >= total
+        now = time.monotonic()
+        with self._lock:
+            if progress <= self._last_progress:
+                return
+            if not finished and now - self._last_sent < MCP_PROGRESS_INTERVAL_SECONDS:
+                return
+            self._last_sent, self._last_progress = now, progress
+            announce = finished and stage not in self._finished_stages
+            if announce:
+                self._finished_stages.add(stage)
+
+        self._send(self._ctx.report_progress(progress, PROGRESS_TOTAL))
+        if announce and stage in _STAGE_DONE_MESSAGES:
+            self._send(self._ctx.info(_STAGE_DONE_MESSAGES[stage].format(total=total)))
+
+    def _send(self, coroutine) -> None:
+        # 수집 스레드를 기다리게 하지 않도록 이벤트 루프에 넘기기만 함 (같은 스레드에서 넘긴 순서대로 실행됨)
+        future = asyncio.run_coroutine_threadsafe(coroutine, self._loop)
+        future.add_done_callback(_log_send_error)
+
+
+def _log_send_error(future) -> None:
+    if not future.cancelled() and future.exception() is not None:
+        logger.warning(f"진행 알림 전송 실패: {future.exception()}")
+
+
+async def repo_to_rag(repo_url: str, ctx: Context = None) -> "RepoIngestStatus":
     """
     GITHUB Repository ⇒ Embedding and Store in VectorDB
     주어진 GitHub 저장소의 소스 코드를 임베딩하여 VectorDB에 저장합니다.
     이 과정은 벡터 기반 코드 검색 및 검색 기반 질문 응답을 가능하게 합니다.
+    클라이언트가 progressToken 을 보내면 단계별 진행률(0~100)을 알리고, 코드 청크는 가설 질문 생성 전에 먼저 저장되어
+    수집이 끝나기 전에도 검색할 수 있습니다. 저장소 전체 내용 대신 문서·청크·질문 수 요약을 반환합니다.
 
     Parameters:
         repo_url: GitHub 저장소 URL
     """
-    state = RepositoryToVectorDBState(
-        repo_info=RepositoryInfo(repo_url=repo_url)
+    from src.models.git_repository import RepositoryInfo
+    from src.models.ingest_status import RepoIngestStatus
+    from src.utils.progress import progress_reporter
+
+    repo_info = RepositoryInfo(repo_url=repo_url)
+    start = time.perf_counter()
+    with metrics.timer("ingest", tool="repo_to_rag"):
+        if ctx is None:
+            result = await asyncio.to_thread(ingest_repository, repo_info)
+        else:
+            # 콜백은 contextvars 로 전달되므로 to_thread 로 시작한 수집 스레드와 그래프 노드까지 이어짐
+            with progress_reporter(_McpProgress(ctx, asyncio.get_running_loop())):
+                result = await asyncio.to_thread(ingest_repository, repo_info)
+    logger.debug(f"repo_to_rag result: {result.repo_info}")
+
+    return RepoIngestStatus(
+        repo_url=result.repo_info.repo_url,
+        ref=result.repo_info.branch,
+        status="succeeded",
+        size_kb=result.repo_info.size,
+        documents=sum(len(documents) for documents in result.documents_by_language.values()),
+        chunks=len(result.split_documents),
+        questions=len(result.hypothetical_questions),
+        seconds=round(time.perf_counter() - start, 3),
     )
-    workflow: CompiledStateGraph = create_repo_to_vectordb_graph()
-    finish_state: dict[str, Any] = workflow.invoke(state)
-    result: RepositoryToVectorDBState = RepositoryToVectorDBState.model_validate(finish_state)
-    repo_info: RepositoryInfo = result.repo_info
-    logger.debug(f"repo_to_rag result: {repo_info}")
 
-    return result
 
+def ingest_repository(repo_info: "RepositoryInfo") -> "RepositoryToVectorDBState":
+    """
+    저장소 하나를 수집합니다. 같은 저장소·브랜치의 중단된 작업이 있으면 이어서 진행합니다. (repo_to_rag / 배치 수집 공용)
+
+    Args:
+        repo_info: 저장소 정보 (branch 가 있으면 저장소 정보를 다시 조회하지 않음)
+
+    Returns:
+        RepositoryToVectorDBState: 수집 결과
+
+    Raises:
+        RuntimeError: 같은 저장소·브랜치를 이미 수집 중인 경우
+    """
+    from src.llm_workflows.state import RepositoryToVectorDBState
+    from src.llm_workflows.graphs.repo_to_vectordb_graph import get_repo_to_vectordb_graph
+    from src.utils.git_repository_utils import GitHubRepositoryUtils
+    from src.utils.ingest_progress import IngestProgress
+
+    # 작업 ID 가 브랜치별이므로 기본 브랜치를 먼저 확정 (코드 로더는 이미 확정된 branch 를 그대로 사용)
+    if not repo_info.branch:
+        repo_info = GitHubRepositoryUtils.parse_repo_url(repo_info.repo_url)
+    state = RepositoryToVectorDBState(repo_info=repo_info)
+    workflow: CompiledStateGraph = get_repo_to_vectordb_graph()
+    job_id = IngestProgress.job_id(repo_info.repo_url, repo_info.branch)
+    config = {"configurable": {"thread_id": job_id}}
+    with _exclusive_job(job_id):
+        finish_state: dict[str, Any] = workflow.invoke(_ingest_input(workflow, config, state), config)
+        _finish_ingest(workflow, job_id)
+    return RepositoryToVectorDBState.model_validate(finish_state)
+
+
+async def repo_to_rag_batch(
+    repo_urls: Optional[List[str]] = None,
+    org: Optional[str] = None,
+    max_workers: Optional[int] = None,
+    ctx: Context = None,
+) -> dict:
+    """
+    Batch GITHUB Repositories ⇒ Embedding and Store in VectorDB
+    여러 저장소 또는 조직/사용자의 모든 저장소를 한 번에 수집합니다.
+    작은 저장소부터 작업자 풀에서 동시에 처리하며, 모든 작업이 GitHub 요청 한도와 OpenAI 토큰 한도를 함께 사용합니다.
+    저장소별 상태(succeeded / failed, 문서·청크 수, 처리 시간, 실패 사유)를 반환합니다.
+    클라이언트가 progressToken 을 보내면 저장소 하나가 끝날 때마다 끝난 저장소 수를 알립니다.
+
+    Parameters:
+        repo_urls: GitHub 저장소 URL 목록
+        org: GitHub 조직 또는 사용자 이름
+        max_workers: 동시에 수집할 저장소 수 (기본값 INGEST_BATCH_WORKERS)
+    """
+    from src.llm_workflows.batch_ingest import ingest_repositories
+
+    on_update = None
+    if ctx is not None:
+        loop = asyncio.get_running_loop()
+        finished: Set[str] = set()
+
+        def on_update(status: "RepoIngestStatus") -> None:
+            if status.status not in ("succeeded", "failed") or status.repo_url in finished:
+                return
+            finished.add(status.repo_url)
+            message = f"{status.repo_url}: {status.status} (청크 {status.chunks}개, {status.seconds}초)"
+            for coroutine in (ctx.report_progress(len(finished)), ctx.info(message)):
+                asyncio.run_coroutine_threadsafe(coroutine, loop).add_done_callback(_log_send_error)
+
+    # 수집은 오래 걸리므로 이벤트 루프를 막지 않도록 별도 스레드에서 실행
+    return await asyncio.to_thread(ingest_repositories, repo_urls, org, max_workers, on_update)
+
+
+@contextlib.contextmanager
+def _exclusive_job(job_id: str) -> Iterator[None]:
+    """
+    같은 작업 ID 의 수집이 진행 중이면 거부합니다.
+    두 수집이 같은 체크포인트를 이어 쓰거나, 먼저 끝난 쪽이 다른 쪽의 체크포인트와 진행 기록을 지우지 않도록 합니다.
+    """
+    with _active_jobs_lock:
+        if job_id in _active_jobs:
+            raise RuntimeError(f"이미 수집 중인 저장소입니다: {job_id}")
+        _active_jobs.add(job_id)
+    try:
+        yield
+    finally:
+        with _active_jobs_lock:
+            _active_jobs.discard(job_id)
+
+
+def _ingest_input(
+    workflow: "CompiledStateGraph", config: dict, state: "RepositoryToVectorDBState"
+) -> "Union[RepositoryToVectorDBState, None]":
+    """
+    같은 저장소의 중단된 수집 작업이 체크포인트에 남아 있으면 재개(None 입력)하고,
+    없거나 INGEST_RESUME_TTL_SECONDS 보다 오래되었으면 이전 기록을 지우고 새로 시작합니다.
+    """
+    from datetime import datetime, timezone
+    from src.utils.ingest_progress import IngestProgress, INGEST_RESUME_TTL_SECONDS
+
+    job_id = config["configurable"]["thread_id"]
+    IngestProgress().clear(job_id, expired_only=True)
+    if workflow.checkpointer is None:
+        return state
+
+    snapshot = workflow.get_state(config)
+    if snapshot.created_at is None:
+        return state
+
+    age = (datetime.now(timezone.utc) - datetime.fromisoformat(snapshot.created_at)).total_seconds()
+    if snapshot.next and age <= INGEST_RESUME_TTL_SECONDS:
+        logger.info(f"중단된 수집 작업을 재개합니다: {job_id} (다음 단계: {', '.join(snapshot.next)})")
+        return None
+
+    # 완료되었거나 오래된 체크포인트의 상태가 새 입력과 합쳐지지 않도록 삭제
+    workflow.checkpointer.delete_thread(job_id)
+    return state
+
+
+def _finish_ingest(workflow: "CompiledStateGraph", job_id: str) -> None:
+    """완료된 수집 작업의 체크포인트(저장소 전체 내용 포함)와 진행 기록을 삭제합니다."""
+    from src.utils.ingest_progress import IngestProgress
+
+    if workflow.checkpointer is not None:
+        workflow.checkpointer.delete_thread(job_id)
+    IngestProgress().clear(job_id)
 
-async def rag_to_context(query: str) -> str:
+
+async def rag_to_context(
+    query: str,
+    repo: Optional[str] = None,
+    ref: Optional[str] = None,
+    path_prefix: Optional[str] = None,
+    language: Optional[str] = None,
+    extension: Optional[str] = None,
+    token_budget: Optional[int] = None,
+    neighbors: Optional[int] = None,
+) -> "List[Document]":
     """
     Embedding Search ⇒ Generate Answer
     질문을 받아 임베딩 기반 유사성 검색을 수행하고, VectorDB에서 가장 관련성 높은 문서를 기반으로 응답을 생성합니다.
+    범위를 지정하면 해당 범위의 문서만 검색합니다. (지정한 조건은 모두 만족해야 함)
+    같은 파일의 겹치는 청크는 하나의 구간으로 합쳐지고, 점수가 높은 순서로 토큰 예산 안에 들어가는 문서만 반환합니다.
+    neighbors 를 지정하면 결과 청크마다 import 대상, 사용하는 정의, 호출하는 쪽, 같은 파일의 앞뒤 청크 중
+    관련도가 높은 청크를 남은 토큰 예산 안에서 함께 반환합니다. (metadata.retrieved_from 이 neighbor_graph, relation 에 관계)
+
+    Parameters:
+        query: 질문
+        repo: 저장소 URL 또는 owner/name
+        ref: 브랜치 또는 커밋 참조
+        path_prefix: 디렉토리 또는 파일 경로 (예: src/utils)
+        language: 언어 (예: PYTHON, MARKDOWN)
+        extension: 파일 확장자 (예: py)
+        token_budget: 반환할 컨텍스트의 최대 토큰 수 (기본값 CONTEXT_TOKEN_BUDGET, 0 이면 제한 없음)
+        neighbors: 결과 청크마다 함께 반환할 이웃 청크 수 (기본값 CONTEXT_NEIGHBORS, 0 이면 확장하지 않음)
     """
-    state = RagToContextState(query=query)
-    workflow: CompiledStateGraph = create_rag_to_context_graph()
-    finish_state: dict[str, Any] = workflow.invoke(state)
-    result: RagToContextState = RagToContextState.model_validate(finish_state)
+    from src.llm_workflows.state import RagToContextState
+    from src.llm_workflows.graphs.rag_to_context_graph import get_rag_to_context_graph
+    from src.models.search_scope import SearchScope
+
+    scope = SearchScope(repo=repo, ref=ref, path_prefix=path_prefix, language=language, extension=extension)
+    state = RagToContextState(query=query, scope=scope, token_budget=token_budget, neighbors=neighbors)
+    workflow: CompiledStateGraph = get_rag_to_context_graph()
+    # 그래프 실행은 블로킹이므로 스레드에서 실행 (다른 요청과 진행 중인 수집이 이벤트 루프를 기다리지 않도록)
+    with metrics.timer("query", tool="rag_to_context"):
+        finish_state: dict[str, Any] = await asyncio.to_thread(workflow.invoke, state)
+    result = RagToContextState.model_validate(finish_state)
     retrieved_documents: List[Document] = result.retrieved_documents
-    for i, result in enumerate(retrieved_documents):
-        logger.debug(f"{i+1}번째 문서: \n내용 :\n{result.page_content[:100]}\n참조 경로:\n{result.metadata.get('path')}")
+    for i, document in enumerate(retrieved_documents):
+        logger.debug(f"{i+1}번째 문서: \n내용 :\n{document.page_content[:100]}\n참조 경로:\n{document.metadata.get('path')}")
+
+    return retrieved_documents
+
+
+async def rag_to_context_batch(
+    queries: List[str],
+    repo: Optional[str] = None,
+    ref: Optional[str] = None,
+    path_prefix: Optional[str] = None,
+    language: Optional[str] = None,
+    extension: Optional[str] = None,
+    token_budget: Optional[int] = None,
+    neighbors: Optional[int] = None,
+) -> "List[List[Document]]":
+    """
+    Batch Embedding Search ⇒ Per-query Context
+    여러 질문을 한 번에 받아 한 번의 임베딩 요청과 컬렉션별 한 번의 다중 벡터 검색으로 처리하고,
+    질문 순서대로 관련 문서 목록을 반환합니다. 연관된 질문을 여러 개 보낼 때 rag_to_context 를 반복 호출하는 것보다 빠릅니다.
+
+    Parameters:
+        queries: 질문 목록
+        repo, ref, path_prefix, language, extension: 모든 질문에 적용할 검색 범위 (rag_to_context 와 같음)
+        token_budget: 질문별 컨텍스트의 최대 토큰 수 (rag_to_context 와 같음)
+        neighbors: 결과 청크마다 함께 반환할 이웃 청크 수 (rag_to_context 와 같음)
+    """
+    from src.llm_workflows.state import RagToContextBatchState
+    from src.llm_workflows.graphs.rag_to_context_graph import get_rag_to_context_batch_graph
+    from src.models.search_scope import SearchScope
+
+    scope = SearchScope(repo=repo, ref=ref, path_prefix=path_prefix, language=language, extension=extension)
+    state = RagToContextBatchState(queries=queries, scope=scope, token_budget=token_budget, neighbors=neighbors)
+    workflow: CompiledStateGraph = get_rag_to_context_batch_graph()
+    # 그래프 실행은 블로킹이므로 스레드에서 실행 (다른 요청과 진행 중인 수집이 이벤트 루프를 기다리지 않도록)
+    with metrics.timer("query", tool="rag_to_context_batch"):
+        finish_state: dict[str, Any] = await asyncio.to_thread(workflow.invoke, state)
+    metrics.inc("batch_queries_total", len(queries))
+    result = RagToContextBatchState.model_validate(finish_state)
+    for query, documents in zip(result.queries, result.retrieved_documents):
+        logger.debug(f"'{query}' 검색 결과: {len(documents)}개 문서")
+
+    return result.retrieved_documents
+
+
+async def compact_vectordb() -> dict:
+    """
+    VectorDB Maintenance ⇒ Dedup and Compact
+    ID 없이 중복 저장된 코드 청크와 가설 질문을 하나만 남기고 삭제한 뒤, 저장소 파일을 압축합니다.
+    재수집을 반복해 컬렉션이 비대해졌을 때 한 번 실행하면 됩니다.
+    """
+    from src.utils.chroma_utils import ChromaUtils
+
+    chroma_utils = ChromaUtils()
+    report = {}
+    for collection_name, vectorstore in (
+        ("code_documents", chroma_utils.get_code_documents_vectorstore()),
+        ("hypothetical_questions", chroma_utils.get_hypothetical_questions_vectorstore()),
+    ):
+        removed = ChromaUtils.dedup_collection(vectorstore)
+        ChromaUtils.compact(vectorstore, collection_name)
+        report[collection_name] = {"removed_duplicates": removed}
+        logger.info(f"{collection_name} 중복 제거 및 압축 완료: {removed}개 삭제")
+
+    return report
+
+
+async def get_metrics() -> dict:
+    """
+    Server Statistics
+    그래프 노드별 실행 시간, GitHub 요청 수/바이트, 필터링된 파일 수, 청크 수, 임베딩 토큰, LLM 호출, 캐시 적중률,
+    질의 지연 시간 분포를 반환합니다. METRICS_ENABLED=true 일 때만 수집됩니다.
+    """
+    return metrics.snapshot()
+
+
+def warm_up() -> None:
+    """
+    무거운 모듈 import, 그래프 컴파일, 벡터 저장소/블롭 저장소 클라이언트 생성을 미리 수행합니다.
+    서버 시작 후 백그라운드 스레드에서 호출하면 첫 도구 호출의 지연 시간이 줄어듭니다.
+    """
+    from src.llm_workflows.graphs.repo_to_vectordb_graph import get_repo_to_vectordb_graph
+    from src.llm_workflows.graphs.rag_to_context_graph import get_rag_to_context_graph, get_rag_to_context_batch_graph
+    from src.utils.chroma_utils import ChromaUtils
+    from src.utils.blob_store import BlobStore
+    from src.utils.ingest_progress import IngestProgress
 
-    return result
+    get_repo_to_vectordb_graph()
+    get_rag_to_context_graph()
+    get_rag_to_context_batch_graph()
+    ChromaUtils()
+    BlobStore()
+    IngestProgress()
     
     
 async def test_repo_to_rag():
@@ -64,6 +394,5 @@ async def test_rag_to_context():
     result = await rag_to_context(query)
 
 if __name__ == "__main__":
-    import asyncio
     asyncio.run(test_repo_to_rag())
     asyncio.run(test_rag_to_context())
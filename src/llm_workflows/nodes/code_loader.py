@@ -1,9 +1,11 @@
 from src.llm_workflows.state import RepositoryToVectorDBState
+from src.utils import download_spool
 from src.utils.git_repository_utils import GitHubRepositoryUtils
 from src.models.git_repository import ParsedCode
 from src.config.log_config import Logger
 from src.llm_workflows.adapters.blob import GitHubBlobLoader
 from src.llm_workflows.adapters.parser import MultiLanguageParser
+from src.utils.language_registry import UNKNOWN_LANGUAGE
 from typing import List, Dict, Any, Optional
 from collections import defaultdict
 from langchain_community.document_loaders.generic import GenericLoader
@@ -11,57 +13,26 @@ from langchain_community.document_loaders.parsers import LanguageParser
 
 logger = Logger()
 
-# 전역 상수 
-EXTENSION_LANGUAGE_MAP = {
-    'py': 'PYTHON',
-    'js': 'JS',
-    'jsx': 'JS',
-    'mjs': 'JS',
-    'ts': 'TS',
-    'tsx': 'TS',
-    'java': 'JAVA',
-    'cpp': 'CPP',
-    'hpp': 'CPP',
-    'cc': 'CPP',
-    'h': 'C',
-    'cxx': 'CPP',
-    'hxx': 'CPP',
-    'go': 'GO',
-    'rb': 'RUBY',
-    'rake': 'RUBY',
-    'gemspec': 'RUBY',
-    'rs': 'RUST',
-    'php': 'PHP',
-    'proto': 'PROTO',
-    'rst': 'RST',
-    'scala': 'SCALA',
-    'md': 'MARKDOWN',
-    'markdown': 'MARKDOWN',
-    'tex': 'LATEX',
-    'html': 'HTML',
-    'htm': 'HTML',
-    'sol': 'SOL',
-    'cs': 'CSHARP',
-    'cob': 'COBOL',
-    'cbl': 'COBOL',
-    'c': 'C',
-    'lua': 'LUA',
-    'pl': 'PERL',
-    'pm': 'PERL',
-    'ex': 'ELIXIR',
-    'exs': 'ELIXIR',
-    '': 'UNKNOWN'  # 빈 확장자에 대한 처리 추가
-}
 
 def repo_to_documents(state: RepositoryToVectorDBState) -> RepositoryToVectorDBState:
     """저장소 컨텐츠를 Document 객체로 변환하는 노드"""
-    parsed_code_list: List[ParsedCode] = GitHubRepositoryUtils.fetch_repo_contents(state.repo_info.repo_url)
-    documents: Dict[str, List] = load_documents(parsed_code_list)
+    # 기본 브랜치를 state 에 기록해 두어야 이후 단계에서 청크 ID와 이전 청크 정리에 사용할 수 있음
+    # (배치 수집처럼 저장소 목록을 조회하며 이미 알아낸 경우에는 다시 요청하지 않음)
+    if not state.repo_info.branch:
+        state.repo_info = GitHubRepositoryUtils.parse_repo_url(state.repo_info.repo_url)
+    parsed_code_list: List[ParsedCode] = GitHubRepositoryUtils.fetch_repo_contents(
+        state.repo_info.repo_url, repo_info=state.repo_info
+    )
+    try:
+        documents: Dict[str, List] = load_documents(parsed_code_list, state.failures)
+    finally:
+        for parsed_code in parsed_code_list:
+            download_spool.remove(parsed_code.spool_path)
     state.documents_by_language = documents
     return state
     
 
-def load_documents(processed_files: List[ParsedCode]) -> Dict[str, List]:
+def load_documents(processed_files: List[ParsedCode], failures: Optional[List[str]] = None) -> Dict[str, List]:
     """
     처리된 파일 목록을 받아 파일확장자별로 LangChain Document 객체로 변환합니다.
     
@@ -77,6 +48,7 @@ def load_documents(processed_files: List[ParsedCode]) -> Dict[str, List]:
                 'repo_url': repo_url
             }
         }   
+        failures: 로드 실패를 기록할 목록 (실패하면 일부 문서만 반환되므로 이전 문서 정리를 건너뛰는 데 사용)
         
     Returns:
         파일확장자별로 LangChain Document 객체로 변환된 목록
@@ -84,27 +56,32 @@ def load_documents(processed_files: List[ParsedCode]) -> Dict[str, List]:
     documents_by_language = defaultdict(list)
 
     try:
-        blob_loader = GitHubBlobLoader(processed_files)
+        blob_loader = GitHubBlobLoader(processed_files, failures)
         parser = MultiLanguageParser()
         loader = GenericLoader(
             blob_loader=blob_loader,
             blob_parser=parser
         )
         documents = loader.load()
-        logger.debug(f"총 문서 개수: {len(documents)}")
+        logger.debug("총 문서 개수: %d", len(documents))
 
         for document in documents:
-            extension = document.metadata.get("extension")
-            lang = EXTENSION_LANGUAGE_MAP.get(extension, "UNKNOWN")
+            # 언어는 blob 로더가 파일 이름 / 확장자 / shebang 으로 판별해 둠 (language_registry)
+            lang = document.metadata.get("language") or UNKNOWN_LANGUAGE
+            document.metadata["language"] = lang
             documents_by_language[lang].append(document)
         
-        for lang, documents in documents_by_language.items():
-            logger.debug(f"{lang} 언어 문서 개수: {len(documents)}")
-            for document in documents:
-                logger.debug(f"문서 내용: {document.page_content[:100]}")
-                logger.debug(f"문서 메타데이터: {document.metadata}")
+        if logger.debug_enabled:
+            for lang, documents in documents_by_language.items():
+                logger.debug("%s 언어 문서 개수: %d", lang, len(documents))
+                for document in documents:
+                    # 문서마다 기록하면 큰 저장소에서 로그 비용이 커지므로 일부만 기록
+                    if logger.sample("load_documents.document"):
+                        logger.debug("문서 샘플: %r", document.page_content[:100], **document.metadata)
 
     except Exception as e:
         logger.error(f"문서 로드 중 오류 발생: {str(e)}")
+        if failures is not None:
+            failures.append(f"load: {e}")
         
     return documents_by_language
\ No newline at end of file
@@ -1,68 +1,20 @@
-from langchain_text_splitters import (
-    RecursiveCharacterTextSplitter,
-    Language
-)
+import hashlib
+from typing import List
+from langchain_core.documents import Document
+from langchain_text_splitters import RecursiveCharacterTextSplitter
 from src.llm_workflows.state import RepositoryToVectorDBState
+from src.utils.blob_store import BlobStore
+from src.utils.chroma_utils import ChromaUtils
+from src.utils.language_registry import get_splitter
+from src.utils.progress import report_progress
+from src.utils.syntax_chunker import CHUNKING_MODE, split_by_syntax
+from src.utils.token_utils import CHUNK_LENGTH_UNIT
 
 from src.config.log_config import Logger
+from src.config.metrics_config import Metrics
 
 logger = Logger()
-DEFAULT_CHUNK_SIZE: int = 1000
-DEFAULT_CHUNK_OVERLAP: int = 200
-        
-# 언어별 청크 크기 및 중복 설정
-LANGUAGE_SPECIFIC_CHUNKS: dict = {
-    # 복잡한 문법 구조를 가진 언어들
-    'JAVA': {'chunk_size': 1500, 'chunk_overlap': 300},
-    'CPP': {'chunk_size': 1500, 'chunk_overlap': 300},
-    'CSHARP': {'chunk_size': 1500, 'chunk_overlap': 300},
-    'GO': {'chunk_size': 1500, 'chunk_overlap': 300},
-    'RUST': {'chunk_size': 1500, 'chunk_overlap': 300},
-    
-    # 스크립트 언어들
-    'PYTHON': {'chunk_size': 1000, 'chunk_overlap': 200},
-    'JS': {'chunk_size': 1000, 'chunk_overlap': 200},
-    'TS': {'chunk_size': 1000, 'chunk_overlap': 200},
-    'RUBY': {'chunk_size': 1000, 'chunk_overlap': 200},
-    'PHP': {'chunk_size': 1000, 'chunk_overlap': 200},
-    'PERL': {'chunk_size': 1000, 'chunk_overlap': 200},
-    
-    # 마크업/문서 언어들
-    'HTML': {'chunk_size': 800, 'chunk_overlap': 150},
-    'MARKDOWN': {'chunk_size': 800, 'chunk_overlap': 150},
-    'RST': {'chunk_size': 800, 'chunk_overlap': 150},
-    'LATEX': {'chunk_size': 800, 'chunk_overlap': 150},
-    
-    # 기타 언어들
-    'PROTO': {'chunk_size': 600, 'chunk_overlap': 100}  # 프로토콜 정의도 비교적 작은 단위
-}
-        
-# 언어별 파서 매핑
-LANGUAGE_PARSERS: dict = {
-    'PYTHON': Language.PYTHON,
-    'JS': Language.JS,
-    'TS': Language.TS,
-    'JAVA': Language.JAVA,
-    'CPP': Language.CPP,
-    'GO': Language.GO,
-    'RUBY': Language.RUBY,
-    'RUST': Language.RUST,
-    'PHP': Language.PHP,
-    'PROTO': Language.PROTO,
-    'RST': Language.RST,
-    'SCALA': Language.SCALA,
-    'MARKDOWN': Language.MARKDOWN,
-    'LATEX': Language.LATEX,
-    'HTML': Language.HTML,
-    'SOL': Language.SOL,
-    'CSHARP': Language.CSHARP,
-    'COBOL': Language.COBOL,
-    'C': Language.C,
-    'LUA': Language.LUA,
-    'PERL': Language.PERL, # 현재 지원 안함
-    'ELIXIR': Language.ELIXIR
-}
-
+metrics = Metrics()
 
 def split_documents(state: RepositoryToVectorDBState) -> RepositoryToVectorDBState:
     """
@@ -79,63 +31,75 @@ def split_documents(state: RepositoryToVectorDBState) -> RepositoryToVectorDBSta
     for language, documents in state.documents_by_language.items():
 
         try:
-            splitter = _create_language_splitter(language)
-            split_docs = splitter.split_documents(documents)
+            splitter = get_splitter(language)
+            split_docs = _split_with_cache(splitter, language, documents)
+            for split_doc in split_docs:
+                split_doc.metadata["chunk_id"] = ChromaUtils.chunk_id(split_doc)
             
+            metrics.inc("chunks_total", len(split_docs), language=language)
             logger.info(f"{language}: {len(documents)}개 문서를 {len(split_docs)}개로 분할 완료")
             all_split_documents = all_split_documents + split_docs
             
         except Exception as e:
             logger.error(f"{language} 문서 분할 중 오류 발생: {str(e)}", exc_info=True)
+            state.failures.append(f"split {language}: {e}")
             continue
     
     logger.info(f"총 {len(all_split_documents)}개의 분할된 문서 생성 완료")
+    report_progress("split", len(all_split_documents), len(all_split_documents))
     state.split_documents = all_split_documents
     return state
-def _get_language_specific_params(language: str) -> tuple[int, int]:
-    """
-    언어별 특화된 청크 크기와 중복 값을 반환합니다.
-    
-    Args:
-        language: 프로그래밍 언어
-        
-    Returns:
-        tuple[int, int]: (chunk_size, chunk_overlap)
-    """
-    if language in LANGUAGE_SPECIFIC_CHUNKS:
-        params = LANGUAGE_SPECIFIC_CHUNKS[language]
-        return params['chunk_size'], params['chunk_overlap']
-    return DEFAULT_CHUNK_SIZE, DEFAULT_CHUNK_OVERLAP
 
-def _create_language_splitter(language: str) -> RecursiveCharacterTextSplitter:
+
+def _split_with_cache(splitter: RecursiveCharacterTextSplitter, language: str, documents: List[Document]) -> List[Document]:
     """
-    언어별 TextSplitter를 생성합니다.
-    
+    문서별 분할 결과를 블롭 저장소에 캐시하며 분할합니다.
+    캐시 키는 분할 설정과 문서 내용 해시이므로 다른 저장소/브랜치의 같은 내용도 재사용됩니다.
+    CHUNKING_MODE=syntax 이면 정의 경계로 나누고, 구문 분석을 지원하지 않는 언어/문서는 splitter 로 나눕니다.
+
     Args:
+        splitter: 언어별 텍스트 분할기
         language: 프로그래밍 언어
-        
+        documents: 분할할 문서 목록
+
     Returns:
-        RecursiveCharacterTextSplitter: 해당 언어에 맞는 텍스트 분할기
+        List[Document]: 분할된 문서 목록
     """
-    try:
-        chunk_size, chunk_overlap = _get_language_specific_params(language)
-        
-        if language in LANGUAGE_PARSERS:
-            logger.info(f"{language} 언어용 분할기 생성 (chunk_size: {chunk_size}, overlap: {chunk_overlap})")
-            return RecursiveCharacterTextSplitter.from_language(
-                language=LANGUAGE_PARSERS[language],
-                chunk_size=chunk_size,
-                chunk_overlap=chunk_overlap
-            )
-        else:
-            logger.warning(f"{language}는 지원되지 않는 언어입니다. 기본 분할기를 사용합니다.")
-            return RecursiveCharacterTextSplitter(
-                chunk_size=DEFAULT_CHUNK_SIZE,
-                chunk_overlap=DEFAULT_CHUNK_OVERLAP
-            )
-    except Exception as e:
-        logger.error(f"{language} 분할기 생성 중 오류 발생: {str(e)}")
-        return RecursiveCharacterTextSplitter(
-            chunk_size=DEFAULT_CHUNK_SIZE,
-            chunk_overlap=DEFAULT_CHUNK_OVERLAP
-        )
\ No newline at end of file
+    blob_store = BlobStore()
+    split_docs: List[Document] = []
+    cache_hits = 0
+
+    for document in documents:
+        content_hash = hashlib.sha256(document.page_content.encode("utf-8")).hexdigest()
+        cache_key = f"split:{language}:{splitter._chunk_size}:{splitter._chunk_overlap}:{content_hash}"
+        if CHUNK_LENGTH_UNIT == "tokens":
+            cache_key = f"tokens-{cache_key}"
+        if CHUNKING_MODE == "syntax":
+            cache_key = f"{CHUNKING_MODE}-{cache_key}"
+        cached = blob_store.get_derived(cache_key)
+
+        if cached is not None:
+            cache_hits += 1
+            for chunk in cached:
+                metadata = {**document.metadata, "start_index": chunk["start_index"]}
+                if "symbols" in chunk:
+                    metadata["symbols"] = chunk["symbols"]
+                split_docs.append(Document(page_content=chunk["page_content"], metadata=metadata))
+            continue
+
+        chunks = split_by_syntax(document, language, splitter) if CHUNKING_MODE == "syntax" else None
+        if chunks is None:
+            chunks = splitter.split_documents([document])
+        blob_store.put_derived(cache_key, [
+            {
+                "page_content": chunk.page_content,
+                "start_index": chunk.metadata.get("start_index", -1),
+                **({"symbols": chunk.metadata["symbols"]} if "symbols" in chunk.metadata else {}),
+            }
+            for chunk in chunks
+        ])
+        split_docs.extend(chunks)
+
+    if cache_hits:
+        logger.debug(f"{language}: 분할 캐시 적중 {cache_hits}/{len(documents)}개 문서")
+    return split_docs
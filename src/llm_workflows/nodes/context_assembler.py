@@ -0,0 +1,184 @@
+import os
+from typing import Dict, List, Optional, Tuple
+from langchain_core.documents import Document
+from src.llm_workflows.state import RagToContextState, RagToContextBatchState
+from src.config.log_config import Logger
+from src.config.metrics_config import Metrics
+from src.utils.token_utils import count_tokens, truncate_to_tokens
+
+logger = Logger()
+metrics = Metrics()
+
+# 쿼리별 컨텍스트 토큰 예산 기본값 (도구 호출 시 token_budget 으로 지정 가능, 0 이하이면 제한 없음)
+CONTEXT_TOKEN_BUDGET: int = int(os.getenv("CONTEXT_TOKEN_BUDGET", "4000"))
+
+
+def assemble_context(state: RagToContextState) -> RagToContextState:
+    """
+    검색 결과를 LLM 에 전달할 컨텍스트로 정리합니다.
+    같은 파일의 겹치거나 이어지는 청크를 하나의 구간으로 합치고, 코드 결과와 중복되는 가설 질문 결과를 제외한 뒤
+    점수가 높은 순서로 토큰 예산 안에 들어가는 만큼만 남깁니다.
+    이웃 확장으로 붙은 청크는 검색 결과를 모두 담은 뒤 남은 예산 안에서만 뒤에 붙입니다.
+    """
+    budget = _resolve_budget(state.token_budget)
+    state.retrieved_documents = _assemble(state.retrieved_documents, budget)
+    return state
+
+
+def assemble_context_batch(state: RagToContextBatchState) -> RagToContextBatchState:
+    """쿼리별 검색 결과를 각각 assemble_context 와 같은 방식으로 정리합니다. (토큰 예산은 쿼리마다 적용)"""
+    budget = _resolve_budget(state.token_budget)
+    state.retrieved_documents = [_assemble(documents, budget) for documents in state.retrieved_documents]
+    return state
+
+
+def _resolve_budget(token_budget: Optional[int]) -> Optional[int]:
+    budget = CONTEXT_TOKEN_BUDGET if token_budget is None else token_budget
+    return budget if budget > 0 else None
+
+
+def _score(document: Document) -> float:
+    return document.metadata.get("score", 0.0)
+
+
+def _file_key(document: Document) -> Tuple[str, str, str]:
+    metadata = document.metadata
+    return (
+        metadata.get("repo_url", ""),
+        metadata.get("ref", ""),
+        metadata.get("file_path") or f"{metadata.get('path', '')}/{metadata.get('filename', '')}",
+    )
+
+
+def _is_question(document: Document) -> bool:
+    return document.metadata.get("retrieved_from") == "hypothetical_questions"
+
+
+def _is_neighbor(document: Document) -> bool:
+    return document.metadata.get("retrieved_from") == "neighbor_graph"
+
+
+def _merge_spans(documents: List[Document]) -> List[Document]:
+    """
+    같은 파일의 청크를 시작 위치 순으로 정렬해 겹치거나 맞닿은 청크를 하나의 연속 구간으로 합칩니다.
+    합친 구간의 점수는 포함된 청크 중 가장 높은 점수이며, 시작 위치를 모르는 청크(start_index < 0)는 합치지 않습니다.
+
+    Args:
+        documents: 코드 검색 결과 (metadata 에 score, start_index 포함)
+
+    Returns:
+        List[Document]: 합친 구간 목록 (metadata 에 end_index, merged_chunks 추가)
+    """
+    by_file: Dict[Tuple[str, str, str], List[Document]] = {}
+    for document in documents:
+        by_file.setdefault(_file_key(document), []).append(document)
+
+    spans: List[Document] = []
+    for chunks in by_file.values():
+        current: Optional[Document] = None
+        for chunk in sorted(chunks, key=lambda doc: doc.metadata.get("start_index", -1)):
+            start = chunk.metadata.get("start_index", -1)
+            end = start + len(chunk.page_content)
+            if start < 0:
+                spans.append(chunk)
+                continue
+
+            if current is not None and start <= current.metadata["end_index"]:
+                current_end = current.metadata["end_index"]
+                if end > current_end:
+                    current.page_content += chunk.page_content[current_end - start:]
+                    current.metadata["end_index"] = end
+                current.metadata["score"] = max(_score(current), _score(chunk))
+                current.metadata["merged_chunks"] += 1
+                current.metadata["chunk_ids"].append(chunk.metadata.get("chunk_id"))
+                continue
+
+            current = Document(
+                id=chunk.id,
+                page_content=chunk.page_content,
+                metadata={**chunk.metadata, "end_index": end, "merged_chunks": 1,
+                          "chunk_ids": [chunk.metadata.get("chunk_id")]},
+            )
+            spans.append(current)
+    return spans
+
+
+def _fit_budget(documents: List[Document], budget: Optional[int], truncate: bool = True) -> Tuple[List[Document], int]:
+    """
+    점수가 높은 순서로 토큰 예산 안에 들어가는 문서만 남깁니다.
+    들어가지 않는 문서는 건너뛰고 더 작은 다음 문서를 시도하며, 가장 점수가 높은 문서조차 예산을 넘으면 예산에 맞춰 자릅니다.
+
+    Returns:
+        Tuple[List[Document], int]: (남긴 문서, 사용한 토큰 수, 예산이 없으면 0)
+    """
+    ranked = sorted(documents, key=_score, reverse=True)
+    if budget is None or not ranked:
+        return ranked, 0
+
+    selected: List[Document] = []
+    used = 0
+    for document in ranked:
+        tokens = count_tokens(document.page_content)
+        if used + tokens <= budget:
+            selected.append(document)
+            used += tokens
+
+    if not selected and truncate:
+        top = ranked[0]
+        selected.append(Document(id=top.id, page_content=truncate_to_tokens(top.page_content, budget),
+                                 metadata={**top.metadata, "truncated": True}))
+        used = count_tokens(selected[0].page_content)
+    return selected, used
+
+
+def _assemble(documents: List[Document], budget: Optional[int]) -> List[Document]:
+    """
+    Args:
+        documents: 한 쿼리의 검색 결과 (코드 문서 + 가설 질문 문서 + 이웃 청크)
+        budget: 토큰 예산 (None 이면 제한 없음)
+
+    Returns:
+        List[Document]: 점수 순으로 정렬된 컨텍스트 문서 (이웃 청크는 그 뒤에 점수 순)
+    """
+    if not documents:
+        return []
+
+    code_documents: Dict[str, Document] = {}
+    questions: Dict[str, Document] = {}
+    neighbors: Dict[str, Document] = {}
+    for document in documents:
+        if _is_neighbor(document):
+            neighbors[document.id or document.metadata.get("chunk_id") or document.page_content] = document
+        elif _is_question(document):
+            # 같은 청크에서 만든 질문이 여러 개 검색되면 점수가 가장 높은 질문만 유지
+            key = document.metadata.get("chunk_id") or document.page_content
+            if key not in questions or _score(document) > _score(questions[key]):
+                questions[key] = document
+        else:
+            # 첫 검색과 가설 질문 기반 재검색에서 같은 청크가 나올 수 있음
+            key = document.id or document.metadata.get("chunk_id") or document.page_content
+            if key not in code_documents or _score(document) > _score(code_documents[key]):
+                code_documents[key] = document
+
+    spans = _merge_spans(list(code_documents.values()))
+    covered = {chunk_id for span in spans for chunk_id in span.metadata.get("chunk_ids", [span.metadata.get("chunk_id")])}
+    remaining_questions = [question for key, question in questions.items() if key not in covered]
+
+    context, used = _fit_budget(spans + remaining_questions, budget)
+
+    neighbor_context: List[Document] = []
+    remaining_neighbors = [document for key, document in neighbors.items() if key not in covered]
+    if remaining_neighbors and (budget is None or used < budget):
+        # 이웃끼리 이어지는 청크는 합치되 검색 결과 구간과는 합치지 않음 (검색 결과가 예산에서 밀려나지 않도록)
+        neighbor_context, neighbor_tokens = _fit_budget(
+            _merge_spans(remaining_neighbors), None if budget is None else budget - used, truncate=False
+        )
+        used += neighbor_tokens
+
+    if budget is not None:
+        metrics.observe("context_tokens", used)
+    logger.debug(
+        f"컨텍스트 정리: {len(documents)}개 문서 → 구간 {len(spans)}개 + 가설 질문 {len(remaining_questions)}개 "
+        f"+ 이웃 {len(remaining_neighbors)}개 → {len(context)}개 + 이웃 {len(neighbor_context)}개 (예산 {budget} 토큰)"
+    )
+    return context + neighbor_context
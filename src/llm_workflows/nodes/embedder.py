@@ -1,26 +1,213 @@
-from langchain_openai import OpenAIEmbeddings
-from langchain_chroma import Chroma
+import contextlib
+import os
+from typing import Dict, List, Optional, Tuple
+from langchain_core.documents import Document
+from langchain_core.vectorstores import VectorStore
 from src.llm_workflows.state import RepositoryToVectorDBState
+from src.models.git_repository import RepositoryInfo
 from src.config.log_config import Logger
 from src.utils.chroma_utils import ChromaUtils
+from src.utils.ingest_progress import IngestProgress
+from src.utils.progress import report_progress
+from src.utils.rate_budget import get_openai_budget
+from src.utils.token_utils import batch_by_tokens
 
 logger = Logger()
 
+# 진행 기록 단위 (문서 수)
+EMBED_BATCH_SIZE: int = 500
+# 배치당 최대 임베딩 입력 토큰 수 (OpenAI 임베딩 요청 한도 300k 토큰 이하, 0 이면 문서 수로만 나눔)
+EMBED_BATCH_TOKENS: int = int(os.getenv("EMBED_BATCH_TOKENS", "200000"))
+# 저장할 문서가 이 수 이상이면 대량 적재 모드로 더 큰 배치씩 저장 (0 이면 사용 안 함)
+BULK_LOAD_MIN_DOCUMENTS: int = int(os.getenv("BULK_LOAD_MIN_DOCUMENTS", "2000"))
+EMBED_BULK_BATCH_SIZE: int = int(os.getenv("EMBED_BULK_BATCH_SIZE", "2000"))
+
+
+def add_code_documents(state: RepositoryToVectorDBState) -> RepositoryToVectorDBState:
+    """
+    코드 청크를 가설 질문보다 먼저 벡터 저장소에 upsert 합니다.
+    가설 질문 생성(가장 오래 걸리는 단계)이 끝나기 전에도 코드 청크는 검색할 수 있습니다.
+    로드/분할에 실패한 항목이 있으면 이전 청크는 삭제하지 않습니다.
+    실패 없이 청크가 하나도 나오지 않았으면(모든 파일이 삭제/제외됨) 저장소/참조의 이전 청크를 모두 삭제합니다.
+    """
+    try:
+        code_ids = upsert_code_documents(state) if state.split_documents else []
+        removed_code, _ = _delete_stale_unless_failed(state, code_ids, None)
+        logger.info(f"벡터 DB에 코드 청크 upsert 완료: {len(code_ids)}개 (이전 문서 삭제: {removed_code}개)")
+        state.code_indexed = True
+        return state
+
+    except Exception as e:
+        logger.error(f"코드 청크 추가 중 오류 발생: {e}")
+        raise
+
+
 def add_documents(state: RepositoryToVectorDBState) -> RepositoryToVectorDBState:
-    """문서들을 벡터 저장소에 추가합니다."""
+    """
+    문서들을 고정 ID로 벡터 저장소에 upsert 합니다. (add_code_documents 가 먼저 실행됐으면 가설 질문만 저장)
+    같은 저장소를 다시 수집하면 기존 청크를 덮어쓰고, 이번 수집에 없는 이전 청크는 삭제합니다. (로드/분할 실패가 있으면 삭제하지 않음)
+    실패 없이 청크가 하나도 나오지 않았으면 저장소/참조의 이전 문서를 모두 삭제합니다.
+    EMBED_BATCH_SIZE 개(또는 EMBED_BATCH_TOKENS 토큰)마다 진행 기록을 남겨 재시도 시 이미 저장한 문서는 다시 임베딩하지 않습니다.
+    문서가 BULK_LOAD_MIN_DOCUMENTS 개 이상이면 대량 적재 모드로 저장한 뒤 인덱스를 한 번에 정리합니다.
+    """
     try:
         if state.split_documents:
-            code_documents_vectorstore = ChromaUtils().get_code_documents_vectorstore()
-            code_documents_vectorstore.add_documents(state.split_documents)
-
-            hypothetical_questions_vectorstore = ChromaUtils().get_hypothetical_questions_vectorstore()
-            hypothetical_questions_vectorstore.add_documents(state.hypothetical_questions)
+            code_ids = None if state.code_indexed else upsert_code_documents(state)
+            question_ids = upsert_question_documents(state)
+        else:
+            code_ids = None if state.code_indexed else []
+            question_ids = []
+        removed_code, removed_questions = _delete_stale_unless_failed(state, code_ids, question_ids)
 
-            logger.info(f"벡터 DB에 문서 추가 완료: {len(state.split_documents)}개")
-            
+        if code_ids is None:
+            logger.info(
+                f"벡터 DB에 가설 질문 upsert 완료: {len(question_ids)}개 (이전 문서 삭제: {removed_questions}개)"
+            )
+        else:
+            logger.info(
+                f"벡터 DB에 문서 upsert 완료: 코드 {len(code_ids)}개, 가설 질문 {len(question_ids)}개 "
+                f"(이전 문서 삭제: 코드 {removed_code}개, 가설 질문 {removed_questions}개)"
+            )
 
         return state
 
     except Exception as e:
         logger.error(f"문서 추가 중 오류 발생: {e}")
-        raise
\ No newline at end of file
+        raise
+
+
+def upsert_documents(state: RepositoryToVectorDBState) -> Tuple[List[str], List[str]]:
+    """
+    코드 청크와 가설 질문을 upsert 만 합니다. (이전 청크는 삭제하지 않음)
+    저장소를 여러 샤드로 나눠 수집할 때 각 샤드가 사용하고, 이전 청크 정리는 모든 샤드가 끝난 뒤 한 번 합니다.
+
+    Args:
+        state: 분할 문서와 가설 질문이 채워진 상태
+
+    Returns:
+        Tuple[List[str], List[str]]: (코드 청크 ID 목록, 가설 질문 ID 목록)
+    """
+    return upsert_code_documents(state), upsert_question_documents(state)
+
+
+def upsert_code_documents(state: RepositoryToVectorDBState) -> List[str]:
+    """
+    코드 청크만 upsert 합니다.
+
+    Returns:
+        List[str]: 코드 청크 ID 목록
+    """
+    return _upsert_in_batches(
+        IngestProgress.job_id(state.repo_info.repo_url, state.repo_info.branch),
+        "embed_code",
+        ChromaUtils().get_code_documents_vectorstore(),
+        state.split_documents,
+        [doc.metadata.get("chunk_id") or ChromaUtils.chunk_id(doc) for doc in state.split_documents]
+    )
+
+
+def upsert_question_documents(state: RepositoryToVectorDBState) -> List[str]:
+    """
+    가설 질문만 upsert 합니다.
+
+    Returns:
+        List[str]: 가설 질문 ID 목록
+    """
+    return _upsert_in_batches(
+        IngestProgress.job_id(state.repo_info.repo_url, state.repo_info.branch),
+        "embed_questions",
+        ChromaUtils().get_hypothetical_questions_vectorstore(),
+        state.hypothetical_questions,
+        [ChromaUtils.question_id(doc) for doc in state.hypothetical_questions]
+    )
+
+
+def delete_stale_documents(
+    repo_info: RepositoryInfo, code_ids: Optional[List[str]], question_ids: Optional[List[str]]
+) -> Tuple[int, int]:
+    """
+    저장소/브랜치의 문서 중 이번 수집에 없는 코드 청크와 가설 질문을 삭제합니다.
+
+    Args:
+        repo_info: 저장소 정보 (repo_url, branch)
+        code_ids: 이번 수집의 코드 청크 ID 전체 (None 이면 코드 청크는 정리하지 않음)
+        question_ids: 이번 수집의 가설 질문 ID 전체 (None 이면 가설 질문은 정리하지 않음)
+
+    Returns:
+        Tuple[int, int]: (삭제한 코드 청크 수, 삭제한 가설 질문 수)
+    """
+    repo_url, ref = repo_info.repo_url, repo_info.branch
+    removed_code = removed_questions = 0
+    if code_ids is not None:
+        removed_code = ChromaUtils.delete_stale_documents(
+            ChromaUtils().get_code_documents_vectorstore(), repo_url, ref, code_ids
+        )
+    if question_ids is not None:
+        removed_questions = ChromaUtils.delete_stale_documents(
+            ChromaUtils().get_hypothetical_questions_vectorstore(), repo_url, ref, question_ids
+        )
+    return removed_code, removed_questions
+
+
+def _delete_stale_unless_failed(
+    state: RepositoryToVectorDBState, code_ids: Optional[List[str]], question_ids: Optional[List[str]]
+) -> Tuple[int, int]:
+    """
+    로드/분할에 실패한 항목이 없을 때만 이전 문서를 삭제합니다.
+    실패한 파일/언어의 청크는 이번 수집 ID 에 없으므로, 정리하면 일시적인 오류로 기존 문서가 지워집니다.
+    실패 없이 ID 목록이 비어 있으면 저장소/참조의 이전 문서를 모두 삭제합니다.
+    """
+    if state.failures:
+        logger.warning(
+            f"로드/분할 실패 {len(state.failures)}건이 있어 이전 문서를 정리하지 않습니다: {state.failures[0]}"
+        )
+        return 0, 0
+    return delete_stale_documents(state.repo_info, code_ids, question_ids)
+
+
+def _upsert_in_batches(
+    job_id: str,
+    stage: str,
+    vectorstore: VectorStore,
+    documents: List[Document],
+    ids: List[str],
+) -> List[str]:
+    """
+    이전 시도에서 저장하지 않은 문서만 배치 단위로 upsert 하고 배치마다 진행 기록을 남깁니다.
+
+    Args:
+        job_id: 수집 작업 ID
+        stage: 진행 기록 단계 이름
+        vectorstore: 벡터 저장소
+        documents: 저장할 문서 목록
+        ids: 문서별 고정 ID
+
+    Returns:
+        List[str]: 이번 수집에 속한 전체 고유 ID 목록 (이전 시도에서 저장한 ID 포함)
+    """
+    progress = IngestProgress()
+    completed = progress.get_completed(job_id, stage)
+
+    unique: Dict[str, Document] = {}
+    for id_, document in zip(ids, documents):
+        unique[id_] = document
+    pending = [id_ for id_ in unique if id_ not in completed]
+    if len(pending) < len(unique):
+        logger.info(f"{stage} 재개: {len(unique) - len(pending)}개 문서는 이전 시도에서 저장됨")
+
+    done = len(unique) - len(pending)
+    report_progress(stage, done, len(unique))
+
+    bulk = 0 < BULK_LOAD_MIN_DOCUMENTS <= len(pending)
+    batch_size = EMBED_BULK_BATCH_SIZE if bulk else EMBED_BATCH_SIZE
+    with ChromaUtils.bulk_load(vectorstore) if bulk else contextlib.nullcontext():
+        for batch, tokens in batch_by_tokens(
+            pending, lambda id_: unique[id_].page_content, EMBED_BATCH_TOKENS, max_items=batch_size
+        ):
+            get_openai_budget().acquire(tokens)
+            ChromaUtils.upsert_documents(vectorstore, [unique[id_] for id_ in batch], batch)
+            progress.mark_completed(job_id, stage, dict.fromkeys(batch))
+            done += len(batch)
+            report_progress(stage, done, len(unique))
+
+    return list(unique.keys())
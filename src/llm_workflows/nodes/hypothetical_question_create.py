@@ -1,16 +1,71 @@
+import functools
+import os
+import sys
+from contextlib import nullcontext
+from typing import Dict, List, Optional
 from langchain_core.prompts import ChatPromptTemplate
+from langchain_community.callbacks import get_openai_callback
 from langchain.output_parsers.openai_functions import JsonKeyOutputFunctionsParser
 from langchain_openai import ChatOpenAI
 from langchain_core.documents import Document
 from src.llm_workflows.state import RepositoryToVectorDBState
 from src.config.log_config import Logger
+from src.config.metrics_config import Metrics
+from src.utils.chroma_utils import ChromaUtils
+from src.utils.ingest_progress import IngestProgress
+from src.utils.progress import report_progress
+from src.utils.rate_budget import get_openai_budget
+from src.utils.token_utils import count_tokens, truncate_to_tokens
 
 logger = Logger()
+metrics = Metrics()
 
-def hypothetical_question_create(state: RepositoryToVectorDBState):
+# 진행 기록 단위 (청크 수)
+QUESTION_BATCH_SIZE: int = 50
+# 청크당 프롬프트 최대 토큰 수 (템플릿 포함, 넘는 코드는 뒷부분을 잘라 전송, 0 이면 제한 없음)
+QUESTION_PROMPT_TOKENS: int = int(os.getenv("QUESTION_PROMPT_TOKENS", "3000"))
+# 청크당 응답(질문 5-8개) 토큰 추정치 (OpenAI 토큰 한도 차감용)
+QUESTION_RESPONSE_TOKENS: int = 300
+
+QUESTION_PROMPT_TEMPLATE: str = """
+        당신은 코드 분석 전문가입니다. 주어진 코드를 분석하고, 개발자들이 이 코드에 대해 물어볼 만한 다양한 질문을 생성해주세요.
+        
+        코드:
+        ```{language}
+        {code}
+        ```
+        
+        다음과 같은 다양한 카테고리의 질문을 5-8개 생성해주세요:
+        1. 구현방식: 코드가 어떻게 구현되었는지에 대한 질문
+        2. 설계패턴: 코드에 사용된 설계 패턴이나 아키텍처에 대한 질문
+        3. 최적화: 성능 최적화나 효율성에 대한 질문
+        4. 버그가능성: 잠재적인 버그나 오류 가능성에 대한 질문
+        5. 사용법: 코드를 어떻게 사용하는지에 대한 질문
+        6. 기능설명: 코드가 어떤 기능을 수행하는지에 대한 질문
+        """
+
+
+@functools.lru_cache(maxsize=1)
+def _prompt_overhead_tokens() -> int:
+    """코드를 제외한 프롬프트 템플릿 토큰 수"""
+    return count_tokens(QUESTION_PROMPT_TEMPLATE.format(language="", code=""))
 
-    from typing import List, Dict
 
+def _code_token_budget() -> Optional[int]:
+    """프롬프트에 넣을 수 있는 코드 토큰 수 (None 이면 제한 없음)"""
+    if QUESTION_PROMPT_TOKENS <= 0:
+        return None
+    return max(QUESTION_PROMPT_TOKENS - _prompt_overhead_tokens(), 1)
+
+
+def _prompt_code(code: str) -> str:
+    budget = _code_token_budget()
+    return code if budget is None else truncate_to_tokens(code, budget)
+
+
+@functools.lru_cache(maxsize=1)
+def _get_hypothetical_query_chain():
+    """가설 질문 생성 체인 (프로세스 전체에서 LLM 클라이언트와 함께 재사용)"""
     functions = [
         {
             "name": "hypothetical_questions",
@@ -32,27 +87,12 @@ def hypothetical_question_create(state: RepositoryToVectorDBState):
         }
     ]
 
-    question_prompt = ChatPromptTemplate.from_template("""
-        당신은 코드 분석 전문가입니다. 주어진 코드를 분석하고, 개발자들이 이 코드에 대해 물어볼 만한 다양한 질문을 생성해주세요.
-        
-        코드:
-        ```{language}
-        {code}
-        ```
-        
-        다음과 같은 다양한 카테고리의 질문을 5-8개 생성해주세요:
-        1. 구현방식: 코드가 어떻게 구현되었는지에 대한 질문
-        2. 설계패턴: 코드에 사용된 설계 패턴이나 아키텍처에 대한 질문
-        3. 최적화: 성능 최적화나 효율성에 대한 질문
-        4. 버그가능성: 잠재적인 버그나 오류 가능성에 대한 질문
-        5. 사용법: 코드를 어떻게 사용하는지에 대한 질문
-        6. 기능설명: 코드가 어떤 기능을 수행하는지에 대한 질문
-        """)
+    question_prompt = ChatPromptTemplate.from_template(QUESTION_PROMPT_TEMPLATE)
 
-    hypothetical_query_chain = (
+    return (
         {
             "language": lambda x: x.metadata.get("language"),
-            "code": lambda x: x.page_content,
+            "code": lambda x: _prompt_code(x.page_content),
         }
         | question_prompt
         | ChatOpenAI(max_retries=0, model="gpt-4o-mini").bind(
@@ -61,21 +101,65 @@ def hypothetical_question_create(state: RepositoryToVectorDBState):
         | JsonKeyOutputFunctionsParser(key_name="questions")
     )
 
-    hypothetical_questions: List[List[str]] = hypothetical_query_chain.batch(
-        state.split_documents, config={"configurable": {"max_concurrency": 10}}
-    )
+
+def hypothetical_question_create(state: RepositoryToVectorDBState):
+    """
+    분할된 문서별 가설 질문을 생성합니다.
+    QUESTION_BATCH_SIZE 개 청크마다 결과를 진행 기록에 저장하므로, 중간에 실패한 작업을 재시도하면
+    이미 질문을 만든 청크는 LLM 을 다시 호출하지 않습니다.
+    """
+    progress = IngestProgress()
+    job_id = IngestProgress.job_id(state.repo_info.repo_url, state.repo_info.branch)
+    completed: Dict[str, List[str]] = progress.get_completed(job_id, "questions")
+
+    chunk_keys = [doc.metadata.get("chunk_id") or ChromaUtils.chunk_id(doc) for doc in state.split_documents]
+    pending = [index for index, key in enumerate(chunk_keys) if key not in completed]
+    if len(pending) < len(state.split_documents):
+        logger.info(f"가설 질문 생성 재개: {len(state.split_documents) - len(pending)}개 청크는 이전 결과 사용")
+
+    report_progress("questions", len(state.split_documents) - len(pending), len(state.split_documents))
+    hypothetical_query_chain = _get_hypothetical_query_chain()
+
+    for start in range(0, len(pending), QUESTION_BATCH_SIZE):
+        batch = pending[start:start + QUESTION_BATCH_SIZE]
+        code_budget = _code_token_budget()
+        get_openai_budget().acquire(sum(
+            min(count_tokens(state.split_documents[index].page_content), code_budget or sys.maxsize)
+            + _prompt_overhead_tokens() + QUESTION_RESPONSE_TOKENS
+            for index in batch
+        ))
+
+        # 메트릭 활성화 시에만 LLM 호출 수/토큰 사용량 집계
+        with get_openai_callback() if metrics.enabled else nullcontext() as callback:
+            batch_questions: List[List[str]] = hypothetical_query_chain.batch(
+                [state.split_documents[index] for index in batch], config={"configurable": {"max_concurrency": 10}}
+            )
+
+        if callback is not None:
+            metrics.inc("llm_calls_total", callback.successful_requests, purpose="hypothetical_questions")
+            metrics.inc("llm_tokens_total", callback.prompt_tokens, kind="prompt", purpose="hypothetical_questions")
+            metrics.inc("llm_tokens_total", callback.completion_tokens, kind="completion", purpose="hypothetical_questions")
+
+        batch_results = {chunk_keys[index]: questions for index, questions in zip(batch, batch_questions)}
+        progress.mark_completed(job_id, "questions", batch_results)
+        completed.update(batch_results)
+        logger.debug("가설 질문 생성 진행: %d/%d", min(start + QUESTION_BATCH_SIZE, len(pending)), len(pending))
+        report_progress("questions", len(state.split_documents) - len(pending) + start + len(batch), len(state.split_documents))
 
     hypothetical_questions_docs: List[Document] = []
     for i, doc in enumerate(state.split_documents):
         path = doc.metadata.get("path")
         if path:
-            for question in hypothetical_questions[i]:
-                hypothetical_questions_docs.append(Document(page_content=question, metadata=doc.metadata))
+            for question in completed[chunk_keys[i]]:
+                hypothetical_questions_docs.append(Document(page_content=question, metadata=dict(doc.metadata)))
         else:
             logger.warning(f"Document at index {i} has no path in metadata.")
 
     state.hypothetical_questions = hypothetical_questions_docs
 
-    logger.debug(f"Generated hypothetical questions: {hypothetical_questions_docs}")
+    logger.debug("Generated hypothetical questions: %d개 (청크 %d개)", len(hypothetical_questions_docs), len(state.split_documents))
+    if hypothetical_questions_docs and logger.debug_enabled:
+        logger.debug("가설 질문 예시: %r", hypothetical_questions_docs[0].page_content,
+                     path=hypothetical_questions_docs[0].metadata.get("path"))
 
     return state
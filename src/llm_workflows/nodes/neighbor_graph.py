@@ -0,0 +1,124 @@
+import os
+from typing import Dict, List, Optional, Tuple
+from langchain_core.documents import Document
+from src.llm_workflows.state import RepositoryToVectorDBState, RagToContextState, RagToContextBatchState
+from src.config.log_config import Logger
+from src.config.metrics_config import Metrics
+from src.utils.chroma_utils import ChromaUtils
+from src.utils.neighbor_graph import NeighborGraph, build_edges
+
+logger = Logger()
+metrics = Metrics()
+
+# 히트마다 붙일 이웃 청크 수 기본값 (도구 호출 시 neighbors 로 지정 가능, 0 이면 확장하지 않음)
+CONTEXT_NEIGHBORS: int = int(os.getenv("CONTEXT_NEIGHBORS", "0"))
+
+
+def build_neighbor_graph(state: RepositoryToVectorDBState) -> RepositoryToVectorDBState:
+    """
+    분할된 코드 청크로 이웃 그래프(import, 정의 → 사용, 같은 파일 앞뒤 청크)를 만들어 저장소/참조 단위로 교체합니다.
+    임베딩이나 외부 요청 없이 청크 본문과 메타데이터만 사용합니다.
+    로드/분할에 실패한 파일이 있으면 이전 문서를 정리하지 않는 것과 같이, 기존 간선을 지우지 않고 새 간선만 합칩니다.
+    """
+    graph = NeighborGraph()
+    if not graph.enabled:
+        return state
+
+    with metrics.timer("neighbor_graph_build"):
+        edges = build_edges(state.split_documents)
+        if state.failures:
+            logger.warning(f"로드/분할 실패 {len(state.failures)}건이 있어 기존 이웃 그래프 간선을 유지하고 새 간선만 합칩니다.")
+            written = graph.merge(state.repo_info.repo_url, state.repo_info.branch, edges)
+        else:
+            written = graph.replace(state.repo_info.repo_url, state.repo_info.branch, edges)
+    logger.info(f"이웃 그래프 저장 완료: 청크 {len(state.split_documents)}개, 간선 {written}개")
+    return state
+
+
+def expand_neighbors(state: RagToContextState) -> RagToContextState:
+    """
+    검색된 코드 청크마다 이웃 그래프에서 점수가 높은 이웃 청크를 neighbors 개까지 붙입니다.
+    이웃 점수는 히트 점수 × 간선 가중치이며, 컨텍스트 정리 단계에서 히트를 먼저 담고 남은 토큰 예산에 들어가는 만큼만 남깁니다.
+    """
+    count = _resolve_neighbors(state.neighbors)
+    if count:
+        state.retrieved_documents = _expand([state.retrieved_documents], count)[0]
+    return state
+
+
+def expand_neighbors_batch(state: RagToContextBatchState) -> RagToContextBatchState:
+    """쿼리별 검색 결과를 expand_neighbors 와 같은 방식으로 확장합니다. (간선 조회와 청크 조회는 한 번씩)"""
+    count = _resolve_neighbors(state.neighbors)
+    if count:
+        state.retrieved_documents = _expand(state.retrieved_documents, count)
+    return state
+
+
+def _resolve_neighbors(neighbors: Optional[int]) -> int:
+    count = CONTEXT_NEIGHBORS if neighbors is None else neighbors
+    return max(count, 0)
+
+
+def _hit_id(document: Document) -> Optional[str]:
+    if document.metadata.get("retrieved_from") != "code_documents":
+        return None
+    return document.id or document.metadata.get("chunk_id")
+
+
+def _expand(results: List[List[Document]], count: int) -> List[List[Document]]:
+    """
+    Args:
+        results: 쿼리별 검색 결과
+        count: 히트마다 붙일 최대 이웃 수
+
+    Returns:
+        List[List[Document]]: 쿼리별 검색 결과 + 이웃 청크 (metadata 에 retrieved_from=neighbor_graph, neighbor_of, relation)
+    """
+    graph = NeighborGraph()
+    hit_ids = {_hit_id(document) for documents in results for document in documents} - {None}
+    if not graph.enabled or not hit_ids:
+        return results
+
+    edges = graph.neighbors(sorted(hit_ids))
+    # 쿼리별 이웃 청크 ID → (점수, 간선 종류, 히트 청크 ID), 여러 히트의 이웃이면 가장 높은 점수
+    selected: List[Dict[str, Tuple[float, str, str]]] = []
+    for documents in results:
+        hits = {
+            _hit_id(document): document.metadata.get("score", 0.0) for document in documents if _hit_id(document)
+        }
+        candidates: Dict[str, Tuple[float, str, str]] = {}
+        for hit_id, score in hits.items():
+            taken = 0
+            for target, kind, weight in edges.get(hit_id, []):
+                if target in hits:
+                    continue
+                neighbor_score = round(score * weight, 4)
+                if target not in candidates or neighbor_score > candidates[target][0]:
+                    candidates[target] = (neighbor_score, kind, hit_id)
+                taken += 1
+                if taken >= count:
+                    break
+        selected.append(candidates)
+
+    target_ids = sorted({target for candidates in selected for target in candidates})
+    fetched = {
+        document.id: document
+        for document in ChromaUtils.get_documents(ChromaUtils().get_code_documents_vectorstore(), target_ids)
+    }
+
+    expanded: List[List[Document]] = []
+    for documents, candidates in zip(results, selected):
+        neighbors = []
+        for target, (score, kind, hit_id) in candidates.items():
+            document = fetched.get(target)
+            # 간선은 남아 있지만 청크가 삭제된 경우 (재수집 중 등)
+            if document is None:
+                continue
+            neighbors.append(Document(id=target, page_content=document.page_content, metadata={
+                **document.metadata, "score": score, "retrieved_from": "neighbor_graph",
+                "neighbor_of": hit_id, "relation": kind,
+            }))
+        metrics.inc("neighbor_chunks_total", len(neighbors))
+        logger.debug(f"이웃 확장: 히트 {len({_hit_id(document) for document in documents} - {None})}개 → 이웃 {len(neighbors)}개")
+        expanded.append(documents + neighbors)
+    return expanded
@@ -1,59 +1,126 @@
-from typing import List
+from typing import Any, Dict, List, Optional, Tuple
 from dotenv import load_dotenv
-from langchain_chroma import Chroma
 from langchain_core.documents import Document
-from src.llm_workflows.state import RagToContextState
+from src.llm_workflows.state import RagToContextState, RagToContextBatchState
+from src.models.search_scope import SearchScope
 from src.config.log_config import Logger
 from src.utils.chroma_utils import ChromaUtils
+from src.utils.scope_filter import build_scope_filter, matches_path_prefix, needs_path_post_filter
 # 환경 변수 로드
 load_dotenv()
 
 # 로깅 설정
 logger = Logger()
 
+TOP_K: int = 5
+SCORE_THRESHOLD: float = 0.5
+# 경로 접두사가 PATH_PREFIX_MAX_DEPTH 보다 깊어 결과를 다시 거를 때 더 가져올 배수
+PATH_POST_FILTER_FACTOR: int = 4
+
 
 def search_documents(state: RagToContextState) -> RagToContextState:
     """
     주어진 쿼리에 대해 관련 문서를 검색합니다.
     """
     query = state.query
-    top_k = 5
-    
+
     try:
-        logger.debug(f"문서 검색 중: 쿼리='{query}', top_k={top_k}")
-        vectorstore: Chroma = ChromaUtils().get_code_documents_vectorstore()
-        retriever = vectorstore.as_retriever(
-            search_type="similarity_score_threshold",
-            search_kwargs={"k": top_k, "score_threshold": 0.5}
-        )
-        code_results: List[Document] = retriever.invoke(query)
-        logger.debug(f"코드 검색 결과: {len(code_results)}개 문서 찾음")
-        if len(code_results) == 0:
-            logger.debug(f"코드 검색 결과가 없습니다. 가설 질문 검색 시도")
-            vectorstore: Chroma = ChromaUtils().get_hypothetical_questions_vectorstore()
-            retriever = vectorstore.as_retriever(
-                search_type="similarity_score_threshold",
-                search_kwargs={"k": top_k, "score_threshold": 0.5}
-            )
-            hypothetical_results: List[Document] = retriever.invoke(query)
-            logger.debug(f"가설 질문 검색 결과: {len(hypothetical_results)}개 문서 찾음")
-
-            if len(hypothetical_results) > 0:
-                search_path_list = []
-                for result in hypothetical_results:
-                    search_path_list.append(result.metadata["path"])
-
-                vectorstore: Chroma = ChromaUtils().get_code_documents_vectorstore()
-                retriever = vectorstore.as_retriever(
-                    search_type="similarity_score_threshold",
-                    search_kwargs={"k": top_k, "score_threshold": 0.5, "filter": {"path": {"in": search_path_list}}}
-                )
-                code_results: List[Document] = retriever.invoke(query)
-                logger.debug(f"코드 검색 재수행 결과: {len(code_results)}개 문서 찾음")
-
-        state.retrieved_documents = code_results + hypothetical_results
+        logger.debug(f"문서 검색 중: 쿼리='{query}', top_k={TOP_K}, 범위={state.scope}")
+        state.retrieved_documents = _search_queries([query], state.scope)[0]
         return state
-    
+
     except Exception as e:
         logger.error(f"문서 검색 중 오류 발생: {str(e)}")
-        raise
\ No newline at end of file
+        raise
+
+
+def search_documents_batch(state: RagToContextBatchState) -> RagToContextBatchState:
+    """
+    여러 쿼리를 한 번에 검색합니다.
+    쿼리 임베딩은 한 번의 요청으로, 벡터 검색은 컬렉션별 한 번의 다중 질의로 수행합니다.
+    """
+    try:
+        logger.debug(f"배치 문서 검색 중: 쿼리 {len(state.queries)}개, top_k={TOP_K}, 범위={state.scope}")
+        state.retrieved_documents = _search_queries(state.queries, state.scope)
+        return state
+
+    except Exception as e:
+        logger.error(f"배치 문서 검색 중 오류 발생: {str(e)}")
+        raise
+
+
+def _above_threshold(
+    results: List[Tuple[Document, float]], scope: Optional[SearchScope] = None, collection: str = "code_documents"
+) -> List[Document]:
+    """점수 기준을 넘는 결과만 남기고, 컨텍스트 정리에 쓰도록 점수와 검색한 컬렉션을 메타데이터에 기록합니다."""
+    documents = []
+    for doc, score in results:
+        if score >= SCORE_THRESHOLD:
+            doc.metadata["score"] = round(score, 4)
+            doc.metadata["retrieved_from"] = collection
+            documents.append(doc)
+    if needs_path_post_filter(scope):
+        documents = [doc for doc in documents if matches_path_prefix(doc.metadata, scope.path_prefix)][:TOP_K]
+    return documents
+
+
+def _and_filter(*filters: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    filters = [where for where in filters if where]
+    if not filters:
+        return None
+    return filters[0] if len(filters) == 1 else {"$and": list(filters)}
+
+
+def _search_queries(queries: List[str], scope: Optional[SearchScope] = None) -> List[List[Document]]:
+    """
+    쿼리별로 코드 문서를 검색하고, 결과가 없는 쿼리는 가설 질문으로 파일을 찾은 뒤
+    해당 파일 범위에서 코드 검색을 다시 수행합니다.
+    검색 범위는 모든 벡터 검색에 메타데이터 필터로 전달되어 범위 밖 벡터는 비교하지 않습니다.
+
+    Args:
+        queries: 쿼리 목록
+        scope: 검색 범위 (저장소, 참조, 경로 접두사, 언어, 확장자)
+
+    Returns:
+        List[List[Document]]: 쿼리별 검색 결과 (코드 문서 + 가설 질문 문서)
+    """
+    if not queries:
+        return []
+
+    scope_filter = build_scope_filter(scope)
+    top_k = TOP_K * PATH_POST_FILTER_FACTOR if needs_path_post_filter(scope) else TOP_K
+    chroma_utils = ChromaUtils()
+    code_vectorstore = chroma_utils.get_code_documents_vectorstore()
+    embeddings = chroma_utils.embed_queries(queries)
+
+    code_results: List[List[Document]] = [
+        _above_threshold(results, scope)
+        for results in ChromaUtils.similarity_search_by_vectors(code_vectorstore, embeddings, top_k, filter=scope_filter)
+    ]
+    logger.debug(f"코드 검색 결과: {[len(results) for results in code_results]}")
+
+    missing = [index for index, results in enumerate(code_results) if not results]
+    if not missing:
+        return code_results
+
+    logger.debug(f"코드 검색 결과가 없는 쿼리 {len(missing)}개. 가설 질문 검색 시도")
+    question_vectorstore = chroma_utils.get_hypothetical_questions_vectorstore()
+    question_results = ChromaUtils.similarity_search_by_vectors(
+        question_vectorstore, [embeddings[index] for index in missing], top_k, filter=scope_filter
+    )
+
+    for index, results in zip(missing, question_results):
+        hypothetical_results = _above_threshold(results, scope, collection="hypothetical_questions")
+        logger.debug(f"가설 질문 검색 결과: {len(hypothetical_results)}개 문서 찾음")
+        if not hypothetical_results:
+            continue
+
+        search_path_list = list({result.metadata["path"] for result in hypothetical_results})
+        rescored = ChromaUtils.similarity_search_by_vectors(
+            code_vectorstore, [embeddings[index]], top_k,
+            filter=_and_filter(scope_filter, {"path": {"$in": search_path_list}})
+        )[0]
+        code_results[index] = _above_threshold(rescored, scope) + hypothetical_results
+        logger.debug(f"코드 검색 재수행 결과: {len(code_results[index]) - len(hypothetical_results)}개 문서 찾음")
+
+    return code_results
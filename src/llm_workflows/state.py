@@ -1,6 +1,7 @@
-from typing import Dict, List, Annotated
+from typing import Dict, List, Annotated, Optional
 from langchain_core.documents import Document
 from src.models.git_repository import RepositoryInfo
+from src.models.search_scope import SearchScope
 from pydantic import BaseModel, Field
 from langgraph.graph import add_messages
 
@@ -10,8 +11,21 @@ class RepositoryToVectorDBState(BaseModel):
     documents_by_language: Annotated[Dict[str, List[Document]], Field(default_factory=dict, description="언어별 문서")]
     split_documents: Annotated[List[Document], add_messages, Field(default_factory=list, description="분할된 문서")]
     hypothetical_questions: Annotated[List[Document], add_messages, Field(default_factory=list, description="가설 질문 도큐먼트 객체")]
+    code_indexed: Annotated[bool, Field(default=False, description="코드 청크를 가설 질문보다 먼저 저장했는지 여부")]
+    failures: Annotated[List[str], Field(default_factory=list, description="로드/분할에 실패한 항목 (있으면 이전 문서를 정리하지 않음)")]
 
     
 class RagToContextState(BaseModel):
     query: Annotated[str, add_messages, Field(..., description="사용자 쿼리")]
-    retrieved_documents: Annotated[List[Document], add_messages, Field(default_factory=list, description="검색된 문서")]
\ No newline at end of file
+    scope: Annotated[Optional[SearchScope], Field(default=None, description="검색 범위")]
+    token_budget: Annotated[Optional[int], Field(default=None, description="컨텍스트 토큰 예산 (None 이면 CONTEXT_TOKEN_BUDGET)")]
+    neighbors: Annotated[Optional[int], Field(default=None, description="히트마다 붙일 이웃 청크 수 (None 이면 CONTEXT_NEIGHBORS)")]
+    retrieved_documents: Annotated[List[Document], add_messages, Field(default_factory=list, description="검색된 문서")]
+
+
+class RagToContextBatchState(BaseModel):
+    queries: Annotated[List[str], Field(..., description="사용자 쿼리 목록")]
+    scope: Annotated[Optional[SearchScope], Field(default=None, description="검색 범위 (모든 쿼리에 적용)")]
+    token_budget: Annotated[Optional[int], Field(default=None, description="쿼리별 컨텍스트 토큰 예산 (None 이면 CONTEXT_TOKEN_BUDGET)")]
+    neighbors: Annotated[Optional[int], Field(default=None, description="히트마다 붙일 이웃 청크 수 (None 이면 CONTEXT_NEIGHBORS)")]
+    retrieved_documents: Annotated[List[List[Document]], Field(default_factory=list, description="쿼리별 검색된 문서")]
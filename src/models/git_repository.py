@@ -1,7 +1,9 @@
-from typing import Annotated
+from typing import Annotated, Optional
 
 from pydantic import BaseModel, Field
 
+from src.utils.download_spool import read_spooled_text
+
 
 class RepositoryInfo(BaseModel):
     """저장소 정보"""
@@ -9,15 +11,18 @@ class RepositoryInfo(BaseModel):
     owner: Annotated[str, Field(default="", description="저장소 소유자")]
     repo_name: Annotated[str, Field(default="", description="저장소 이름")]
     branch: Annotated[str, Field(default="", description="브랜치 이름")]
+    size: Annotated[int, Field(default=0, description="저장소 크기 (KB, GitHub 기준)")]
 
 class CodeMetadata(BaseModel):
     """코드 메타데이터"""
 
     repo_url: Annotated[str, Field(description="저장소 URL")]
+    ref: Annotated[str, Field(default="", description="브랜치 또는 커밋 참조")]
     path: Annotated[str, Field(default="", description="파일 경로")]
     filename: Annotated[str, Field(default="", description="파일 이름")]
     extension: Annotated[str, Field(default="", description="파일 확장자")]
     file_size: Annotated[int, Field(default=0, description="파일 크기")]
+    sha: Annotated[str, Field(default="", description="git blob SHA")]
 
 
 class ParsedCode(BaseModel):
@@ -26,5 +31,15 @@ class ParsedCode(BaseModel):
     path: Annotated[str, Field(description="파일 경로")]
     name: Annotated[str, Field(description="파일 이름")]
     type: Annotated[str, Field(description="파일 타입")]
-    text: Annotated[str, Field(description="파일 내용")]
+    text: Annotated[str, Field(default="", description="파일 내용 (spool_path 가 있으면 비어 있음)")]
+    spool_path: Annotated[Optional[str], Field(default=None, description="큰 파일 내용을 저장한 임시 파일 경로")]
     metadata: Annotated[CodeMetadata, Field(description="파일 메타데이터")]
+
+    def read_text(self) -> str:
+        """
+        파일 내용 (임시 파일에 저장된 경우 mmap 으로 읽음)
+        임시 파일도 전체 문자열로 읽으므로 메모리 한도는 다운로드 단계에만 적용됩니다. (문서/청크는 그래프 상태에 남음)
+        """
+        if self.spool_path is None:
+            return self.text
+        return read_spooled_text(self.spool_path)
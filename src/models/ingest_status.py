@@ -0,0 +1,17 @@
+from typing import Annotated, Optional
+
+from pydantic import BaseModel, Field
+
+
+class RepoIngestStatus(BaseModel):
+    """저장소 하나의 수집 상태 (배치 수집 진행 상황, repo_to_rag 결과 요약)"""
+
+    repo_url: Annotated[str, Field(description="저장소 URL")]
+    ref: Annotated[Optional[str], Field(default=None, description="수집한 브랜치 (rag_to_context 의 ref 범위로 사용)")]
+    status: Annotated[str, Field(default="queued", description="queued | running | succeeded | failed")]
+    size_kb: Annotated[int, Field(default=0, description="저장소 크기 (KB, 처리 순서 결정에 사용)")]
+    documents: Annotated[int, Field(default=0, description="불러온 문서 수 (파서가 파일을 나눈 단위)")]
+    chunks: Annotated[int, Field(default=0, description="저장한 코드 청크 수")]
+    questions: Annotated[int, Field(default=0, description="저장한 가설 질문 수")]
+    seconds: Annotated[Optional[float], Field(default=None, description="처리 시간 (초)")]
+    error: Annotated[Optional[str], Field(default=None, description="실패 사유")]
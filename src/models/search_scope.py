@@ -0,0 +1,13 @@
+from typing import Annotated, Optional
+
+from pydantic import BaseModel, Field
+
+
+class SearchScope(BaseModel):
+    """검색 범위 (지정한 조건은 모두 만족해야 함)"""
+
+    repo: Annotated[Optional[str], Field(default=None, description="저장소 URL 또는 owner/name")]
+    ref: Annotated[Optional[str], Field(default=None, description="브랜치 또는 커밋 참조")]
+    path_prefix: Annotated[Optional[str], Field(default=None, description="디렉토리 또는 파일 경로 (예: src/utils)")]
+    language: Annotated[Optional[str], Field(default=None, description="언어 (예: PYTHON, MARKDOWN)")]
+    extension: Annotated[Optional[str], Field(default=None, description="파일 확장자 (예: py)")]
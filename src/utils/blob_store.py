@@ -0,0 +1,179 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Optional, Tuple
+
+from src.config.log_config import Logger
+from src.config.metrics_config import Metrics
+
+logger = Logger()
+metrics = Metrics()
+
+# 블롭 저장소 설정
+BLOB_STORE_ENABLED: bool = os.getenv("BLOB_STORE_ENABLED", "true").lower() == "true"
+BLOB_STORE_PATH: str = os.getenv("BLOB_STORE_PATH", os.path.join("chroma_db", "blob_store.sqlite3"))
+BLOB_STORE_MAX_BYTES: int = int(os.getenv("BLOB_STORE_MAX_BYTES", str(1024 * 1024 * 1024)))  # 1GB
+
+# 한도 초과 시 이 비율까지 오래된 항목을 제거
+EVICTION_TARGET_RATIO: float = 0.9
+
+
+class BlobStore:
+    """
+    git blob SHA 기반 콘텐츠 주소 저장소
+
+    같은 blob SHA 는 저장소, 포크, 브랜치와 무관하게 같은 내용이므로
+    디코딩된 파일 텍스트와 파생 결과(파싱/분할 결과)를 한 번만 저장하고 재사용합니다.
+    전체 크기가 BLOB_STORE_MAX_BYTES 를 넘으면 가장 오래 사용하지 않은 항목부터 제거합니다(LRU).
+
+    테이블:
+        blobs(sha, text, size, last_access)     blob SHA → 디코딩된 텍스트 (text 가 NULL 이면 바이너리/디코딩 불가)
+        derived(key, payload, size, last_access) 파생 결과 키 → JSON
+    """
+    _init_lock = threading.Lock()
+
+    def __new__(cls):
+        if hasattr(cls, 'instance'):
+            return cls.instance
+        with cls._init_lock:
+            if not hasattr(cls, 'instance'):
+                instance = super(BlobStore, cls).__new__(cls)
+                instance._lock = threading.Lock()
+                instance._connection = None
+                instance._total_bytes = 0
+                if BLOB_STORE_ENABLED:
+                    instance._open(BLOB_STORE_PATH)
+                cls.instance = instance
+        return cls.instance
+
+    def _open(self, path: str) -> None:
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.executescript("""
+            CREATE TABLE IF NOT EXISTS blobs (
+                sha TEXT PRIMARY KEY,
+                text TEXT,
+                size INTEGER NOT NULL,
+                last_access REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS derived (
+                key TEXT PRIMARY KEY,
+                payload TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                last_access REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_blobs_last_access ON blobs(last_access);
+            CREATE INDEX IF NOT EXISTS idx_derived_last_access ON derived(last_access);
+        """)
+        self._total_bytes = self._connection.execute(
+            "SELECT COALESCE((SELECT SUM(size) FROM blobs), 0) + COALESCE((SELECT SUM(size) FROM derived), 0)"
+        ).fetchone()[0]
+
+    @property
+    def enabled(self) -> bool:
+        return self._connection is not None
+
+    def get_text(self, sha: Optional[str]) -> Tuple[bool, Optional[str]]:
+        """
+        blob SHA 로 저장된 텍스트를 조회합니다.
+
+        Args:
+            sha: git blob SHA
+
+        Returns:
+            Tuple[bool, Optional[str]]: (저장 여부, 텍스트). 바이너리로 기록된 blob 은 (True, None)
+        """
+        if not self.enabled or not sha:
+            return False, None
+
+        with self._lock:
+            row = self._connection.execute("SELECT text FROM blobs WHERE sha = ?", (sha,)).fetchone()
+            metrics.inc("blob_store_lookups_total", kind="blob", result="miss" if row is None else "hit")
+            if row is None:
+                return False, None
+            self._connection.execute("UPDATE blobs SET last_access = ? WHERE sha = ?", (time.time(), sha))
+            self._connection.commit()
+        return True, row[0]
+
+    def put_text(self, sha: Optional[str], text: Optional[str]) -> None:
+        """
+        blob SHA 에 텍스트를 저장합니다. text 가 None 이면 바이너리/사용 불가 blob 으로 기록합니다.
+        """
+        if not self.enabled or not sha:
+            return
+
+        size = len(text.encode("utf-8")) if text else 0
+        if size > BLOB_STORE_MAX_BYTES * (1 - EVICTION_TARGET_RATIO):
+            # 저장소를 비워야 할 만큼 큰 파일은 캐시하지 않음
+            return
+
+        with self._lock:
+            self._upsert("blobs", "sha", sha, "text", text, size)
+
+    def get_derived(self, key: str) -> Optional[Any]:
+        """파생 결과(JSON)를 조회합니다."""
+        if not self.enabled:
+            return None
+
+        with self._lock:
+            row = self._connection.execute("SELECT payload FROM derived WHERE key = ?", (key,)).fetchone()
+            metrics.inc("blob_store_lookups_total", kind=key.split(":", 1)[0], result="miss" if row is None else "hit")
+            if row is None:
+                return None
+            self._connection.execute("UPDATE derived SET last_access = ? WHERE key = ?", (time.time(), key))
+            self._connection.commit()
+        return json.loads(row[0])
+
+    def put_derived(self, key: str, value: Any) -> None:
+        """파생 결과를 JSON 으로 저장합니다."""
+        if not self.enabled:
+            return
+
+        payload = json.dumps(value, ensure_ascii=False)
+        size = len(payload.encode("utf-8"))
+        if size > BLOB_STORE_MAX_BYTES * (1 - EVICTION_TARGET_RATIO):
+            return
+
+        with self._lock:
+            self._upsert("derived", "key", key, "payload", payload, size)
+
+    def _upsert(self, table: str, key_column: str, key: str, value_column: str, value: Any, size: int) -> None:
+        previous = self._connection.execute(
+            f"SELECT size FROM {table} WHERE {key_column} = ?", (key,)
+        ).fetchone()
+        self._connection.execute(
+            f"INSERT OR REPLACE INTO {table} ({key_column}, {value_column}, size, last_access) VALUES (?, ?, ?, ?)",
+            (key, value, size, time.time())
+        )
+        self._total_bytes += size - (previous[0] if previous else 0)
+        if self._total_bytes > BLOB_STORE_MAX_BYTES:
+            self._evict()
+        self._connection.commit()
+
+    def _evict(self) -> None:
+        """가장 오래 사용하지 않은 항목부터 제거해 EVICTION_TARGET_RATIO 이하로 줄입니다."""
+        target = BLOB_STORE_MAX_BYTES * EVICTION_TARGET_RATIO
+        removed = 0
+        rows = self._connection.execute("""
+            SELECT 'blobs', sha, size, last_access FROM blobs
+            UNION ALL
+            SELECT 'derived', key, size, last_access FROM derived
+            ORDER BY last_access
+        """).fetchall()
+
+        for table, key, size, _ in rows:
+            if self._total_bytes <= target:
+                break
+            key_column = "sha" if table == "blobs" else "key"
+            self._connection.execute(f"DELETE FROM {table} WHERE {key_column} = ?", (key,))
+            self._total_bytes -= size
+            removed += 1
+
+        logger.debug(f"블롭 저장소 LRU 정리: {removed}개 항목 제거 (현재 {self._total_bytes} bytes)")
@@ -1,34 +1,829 @@
+import contextlib
+import functools
+import hashlib
+import json
+import os
+import sqlite3
+import sys
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from langchain_core.documents import Document
 from langchain_openai import OpenAIEmbeddings
 from langchain_chroma import Chroma
+from langchain_core.vectorstores import VectorStore
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from src.config.log_config import Logger
+from src.config.metrics_config import Metrics
+from src.utils.quantized_vectorstore import QuantizedVectorStore
+from src.utils.token_utils import count_tokens
 
 logger = Logger()
+metrics = Metrics()
+
+# 벡터 저장소 설정
+VECTOR_STORE_BACKEND: str = os.getenv("VECTOR_STORE_BACKEND", "chroma")  # chroma | quantized
+EMBEDDING_MODEL: str = os.getenv("EMBEDDING_MODEL", "text-embedding-3-small")
+EMBEDDING_DIMENSIONS: int = int(os.getenv("EMBEDDING_DIMENSIONS", "1536"))
+# false 이면 tiktoken 으로 긴 입력을 나누지 않고 문자열 그대로 전송 (tiktoken 인코딩 파일을 받을 수 없는 오프라인 환경용)
+EMBEDDING_CHECK_CTX_LENGTH: bool = os.getenv("EMBEDDING_CHECK_CTX_LENGTH", "true").lower() == "true"
+VECTOR_QUANTIZATION: str = os.getenv("VECTOR_QUANTIZATION", "int8")  # int8 | binary
+QUANTIZED_RERANK_FACTOR: int = int(os.getenv("QUANTIZED_RERANK_FACTOR", "4"))
+VECTOR_DB_PATH: str = os.getenv("VECTOR_DB_PATH", "chroma_db")
+
+# Chroma 연결 방식: embedded(프로세스 내 PersistentClient) | http(Chroma 서버, 여러 서버 복제본이 같은 인덱스 공유)
+CHROMA_MODE: str = os.getenv("CHROMA_MODE", "embedded")
+CHROMA_HOST: str = os.getenv("CHROMA_HOST", "localhost")
+CHROMA_PORT: int = int(os.getenv("CHROMA_PORT", "8000"))
+CHROMA_SSL: bool = os.getenv("CHROMA_SSL", "false").lower() == "true"
+CHROMA_AUTH_TOKEN: Optional[str] = os.getenv("CHROMA_AUTH_TOKEN")
+CHROMA_TIMEOUT_SECONDS: float = float(os.getenv("CHROMA_TIMEOUT_SECONDS", "30"))
+CHROMA_POOL_SIZE: int = int(os.getenv("CHROMA_POOL_SIZE", "20"))
+CHROMA_MAX_RETRIES: int = int(os.getenv("CHROMA_MAX_RETRIES", "3"))
+
+COLLECTION_NAMES = ("code_documents", "hypothetical_questions")
+
+# HNSW 인덱스 설정 (환경 변수 접미사 → Chroma 컬렉션 메타데이터 키)
+# HNSW_M 처럼 전역으로, CODE_DOCUMENTS_HNSW_M 처럼 컬렉션별로 지정 (컬렉션별 값 우선, 미지정 시 Chroma 기본값)
+# M, construction_ef 는 컬렉션을 처음 만들 때만 적용되고 search_ef 는 기존 컬렉션에도 적용 (내장 모드)
+HNSW_PARAMS: Dict[str, str] = {
+    "M": "hnsw:M",
+    "CONSTRUCTION_EF": "hnsw:construction_ef",
+    "SEARCH_EF": "hnsw:search_ef",
+}
+
+# 대량 적재 모드: HNSW 인덱스에 한 번에 추가할 벡터 수 (Chroma 기본값 100)
+BULK_LOAD_BATCH_SIZE: int = int(os.getenv("BULK_LOAD_BATCH_SIZE", "5000"))
+# 검색 범위 필터별로 기억해 둘 허용 id 목록 수 (컬렉션이 바뀌면 max_seq_id 로 무효화)
+SCOPE_FILTER_CACHE_SIZE: int = int(os.getenv("SCOPE_FILTER_CACHE_SIZE", "64"))
+# 내장 Chroma 의 범위 필터를 sqlite 직접 조회로 처리 (Chroma 내부 스키마에 의존하므로 명시적으로 켤 때만 사용,
+# 꺼져 있으면 Chroma where 질의만 사용하고 메타데이터 인덱스도 만들지 않음)
+CHROMA_SQL_PREFILTER: bool = os.getenv("CHROMA_SQL_PREFILTER", "false").lower() == "true"
+# 직접 조회에 필요한 Chroma sqlite 테이블별 컬럼
+_PREFILTER_SCHEMA: Dict[str, Tuple[str, ...]] = {
+    "embedding_metadata": ("id", "key", "string_value"),
+    "embeddings": ("id", "segment_id", "embedding_id"),
+}
+
+# 컬렉션 조회/삭제 시 한 번에 처리할 문서 수
+PAGE_SIZE: int = 5000
+
+# 내부 구현(세션, 세그먼트)을 직접 사용하는 최적화를 검증한 Chroma 버전 (다른 버전은 공개 API 로 동작)
+CHROMA_INTERNALS_VERSIONS: Tuple[str, ...] = ("0.4.24",)
+# PersistentLocalHnswSegment 에서 사용하는 내부 속성
+_HNSW_SEGMENT_ATTRS: Tuple[str, ...] = (
+    "_lock", "_params", "_index", "_index_initialized", "_batch_size", "_sync_threshold",
+    "_curr_batch", "_brute_force_index", "_dimensionality", "_apply_batch", "_persist",
+)
+
+
+def _read_hnsw_params(collection_name: str) -> Dict[str, int]:
+    """컬렉션의 HNSW 설정을 환경 변수에서 읽습니다."""
+    params = {}
+    for suffix, key in HNSW_PARAMS.items():
+        value = os.getenv(f"{collection_name.upper()}_HNSW_{suffix}") or os.getenv(f"HNSW_{suffix}")
+        if value:
+            params[key] = int(value)
+    return params
+
+
+HNSW_COLLECTION_PARAMS: Dict[str, Dict[str, int]] = {name: _read_hnsw_params(name) for name in COLLECTION_NAMES}
+
+_fallback_warned: set = set()
+
+
+def _warn_fallback(feature: str, reason: Any) -> None:
+    """Chroma 내부 구현을 쓸 수 없어 공개 API 로 대신할 때 기능별로 한 번만 알립니다."""
+    if feature in _fallback_warned:
+        return
+    _fallback_warned.add(feature)
+    logger.warning(f"{feature}: Chroma 내부 구현을 사용할 수 없어 기본 동작으로 대신합니다. ({reason})")
+
+
+@functools.lru_cache(maxsize=1)
+def _chroma_internals_supported() -> bool:
+    """설치된 Chroma 가 내부 구현 접근을 검증한 버전인지 확인합니다."""
+    import chromadb
+
+    version = getattr(chromadb, "__version__", "unknown")
+    if version not in CHROMA_INTERNALS_VERSIONS:
+        _warn_fallback("Chroma 버전", f"chromadb {version}, 검증한 버전 {', '.join(CHROMA_INTERNALS_VERSIONS)}")
+        return False
+    return True
+
+
+def _record_embedding_tokens(texts: List[str], purpose: str) -> None:
+    """임베딩 요청 토큰 수를 메트릭으로 기록합니다. (메트릭 비활성화 시 계산하지 않음)"""
+    if not metrics.enabled:
+        return
+    tokens = sum(count_tokens(text) for text in texts)
+    metrics.inc("embedding_tokens_total", tokens, purpose=purpose)
+    metrics.inc("embedding_texts_total", len(texts), purpose=purpose)
+
+
+class _TimeoutHTTPAdapter(HTTPAdapter):
+    """요청에 timeout 이 지정되지 않으면 기본값을 사용하는 HTTPAdapter (Chroma 클라이언트는 timeout 없이 요청함)"""
+    def __init__(self, timeout: float, **kwargs):
+        self.timeout = timeout
+        super().__init__(**kwargs)
+
+    def send(self, request, **kwargs):
+        if kwargs.get("timeout") is None:
+            kwargs["timeout"] = self.timeout
+        return super().send(request, **kwargs)
+
+
+@functools.lru_cache(maxsize=1)
+def _get_http_client():
+    """
+    Chroma 서버용 HTTP 클라이언트를 생성합니다. 두 컬렉션이 하나의 연결 풀을 공유합니다.
+
+    Returns:
+        chromadb.ClientAPI: Chroma HTTP 클라이언트
+    """
+    import chromadb
+    import requests
+
+    headers = {"Authorization": f"Bearer {CHROMA_AUTH_TOKEN}"} if CHROMA_AUTH_TOKEN else {}
+
+    # 동시 질의 수만큼 연결을 재사용하고, 응답 없는 서버에서 요청이 무기한 대기하지 않도록 timeout 설정
+    # 연결 실패만 재시도 (upsert/query 는 POST 이므로 읽기 실패 후 재전송하지 않음)
+    adapter = _TimeoutHTTPAdapter(
+        timeout=CHROMA_TIMEOUT_SECONDS,
+        pool_connections=CHROMA_POOL_SIZE,
+        pool_maxsize=CHROMA_POOL_SIZE,
+        max_retries=Retry(total=CHROMA_MAX_RETRIES, connect=CHROMA_MAX_RETRIES, read=0, backoff_factor=0.2),
+    )
+    session = requests.Session()
+    session.headers.update(headers)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+
+    # HttpClient 는 생성 중에 timeout 없이 서버를 호출하므로, 먼저 같은 세션으로 연결을 확인
+    scheme = "https" if CHROMA_SSL else "http"
+    session.get(f"{scheme}://{CHROMA_HOST}:{CHROMA_PORT}/api/v1/heartbeat").raise_for_status()
+
+    client = chromadb.HttpClient(host=CHROMA_HOST, port=CHROMA_PORT, ssl=CHROMA_SSL, headers=headers)
+    # 연결 풀/timeout 세션은 FastAPI 클라이언트의 내부 세션을 바꿔 적용 (없으면 Chroma 기본 세션 사용)
+    server = getattr(client, "_server", None)
+    if _chroma_internals_supported() and hasattr(server, "_session"):
+        server._session = session
+    else:
+        _warn_fallback("Chroma 연결 풀", "HttpClient 세션을 바꿀 수 없음, 연결 풀/timeout 미적용")
+
+    logger.info(
+        f"Chroma 서버 연결: {CHROMA_HOST}:{CHROMA_PORT} "
+        f"(pool={CHROMA_POOL_SIZE}, timeout={CHROMA_TIMEOUT_SECONDS}s, heartbeat={client.heartbeat()})"
+    )
+    return client
+
 
 class ChromaUtils:
     """
     벡터 저장소 관리 유틸리티 클래스
+
+    VECTOR_STORE_BACKEND 환경 변수로 저장소를 선택합니다.
+        chroma: Chroma (기본값). CHROMA_MODE=embedded 이면 PersistentClient, http 이면 Chroma 서버
+        quantized: 양자화 벡터 + float 재정렬 로컬 인덱스 (QuantizedVectorStore)
     """
+    # 백그라운드 워밍업과 첫 요청이 동시에 생성하지 않도록 보호
+    _init_lock = threading.Lock()
+    # 검색 범위 필터 → (max_seq_id, 허용 문서 id) 캐시
+    _prefilter_cache: "OrderedDict[Tuple[str, str], Tuple[int, List[str]]]" = OrderedDict()
+    _prefilter_lock = threading.Lock()
+    # 스키마를 확인해 sqlite 직접 조회를 사용할 컬렉션 이름
+    _prefilter_collections: set = set()
+    # HNSW 세그먼트별 (진행 중인 대량 적재 수, 이전 batch 설정)
+    _bulk_loads: Dict[int, Tuple[int, Tuple[int, int]]] = {}
+    _bulk_load_lock = threading.Lock()
+
     def __new__(cls):
-        if not hasattr(cls, 'instance'):
-            cls.instance = super(ChromaUtils, cls).__new__(cls)
-            cls.instance.embeddings = OpenAIEmbeddings(
-                model="text-embedding-3-small",
-                dimensions=1536
+        if hasattr(cls, 'instance'):
+            return cls.instance
+        with cls._init_lock:
+            if not hasattr(cls, 'instance'):
+                instance = super(ChromaUtils, cls).__new__(cls)
+                instance.embeddings = OpenAIEmbeddings(
+                    model=EMBEDDING_MODEL,
+                    dimensions=EMBEDDING_DIMENSIONS,
+                    check_embedding_ctx_length=EMBEDDING_CHECK_CTX_LENGTH
+                )
+                instance.code_documents_vectorstore = cls._create_vectorstore(
+                    "code_documents", instance.embeddings
+                )
+                instance.hypothetical_questions_vectorstore = cls._create_vectorstore(
+                    "hypothetical_questions", instance.embeddings
+                )
+                cls.instance = instance
+        return cls.instance
+
+    @staticmethod
+    def _create_vectorstore(collection_name: str, embeddings: OpenAIEmbeddings) -> VectorStore:
+        """
+        설정된 백엔드로 컬렉션별 벡터 저장소를 생성합니다.
+
+        Args:
+            collection_name: 컬렉션 이름
+            embeddings: 임베딩 함수
+
+        Returns:
+            VectorStore: 벡터 저장소
+        """
+        if VECTOR_STORE_BACKEND == "quantized":
+            logger.info(
+                f"{collection_name}: 양자화 벡터 저장소 사용 "
+                f"(dimensions={EMBEDDING_DIMENSIONS}, quantization={VECTOR_QUANTIZATION})"
             )
-            cls.instance.code_documents_vectorstore = Chroma(
-                collection_name="code_documents",
-                embedding_function=cls.instance.embeddings,
-                persist_directory="chroma_db/code_documents"
+            return QuantizedVectorStore(
+                collection_name=collection_name,
+                embedding_function=embeddings,
+                persist_directory=os.path.join(VECTOR_DB_PATH, "quantized", collection_name),
+                dimensions=EMBEDDING_DIMENSIONS,
+                quantization=VECTOR_QUANTIZATION,
+                rerank_factor=QUANTIZED_RERANK_FACTOR,
             )
-            cls.instance.hypothetical_questions_vectorstore = Chroma(
-                collection_name="hypothetical_questions",
-                embedding_function=cls.instance.embeddings,
-                persist_directory="chroma_db/hypothetical_questions"
+
+        if VECTOR_STORE_BACKEND != "chroma":
+            raise ValueError(f"지원하지 않는 벡터 저장소입니다: {VECTOR_STORE_BACKEND}")
+
+        hnsw_params = HNSW_COLLECTION_PARAMS.get(collection_name) or None
+        if CHROMA_MODE == "http":
+            return Chroma(
+                collection_name=collection_name,
+                embedding_function=embeddings,
+                client=_get_http_client(),
+                collection_metadata=hnsw_params
             )
-        return cls.instance
-    
-    def get_code_documents_vectorstore(self) -> Chroma:
+
+        if CHROMA_MODE != "embedded":
+            raise ValueError(f"지원하지 않는 Chroma 연결 방식입니다: {CHROMA_MODE}")
+
+        vectorstore = Chroma(
+            collection_name=collection_name,
+            embedding_function=embeddings,
+            persist_directory=os.path.join(VECTOR_DB_PATH, collection_name),
+            collection_metadata=hnsw_params
+        )
+        ChromaUtils._ensure_metadata_index(collection_name)
+        if hnsw_params:
+            ChromaUtils._apply_hnsw_params(vectorstore, collection_name, hnsw_params)
+        return vectorstore
+
+    @staticmethod
+    def _ensure_metadata_index(collection_name: str) -> None:
+        """
+        내장 Chroma 의 메타데이터 테이블에 (key, string_value) 인덱스를 만들고 범위 필터 직접 조회를 켭니다.
+        Chroma 는 (id, key) 기본 키만 두므로 where 필터(검색 범위, 이전 청크 정리)가 테이블 전체를 훑습니다.
+        검증한 Chroma 버전이 아니거나 직접 조회하는 테이블/컬럼이 없으면 인덱스를 만들지 않고 where 질의를 사용합니다.
+        """
+        sqlite_path = os.path.join(VECTOR_DB_PATH, collection_name, "chroma.sqlite3")
+        if not CHROMA_SQL_PREFILTER or not os.path.exists(sqlite_path) or not _chroma_internals_supported():
+            return
+        connection = sqlite3.connect(sqlite_path)
+        try:
+            for table, columns in _PREFILTER_SCHEMA.items():
+                existing = {row[1] for row in connection.execute(f"PRAGMA table_info({table})")}
+                missing = [column for column in columns if column not in existing]
+                if missing:
+                    _warn_fallback("검색 범위 사전 조회", f"{table} 테이블에 {', '.join(missing)} 컬럼 없음")
+                    return
+            connection.execute(
+                "CREATE INDEX IF NOT EXISTS embedding_metadata_key_string_value "
+                "ON embedding_metadata (key, string_value)"
+            )
+            connection.commit()
+            ChromaUtils._prefilter_collections.add(collection_name)
+        except sqlite3.Error as e:
+            logger.warning(f"{collection_name} 메타데이터 인덱스 생성 실패: {e}")
+        finally:
+            connection.close()
+
+    @staticmethod
+    def _get_hnsw_segment(vectorstore: VectorStore):
+        """
+        내장 Chroma 컬렉션의 영구 HNSW 세그먼트를 반환합니다.
+
+        Returns:
+            Optional[PersistentLocalHnswSegment]: 세그먼트 (Chroma 서버 모드, 양자화 저장소이거나 조회 실패 시 None)
+        """
+        if CHROMA_MODE != "embedded" or not isinstance(vectorstore, Chroma) or not _chroma_internals_supported():
+            return None
+        try:
+            from chromadb.segment import VectorReader
+            # _resize_hnsw_batch 에서 사용하는 모듈도 미리 확인
+            from chromadb.segment.impl.vector.batch import Batch  # noqa: F401
+            from chromadb.segment.impl.vector.brute_force_index import BruteForceIndex  # noqa: F401
+            from chromadb.utils.read_write_lock import WriteRWLock  # noqa: F401
+
+            segment = vectorstore._client._server._manager.get_segment(vectorstore._collection.id, VectorReader)
+        except Exception as e:
+            _warn_fallback("HNSW 대량 적재/설정", f"세그먼트 조회 실패: {e}")
+            return None
+        missing = [attr for attr in _HNSW_SEGMENT_ATTRS if not hasattr(segment, attr)]
+        if missing:
+            _warn_fallback("HNSW 대량 적재/설정", f"세그먼트에 {', '.join(missing)} 없음")
+            return None
+        return segment
+
+    @staticmethod
+    def _apply_hnsw_params(vectorstore: VectorStore, collection_name: str, hnsw_params: Dict[str, int]) -> None:
+        """
+        기존 컬렉션에 search_ef 를 적용하고, 생성 시에만 정해지는 M / construction_ef 가 설정과 다르면 알립니다.
+        (Chroma 는 컬렉션 메타데이터가 바뀌어도 이미 만든 세그먼트의 설정을 바꾸지 않음)
+        """
+        segment = ChromaUtils._get_hnsw_segment(vectorstore)
+        if segment is None:
+            return
+
+        search_ef = hnsw_params.get("hnsw:search_ef")
+        if search_ef is not None and segment._params.search_ef != search_ef:
+            segment._params.search_ef = search_ef
+            if segment._index is not None:
+                segment._index.set_ef(search_ef)
+
+        for key, current in (("hnsw:M", segment._params.M), ("hnsw:construction_ef", segment._params.construction_ef)):
+            if key in hnsw_params and hnsw_params[key] != current:
+                logger.warning(
+                    f"{collection_name}: {key}={hnsw_params[key]} 은 컬렉션 생성 시에만 적용됩니다. "
+                    f"(현재 {current}, 적용하려면 컬렉션을 삭제 후 다시 수집)"
+                )
+
+    @staticmethod
+    def _resize_hnsw_batch(segment, batch_size: int, sync_threshold: int, persist: bool = False) -> Tuple[int, int]:
+        """
+        HNSW 세그먼트가 인덱스에 한 번에 추가할 벡터 수와 디스크 동기화 주기를 바꿉니다.
+        대기 중인 벡터의 brute-force 버퍼는 크기가 고정이므로 남은 벡터를 먼저 인덱스에 반영한 뒤 새 크기로 만듭니다.
+
+        Args:
+            segment: PersistentLocalHnswSegment
+            batch_size: 인덱스에 한 번에 추가할 벡터 수
+            sync_threshold: 디스크에 동기화할 추가 벡터 수
+            persist: 변경 후 인덱스를 디스크에 저장할지 여부
+
+        Returns:
+            Tuple[int, int]: 이전 (batch_size, sync_threshold)
+        """
+        from chromadb.segment.impl.vector.batch import Batch
+        from chromadb.segment.impl.vector.brute_force_index import BruteForceIndex
+        from chromadb.utils.read_write_lock import WriteRWLock
+
+        with WriteRWLock(segment._lock):
+            previous = (segment._batch_size, segment._sync_threshold)
+            segment._batch_size = batch_size
+            segment._sync_threshold = sync_threshold
+            if segment._index_initialized:
+                if len(segment._curr_batch) > 0:
+                    segment._apply_batch(segment._curr_batch)
+                    segment._curr_batch = Batch()
+                segment._brute_force_index = BruteForceIndex(
+                    size=batch_size,
+                    dimensionality=segment._dimensionality,
+                    space=segment._params.space,
+                )
+                if persist:
+                    segment._persist()
+        return previous
+
+    @staticmethod
+    @contextlib.contextmanager
+    def bulk_load(vectorstore: VectorStore) -> Iterator[None]:
+        """
+        대량 적재 모드로 문서를 추가합니다.
+        블록 안에서는 내장 Chroma 가 BULK_LOAD_BATCH_SIZE 개씩 모아 HNSW 인덱스에 추가하고 중간 디스크 동기화를 생략하며,
+        블록이 끝나면 남은 벡터를 인덱스에 반영하고 한 번만 저장(finalize)한 뒤 원래 설정으로 되돌립니다.
+        동기화하지 않은 벡터도 Chroma 의 sqlite 로그에 남아 있으므로 중간에 종료되면 다음 시작 시 다시 반영됩니다.
+        Chroma 서버 모드와 양자화 저장소에서는 아무것도 하지 않습니다.
+
+        Args:
+            vectorstore: 벡터 저장소
+        """
+        segment = ChromaUtils._get_hnsw_segment(vectorstore)
+        if segment is None:
+            yield
+            return
+
+        # 여러 수집 작업이 같은 컬렉션에 동시에 적재하면 마지막 작업이 끝날 때 원래 설정으로 되돌림
+        with ChromaUtils._bulk_load_lock:
+            depth, previous = ChromaUtils._bulk_loads.get(id(segment), (0, None))
+            if depth == 0:
+                try:
+                    previous = ChromaUtils._resize_hnsw_batch(segment, BULK_LOAD_BATCH_SIZE, sync_threshold=sys.maxsize)
+                except Exception as e:
+                    _warn_fallback("HNSW 대량 적재/설정", e)
+                    previous = None
+            if previous is not None:
+                ChromaUtils._bulk_loads[id(segment)] = (depth + 1, previous)
+        if previous is None:
+            yield
+            return
+        try:
+            yield
+        finally:
+            with ChromaUtils._bulk_load_lock:
+                depth, previous = ChromaUtils._bulk_loads.pop(id(segment))
+                if depth > 1:
+                    ChromaUtils._bulk_loads[id(segment)] = (depth - 1, previous)
+                else:
+                    ChromaUtils._resize_hnsw_batch(segment, *previous, persist=True)
+
+    def get_code_documents_vectorstore(self) -> VectorStore:
         return self.code_documents_vectorstore
-    
-    def get_hypothetical_questions_vectorstore(self) -> Chroma:
-        return self.hypothetical_questions_vectorstore
\ No newline at end of file
+
+    def get_hypothetical_questions_vectorstore(self) -> VectorStore:
+        return self.hypothetical_questions_vectorstore
+
+    def embed_queries(self, queries: List[str]) -> List[List[float]]:
+        """여러 질의를 한 번의 임베딩 요청으로 임베딩합니다."""
+        _record_embedding_tokens(queries, "query")
+        return self.embeddings.embed_documents(queries)
+
+    @staticmethod
+    def similarity_search_by_vectors(
+        vectorstore: VectorStore,
+        embeddings: List[List[float]],
+        k: int,
+        filter: Optional[Dict[str, Any]] = None,
+    ) -> List[List[Tuple[Document, float]]]:
+        """
+        여러 질의 벡터를 저장소에 한 번의 다중 질의로 검색합니다.
+
+        Args:
+            vectorstore: 벡터 저장소
+            embeddings: 질의 벡터 목록
+            k: 질의별 최대 결과 수
+            filter: 메타데이터 필터 (Chroma where 문법)
+
+        Returns:
+            List[List[Tuple[Document, float]]]: 질의별 (문서, relevance score) 목록
+        """
+        if not embeddings:
+            return []
+
+        relevance_fn = vectorstore._select_relevance_score_fn()
+
+        if isinstance(vectorstore, QuantizedVectorStore):
+            batch = vectorstore.batch_similarity_search_by_vector_with_score(embeddings, k=k, filter=filter)
+            return [[(doc, relevance_fn(distance)) for doc, distance in results] for results in batch]
+
+        if filter:
+            prefiltered = ChromaUtils._prefiltered_search(vectorstore, embeddings, k, filter)
+            if prefiltered is not None:
+                return [[(doc, relevance_fn(distance)) for doc, distance in results] for results in prefiltered]
+
+        response = vectorstore._collection.query(
+            query_embeddings=embeddings,
+            n_results=k,
+            where=filter,
+            include=["documents", "metadatas", "distances"],
+        )
+        results = []
+        for ids, documents, metadatas, distances in zip(
+            response["ids"], response["documents"], response["metadatas"], response["distances"]
+        ):
+            results.append([
+                (Document(id=id_, page_content=document, metadata=metadata or {}), relevance_fn(distance))
+                for id_, document, metadata, distance in zip(ids, documents, metadatas, distances)
+            ])
+        return results
+
+    @staticmethod
+    def get_documents(vectorstore: VectorStore, ids: List[str]) -> List[Document]:
+        """
+        ID 로 문서를 조회합니다. (없는 ID 는 건너뜀)
+
+        Args:
+            vectorstore: 벡터 저장소
+            ids: 문서 ID 목록
+
+        Returns:
+            List[Document]: 조회한 문서 (id 포함)
+        """
+        documents: List[Document] = []
+        for start in range(0, len(ids), PAGE_SIZE):
+            page = vectorstore.get(ids=ids[start:start + PAGE_SIZE], include=["documents", "metadatas"])
+            documents.extend(
+                Document(id=id_, page_content=document, metadata=metadata or {})
+                for id_, document, metadata in zip(page["ids"], page["documents"], page["metadatas"])
+            )
+        return documents
+
+    @staticmethod
+    def _where_to_sql(where: Dict[str, Any]) -> Optional[Tuple[str, List[Any]]]:
+        """
+        문자열 동등 / $in 조건과 $and / $or 조합으로 된 where 필터를 embedding_metadata id 를 고르는 SQL 로 바꿉니다.
+        (key, string_value) 인덱스를 그대로 타는 형태만 변환합니다.
+
+        Returns:
+            Optional[Tuple[str, List[Any]]]: (SQL, 파라미터) (변환할 수 없는 조건이 있으면 None)
+        """
+        parts: List[Tuple[str, List[Any]]] = []
+        for key, value in where.items():
+            if key in ("$and", "$or"):
+                subqueries = [ChromaUtils._where_to_sql(condition) for condition in value]
+                if not subqueries or any(subquery is None for subquery in subqueries):
+                    return None
+                operator = " INTERSECT " if key == "$and" else " UNION "
+                parts.append((
+                    operator.join(f"SELECT id FROM ({sql})" for sql, _ in subqueries),
+                    [param for _, params in subqueries for param in params],
+                ))
+                continue
+            if key.startswith("$"):
+                return None
+
+            if isinstance(value, dict):
+                if len(value) != 1:
+                    return None
+                operator, value = next(iter(value.items()))
+                if operator == "$eq":
+                    value = [value]
+                elif operator != "$in":
+                    return None
+            else:
+                value = [value]
+            if not value or not all(isinstance(item, str) for item in value):
+                return None
+            placeholders = ", ".join("?" * len(value))
+            parts.append((
+                f"SELECT id FROM embedding_metadata WHERE key = ? AND string_value IN ({placeholders})",
+                [key, *value],
+            ))
+
+        if not parts:
+            return None
+        return (
+            " INTERSECT ".join(f"SELECT id FROM ({sql})" for sql, _ in parts),
+            [param for _, params in parts for param in params],
+        )
+
+    @staticmethod
+    def _prefiltered_ids(metadata_segment, where: Dict[str, Any]) -> Optional[List[str]]:
+        """
+        where 필터를 만족하는 문서 id 를 내장 Chroma sqlite 에서 바로 조회합니다.
+        Chroma 의 where 질의는 일치하는 모든 문서의 메타데이터 레코드를 만든 뒤 id 만 쓰므로
+        범위가 넓을수록 느려집니다. 여기서는 id 만 읽고, 컬렉션의 max_seq_id 가 같으면 이전 결과를 재사용합니다.
+
+        Returns:
+            Optional[List[str]]: 문서 id 목록 (변환할 수 없는 필터이면 None)
+        """
+        translated = ChromaUtils._where_to_sql(where)
+        if translated is None:
+            return None
+        sql, params = translated
+
+        segment_id = str(metadata_segment._id)
+        cache_key = (segment_id, json.dumps(where, sort_keys=True))
+        seq_id = metadata_segment.max_seqid()
+        with ChromaUtils._prefilter_lock:
+            cached = ChromaUtils._prefilter_cache.get(cache_key)
+            if cached is not None and cached[0] == seq_id:
+                ChromaUtils._prefilter_cache.move_to_end(cache_key)
+                return cached[1]
+
+        with metadata_segment._db.tx() as cursor:
+            rows = cursor.execute(
+                f"SELECT embedding_id FROM embeddings WHERE segment_id = ? AND id IN ({sql})",
+                [segment_id, *params],
+            ).fetchall()
+        ids = [row[0] for row in rows]
+
+        with ChromaUtils._prefilter_lock:
+            ChromaUtils._prefilter_cache[cache_key] = (seq_id, ids)
+            ChromaUtils._prefilter_cache.move_to_end(cache_key)
+            while len(ChromaUtils._prefilter_cache) > SCOPE_FILTER_CACHE_SIZE:
+                ChromaUtils._prefilter_cache.popitem(last=False)
+        return ids
+
+    @staticmethod
+    def _prefiltered_search(
+        vectorstore: VectorStore,
+        embeddings: List[List[float]],
+        k: int,
+        where: Dict[str, Any],
+    ) -> Optional[List[List[Tuple[Document, float]]]]:
+        """
+        내장 Chroma 에서 허용 id 를 먼저 구한 뒤 HNSW 세그먼트를 직접 검색하고, 상위 k 개 문서만 가져옵니다.
+
+        Returns:
+            Optional[List[List[Tuple[Document, float]]]]: 질의별 (문서, 거리) 목록
+                (서버 모드, 스키마 확인 전/실패, 변환할 수 없는 필터, 조회 실패 시 None → collection.query 로 검색)
+        """
+        if CHROMA_MODE != "embedded" or not isinstance(vectorstore, Chroma):
+            return None
+        if vectorstore._collection.name not in ChromaUtils._prefilter_collections:
+            return None
+        try:
+            from chromadb.segment import MetadataReader, VectorReader
+            from chromadb.types import VectorQuery
+
+            manager = vectorstore._client._server._manager
+            collection_id = vectorstore._collection.id
+            ids = ChromaUtils._prefiltered_ids(manager.get_segment(collection_id, MetadataReader), where)
+            if ids is None:
+                return None
+            if not ids:
+                # allowed_ids 가 비어 있으면 Chroma 는 필터 없이 검색하므로 직접 빈 결과를 반환
+                return [[] for _ in embeddings]
+
+            hits = manager.get_segment(collection_id, VectorReader).query_vectors(VectorQuery(
+                vectors=embeddings,
+                k=min(k, len(ids)),
+                allowed_ids=ids,
+                include_embeddings=False,
+                options=None,
+            ))
+            hit_ids = list(dict.fromkeys(hit["id"] for results in hits for hit in results))
+            entries = vectorstore._collection.get(ids=hit_ids, include=["documents", "metadatas"]) if hit_ids else None
+        except Exception as e:
+            logger.warning(f"범위 필터 사전 조회 실패, Chroma where 질의로 검색합니다: {e}")
+            return None
+
+        documents = {}
+        if entries:
+            for id_, document, metadata in zip(entries["ids"], entries["documents"], entries["metadatas"]):
+                documents[id_] = Document(id=id_, page_content=document or "", metadata=metadata or {})
+        return [
+            [(documents[hit["id"]], hit["distance"]) for hit in results if hit["id"] in documents]
+            for results in hits
+        ]
+
+    @staticmethod
+    def _hash(*parts: Any) -> str:
+        return hashlib.sha256("\0".join(str(part) for part in parts).encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def chunk_id(document: Document) -> str:
+        """
+        (저장소, 참조, 파일 경로, 청크 시작 위치, 내용 해시)로 청크의 고정 ID를 만듭니다.
+        같은 저장소를 다시 수집해도 변경되지 않은 청크는 같은 ID를 가집니다.
+
+        Args:
+            document: 분할된 문서
+
+        Returns:
+            str: 청크 ID
+        """
+        metadata = document.metadata
+        content_hash = hashlib.sha256(document.page_content.encode("utf-8")).hexdigest()
+        return ChromaUtils._hash(
+            metadata.get("repo_url", ""),
+            metadata.get("ref", ""),
+            metadata.get("file_path") or f"{metadata.get('path', '')}/{metadata.get('filename', '')}",
+            metadata.get("content_type", ""),
+            metadata.get("start_index", ""),
+            content_hash,
+        )
+
+    @staticmethod
+    def question_id(document: Document) -> str:
+        """가설 질문 문서의 고정 ID (원본 청크 ID + 질문 내용)"""
+        return ChromaUtils._hash(document.metadata.get("chunk_id", ""), document.page_content)
+
+    @staticmethod
+    def _content_key(document: str, metadata: Dict[str, Any]) -> str:
+        """
+        ID 없이 저장된 기존 문서의 중복 판별 키
+        chunk_id 와 같이 파일 경로와 시작 위치를 포함하므로, 같은 파일의 다른 위치에 있는 같은 내용(라이선스 헤더,
+        반복되는 보일러플레이트 등)은 중복으로 보지 않습니다.
+        """
+        return ChromaUtils._hash(
+            metadata.get("repo_url", ""),
+            metadata.get("ref", ""),
+            metadata.get("file_path", ""),
+            metadata.get("path", ""),
+            metadata.get("filename", ""),
+            metadata.get("content_type", ""),
+            metadata.get("start_index", ""),
+            metadata.get("chunk_id", ""),
+            document,
+        )
+
+    @staticmethod
+    def upsert_documents(vectorstore: VectorStore, documents: List[Document], ids: List[str]) -> List[str]:
+        """
+        고정 ID로 문서를 upsert 합니다. 같은 ID가 여러 번 나오면 마지막 문서만 사용합니다.
+
+        Args:
+            vectorstore: 벡터 저장소
+            documents: 저장할 문서 목록
+            ids: 문서별 ID
+
+        Returns:
+            List[str]: 저장된 고유 ID 목록
+        """
+        unique: Dict[str, Document] = {}
+        for id_, document in zip(ids, documents):
+            unique[id_] = document
+        if unique:
+            _record_embedding_tokens([document.page_content for document in unique.values()], "index")
+            # Chroma/QuantizedVectorStore 모두 ID가 주어지면 upsert 로 동작
+            vectorstore.add_documents(list(unique.values()), ids=list(unique.keys()))
+        return list(unique.keys())
+
+    @staticmethod
+    def upsert_embeddings(
+        vectorstore: VectorStore,
+        ids: List[str],
+        embeddings: Any,
+        documents: List[str],
+        metadatas: List[Dict[str, Any]],
+    ) -> None:
+        """
+        미리 계산된 임베딩을 고정 ID로 upsert 합니다. (임베딩 API 를 호출하지 않음, 스냅샷 불러오기용)
+        QuantizedVectorStore 는 파일 끝에 덧붙이기만 하고 확정하지 않으므로 적재가 끝난 뒤 compact(persist) 해야 합니다.
+
+        Args:
+            vectorstore: 벡터 저장소
+            ids: 문서 ID 목록
+            embeddings: 문서별 임베딩 ((n, dim) 배열 또는 리스트)
+            documents: 문서 본문 목록
+            metadatas: 문서별 메타데이터
+        """
+        if not ids:
+            return
+        if isinstance(vectorstore, QuantizedVectorStore):
+            vectorstore.add_embeddings(documents, embeddings, metadatas=metadatas, ids=ids, persist=False)
+            return
+        # Chroma 0.4 는 numpy 배열을 받지 않음
+        embeddings = embeddings.tolist() if hasattr(embeddings, "tolist") else embeddings
+        vectorstore._collection.upsert(ids=ids, embeddings=embeddings, documents=documents, metadatas=metadatas)
+
+    @staticmethod
+    def _iter_entries(vectorstore: VectorStore, where: Optional[Dict[str, Any]] = None, include: Optional[List[str]] = None):
+        """컬렉션 문서를 PAGE_SIZE 단위로 순회합니다."""
+        offset = 0
+        while True:
+            page = vectorstore.get(where=where, include=include or [], limit=PAGE_SIZE, offset=offset)
+            ids = page.get("ids") or []
+            if not ids:
+                return
+            yield page
+            if len(ids) < PAGE_SIZE:
+                return
+            offset += PAGE_SIZE
+
+    @staticmethod
+    def delete_stale_documents(vectorstore: VectorStore, repo_url: str, ref: str, keep_ids: List[str]) -> int:
+        """
+        저장소/참조에 속하지만 이번 수집 결과에 없는 문서(삭제·변경된 파일의 이전 청크)를 제거합니다.
+        ref 메타데이터가 없는 이전 버전 문서도 같은 저장소라면 함께 제거합니다.
+
+        Returns:
+            int: 삭제된 문서 수
+        """
+        keep = set(keep_ids)
+        stale_ids: List[str] = []
+        for page in ChromaUtils._iter_entries(vectorstore, where={"repo_url": repo_url}, include=["metadatas"]):
+            for id_, metadata in zip(page["ids"], page["metadatas"]):
+                if id_ not in keep and (metadata or {}).get("ref", ref) == ref:
+                    stale_ids.append(id_)
+
+        for start in range(0, len(stale_ids), PAGE_SIZE):
+            vectorstore.delete(ids=stale_ids[start:start + PAGE_SIZE])
+        return len(stale_ids)
+
+    @staticmethod
+    def dedup_collection(vectorstore: VectorStore) -> int:
+        """
+        같은 내용이 여러 ID로 중복 저장된 문서를 하나만 남기고 삭제합니다.
+        (ID 없이 add 되던 이전 버전에서 재수집마다 쌓인 중복 제거용)
+
+        Returns:
+            int: 삭제된 문서 수
+        """
+        seen: Dict[str, str] = {}
+        duplicate_ids: List[str] = []
+        for page in ChromaUtils._iter_entries(vectorstore, include=["documents", "metadatas"]):
+            for id_, document, metadata in zip(page["ids"], page["documents"], page["metadatas"]):
+                key = ChromaUtils._content_key(document or "", metadata or {})
+                if key in seen:
+                    duplicate_ids.append(id_)
+                else:
+                    seen[key] = id_
+
+        for start in range(0, len(duplicate_ids), PAGE_SIZE):
+            vectorstore.delete(ids=duplicate_ids[start:start + PAGE_SIZE])
+        return len(duplicate_ids)
+
+    @staticmethod
+    def compact(vectorstore: VectorStore, collection_name: str) -> None:
+        """
+        삭제로 생긴 빈 공간을 회수합니다.
+        QuantizedVectorStore 는 살아 있는 행만 새 세대 파일로 다시 쓰고, 내장 Chroma 는 sqlite 파일을 VACUUM 합니다.
+        Chroma 서버 모드에서는 서버가 저장소를 관리하므로 아무것도 하지 않습니다.
+        """
+        if isinstance(vectorstore, QuantizedVectorStore):
+            vectorstore.persist()
+            return
+
+        if CHROMA_MODE == "http":
+            return
+
+        sqlite_path = os.path.join(VECTOR_DB_PATH, collection_name, "chroma.sqlite3")
+        if os.path.exists(sqlite_path):
+            connection = sqlite3.connect(sqlite_path)
+            try:
+                connection.execute("VACUUM")
+            finally:
+                connection.close()
@@ -0,0 +1,165 @@
+import codecs
+import io
+import mmap
+import os
+import tempfile
+from dataclasses import dataclass
+from typing import Iterable, Optional, Union
+
+from src.config.log_config import Logger
+from src.config.metrics_config import Metrics
+
+logger = Logger()
+metrics = Metrics()
+
+# 이 크기를 넘는 파일은 다운로드하지 않음 (목록의 size 로 먼저 거르고, 스트리밍 중에도 넘으면 중단)
+MAX_FILE_BYTES: int = int(os.getenv("MAX_FILE_BYTES", str(10 * 1024 * 1024)))
+# 이 크기를 넘는 파일 내용은 메모리 대신 임시 파일에 저장하고 문서 로드 시 mmap 으로 읽음
+SPOOL_THRESHOLD_BYTES: int = int(os.getenv("SPOOL_THRESHOLD_BYTES", str(256 * 1024)))
+# 임시 파일 디렉토리 (없으면 시스템 임시 디렉토리)
+DOWNLOAD_SPOOL_DIR: Optional[str] = os.getenv("DOWNLOAD_SPOOL_DIR") or None
+STREAM_CHUNK_BYTES: int = 64 * 1024
+# 바이너리 판별에 사용할 앞부분 크기
+SNIFF_BYTES: int = 8 * 1024
+# 가치 판단(_is_valuable_text)에 사용할 앞부분 글자 수
+HEAD_CHARS: int = 4 * 1024
+
+
+@dataclass
+class SpooledFile:
+    """임시 파일에 저장한 다운로드 내용"""
+    path: str
+    size: int
+    head: str
+
+
+def looks_binary(head: bytes) -> bool:
+    """
+    앞부분 바이트로 바이너리 파일인지 판별합니다. (NUL 바이트 또는 UTF-8 로 읽을 수 없는 내용)
+
+    Args:
+        head: 파일 앞부분 바이트
+
+    Returns:
+        bool: 바이너리로 보이면 True
+    """
+    head = head[:SNIFF_BYTES]
+    if b"\0" in head:
+        return True
+    try:
+        # 잘린 마지막 멀티바이트 문자는 오류로 보지 않음
+        codecs.getincrementaldecoder("utf-8")().decode(head, final=False)
+    except UnicodeDecodeError:
+        return True
+    return False
+
+
+def _spool_file() -> "io.BufferedWriter":
+    if DOWNLOAD_SPOOL_DIR:
+        os.makedirs(DOWNLOAD_SPOOL_DIR, exist_ok=True)
+    return tempfile.NamedTemporaryFile(dir=DOWNLOAD_SPOOL_DIR, prefix="download_", suffix=".spool", delete=False)
+
+
+def spool_chunks(chunks: Iterable[bytes], name: str) -> Union[str, SpooledFile, None]:
+    """
+    스트리밍 응답을 읽어 작은 파일은 문자열로, SPOOL_THRESHOLD_BYTES 를 넘으면 임시 파일로 저장합니다.
+    첫 부분이 바이너리로 보이거나 MAX_FILE_BYTES 를 넘으면 읽기를 중단합니다.
+    임시 파일에 쓰는 내용은 조각마다 UTF-8 로 검사해, 뒷부분이 깨진 파일을 문서 로드 단계까지 넘기지 않습니다.
+
+    Args:
+        chunks: 응답 본문 조각 (iter_content)
+        name: 로그에 사용할 파일 이름
+
+    Returns:
+        Union[str, SpooledFile, None]: 내용 (바이너리, 크기 초과, 디코딩 불가이면 None)
+    """
+    buffer = bytearray()
+    spool = None
+    size = 0
+    # 임시 파일 내용 검사용 (조각 경계에서 잘린 멀티바이트 문자는 다음 조각과 이어서 검사)
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    try:
+        for chunk in chunks:
+            if not chunk:
+                continue
+            if size == 0 and looks_binary(chunk):
+                metrics.inc("download_aborted_total", reason="binary")
+                logger.debug("바이너리 파일 다운로드 중단: %s", name)
+                return None
+            size += len(chunk)
+            if size > MAX_FILE_BYTES:
+                metrics.inc("download_aborted_total", reason="too_large")
+                logger.warning(f"파일이 너무 큼, 다운로드 중단: {name} ({size} bytes 초과)")
+                return None
+
+            if spool is None:
+                buffer += chunk
+                if len(buffer) > SPOOL_THRESHOLD_BYTES:
+                    decoder.decode(buffer)
+                    spool = _spool_file()
+                    spool.write(buffer)
+                    head = bytes(buffer[:HEAD_CHARS * 4])
+                    buffer = bytearray()
+            else:
+                decoder.decode(chunk)
+                spool.write(chunk)
+
+        if spool is None:
+            return buffer.decode("utf-8")
+
+        decoder.decode(b"", final=True)
+        spool.close()
+        metrics.inc("download_spooled_total")
+        metrics.inc("download_spooled_bytes_total", size)
+        spooled = SpooledFile(
+            path=spool.name,
+            size=size,
+            head=codecs.getincrementaldecoder("utf-8")(errors="ignore").decode(head)[:HEAD_CHARS],
+        )
+        spool = None
+        return spooled
+    except UnicodeDecodeError:
+        logger.debug("UTF-8 로 읽을 수 없는 파일: %s", name)
+        return None
+    finally:
+        # 중단/실패 시 쓰던 임시 파일 삭제
+        if spool is not None:
+            spool.close()
+            remove(spool.name)
+
+
+def spool_text(text: str) -> Union[str, SpooledFile]:
+    """이미 메모리에 있는 큰 텍스트(블롭 저장소 적중)를 임시 파일로 옮깁니다. 작은 텍스트는 그대로 반환합니다."""
+    data = text.encode("utf-8")
+    if len(data) <= SPOOL_THRESHOLD_BYTES:
+        return text
+    with _spool_file() as spool:
+        spool.write(data)
+    return SpooledFile(path=spool.name, size=len(data), head=text[:HEAD_CHARS])
+
+
+def read_spooled_text(path: str) -> str:
+    """
+    임시 파일을 mmap 으로 열어 중간 bytes 복사 없이 문자열로 디코딩합니다.
+
+    Args:
+        path: 임시 파일 경로
+
+    Returns:
+        str: 파일 내용
+    """
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return ""
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            return str(mapped, "utf-8")
+
+
+def remove(path: Optional[str]) -> None:
+    """임시 파일을 삭제합니다. (없으면 무시)"""
+    if not path:
+        return
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
@@ -1,15 +1,34 @@
 from abc import ABC, abstractmethod
 from src.models.git_repository import RepositoryInfo, ParsedCode
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Iterator, Optional, Tuple, Union
 
 import os
 import requests
 from urllib.parse import urlparse
 import time
 import re
+from datetime import datetime
 from src.config.log_config import Logger
+from src.config.metrics_config import Metrics
+from src.utils.blob_store import BlobStore
+from src.utils.download_spool import (
+    MAX_FILE_BYTES, STREAM_CHUNK_BYTES, SpooledFile, looks_binary, remove, spool_chunks, spool_text
+)
+from src.utils.progress import report_progress
+from src.utils.rate_budget import RateBudget, get_github_budget, get_github_graphql_budget
 
 logger = Logger()
+metrics = Metrics()
+
+# 파일 내용 받기 방식: rest(파일마다 contents API 요청) | graphql(GraphQL 요청 하나로 여러 blob 의 텍스트를 받음)
+GITHUB_FETCH_STRATEGY: str = os.getenv("GITHUB_FETCH_STRATEGY", "rest")
+# GraphQL 엔드포인트 (비어 있으면 GITHUB_API_BASE 에서 유도, GitHub Enterprise 는 /api/v3 → /api/graphql)
+GITHUB_GRAPHQL_URL: str = os.getenv("GITHUB_GRAPHQL_URL", "")
+# GraphQL 요청 하나로 받을 blob 의 최대 총 바이트 (파일 목록의 size 기준) / 최대 파일 수
+GRAPHQL_BATCH_BYTES: int = int(os.getenv("GRAPHQL_BATCH_BYTES", str(1024 * 1024)))
+GRAPHQL_BATCH_MAX_FILES: int = int(os.getenv("GRAPHQL_BATCH_MAX_FILES", "100"))
+# GraphQL 한도 초과(RATE_LIMITED) 응답 후 초기화 시각까지 기다렸다가 다시 보낼 횟수
+GRAPHQL_MAX_RETRIES: int = 3
 
 class GitRepositoryUtils(ABC):
     @classmethod
@@ -19,7 +38,7 @@ class GitRepositoryUtils(ABC):
 
     @classmethod
     @abstractmethod
-    def fetch_repo_contents(cls, repo_url: str) -> List[ParsedCode]:
+    def fetch_repo_contents(cls, repo_url: str, repo_info: Optional[RepositoryInfo] = None) -> List[ParsedCode]:
         pass
     
     @staticmethod
@@ -109,15 +128,71 @@ class GitRepositoryUtils(ABC):
 
 
 class GitHubRepositoryUtils(GitRepositoryUtils):
-    GITHUB_TOKEN = os.getenv("GITHUB_TOKEN")
-    GITHUB_API_BASE = "https://api.github.com"
-    if not GITHUB_TOKEN:
-        raise ValueError("GitHub 토큰이 필요합니다. 환경 변수 GITHUB_TOKEN을 설정하세요.")
-    
-    headers = {
-        "Authorization": f"Bearer {GITHUB_TOKEN}",
-        "Accept": "application/vnd.github.v3+json"
-    }
+    # GitHub Enterprise 또는 로컬 테스트 서버(benchmarks.fake_github)를 사용할 때 변경
+    GITHUB_API_BASE = os.getenv("GITHUB_API_BASE", "https://api.github.com").rstrip("/")
+    _headers: Optional[Dict[str, str]] = None
+
+    @classmethod
+    def _get_headers(cls) -> Dict[str, str]:
+        """
+        GitHub API 인증 헤더를 반환합니다.
+        토큰 검사는 모듈 import 시점이 아니라 첫 GitHub 요청 시점에 수행합니다.
+
+        Raises:
+            ValueError: GITHUB_TOKEN 환경 변수가 없는 경우
+        """
+        if cls._headers is None:
+            github_token = os.getenv("GITHUB_TOKEN")
+            if not github_token:
+                raise ValueError("GitHub 토큰이 필요합니다. 환경 변수 GITHUB_TOKEN을 설정하세요.")
+            cls._headers = {
+                "Authorization": f"Bearer {github_token}",
+                "Accept": "application/vnd.github.v3+json"
+            }
+        return cls._headers
+
+    @classmethod
+    def _get(cls, url: str, endpoint: str, **kwargs) -> requests.Response:
+        """
+        GitHub 요청을 보내고 요청 수/응답 크기 메트릭을 기록합니다.
+        API 요청은 모든 수집 작업이 공유하는 GitHub 요청 한도(GITHUB_REQUESTS_PER_HOUR)를 차감하고,
+        한도 초과 응답을 받으면 초기화 시각까지 모든 작업의 요청을 멈춥니다.
+
+        Args:
+            url: 요청 URL
+            endpoint: 메트릭 label 로 사용할 요청 종류
+        """
+        # download_url(raw 콘텐츠)은 REST API 한도에 포함되지 않음
+        return cls._request("GET", url, endpoint, get_github_budget(), acquire=endpoint != "download", **kwargs)
+
+    @classmethod
+    def _request(
+        cls, method: str, url: str, endpoint: str, budget: RateBudget, acquire: bool = True, **kwargs
+    ) -> requests.Response:
+        """
+        요청을 보내고 메트릭을 기록합니다. 한도 초과 응답을 받으면 budget 을 초기화 시각까지 멈춥니다.
+
+        Args:
+            method: HTTP 메서드
+            url: 요청 URL
+            endpoint: 메트릭 label 로 사용할 요청 종류
+            budget: 요청이 속한 한도 (REST 요청 수 / GraphQL 포인트)
+            acquire: 요청 전에 한도를 1 만큼 차감할지 여부
+        """
+        if acquire:
+            budget.acquire()
+        response = requests.request(method, url, **kwargs)
+        metrics.inc("github_requests_total", endpoint=endpoint, status=response.status_code)
+        # 스트리밍 응답은 본문을 읽지 않음 (호출한 쪽에서 읽은 만큼 기록)
+        if not kwargs.get("stream"):
+            metrics.inc("github_response_bytes_total", len(response.content), endpoint=endpoint)
+
+        if response.status_code in (403, 429):
+            if response.headers.get("X-RateLimit-Remaining") == "0" and response.headers.get("X-RateLimit-Reset"):
+                budget.pause_until(float(response.headers["X-RateLimit-Reset"]))
+            elif response.headers.get("Retry-After", "").isdigit():
+                budget.pause_until(time.time() + int(response.headers["Retry-After"]))
+        return response
 
     @classmethod
     def parse_repo_url(cls, repo_url: str) -> RepositoryInfo:
@@ -153,91 +228,378 @@ class GitHubRepositoryUtils(GitRepositoryUtils):
         # 기본 브랜치 이름 가져오기
         api_url = f"{cls.GITHUB_API_BASE}/repos/{owner}/{repo_name}"
         
-        # cls._throttle_request()
-        response = requests.get(api_url, headers=cls.headers)
+        response = cls._get(api_url, "repo", headers=cls._get_headers())
         response.raise_for_status()
         
         data = response.json()
         branch = data.get("default_branch", "main")
         
-        return RepositoryInfo(repo_url=repo_url, owner=owner, repo_name=repo_name, branch=branch)
+        return RepositoryInfo(repo_url=repo_url, owner=owner, repo_name=repo_name, branch=branch, size=data.get("size", 0))
 
+    @classmethod
+    def get_commit_sha(cls, repo_info: RepositoryInfo) -> str:
+        """
+        브랜치(또는 참조)가 현재 가리키는 커밋 SHA 를 조회합니다.
+
+        Args:
+            repo_info: 저장소 정보 (branch 포함)
+
+        Returns:
+            str: 커밋 SHA
+        """
+        api_url = f"{cls.GITHUB_API_BASE}/repos/{repo_info.owner}/{repo_info.repo_name}/commits/{repo_info.branch}"
+        response = cls._get(api_url, "commit", headers=cls._get_headers())
+        response.raise_for_status()
+        return response.json()["sha"]
 
     @classmethod
-    def fetch_repo_contents(cls, repo_url: str) -> List[ParsedCode]:
+    def list_repositories(cls, owner: str) -> List[RepositoryInfo]:
+        """
+        조직 또는 사용자의 저장소 목록을 가져옵니다. (보관 처리된 저장소 제외)
+
+        Args:
+            owner: 조직 또는 사용자 이름
+
+        Returns:
+            List[RepositoryInfo]: 저장소 정보 목록 (기본 브랜치, 크기 포함)
+
+        Raises:
+            ValueError: 조직/사용자를 찾을 수 없는 경우
+        """
+        for kind in ("orgs", "users"):
+            repositories: List[RepositoryInfo] = []
+            page = 1
+            while True:
+                api_url = f"{cls.GITHUB_API_BASE}/{kind}/{owner}/repos?per_page=100&page={page}"
+                response = cls._get(api_url, "list_repos", headers=cls._get_headers())
+                if response.status_code == 404:
+                    break
+                response.raise_for_status()
+                items = response.json()
+                for item in items:
+                    if item.get("archived"):
+                        continue
+                    repositories.append(RepositoryInfo(
+                        repo_url=item.get("html_url") or f"https://github.com/{owner}/{item['name']}",
+                        owner=owner,
+                        repo_name=item["name"],
+                        branch=item.get("default_branch", "main"),
+                        size=item.get("size", 0),
+                    ))
+                if len(items) < 100:
+                    return repositories
+                page += 1
+
+        raise ValueError(f"GitHub 조직 또는 사용자를 찾을 수 없습니다: {owner}")
+
+
+    @classmethod
+    def fetch_repo_contents(cls, repo_url: str, repo_info: Optional[RepositoryInfo] = None) -> List[ParsedCode]:
         """
         저장소의 파일들을 처리하고 가치 있는 텍스트 파일을 반환합니다.
         
         Args:
             repo_url: GitHub 저장소 URL
+            repo_info: 이미 조회한 저장소 정보 (없으면 repo_url 로 조회)
             
         Returns:
             List[ParsedCode]: 처리된 파일 정보 목록
+
+        Raises:
+            Exception: GitHub 요청 실패 (rate limit 등). 빈 목록으로 삼키면 빈 저장소로 수집이 끝나 버리므로
+                그대로 전파해 작업이 실패하고 재시도 시 재개되도록 합니다.
         """
         try:
             start_time = time.time()
             logger.debug(f"저장소 처리 시작: {repo_url}")
             
             # 저장소 정보 가져오기
-            repo_info = cls.parse_repo_url(repo_url)
-            
-            # 저장소 내 모든 파일 수집 (BFS 방식)
-            all_files = []
-            dirs_queue = [""]  # 루트 디렉토리부터 시작
-            processed_dirs = set()
+            if repo_info is None or not repo_info.branch:
+                repo_info = cls.parse_repo_url(repo_url)
             
-            while dirs_queue:
-                current_dir = dirs_queue.pop(0)
-                
-                if current_dir in processed_dirs:
-                    continue
-                processed_dirs.add(current_dir)
-                
-                # 디렉토리 내용 가져오기
-                contents = cls._get_directory_contents(repo_info, current_dir)
-                
-                for item in contents:
-                    item_path = item.get("path", "")
-                    item_type = item.get("type", "")
-                    
-                    # 디렉토리인 경우 큐에 추가
-                    if item_type == "dir":
-                        dirs_queue.append(item_path)
-                    
-                    # 파일인 경우 처리
-                    elif item_type == "file":
-                        # 파일 확장자 체크
-                        _, ext = os.path.splitext(item_path)
-                        ext = ext.lstrip('.').lower()
-                        
-                        # 파일 내용 가져오기
-                        file_content = cls._get_file_content(repo_info, item_path)
-                        
-                        # 유효한 텍스트이고 가치 있는 내용인 경우 추가
-                        if file_content and cls._is_valuable_text(file_content, item_path):
-                            all_files.append(ParsedCode(
-                                path=item_path,
-                                name=os.path.basename(item_path),
-                                type='file',
-                                text=file_content,
-                                metadata={
-                                    'repo_url': repo_info.repo_url,
-                                    'extension': ext if ext else ''
-                                }
-                            ))
-                
-                # 로깅
-                if len(all_files) % 20 == 0 and all_files:
-                    logger.debug(f"처리 진행: {len(all_files)}개 파일, {len(processed_dirs)}개 디렉토리, 남은 디렉토리: {len(dirs_queue)}개")
+            all_files = cls.fetch_files(repo_info, cls.list_repo_files(repo_info))
             
             elapsed_time = time.time() - start_time
+            metrics.observe("repo_fetch_seconds", elapsed_time)
             logger.info(f"저장소 처리 완료: {len(all_files)}개 파일 추출 (소요 시간: {elapsed_time:.2f}초)")
             
             return all_files
             
         except Exception as e:
             logger.error(f"저장소 처리 중 오류 발생: {e}")
-            return []
+            raise
+
+    @classmethod
+    def list_repo_files(cls, repo_info: RepositoryInfo) -> List[Dict[str, Any]]:
+        """
+        저장소의 모든 파일 목록을 디렉토리 단위로 조회합니다. (BFS, 파일 내용은 받지 않음)
+
+        Args:
+            repo_info: 저장소 정보 (branch 포함)
+
+        Returns:
+            List[Dict[str, Any]]: 파일 항목 목록 (path, sha, size 포함)
+        """
+        files = []
+        dirs_queue = [""]  # 루트 디렉토리부터 시작
+        processed_dirs = set()
+
+        while dirs_queue:
+            current_dir = dirs_queue.pop(0)
+
+            if current_dir in processed_dirs:
+                continue
+            processed_dirs.add(current_dir)
+
+            for item in cls._get_directory_contents(repo_info, current_dir):
+                item_type = item.get("type", "")
+                # 디렉토리인 경우 큐에 추가
+                if item_type == "dir":
+                    dirs_queue.append(item.get("path", ""))
+                elif item_type == "file":
+                    files.append(item)
+
+        logger.debug("파일 목록 조회 완료: %d개 파일, %d개 디렉토리", len(files), len(processed_dirs))
+        return files
+
+    @classmethod
+    def fetch_files(cls, repo_info: RepositoryInfo, items: List[Dict[str, Any]]) -> List[ParsedCode]:
+        """
+        파일 목록의 내용을 받아 가치 있는 텍스트 파일만 반환합니다.
+
+        Args:
+            repo_info: 저장소 정보 (branch 포함)
+            items: list_repo_files 의 파일 항목 (path, sha, size)
+
+        Returns:
+            List[ParsedCode]: 처리된 파일 정보 목록
+        """
+        all_files = []
+        fetchable = []
+        for item in items:
+            # 목록의 크기로 너무 큰 파일은 요청 없이 제외
+            if item.get("size", 0) > MAX_FILE_BYTES:
+                logger.warning(f"파일이 너무 큼: {item.get('path', '')} ({item.get('size')} bytes)")
+                metrics.inc("files_total", result="filtered")
+                continue
+            fetchable.append(item)
+
+        # 파일 내용 가져오기 (blob SHA 가 같으면 저장소/브랜치가 달라도 캐시 재사용)
+        contents = cls._iter_file_contents(repo_info, fetchable)
+        for index, (item, file_content) in enumerate(contents, start=len(items) - len(fetchable) + 1):
+            item_path = item.get("path", "")
+            item_sha = item.get("sha", "")
+            # 파일 확장자 체크
+            _, ext = os.path.splitext(item_path)
+            ext = ext.lstrip('.').lower()
+
+            # 큰 파일은 임시 파일에 있으므로 앞부분으로 가치를 판단
+            spooled = file_content if isinstance(file_content, SpooledFile) else None
+            sample = spooled.head if spooled else file_content
+
+            # 유효한 텍스트이고 가치 있는 내용인 경우 추가
+            if sample and cls._is_valuable_text(sample, item_path):
+                metrics.inc("files_total", result="kept")
+                all_files.append(ParsedCode(
+                    path=item_path,
+                    name=os.path.basename(item_path),
+                    type='file',
+                    text="" if spooled else file_content,
+                    spool_path=spooled.path if spooled else None,
+                    metadata={
+                        'repo_url': repo_info.repo_url,
+                        'ref': repo_info.branch,
+                        'extension': ext if ext else '',
+                        'file_size': item.get("size", 0),
+                        'sha': item_sha
+                    }
+                ))
+            else:
+                if spooled:
+                    remove(spooled.path)
+                metrics.inc("files_total", result="filtered")
+
+            report_progress("fetch", index, len(items))
+            # 로깅
+            if index % 100 == 0:
+                logger.debug("처리 진행: %d/%d개 파일, %d개 추출", index, len(items), len(all_files))
+
+        return all_files
+
+    @classmethod
+    def _iter_file_contents(
+        cls, repo_info: RepositoryInfo, items: List[Dict[str, Any]]
+    ) -> Iterator[Tuple[Dict[str, Any], Union[str, SpooledFile, None]]]:
+        """
+        GITHUB_FETCH_STRATEGY 방식으로 파일 내용을 받아 목록 순서대로 돌려줍니다.
+
+        Args:
+            repo_info: 저장소 정보 (branch 포함)
+            items: 파일 항목 (path, sha, size)
+
+        Returns:
+            Iterator[Tuple[Dict[str, Any], Union[str, SpooledFile, None]]]: (파일 항목, 파일 내용/임시 파일/None)
+        """
+        if GITHUB_FETCH_STRATEGY == "graphql":
+            yield from cls._iter_graphql_contents(repo_info, items)
+            return
+        if GITHUB_FETCH_STRATEGY != "rest":
+            raise ValueError(f"지원하지 않는 파일 받기 방식입니다: {GITHUB_FETCH_STRATEGY} (지원: rest, graphql)")
+        for item in items:
+            yield item, cls._get_file_content(repo_info, item.get("path", ""), sha=item.get("sha", ""))
+
+    @classmethod
+    def _iter_graphql_contents(
+        cls, repo_info: RepositoryInfo, items: List[Dict[str, Any]]
+    ) -> Iterator[Tuple[Dict[str, Any], Union[str, SpooledFile, None]]]:
+        """
+        블롭 저장소에 없는 파일을 GRAPHQL_BATCH_BYTES / GRAPHQL_BATCH_MAX_FILES 단위로 묶어 GraphQL 요청 하나로 받습니다.
+        묶음마다 받은 내용을 목록 순서대로 돌려주므로 메모리에는 한 묶음만 남습니다.
+        """
+        blob_store = BlobStore()
+
+        def flush(batch: List[Tuple[Dict[str, Any], bool, Optional[str]]]):
+            misses = [item for item, found, _ in batch if not found]
+            fetched = cls._fetch_blobs_graphql(repo_info, misses) if misses else {}
+            for item, found, cached in batch:
+                if found:
+                    logger.debug("블롭 저장소 적중: %s (%s)", item.get("path", ""), item.get("sha", ""))
+                    yield item, spool_text(cached) if cached else cached
+                else:
+                    yield item, fetched.get(item.get("path", ""))
+
+        batch: List[Tuple[Dict[str, Any], bool, Optional[str]]] = []
+        batch_bytes = batch_misses = 0
+        for item in items:
+            found, cached = blob_store.get_text(item.get("sha", ""))
+            # 캐시 적중 내용도 묶음이 끝날 때까지 메모리에 있으므로 크기에 포함
+            size = len(cached) if found and cached else 0 if found else item.get("size", 0)
+            if batch and (batch_bytes + size > GRAPHQL_BATCH_BYTES or (not found and batch_misses >= GRAPHQL_BATCH_MAX_FILES)):
+                yield from flush(batch)
+                batch, batch_bytes, batch_misses = [], 0, 0
+            batch.append((item, found, cached))
+            batch_bytes += size
+            batch_misses += not found
+        if batch:
+            yield from flush(batch)
+
+    @classmethod
+    def _graphql_url(cls) -> str:
+        if GITHUB_GRAPHQL_URL:
+            return GITHUB_GRAPHQL_URL
+        if cls.GITHUB_API_BASE.endswith("/api/v3"):
+            return cls.GITHUB_API_BASE[:-len("/v3")] + "/graphql"
+        return f"{cls.GITHUB_API_BASE}/graphql"
+
+    @classmethod
+    def _graphql(cls, query: str, variables: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        GitHub GraphQL 요청을 보냅니다.
+        요청 전에 GraphQL 포인트 한도를 1 차감하고, 응답의 rateLimit.cost 가 더 크면 나머지를 차감합니다.
+        남은 포인트가 없으면 resetAt 까지 모든 작업의 GraphQL 요청을 멈추고, RATE_LIMITED 응답은 그 뒤에 다시 보냅니다.
+
+        Args:
+            query: GraphQL 쿼리 (rateLimit { cost remaining resetAt } 포함)
+            variables: 쿼리 변수
+
+        Returns:
+            Dict[str, Any]: 응답의 data
+
+        Raises:
+            RuntimeError: data 없이 오류만 돌아온 경우
+        """
+        budget = get_github_graphql_budget()
+        for attempt in range(GRAPHQL_MAX_RETRIES + 1):
+            response = cls._request(
+                "POST", cls._graphql_url(), "graphql", budget,
+                json={"query": query, "variables": variables}, headers=cls._get_headers(),
+            )
+            # 1차 한도(X-RateLimit-Remaining: 0) / 2차 한도(Retry-After) 초과는 _request 가 멈춘 뒤 다시 보냄
+            rate_limit_headers = response.headers.get("X-RateLimit-Remaining") == "0" or "Retry-After" in response.headers
+            if response.status_code in (403, 429) and rate_limit_headers and attempt < GRAPHQL_MAX_RETRIES:
+                continue
+            response.raise_for_status()
+            payload = response.json()
+            data = payload.get("data") or {}
+            errors = payload.get("errors") or []
+
+            rate_limit = data.get("rateLimit") or {}
+            cost = int(rate_limit.get("cost") or 1)
+            metrics.inc("github_graphql_points_total", cost)
+            if cost > 1:
+                budget.acquire(cost - 1)
+            reset_at = rate_limit.get("resetAt")
+            rate_limited = any(error.get("type") == "RATE_LIMITED" for error in errors)
+            if reset_at and (rate_limited or rate_limit.get("remaining") == 0):
+                budget.pause_until(datetime.fromisoformat(reset_at.replace("Z", "+00:00")).timestamp())
+            elif rate_limited and response.headers.get("X-RateLimit-Reset"):
+                budget.pause_until(float(response.headers["X-RateLimit-Reset"]))
+
+            if rate_limited and attempt < GRAPHQL_MAX_RETRIES:
+                continue
+            if errors and not data:
+                raise RuntimeError(f"GitHub GraphQL 요청 실패: {errors[0].get('message', errors[0])}")
+            for error in errors:
+                logger.debug("GraphQL 부분 오류: %s", error.get("message", error))
+            return data
+        raise RuntimeError("GitHub GraphQL 요청 한도 초과가 계속됩니다.")
+
+    @classmethod
+    def _fetch_blobs_graphql(cls, repo_info: RepositoryInfo, items: List[Dict[str, Any]]) -> Dict[str, Union[str, SpooledFile, None]]:
+        """
+        여러 파일의 blob 텍스트를 GraphQL 요청 하나로 받고 블롭 저장소에 저장합니다.
+        서버가 isBinary 로 알려준 바이너리 파일은 내용 없이 건너뛰고, 텍스트가 잘린(isTruncated) 큰 파일은
+        REST contents API / download_url 로 다시 받습니다.
+
+        Args:
+            repo_info: 저장소 정보 (branch 포함)
+            items: 파일 항목 (path, sha, size)
+
+        Returns:
+            Dict[str, Union[str, SpooledFile, None]]: 파일 경로 → 내용/임시 파일/None
+        """
+        variables: Dict[str, Any] = {"owner": repo_info.owner, "name": repo_info.repo_name}
+        declarations = ["$owner: String!", "$name: String!"]
+        fields = []
+        for index, item in enumerate(items):
+            variables[f"e{index}"] = f"{repo_info.branch}:{item.get('path', '')}"
+            declarations.append(f"$e{index}: String!")
+            fields.append(f"f{index}: object(expression: $e{index}) {{ ... on Blob {{ text byteSize isBinary isTruncated }} }}")
+        query = (
+            f"query({', '.join(declarations)}) {{ rateLimit {{ cost remaining resetAt }} "
+            f"repository(owner: $owner, name: $name) {{ {' '.join(fields)} }} }}"
+        )
+        logger.debug("GraphQL blob 요청: %d개 파일", len(items))
+        repository = cls._graphql(query, variables).get("repository")
+        if repository is None:
+            raise RuntimeError(f"GraphQL 로 저장소를 찾을 수 없습니다: {repo_info.repo_url}")
+
+        blob_store = BlobStore()
+        contents: Dict[str, Union[str, SpooledFile, None]] = {}
+        for index, item in enumerate(items):
+            path, sha = item.get("path", ""), item.get("sha", "")
+            blob = repository.get(f"f{index}")
+            if blob is None:
+                logger.warning(f"파일을 찾을 수 없음: {path}")
+                contents[path] = None
+                continue
+            if blob.get("isBinary"):
+                metrics.inc("github_graphql_blobs_total", result="binary")
+                blob_store.put_text(sha, None)
+                contents[path] = None
+                continue
+            if blob.get("byteSize", 0) > MAX_FILE_BYTES:
+                logger.warning(f"파일이 너무 큼: {path} ({blob.get('byteSize')} bytes)")
+                contents[path] = None
+                continue
+            if blob.get("isTruncated") or blob.get("text") is None:
+                metrics.inc("github_graphql_blobs_total", result="truncated")
+                contents[path] = cls._get_file_content(repo_info, path, sha=sha)
+                continue
+            metrics.inc("github_graphql_blobs_total", result="text")
+            blob_store.put_text(sha, blob["text"])
+            contents[path] = spool_text(blob["text"])
+        return contents
 
     @classmethod
     def _get_directory_contents(cls, repo_info: RepositoryInfo, path: str = "") -> List[Dict[str, Any]]:
@@ -257,10 +619,9 @@ class GitHubRepositoryUtils(GitRepositoryUtils):
         else:
             api_url = f"{api_url}?ref={repo_info.branch}"
         
-        logger.info(f"디렉토리 내용 조회: {path or '/'}")
+        logger.debug("디렉토리 내용 조회: %s", path or "/")
         
-        # cls._throttle_request()
-        response = requests.get(api_url, headers=cls.headers)
+        response = cls._get(api_url, "contents_dir", headers=cls._get_headers())
         
         if response.status_code == 404:
             logger.warning(f"디렉토리를 찾을 수 없음: {path}")
@@ -270,23 +631,60 @@ class GitHubRepositoryUtils(GitRepositoryUtils):
         return response.json()
     
     @classmethod
-    def _get_file_content(cls, repo_info: RepositoryInfo, path: str) -> Optional[str]:
+    def _get_file_content(
+        cls, repo_info: RepositoryInfo, path: str, sha: Optional[str] = None
+    ) -> Union[str, SpooledFile, None]:
+        """
+        파일 내용을 가져옵니다. blob SHA 가 블롭 저장소에 있으면 다운로드하지 않습니다.
+        SPOOL_THRESHOLD_BYTES 보다 큰 내용은 임시 파일로 옮겨 수집 중 메모리에 남지 않게 하며,
+        블롭 저장소에 넣으려면 전체를 메모리로 읽어야 하므로 캐시하지 않습니다.
+        
+        Args:
+            repo_info: 저장소 정보
+            path: 파일 경로
+            sha: 디렉토리 목록에서 받은 git blob SHA
+            
+        Returns:
+            Union[str, SpooledFile, None]: 파일 내용, 임시 파일 또는 None
+        """
+        blob_store = BlobStore()
+        found, content = blob_store.get_text(sha)
+        if found:
+            logger.debug("블롭 저장소 적중: %s (%s)", path, sha)
+            return spool_text(content) if content else content
+
+        content = cls._download_file_content(repo_info, path)
+        if isinstance(content, SpooledFile):
+            metrics.inc("blob_store_skipped_total", reason="spooled")
+        else:
+            blob_store.put_text(sha, content)
+        return content
+
+    @classmethod
+    def _download_file_content(cls, repo_info: RepositoryInfo, path: str) -> Union[str, SpooledFile, None]:
         """
         GitHub REST API를 사용하여 파일 내용을 가져옵니다.
+        contents API 가 내용을 주지 않는 큰 파일은 download_url 을 스트리밍으로 받아
+        앞부분이 바이너리이거나 MAX_FILE_BYTES 를 넘으면 중단하고, 큰 내용은 임시 파일에 저장합니다.
         
         Args:
             repo_info: 저장소 정보
             path: 파일 경로
             
         Returns:
-            Optional[str]: 파일 내용 또는 None
+            Union[str, SpooledFile, None]: 파일 내용, 임시 파일 또는 None
         """
         import base64
+
+        # 바이너리 파일 체크 (확장자로 간단히 확인)
+        _, ext = os.path.splitext(path.lower())
+        binary_extensions = {'.jpg', '.jpeg', '.png', '.gif', '.pdf', '.zip', '.exe'}
+        if ext in binary_extensions:
+            return None
         
         api_url = f"{cls.GITHUB_API_BASE}/repos/{repo_info.owner}/{repo_info.repo_name}/contents/{path}?ref={repo_info.branch}"
         
-        # cls._throttle_request()
-        response = requests.get(api_url, headers=cls.headers)
+        response = cls._get(api_url, "contents_file", headers=cls._get_headers())
         
         if response.status_code == 404:
             logger.warning(f"파일을 찾을 수 없음: {path}")
@@ -295,33 +693,38 @@ class GitHubRepositoryUtils(GitRepositoryUtils):
         response.raise_for_status()
         data = response.json()
         
-        # 파일이 너무 큰 경우 (GitHub API는 일정 크기 이상의 파일에 대해 다른 URL을 제공)
-        if "content" not in data and "download_url" in data:
-            # cls._throttle_request()
-            content_response = requests.get(data["download_url"])
-            content_response.raise_for_status()
-            return content_response.text
-        
-        # 바이너리 파일 체크 (확장자로 간단히 확인)
-        _, ext = os.path.splitext(path.lower())
-        binary_extensions = {'.jpg', '.jpeg', '.png', '.gif', '.pdf', '.zip', '.exe'}
-        if ext in binary_extensions:
-            return None
-        
         # 파일 크기 체크
-        if data.get("size", 0) > 10 * 1024 * 1024:  # 10MB 초과
+        if data.get("size", 0) > MAX_FILE_BYTES:
             logger.warning(f"파일이 너무 큼: {path} ({data.get('size', 0)} bytes)")
             return None
         
+        # 파일이 너무 큰 경우 (GitHub API는 1MB 를 넘는 파일의 content 를 비워 두고 download_url 만 제공)
+        if not data.get("content") and data.get("download_url"):
+            with cls._get(data["download_url"], "download", stream=True) as content_response:
+                content_response.raise_for_status()
+                read = 0
+
+                def chunks():
+                    nonlocal read
+                    for chunk in content_response.iter_content(STREAM_CHUNK_BYTES):
+                        read += len(chunk)
+                        yield chunk
+
+                content = spool_chunks(chunks(), path)
+                metrics.inc("github_response_bytes_total", read, endpoint="download")
+                return content
+        
         # Base64 디코딩
         try:
             content = data.get("content", "")
             if content:
                 # GitHub API는 Base64로 인코딩된 내용을 줌
                 content = content.replace('\n', '')
-                decoded_content = base64.b64decode(content).decode('utf-8')
-                return decoded_content
+                decoded = base64.b64decode(content)
+                if looks_binary(decoded):
+                    return None
+                return decoded.decode('utf-8')
             return None
         except Exception as e:
             logger.error(f"파일 내용 디코딩 실패: {path}, 오류: {e}")
-            return None
\ No newline at end of file
+            return None
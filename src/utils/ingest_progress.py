@@ -0,0 +1,172 @@
+import functools
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from src.config.log_config import Logger
+
+logger = Logger()
+
+# 수집 재개 설정
+INGEST_RESUME_ENABLED: bool = os.getenv("INGEST_RESUME_ENABLED", "true").lower() == "true"
+INGEST_STATE_PATH: str = os.getenv("INGEST_STATE_PATH", os.path.join("chroma_db", "ingest_state.sqlite3"))
+# 이 시간보다 오래된 중단 작업은 재개하지 않고 처음부터 다시 수집 (초)
+INGEST_RESUME_TTL_SECONDS: int = int(os.getenv("INGEST_RESUME_TTL_SECONDS", str(24 * 60 * 60)))
+
+
+@functools.lru_cache(maxsize=1)
+def get_checkpointer():
+    """
+    repo_to_vectordb 그래프용 LangGraph 체크포인터를 반환합니다.
+    langgraph-checkpoint-sqlite 가 설치되어 있으면 INGEST_STATE_PATH 에 영구 저장하고,
+    없으면 메모리에 저장합니다. (같은 서버 프로세스 안에서의 재시도만 재개 가능)
+    노드마다 문서와 청크를 포함한 상태 전체를 기록하므로 진행 중인 작업은 수집한 텍스트의 수십 배 크기를 차지할 수 있습니다.
+
+    Returns:
+        Optional[BaseCheckpointSaver]: 체크포인터 (INGEST_RESUME_ENABLED=false 이면 None)
+    """
+    if not INGEST_RESUME_ENABLED:
+        return None
+
+    try:
+        from langgraph.checkpoint.sqlite import SqliteSaver
+    except ImportError:
+        from langgraph.checkpoint.memory import MemorySaver
+        logger.warning("langgraph-checkpoint-sqlite 가 설치되어 있지 않아 메모리 체크포인트를 사용합니다. (서버 재시작 시 재개 불가)")
+        return MemorySaver()
+
+    directory = os.path.dirname(INGEST_STATE_PATH)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    connection = sqlite3.connect(INGEST_STATE_PATH, check_same_thread=False)
+    connection.execute("PRAGMA journal_mode=WAL")
+    checkpointer = SqliteSaver(connection)
+    checkpointer.setup()
+    return checkpointer
+
+
+class IngestProgress:
+    """
+    수집 작업의 배치 단위 진행 기록
+
+    LangGraph 체크포인트는 노드가 끝날 때만 저장되므로, 노드 안에서 오래 걸리는 배치 작업
+    (가설 질문 생성, 임베딩)은 배치가 끝날 때마다 여기에 결과를 기록해 두고 재시도 시 건너뜁니다.
+    항목 키는 청크 ID 처럼 내용으로 정해지는 값이므로 저장소가 바뀌었다면 자연히 다시 처리됩니다.
+
+    테이블:
+        batch_progress(job_id, stage, item_key, payload, updated_at)
+    """
+    _init_lock = threading.Lock()
+
+    def __new__(cls):
+        if hasattr(cls, 'instance'):
+            return cls.instance
+        with cls._init_lock:
+            if not hasattr(cls, 'instance'):
+                instance = super(IngestProgress, cls).__new__(cls)
+                instance._lock = threading.Lock()
+                instance._connection = None
+                if INGEST_RESUME_ENABLED:
+                    instance._open(INGEST_STATE_PATH)
+                cls.instance = instance
+        return cls.instance
+
+    def _open(self, path: str) -> None:
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("""
+            CREATE TABLE IF NOT EXISTS batch_progress (
+                job_id TEXT NOT NULL,
+                stage TEXT NOT NULL,
+                item_key TEXT NOT NULL,
+                payload TEXT,
+                updated_at REAL NOT NULL,
+                PRIMARY KEY (job_id, stage, item_key)
+            )
+        """)
+        self._connection.commit()
+
+    @property
+    def enabled(self) -> bool:
+        return self._connection is not None
+
+    @staticmethod
+    def job_id(repo_url: str, ref: str) -> str:
+        """
+        저장소 URL 과 참조로 수집 작업 ID(LangGraph thread_id)를 만듭니다.
+        같은 저장소의 다른 브랜치는 체크포인트와 배치 진행 상황을 공유하지 않습니다.
+
+        Args:
+            repo_url: GitHub 저장소 URL
+            ref: 브랜치 또는 커밋 참조
+
+        Returns:
+            str: 작업 ID
+        """
+        repo_url = repo_url.strip().rstrip('/')
+        if repo_url.endswith('.git'):
+            repo_url = repo_url[:-4]
+        return f"repo_to_vectordb:{repo_url}@{ref}"
+
+    def get_completed(self, job_id: str, stage: str) -> Dict[str, Any]:
+        """
+        단계에서 이미 처리된 항목을 조회합니다.
+
+        Args:
+            job_id: 작업 ID
+            stage: 단계 이름 (예: questions, embed_code)
+
+        Returns:
+            Dict[str, Any]: 항목 키 → 저장된 결과
+        """
+        if not self.enabled:
+            return {}
+
+        min_updated_at = time.time() - INGEST_RESUME_TTL_SECONDS
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT item_key, payload FROM batch_progress WHERE job_id = ? AND stage = ? AND updated_at >= ?",
+                (job_id, stage, min_updated_at)
+            ).fetchall()
+        return {key: json.loads(payload) if payload is not None else None for key, payload in rows}
+
+    def mark_completed(self, job_id: str, stage: str, items: Dict[str, Any]) -> None:
+        """배치 처리 결과를 한 트랜잭션으로 기록합니다."""
+        if not self.enabled or not items:
+            return
+
+        now = time.time()
+        with self._lock:
+            self._connection.executemany(
+                "INSERT OR REPLACE INTO batch_progress (job_id, stage, item_key, payload, updated_at) VALUES (?, ?, ?, ?, ?)",
+                [(job_id, stage, key, json.dumps(value, ensure_ascii=False), now) for key, value in items.items()]
+            )
+            self._connection.commit()
+
+    def clear(self, job_id: str, expired_only: bool = False) -> None:
+        """
+        작업의 진행 기록을 삭제합니다.
+
+        Args:
+            job_id: 작업 ID
+            expired_only: True 이면 INGEST_RESUME_TTL_SECONDS 보다 오래된 기록만 삭제
+        """
+        if not self.enabled:
+            return
+
+        with self._lock:
+            if expired_only:
+                self._connection.execute(
+                    "DELETE FROM batch_progress WHERE job_id = ? AND updated_at < ?",
+                    (job_id, time.time() - INGEST_RESUME_TTL_SECONDS)
+                )
+            else:
+                self._connection.execute("DELETE FROM batch_progress WHERE job_id = ?", (job_id,))
+            self._connection.commit()
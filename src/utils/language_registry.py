@@ -0,0 +1,231 @@
+"""
+파일 이름 / 확장자 / shebang 으로 언어를 판별하고, 언어별 파서와 분할기를 프로세스 전체에서 하나씩 재사용합니다.
+
+언어 이름(PYTHON, JS, ...)은 문서 메타데이터의 language 값과 검색 범위 필터에 그대로 사용됩니다.
+"""
+
+import copy
+import functools
+import os
+import re
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from langchain_community.document_loaders.parsers import LanguageParser
+from langchain_core.documents import Document
+from langchain_community.document_loaders.parsers.language.language_parser import LANGUAGE_SEGMENTERS
+from langchain_text_splitters import Language, RecursiveCharacterTextSplitter
+
+from src.config.log_config import Logger
+from src.utils.token_utils import CHARS_PER_TOKEN, CHUNK_LENGTH_UNIT, count_tokens
+
+logger = Logger()
+
+UNKNOWN_LANGUAGE: str = "UNKNOWN"
+DEFAULT_CHUNK_SIZE: int = 1000
+DEFAULT_CHUNK_OVERLAP: int = 200
+
+
+@dataclass(frozen=True)
+class LanguageSpec:
+    """언어 하나의 판별 규칙과 파서/분할기 설정"""
+    name: str
+    extensions: Tuple[str, ...] = ()
+    # 확장자 없이 이름으로 판별하는 파일 (소문자로 비교)
+    filenames: Tuple[str, ...] = ()
+    # shebang 인터프리터 이름 (버전 숫자 제외, 예: python3.11 -> python)
+    interpreters: Tuple[str, ...] = ()
+    # LanguageParser 세그먼터 이름 (None 이면 파일 전체를 문서 하나로 사용)
+    parser_language: Optional[str] = None
+    # RecursiveCharacterTextSplitter 구분자 (None 이면 기본 분할기)
+    splitter_language: Optional[Language] = None
+    # CHUNKING_MODE=syntax 에서 사용할 tree_sitter_languages 문법 이름 (PYTHON 은 표준 ast 모듈 사용)
+    tree_sitter_language: Optional[str] = None
+    # 글자 수 (CHUNK_LENGTH_UNIT=tokens 이면 CHARS_PER_TOKEN 으로 나눈 토큰 수)
+    chunk_size: int = DEFAULT_CHUNK_SIZE
+    chunk_overlap: int = DEFAULT_CHUNK_OVERLAP
+
+
+LANGUAGES: Tuple[LanguageSpec, ...] = (
+    # 복잡한 문법 구조를 가진 언어들
+    LanguageSpec("JAVA", ("java",), parser_language="java", splitter_language=Language.JAVA,
+                 chunk_size=1500, chunk_overlap=300, tree_sitter_language="java"),
+    LanguageSpec("KOTLIN", ("kt", "kts"), parser_language="kotlin", splitter_language=Language.KOTLIN,
+                 chunk_size=1500, chunk_overlap=300, tree_sitter_language="kotlin"),
+    LanguageSpec("CPP", ("cpp", "hpp", "cc", "hh", "cxx", "hxx"), parser_language="cpp",
+                 splitter_language=Language.CPP, chunk_size=1500, chunk_overlap=300,
+                 tree_sitter_language="cpp"),
+    LanguageSpec("CSHARP", ("cs",), parser_language="csharp", splitter_language=Language.CSHARP,
+                 chunk_size=1500, chunk_overlap=300, tree_sitter_language="c_sharp"),
+    LanguageSpec("GO", ("go",), parser_language="go", splitter_language=Language.GO,
+                 chunk_size=1500, chunk_overlap=300, tree_sitter_language="go"),
+    LanguageSpec("RUST", ("rs",), parser_language="rust", splitter_language=Language.RUST,
+                 chunk_size=1500, chunk_overlap=300, tree_sitter_language="rust"),
+
+    # 스크립트 언어들
+    LanguageSpec("PYTHON", ("py", "pyi", "pyw"), interpreters=("python", "pypy"),
+                 parser_language="python", splitter_language=Language.PYTHON),
+    LanguageSpec("JS", ("js", "jsx", "mjs", "cjs"), interpreters=("node", "nodejs"),
+                 parser_language="js", splitter_language=Language.JS, tree_sitter_language="javascript"),
+    LanguageSpec("TS", ("ts", "tsx", "mts", "cts"), interpreters=("ts-node", "deno"),
+                 parser_language="ts", splitter_language=Language.TS, tree_sitter_language="typescript"),
+    LanguageSpec("RUBY", ("rb", "rake", "gemspec"), filenames=("rakefile", "gemfile"), interpreters=("ruby",),
+                 parser_language="ruby", splitter_language=Language.RUBY, tree_sitter_language="ruby"),
+    LanguageSpec("PHP", ("php",), interpreters=("php",), parser_language="php", splitter_language=Language.PHP,
+                 tree_sitter_language="php"),
+    # langchain_text_splitters 에 PERL 구분자가 구현되어 있지 않아 기본 분할기 사용
+    LanguageSpec("PERL", ("pl", "pm"), interpreters=("perl",), parser_language="perl",
+                 tree_sitter_language="perl"),
+    LanguageSpec("SHELL", ("sh", "bash", "zsh"), interpreters=("sh", "bash", "zsh", "dash", "ksh"),
+                 tree_sitter_language="bash"),
+
+    # 마크업/문서 언어들
+    LanguageSpec("HTML", ("html", "htm"), splitter_language=Language.HTML, chunk_size=800, chunk_overlap=150),
+    LanguageSpec("MARKDOWN", ("md", "markdown"), splitter_language=Language.MARKDOWN,
+                 chunk_size=800, chunk_overlap=150),
+    LanguageSpec("RST", ("rst",), splitter_language=Language.RST, chunk_size=800, chunk_overlap=150),
+    LanguageSpec("LATEX", ("tex",), splitter_language=Language.LATEX, chunk_size=800, chunk_overlap=150),
+
+    # 기타 언어들
+    LanguageSpec("PROTO", ("proto",), splitter_language=Language.PROTO, chunk_size=600, chunk_overlap=100),
+    LanguageSpec("C", ("c", "h"), parser_language="c", splitter_language=Language.C,
+                 tree_sitter_language="c"),
+    LanguageSpec("SCALA", ("scala",), parser_language="scala", splitter_language=Language.SCALA,
+                 tree_sitter_language="scala"),
+    LanguageSpec("SWIFT", ("swift",), splitter_language=Language.SWIFT),
+    LanguageSpec("SOL", ("sol",), splitter_language=Language.SOL),
+    LanguageSpec("COBOL", ("cob", "cbl"), parser_language="cobol", splitter_language=Language.COBOL),
+    LanguageSpec("LUA", ("lua",), interpreters=("lua",), parser_language="lua", splitter_language=Language.LUA,
+                 tree_sitter_language="lua"),
+    LanguageSpec("ELIXIR", ("ex", "exs"), interpreters=("elixir",), parser_language="elixir",
+                 splitter_language=Language.ELIXIR, tree_sitter_language="elixir"),
+    LanguageSpec("SQL", ("sql",), parser_language="sql", tree_sitter_language="sql"),
+    LanguageSpec("DOCKERFILE", ("dockerfile",), filenames=("dockerfile", "containerfile")),
+    LanguageSpec("MAKEFILE", ("mk", "mak"), filenames=("makefile", "gnumakefile"), interpreters=("make",)),
+    LanguageSpec(UNKNOWN_LANGUAGE),
+)
+
+_SPECS: Dict[str, LanguageSpec] = {spec.name: spec for spec in LANGUAGES}
+_BY_EXTENSION: Dict[str, str] = {ext: spec.name for spec in LANGUAGES for ext in spec.extensions}
+_BY_FILENAME: Dict[str, str] = {name: spec.name for spec in LANGUAGES for name in spec.filenames}
+_BY_INTERPRETER: Dict[str, str] = {name: spec.name for spec in LANGUAGES for name in spec.interpreters}
+_INTERPRETER_VERSION = re.compile(r"[\d.]+$")
+
+
+def get_spec(language: str) -> LanguageSpec:
+    """언어 설정 (등록되지 않은 언어는 UNKNOWN 설정)"""
+    return _SPECS.get(language) or _SPECS[UNKNOWN_LANGUAGE]
+
+
+def _language_from_shebang(head: str) -> Optional[str]:
+    if not head.startswith("#!"):
+        return None
+    tokens = head[2:].split("\n", 1)[0].split()
+    if not tokens:
+        return None
+    interpreter = os.path.basename(tokens[0])
+    if interpreter == "env":
+        # #!/usr/bin/env -S python3 -u 처럼 env 옵션이 앞에 올 수 있음
+        interpreter = next((token for token in tokens[1:] if not token.startswith("-")), "")
+    return _BY_INTERPRETER.get(_INTERPRETER_VERSION.sub("", interpreter))
+
+
+def resolve_language(filename: str, extension: Optional[str] = None, head: str = "") -> str:
+    """
+    파일의 언어를 판별합니다. (특수 파일 이름 -> 확장자 -> 이름 앞부분(Dockerfile.dev) -> shebang 순서)
+
+    Args:
+        filename: 파일 이름 (경로여도 됨)
+        extension: 점을 뺀 확장자 (None 이면 파일 이름에서 추출)
+        head: 파일 앞부분 (shebang 판별용)
+
+    Returns:
+        str: 언어 이름 (판별하지 못하면 UNKNOWN)
+    """
+    name = os.path.basename(filename).lower()
+    language = _BY_FILENAME.get(name)
+    if language:
+        return language
+
+    if extension is None:
+        extension = os.path.splitext(name)[1]
+    language = _BY_EXTENSION.get(extension.lstrip(".").lower())
+    if language:
+        return language
+
+    language = _BY_FILENAME.get(name.split(".", 1)[0]) or _language_from_shebang(head)
+    return language or UNKNOWN_LANGUAGE
+
+
+@functools.lru_cache(maxsize=None)
+def get_parser(language: str) -> Optional[LanguageParser]:
+    """
+    언어별 LanguageParser (프로세스 전체에서 하나만 생성)
+    세그먼터가 필요로 하는 패키지(tree_sitter, esprima 등)가 없으면 한 번만 경고하고 None 을 반환합니다.
+
+    Args:
+        language: 언어 이름
+
+    Returns:
+        Optional[LanguageParser]: 파서 (None 이면 파일 전체를 문서 하나로 사용)
+    """
+    parser_language = get_spec(language).parser_language
+    if parser_language is None:
+        return None
+    try:
+        # 세그먼터는 생성 시 의존 패키지를 import 함
+        LANGUAGE_SEGMENTERS[parser_language]("")
+    except ImportError as e:
+        logger.warning(f"{language} 파서를 사용할 수 없어 파일 전체를 문서 하나로 사용합니다: {e}")
+        return None
+    return LanguageParser(language=parser_language)
+
+
+class _TokenLengthSplitter(RecursiveCharacterTextSplitter):
+    """
+    토큰 수로 크기를 재는 분할기
+    기본 구현은 start_index 를 찾을 때 chunk_overlap 을 글자 수로 보고 검색 시작 위치를 정하므로,
+    토큰 단위에서는 이전 청크 시작 위치 다음부터 찾습니다.
+    """
+
+    def create_documents(self, texts: List[str], metadatas: Optional[List[dict]] = None) -> List[Document]:
+        documents = []
+        for i, text in enumerate(texts):
+            index = -1
+            for chunk in self.split_text(text):
+                metadata = copy.deepcopy(metadatas[i]) if metadatas else {}
+                if self._add_start_index:
+                    index = text.find(chunk, index + 1)
+                    metadata["start_index"] = index
+                documents.append(Document(page_content=chunk, metadata=metadata))
+        return documents
+
+
+@functools.lru_cache(maxsize=None)
+def get_splitter(language: str) -> RecursiveCharacterTextSplitter:
+    """
+    언어별 RecursiveCharacterTextSplitter (프로세스 전체에서 하나만 생성)
+    CHUNK_LENGTH_UNIT=tokens 이면 청크 크기/겹침을 임베딩 모델 토큰 수(글자 수 설정의 1/CHARS_PER_TOKEN)로 잽니다.
+
+    Args:
+        language: 언어 이름
+
+    Returns:
+        RecursiveCharacterTextSplitter: 언어 구분자와 청크 크기를 적용한 분할기 (구분자가 없는 언어는 기본 분할기)
+    """
+    spec = get_spec(language)
+    splitter_class = RecursiveCharacterTextSplitter
+    params = {"chunk_size": spec.chunk_size, "chunk_overlap": spec.chunk_overlap, "add_start_index": True}
+    if CHUNK_LENGTH_UNIT == "tokens":
+        splitter_class = _TokenLengthSplitter
+        params.update(
+            chunk_size=spec.chunk_size // CHARS_PER_TOKEN,
+            chunk_overlap=spec.chunk_overlap // CHARS_PER_TOKEN,
+            length_function=count_tokens,
+        )
+
+    if spec.splitter_language is None:
+        return splitter_class(**params)
+    logger.debug("%s 언어용 분할기 생성 (chunk_size: %d, overlap: %d %s)", language, params["chunk_size"],
+                 params["chunk_overlap"], CHUNK_LENGTH_UNIT)
+    return splitter_class.from_language(language=spec.splitter_language, **params)
@@ -0,0 +1,385 @@
+"""
+파일 간 이웃 그래프
+
+수집 중 분할된 청크 사이의 관계를 간선으로 만들어 로컬 sqlite 에 저장합니다.
+검색 결과(히트)의 import 대상, 호출하는 정의, 호출하는 쪽, 같은 파일의 앞뒤 청크를
+추가 검색과 임베딩 없이 바로 찾을 수 있습니다.
+
+간선 종류 (source 청크 → target 청크):
+    imports         source 의 import 문이 가리키는 파일의 청크 (가져온 이름을 정의한 청크, 없으면 파일 첫 청크)
+    references      source 에 나오는 이름을 정의한 다른 청크
+    referenced_by   references 의 역방향 (정의 → 사용하는 청크)
+    adjacent        같은 파일에서 바로 앞/뒤 청크
+
+정의 이름은 구문 단위 분할(CHUNKING_MODE=syntax)의 symbols 메타데이터를 쓰고, 없으면 줄 첫머리의 정의 키워드로 찾습니다.
+import 는 Python 과 상대 경로 JS/TS 만 해석합니다.
+"""
+
+import os
+import posixpath
+import re
+import sqlite3
+import threading
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from langchain_core.documents import Document
+
+from src.config.log_config import Logger
+from src.config.metrics_config import Metrics
+
+logger = Logger()
+metrics = Metrics()
+
+NEIGHBOR_GRAPH_ENABLED: bool = os.getenv("NEIGHBOR_GRAPH_ENABLED", "true").lower() == "true"
+NEIGHBOR_GRAPH_PATH: str = os.getenv("NEIGHBOR_GRAPH_PATH", os.path.join("chroma_db", "neighbor_graph.sqlite3"))
+# 청크마다 저장할 최대 간선 수 (가중치가 높은 순)
+NEIGHBOR_MAX_EDGES: int = int(os.getenv("NEIGHBOR_MAX_EDGES", "16"))
+# 이보다 많은 청크에서 정의된 이름(get, run, __init__ 등)은 어느 정의인지 알 수 없으므로 간선을 만들지 않음
+NEIGHBOR_MAX_DEFINITIONS: int = int(os.getenv("NEIGHBOR_MAX_DEFINITIONS", "3"))
+
+# 간선 종류별 가중치 (이웃 점수 = 히트 점수 × 가중치)
+EDGE_WEIGHTS: Dict[str, float] = {
+    "references": 1.0,
+    "imports": 0.8,
+    "referenced_by": 0.7,
+    "adjacent": 0.5,
+}
+
+Edge = Tuple[str, str, str, float]
+
+_IDENTIFIER = re.compile(r"[A-Za-z_][A-Za-z0-9_]{2,}")
+# 줄 첫머리의 정의 (주석 안의 "# Code for: def ..." 같은 자리 표시는 제외)
+_DEFINITION = re.compile(
+    r"^[ \t]*(?:(?:export|default|pub(?:\([^)]*\))?|public|private|protected|internal|static|final|abstract|async)[ \t]+)*"
+    r"(?:def|class|function|func|fn|interface|struct|trait|enum|type|object|module)[ \t]*\*?[ \t]+"
+    r"(?:\([^)]*\)[ \t]*)?([A-Za-z_]\w*)",
+    re.M,
+)
+_PY_FROM_IMPORT = re.compile(r"^[ \t]*from[ \t]+(\.*[\w.]*)[ \t]+import[ \t]+\(?([\w \t,]+)", re.M)
+_PY_IMPORT = re.compile(r"^[ \t]*import[ \t]+([\w.]+(?:[ \t]*,[ \t]*[\w.]+)*)", re.M)
+_JS_IMPORT = re.compile(r"""(?:\bfrom|^[ \t]*import|\brequire\(|\bimport\()[ \t]*['"](\.{1,2}/[^'"]+)['"]""", re.M)
+
+_PYTHON_EXTENSIONS = ("py", "pyi")
+_JS_EXTENSIONS = ("js", "jsx", "mjs", "cjs", "ts", "tsx")
+_JS_SUFFIXES = ("", ".ts", ".tsx", ".js", ".jsx", ".mjs", "/index.ts", "/index.tsx", "/index.js")
+# 정의 키워드를 찾지 않는 문서 언어 (문장 첫 단어가 type, class 등인 경우가 많음)
+_PROSE_LANGUAGES = ("MARKDOWN", "TEXT", "RST", "UNKNOWN")
+
+
+def _chunk_id(document: Document) -> Optional[str]:
+    return document.metadata.get("chunk_id") or document.id
+
+
+def _file_path(document: Document) -> str:
+    metadata = document.metadata
+    return metadata.get("file_path") or f"{metadata.get('path', '').lstrip('/')}/{metadata.get('filename', '')}"
+
+
+def _extension(path: str) -> str:
+    return os.path.splitext(path)[1].lstrip(".").lower()
+
+
+def _definitions(document: Document) -> List[str]:
+    """청크가 정의하는 이름 (Class.method 는 method)"""
+    symbols = document.metadata.get("symbols")
+    if symbols:
+        return [symbol.rsplit(".", 1)[-1] for symbol in symbols.split(",") if symbol]
+    if document.metadata.get("language", "UNKNOWN") in _PROSE_LANGUAGES:
+        return []
+    return _DEFINITION.findall(document.page_content)
+
+
+def _python_modules(paths: Iterable[str]) -> Dict[str, List[str]]:
+    """모듈 이름(모든 접미사, 예: pkg.mod / mod) → 파일 경로 (src 레이아웃처럼 저장소 루트가 패키지 루트가 아니어도 찾도록)"""
+    modules: Dict[str, List[str]] = defaultdict(list)
+    for path in paths:
+        if _extension(path) not in _PYTHON_EXTENSIONS:
+            continue
+        parts = os.path.splitext(path)[0].split("/")
+        if parts[-1] == "__init__":
+            parts = parts[:-1]
+        for start in range(len(parts)):
+            modules[".".join(parts[start:])].append(path)
+    return modules
+
+
+def _resolve_python(module: str, path: str, modules: Dict[str, List[str]]) -> Optional[str]:
+    if module.startswith("."):
+        level = len(module) - len(module.lstrip("."))
+        package = path.split("/")[:-1]
+        if level - 1 > len(package):
+            return None
+        base = package[:len(package) - (level - 1)]
+        module = ".".join(base + ([module.lstrip(".")] if module.lstrip(".") else []))
+    candidates = modules.get(module, [])
+    # 같은 접미사를 가진 모듈이 여러 개면 어느 파일인지 알 수 없음
+    return candidates[0] if len(candidates) == 1 else None
+
+
+def _imports(document: Document, path: str, files: Set[str], modules: Dict[str, List[str]]) -> List[Tuple[str, List[str]]]:
+    """
+    청크의 import 문이 가리키는 저장소 안 파일과 가져온 이름 목록
+
+    Returns:
+        List[Tuple[str, List[str]]]: (대상 파일 경로, 가져온 이름)
+    """
+    text = document.page_content
+    extension = _extension(path)
+    targets: List[Tuple[str, List[str]]] = []
+    if extension in _PYTHON_EXTENSIONS:
+        for module, names in _PY_FROM_IMPORT.findall(text):
+            names = [name.split()[0] for name in names.split(",") if name.strip()]
+            # from pkg import submodule 은 하위 모듈 파일을 우선
+            for name in names:
+                submodule = _resolve_python(f"{module}.{name}" if module.strip(".") else f"{module}{name}", path, modules)
+                if submodule:
+                    targets.append((submodule, []))
+            target = _resolve_python(module, path, modules) if module.strip(".") else None
+            if target:
+                targets.append((target, names))
+        for group in _PY_IMPORT.findall(text):
+            for module in group.split(","):
+                target = _resolve_python(module.strip(), path, modules)
+                if target:
+                    targets.append((target, []))
+    elif extension in _JS_EXTENSIONS:
+        for specifier in _JS_IMPORT.findall(text):
+            base = posixpath.normpath(posixpath.join(posixpath.dirname(path), specifier))
+            target = next((base + suffix for suffix in _JS_SUFFIXES if base + suffix in files), None)
+            if target:
+                targets.append((target, []))
+    return [(target, names) for target, names in targets if target != path]
+
+
+def _file_order(chunks: List[Tuple[int, Document]]) -> List[Document]:
+    """파일 안 청크 순서 (시작 위치가 모두 다르면 시작 위치 순, 아니면 분할 순서)"""
+    starts = [document.metadata.get("start_index", -1) for _, document in chunks]
+    if all(isinstance(start, int) and start >= 0 for start in starts) and len(set(starts)) == len(starts):
+        return [document for _, document in sorted(chunks, key=lambda item: item[1].metadata["start_index"])]
+    return [document for _, document in sorted(chunks, key=lambda item: item[0])]
+
+
+def build_edges(documents: List[Document]) -> List[Edge]:
+    """
+    한 저장소/참조의 분할된 청크로 이웃 그래프 간선을 만듭니다.
+
+    Args:
+        documents: 코드 청크 (metadata 에 chunk_id, file_path, start_index, 선택적으로 symbols)
+
+    Returns:
+        List[Edge]: (source 청크 ID, target 청크 ID, 간선 종류, 가중치). 청크마다 가중치 상위 NEIGHBOR_MAX_EDGES 개
+    """
+    by_file: Dict[str, List[Tuple[int, Document]]] = defaultdict(list)
+    for index, document in enumerate(documents):
+        if _chunk_id(document):
+            by_file[_file_path(document)].append((index, document))
+    ordered = {path: _file_order(chunks) for path, chunks in by_file.items()}
+
+    best: Dict[Tuple[str, str], Tuple[str, float]] = {}
+
+    def add(source: str, target: str, kind: str, weight: float) -> None:
+        if source == target:
+            return
+        current = best.get((source, target))
+        if current is None or weight > current[1]:
+            best[(source, target)] = (kind, weight)
+
+    # 같은 파일의 앞뒤 청크
+    for chunks in ordered.values():
+        for previous, current in zip(chunks, chunks[1:]):
+            add(_chunk_id(previous), _chunk_id(current), "adjacent", EDGE_WEIGHTS["adjacent"])
+            add(_chunk_id(current), _chunk_id(previous), "adjacent", EDGE_WEIGHTS["adjacent"])
+
+    # 이름 → 정의한 청크
+    defined_in: Dict[str, List[str]] = defaultdict(list)
+    definitions: Dict[str, Set[str]] = {}
+    for chunks in ordered.values():
+        for document in chunks:
+            names = set(_definitions(document))
+            definitions[_chunk_id(document)] = names
+            for name in names:
+                defined_in[name].append(_chunk_id(document))
+
+    # import 문 → 대상 파일의 청크
+    files = set(ordered)
+    modules = _python_modules(files)
+    for path, chunks in ordered.items():
+        for document in chunks:
+            for target_path, names in _imports(document, path, files, modules):
+                target_chunks = ordered[target_path]
+                named = [
+                    _chunk_id(target) for target in target_chunks
+                    if definitions[_chunk_id(target)].intersection(names)
+                ]
+                for target in named or [_chunk_id(target_chunks[0])]:
+                    add(_chunk_id(document), target, "imports", EDGE_WEIGHTS["imports"])
+
+    # 이름 사용 → 정의 (양방향)
+    for chunks in ordered.values():
+        for document in chunks:
+            source = _chunk_id(document)
+            for name in set(_IDENTIFIER.findall(document.page_content)) - definitions[source]:
+                targets = defined_in.get(name)
+                if not targets or len(targets) > NEIGHBOR_MAX_DEFINITIONS or name.startswith("__"):
+                    continue
+                for target in targets:
+                    add(source, target, "references", EDGE_WEIGHTS["references"] / len(targets))
+                    add(target, source, "referenced_by", EDGE_WEIGHTS["referenced_by"] / len(targets))
+
+    by_source: Dict[str, List[Edge]] = defaultdict(list)
+    for (source, target), (kind, weight) in best.items():
+        by_source[source].append((source, target, kind, round(weight, 4)))
+    edges: List[Edge] = []
+    for source_edges in by_source.values():
+        edges.extend(sorted(source_edges, key=lambda edge: (-edge[3], edge[1]))[:NEIGHBOR_MAX_EDGES])
+    return edges
+
+
+class NeighborGraph:
+    """
+    이웃 그래프 간선 저장소 (sqlite, 프로세스 전체에서 공유)
+
+    청크 ID 는 저장소/참조를 포함해 만들어지므로 간선은 source 청크 ID 로 바로 조회하고,
+    저장소/참조 단위로 통째로 교체합니다. (일부 파일을 불러오지 못한 수집은 기존 간선에 합침)
+
+    테이블:
+        edges(source, target, repo_url, ref, kind, weight)
+    """
+    _init_lock = threading.Lock()
+
+    def __new__(cls):
+        if hasattr(cls, 'instance'):
+            return cls.instance
+        with cls._init_lock:
+            if not hasattr(cls, 'instance'):
+                instance = super(NeighborGraph, cls).__new__(cls)
+                instance._lock = threading.Lock()
+                instance._connection = None
+                if NEIGHBOR_GRAPH_ENABLED:
+                    instance._open(NEIGHBOR_GRAPH_PATH)
+                cls.instance = instance
+        return cls.instance
+
+    def _open(self, path: str) -> None:
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.executescript("""
+            CREATE TABLE IF NOT EXISTS edges (
+                source TEXT NOT NULL,
+                target TEXT NOT NULL,
+                repo_url TEXT NOT NULL,
+                ref TEXT NOT NULL,
+                kind TEXT NOT NULL,
+                weight REAL NOT NULL,
+                PRIMARY KEY (source, target)
+            ) WITHOUT ROWID;
+            CREATE INDEX IF NOT EXISTS idx_edges_repo ON edges(repo_url, ref);
+        """)
+
+    @property
+    def enabled(self) -> bool:
+        return self._connection is not None
+
+    def replace(self, repo_url: str, ref: str, edges: Iterable[Edge]) -> int:
+        """
+        저장소/참조의 간선을 모두 바꿉니다.
+
+        Returns:
+            int: 저장한 간선 수
+        """
+        return self._write(repo_url, ref, edges, clear=True)
+
+    def merge(self, repo_url: str, ref: str, edges: Iterable[Edge]) -> int:
+        """
+        저장소/참조의 기존 간선을 지우지 않고 간선을 추가/갱신합니다.
+        (일부 파일을 불러오지 못한 수집에서 그 파일로 향하는 간선을 잃지 않도록)
+
+        Returns:
+            int: 저장한 간선 수
+        """
+        return self._write(repo_url, ref, edges, clear=False)
+
+    def _write(self, repo_url: str, ref: str, edges: Iterable[Edge], clear: bool) -> int:
+        if not self.enabled:
+            return 0
+
+        rows = [(source, target, repo_url, ref, kind, weight) for source, target, kind, weight in edges]
+        with self._lock:
+            with self._connection:
+                if clear:
+                    self._connection.execute("DELETE FROM edges WHERE repo_url = ? AND ref = ?", (repo_url, ref))
+                self._connection.executemany(
+                    "INSERT OR REPLACE INTO edges (source, target, repo_url, ref, kind, weight) VALUES (?, ?, ?, ?, ?, ?)",
+                    rows,
+                )
+        metrics.inc("neighbor_edges_written_total", len(rows))
+        return len(rows)
+
+    def edges(self, repo_url: str, ref: str) -> List[Edge]:
+        """저장소/참조의 전체 간선 (스냅샷 내보내기용)"""
+        if not self.enabled:
+            return []
+        with self._lock:
+            return self._connection.execute(
+                "SELECT source, target, kind, weight FROM edges WHERE repo_url = ? AND ref = ? ORDER BY source, weight DESC",
+                (repo_url, ref),
+            ).fetchall()
+
+    def neighbors(self, chunk_ids: List[str]) -> Dict[str, List[Tuple[str, str, float]]]:
+        """
+        청크별 이웃을 가중치가 높은 순서로 조회합니다.
+
+        Args:
+            chunk_ids: source 청크 ID 목록
+
+        Returns:
+            Dict[str, List[Tuple[str, str, float]]]: source 청크 ID → (target 청크 ID, 간선 종류, 가중치) 목록
+        """
+        result: Dict[str, List[Tuple[str, str, float]]] = defaultdict(list)
+        if not self.enabled or not chunk_ids:
+            return result
+        placeholders = ", ".join("?" * len(chunk_ids))
+        with self._lock:
+            rows = self._connection.execute(
+                f"SELECT source, target, kind, weight FROM edges WHERE source IN ({placeholders}) "
+                "ORDER BY source, weight DESC, target",
+                list(chunk_ids),
+            ).fetchall()
+        for source, target, kind, weight in rows:
+            result[source].append((target, kind, weight))
+        return result
+
+
+def build_from_vectorstore(repo_url: str, ref: str) -> int:
+    """
+    벡터 저장소에 있는 저장소/참조의 코드 청크로 이웃 그래프를 다시 만듭니다.
+    샤드별로 나눠 수집한 경우(분산 수집 마무리)처럼 전체 청크를 한 번에 볼 수 없었을 때 사용합니다.
+
+    Returns:
+        int: 저장한 간선 수
+    """
+    from src.utils.chroma_utils import ChromaUtils
+
+    graph = NeighborGraph()
+    if not graph.enabled:
+        return 0
+    documents: List[Document] = []
+    vectorstore = ChromaUtils().get_code_documents_vectorstore()
+    for page in ChromaUtils._iter_entries(vectorstore, where={"repo_url": repo_url}, include=["documents", "metadatas"]):
+        for id_, text, metadata in zip(page["ids"], page["documents"], page["metadatas"]):
+            if (metadata or {}).get("ref", ref) == ref:
+                documents.append(Document(id=id_, page_content=text, metadata={"chunk_id": id_, **(metadata or {})}))
+    written = graph.replace(repo_url, ref, build_edges(documents))
+    logger.info(f"이웃 그래프 재생성: {repo_url} ({ref}) 청크 {len(documents)}개, 간선 {written}개")
+    return written
+
+
+def edge_to_record(edge: Edge) -> Dict[str, Any]:
+    source, target, kind, weight = edge
+    return {"source": source, "target": target, "kind": kind, "weight": weight}
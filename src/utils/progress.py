@@ -0,0 +1,73 @@
+"""
+수집 단계별 진행 상황 보고
+
+그래프 노드와 유틸리티는 report_progress(stage, completed, total) 만 호출하고, 받는 쪽(MCP 도구)은 progress_reporter 로
+콜백을 등록합니다. 콜백은 contextvars 로 전달되므로 asyncio.to_thread 와 LangGraph 노드 실행 스레드까지 이어지며,
+등록되지 않은 경우(배치 수집, 분산 수집 작업자, 벤치마크)에는 아무 일도 하지 않습니다.
+"""
+
+import contextvars
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, Optional, Tuple
+
+from src.config.log_config import Logger
+
+logger = Logger()
+
+# 수집 단계 → 전체 진행률(0~100)에서 차지하는 구간 (실행 순서대로, 가설 질문 생성이 가장 오래 걸림)
+STAGE_RANGES: Dict[str, Tuple[float, float]] = {
+    "fetch": (0, 25),
+    "split": (25, 30),
+    "embed_code": (30, 45),
+    "questions": (45, 90),
+    "embed_questions": (90, 100),
+}
+PROGRESS_TOTAL: float = 100
+
+ProgressCallback = Callable[[str, int, int], None]
+_reporter: contextvars.ContextVar[Optional[ProgressCallback]] = contextvars.ContextVar("progress_reporter", default=None)
+
+
+def report_progress(stage: str, completed: int, total: int) -> None:
+    """
+    단계 진행 상황을 등록된 콜백에 전달합니다. (콜백 오류는 수집을 멈추지 않음)
+
+    Args:
+        stage: 단계 이름 (STAGE_RANGES 의 키)
+        completed: 처리한 항목 수
+        total: 전체 항목 수
+    """
+    callback = _reporter.get()
+    if callback is None:
+        return
+    try:
+        callback(stage, completed, total)
+    except Exception as e:
+        logger.warning(f"진행 상황 보고 실패: {stage} ({e})")
+
+
+def overall_progress(stage: str, completed: int, total: int) -> float:
+    """
+    단계 진행 상황을 전체 진행률(0~PROGRESS_TOTAL)로 바꿉니다.
+
+    Returns:
+        float: 전체 진행률 (알 수 없는 단계는 0)
+    """
+    start, end = STAGE_RANGES.get(stage, (0, 0))
+    fraction = min(completed / total, 1.0) if total > 0 else 1.0
+    return round(start + (end - start) * fraction, 2)
+
+
+@contextmanager
+def progress_reporter(callback: ProgressCallback) -> Iterator[None]:
+    """
+    블록 안(같은 컨텍스트에서 시작한 스레드 포함)의 report_progress 호출을 callback 으로 받습니다.
+
+    Args:
+        callback: (stage, completed, total) 을 받는 함수
+    """
+    token = _reporter.set(callback)
+    try:
+        yield
+    finally:
+        _reporter.reset(token)
@@ -0,0 +1,728 @@
+import json
+import os
+import threading
+import uuid
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+from langchain_core.vectorstores import VectorStore
+from src.config.log_config import Logger
+
+logger = Logger()
+
+# 1차 후보 검색 시 한 번에 스캔할 행 수 (메모리 사용량 제한)
+SCAN_BLOCK_ROWS: int = 4096
+# 살아 있는 행 표시 버퍼의 최소 용량 (부족하면 두 배씩 증가)
+ALIVE_MIN_CAPACITY: int = 1024
+# 삭제/교체된 행이 이 수를 넘고 살아 있는 행보다 많으면 압축
+COMPACT_MIN_DEAD_ROWS: int = 1024
+
+# uint8 값별 set bit 개수 (binary 양자화 해밍 거리 계산용)
+_POPCOUNT_TABLE = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    """행 단위 L2 정규화"""
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+
+def _equality_values(condition: Any) -> Optional[List[str]]:
+    """역색인으로 찾을 수 있는 조건(문자열 동등 비교 / $eq / $in)이면 비교 값 목록을, 아니면 None 을 반환합니다."""
+    if isinstance(condition, dict):
+        if len(condition) != 1:
+            return None
+        op, operand = next(iter(condition.items()))
+        values = [operand] if op == "$eq" else operand if op == "$in" else None
+    else:
+        values = [condition]
+    if values is None or not all(isinstance(value, str) for value in values):
+        return None
+    return list(values)
+
+
+def _match_where(metadata: Dict[str, Any], where: Optional[Dict[str, Any]]) -> bool:
+    """
+    Chroma where 필터 문법($and, $or, $eq, $ne, $in, $nin, $gt, $gte, $lt, $lte)으로 메타데이터를 검사합니다.
+    """
+    if not where:
+        return True
+
+    for key, condition in where.items():
+        if key == "$and":
+            if not all(_match_where(metadata, sub) for sub in condition):
+                return False
+        elif key == "$or":
+            if not any(_match_where(metadata, sub) for sub in condition):
+                return False
+        elif isinstance(condition, dict):
+            value = metadata.get(key)
+            for op, operand in condition.items():
+                if op == "$eq" and value != operand:
+                    return False
+                if op == "$ne" and value == operand:
+                    return False
+                if op == "$in" and value not in operand:
+                    return False
+                if op == "$nin" and value in operand:
+                    return False
+                if op in ("$gt", "$gte", "$lt", "$lte"):
+                    if value is None:
+                        return False
+                    if op == "$gt" and not value > operand:
+                        return False
+                    if op == "$gte" and not value >= operand:
+                        return False
+                    if op == "$lt" and not value < operand:
+                        return False
+                    if op == "$lte" and not value <= operand:
+                        return False
+        elif metadata.get(key) != condition:
+            return False
+    return True
+
+
+class QuantizedVectorStore(VectorStore):
+    """
+    양자화된 벡터를 메모리 매핑 NumPy 파일로 저장하는 로컬 벡터 저장소
+
+    int8(행 단위 스케일) 또는 binary(부호 비트) 양자화 벡터로 전체 후보를 빠르게 훑은 뒤,
+    상위 후보만 float32 원본 벡터로 정확히 재정렬합니다.
+    점수는 Chroma 기본값(l2)과 같은 척도(정규화 벡터의 제곱 L2 거리)로 반환하므로
+    기존 score_threshold 설정을 그대로 사용할 수 있습니다.
+
+    디렉토리 구성 (G 는 세대 번호, 압축할 때마다 증가):
+        manifest.json        차원, 양자화 방식, 세대, 확정된 행 수와 records 로그 크기
+        vectors.f32.G.bin    재정렬용 float32 벡터 (n, dim)
+        vectors.q.G.bin      1차 검색용 양자화 벡터 (int8: (n, dim), binary: (n, dim/8))
+        scales.f32.G.bin     int8 양자화 행별 스케일 (n,)
+        records.G.jsonl      행별 id, 본문, 메타데이터와 삭제 기록({"deleted": [행 번호]}) 로그
+
+    추가/삭제는 파일 끝에 덧붙이고 manifest 만 다시 쓰므로 배치마다 기록 비용이 배치 크기에 비례하며,
+    삭제된 행이 많아지면 새 세대 파일로 압축합니다. 추가/삭제/압축과 검색은 하나의 잠금으로 직렬화해
+    여러 수집 작업과 질의가 동시에 사용해도 행 번호와 본문이 어긋나지 않습니다.
+    """
+
+    QUANTIZATIONS = ("int8", "binary")
+
+    def __init__(
+        self,
+        collection_name: str,
+        embedding_function: Embeddings,
+        persist_directory: str,
+        dimensions: int = 1536,
+        quantization: str = "int8",
+        rerank_factor: int = 4,
+    ):
+        if quantization not in self.QUANTIZATIONS:
+            raise ValueError(f"지원하지 않는 양자화 방식입니다: {quantization} (지원: {', '.join(self.QUANTIZATIONS)})")
+
+        self.collection_name = collection_name
+        self._embedding_function = embedding_function
+        self.persist_directory = persist_directory
+        self.dimensions = dimensions
+        self.quantization = quantization
+        self.rerank_factor = max(1, rerank_factor)
+
+        self._ids: List[str] = []
+        self._documents: List[str] = []
+        self._metadatas: List[Dict[str, Any]] = []
+        self._id_to_row: Dict[str, int] = {}
+        self._reset_alive(0)
+        # 문자열 메타데이터 역색인 (키 → 값 → 행 번호), 필터 검색 시 생성
+        self._metadata_index: Optional[Dict[str, Dict[str, List[int]]]] = None
+
+        self._lock = threading.RLock()
+        self._generation = 0
+        self._rows_on_disk = 0
+        self._map(0)
+
+        self._load()
+
+    @property
+    def embeddings(self) -> Embeddings:
+        return self._embedding_function
+
+    # ------------------------------------------------------------------
+    # 저장 / 로드
+    # ------------------------------------------------------------------
+
+    def _quantized_width(self) -> int:
+        return self.dimensions if self.quantization == "int8" else (self.dimensions + 7) // 8
+
+    def _quantized_dtype(self) -> type:
+        return np.int8 if self.quantization == "int8" else np.uint8
+
+    def _path(self, filename: str) -> str:
+        return os.path.join(self.persist_directory, filename)
+
+    def _files(self, generation: int) -> Dict[str, str]:
+        """세대별 데이터 파일 경로 (압축할 때마다 새 세대 파일에 쓰고 manifest 로 교체)"""
+        return {
+            "float": self._path(f"vectors.f32.{generation}.bin"),
+            "quantized": self._path(f"vectors.q.{generation}.bin"),
+            "scales": self._path(f"scales.f32.{generation}.bin"),
+            "records": self._path(f"records.{generation}.jsonl"),
+        }
+
+    def _load(self) -> None:
+        """저장된 인덱스가 있으면 메모리 매핑으로 엽니다. (커밋되지 않은 꼬리는 잘라냄)"""
+        manifest_path = self._path("manifest.json")
+        if not os.path.exists(manifest_path):
+            return
+
+        with open(manifest_path, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+
+        if manifest["dimensions"] != self.dimensions or manifest["quantization"] != self.quantization:
+            raise ValueError(
+                f"{self.persist_directory} 인덱스 설정이 다릅니다: "
+                f"저장됨(dimensions={manifest['dimensions']}, quantization={manifest['quantization']}), "
+                f"요청(dimensions={self.dimensions}, quantization={self.quantization})"
+            )
+
+        self._generation = manifest["generation"]
+        rows = manifest["rows"]
+        files = self._files(self._generation)
+        # 커밋 전에 중단된 추가분 제거
+        for name, row_bytes in self._row_bytes().items():
+            self._truncate(files[name], rows * row_bytes)
+        self._truncate(files["records"], manifest["records_bytes"])
+        self._rows_on_disk = rows
+        self._map(rows)
+
+        self._reset_alive(rows)
+        if os.path.exists(files["records"]):
+            with open(files["records"], "r", encoding="utf-8") as f:
+                for line in f:
+                    self._replay(json.loads(line))
+        self._metadata_index = None
+        logger.debug(f"{self.collection_name} 양자화 인덱스 로드: {self.count()}개 벡터")
+
+    def _reset_alive(self, rows: int) -> None:
+        self._alive_buffer = np.ones(max(rows, ALIVE_MIN_CAPACITY), dtype=bool)
+        self._alive = self._alive_buffer[:rows]
+
+    def _extend_alive(self, count: int) -> None:
+        """
+        살아 있는 행 표시를 count 개 늘립니다.
+        용량을 두 배씩 키운 버퍼의 앞부분을 쓰므로 배치마다 전체 표시를 복사하지 않습니다.
+        """
+        size = len(self._alive)
+        if size + count > len(self._alive_buffer):
+            buffer = np.ones(max(2 * len(self._alive_buffer), size + count), dtype=bool)
+            buffer[:size] = self._alive
+            self._alive_buffer = buffer
+        self._alive_buffer[size:size + count] = True
+        self._alive = self._alive_buffer[:size + count]
+
+    def _replay(self, record: Dict[str, Any]) -> None:
+        """records 로그 한 줄(행 추가 또는 행 삭제)을 메모리 상태에 반영합니다."""
+        if "deleted" in record:
+            for row in record["deleted"]:
+                self._alive[row] = False
+                if self._id_to_row.get(self._ids[row]) == row:
+                    del self._id_to_row[self._ids[row]]
+            return
+
+        row = len(self._ids)
+        previous_row = self._id_to_row.get(record["id"])
+        if previous_row is not None:
+            self._alive[previous_row] = False
+        self._id_to_row[record["id"]] = row
+        self._ids.append(record["id"])
+        self._documents.append(record["document"])
+        self._metadatas.append(record["metadata"])
+
+    def _row_bytes(self) -> Dict[str, int]:
+        return {
+            "float": self.dimensions * 4,
+            "quantized": self._quantized_width() * np.dtype(self._quantized_dtype()).itemsize,
+            "scales": 4,
+        }
+
+    @staticmethod
+    def _truncate(path: str, size: int) -> None:
+        if os.path.exists(path) and os.path.getsize(path) > size:
+            with open(path, "r+b") as f:
+                f.truncate(size)
+
+    @staticmethod
+    def _remove(path: str) -> None:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+    def _map(self, rows: int) -> None:
+        """디스크의 앞 rows 개 행을 메모리 매핑합니다. (파일에 추가해도 기존 매핑은 유효)"""
+        if rows == 0:
+            self._float_vectors = np.zeros((0, self.dimensions), dtype=np.float32)
+            self._quantized_vectors = np.zeros((0, self._quantized_width()), dtype=self._quantized_dtype())
+            self._scales = np.zeros(0, dtype=np.float32)
+            return
+        files = self._files(self._generation)
+        self._float_vectors = np.memmap(files["float"], dtype=np.float32, mode="r", shape=(rows, self.dimensions))
+        self._quantized_vectors = np.memmap(
+            files["quantized"], dtype=self._quantized_dtype(), mode="r", shape=(rows, self._quantized_width())
+        )
+        self._scales = np.memmap(files["scales"], dtype=np.float32, mode="r", shape=(rows,))
+
+    def _append(self, arrays: Dict[str, np.ndarray], records: List[Dict[str, Any]]) -> None:
+        """현재 세대 파일 끝에 행과 records 로그를 추가합니다. (manifest 는 _commit 에서 갱신)"""
+        os.makedirs(self.persist_directory, exist_ok=True)
+        files = self._files(self._generation)
+        for name, array in arrays.items():
+            with open(files[name], "ab") as f:
+                f.write(np.ascontiguousarray(array).tobytes())
+        with open(files["records"], "a", encoding="utf-8") as f:
+            for record in records:
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+        if arrays:
+            self._rows_on_disk += len(arrays["scales"])
+            self._map(self._rows_on_disk)
+
+    def _commit(self) -> None:
+        """
+        manifest 를 원자적으로 교체해 지금까지 추가한 내용을 확정합니다.
+        확정 전에 중단되면 다음 로드에서 manifest 의 행 수/로그 크기 뒤는 잘려 나갑니다.
+        """
+        os.makedirs(self.persist_directory, exist_ok=True)
+        records_path = self._files(self._generation)["records"]
+        tmp_path = self._path("manifest.json.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({
+                "collection_name": self.collection_name,
+                "dimensions": self.dimensions,
+                "quantization": self.quantization,
+                "generation": self._generation,
+                "rows": self._rows_on_disk,
+                "records_bytes": os.path.getsize(records_path) if os.path.exists(records_path) else 0,
+                "count": self.count(),
+            }, f)
+        os.replace(tmp_path, self._path("manifest.json"))
+
+    def _maybe_compact(self) -> None:
+        """삭제/교체된 행이 살아 있는 행보다 많아지면 압축합니다. (재작성 비용은 추가량에 비례해 분할 상환)"""
+        dead = len(self._ids) - self.count()
+        if dead > COMPACT_MIN_DEAD_ROWS and dead > self.count():
+            self.persist()
+
+    def persist(self) -> None:
+        """
+        삭제된 행을 제거(압축)해 새 세대 파일에 쓰고 manifest 를 원자적으로 교체합니다.
+        SCAN_BLOCK_ROWS 행씩 복사하므로 인덱스 전체를 메모리에 올리지 않습니다.
+        """
+        with self._lock:
+            os.makedirs(self.persist_directory, exist_ok=True)
+            rows = np.flatnonzero(self._alive)
+            previous = self._files(self._generation)
+            self._generation += 1
+            files = self._files(self._generation)
+
+            for name, source in (
+                ("float", self._float_vectors), ("quantized", self._quantized_vectors), ("scales", self._scales)
+            ):
+                with open(files[name], "wb") as f:
+                    for start in range(0, len(rows), SCAN_BLOCK_ROWS):
+                        f.write(np.ascontiguousarray(source[rows[start:start + SCAN_BLOCK_ROWS]]).tobytes())
+            with open(files["records"], "w", encoding="utf-8") as f:
+                for row in rows:
+                    f.write(json.dumps({
+                        "id": self._ids[row],
+                        "document": self._documents[row],
+                        "metadata": self._metadatas[row],
+                    }, ensure_ascii=False) + "\n")
+
+            self._ids = [self._ids[row] for row in rows]
+            self._documents = [self._documents[row] for row in rows]
+            self._metadatas = [self._metadatas[row] for row in rows]
+            self._id_to_row = {id_: row for row, id_ in enumerate(self._ids)}
+            self._reset_alive(len(self._ids))
+            # 행 번호가 바뀌었으므로 다음 필터 검색 때 다시 생성
+            self._metadata_index = None
+            self._rows_on_disk = len(rows)
+            self._map(len(rows))
+            self._commit()
+
+            # 이전 세대는 manifest 교체 후 삭제 (열려 있는 매핑은 계속 읽을 수 있음)
+            for path in previous.values():
+                self._remove(path)
+
+    # ------------------------------------------------------------------
+    # 양자화
+    # ------------------------------------------------------------------
+
+    def _prepare(self, vectors: np.ndarray) -> np.ndarray:
+        """설정된 차원으로 잘라낸 뒤 정규화합니다. (text-embedding-3 계열은 앞 차원 절단을 지원)"""
+        vectors = np.asarray(vectors, dtype=np.float32)
+        if vectors.ndim == 1:
+            vectors = vectors[None, :]
+        if vectors.shape[1] < self.dimensions:
+            raise ValueError(f"임베딩 차원({vectors.shape[1]})이 인덱스 차원({self.dimensions})보다 작습니다.")
+        return _normalize(vectors[:, :self.dimensions]).astype(np.float32)
+
+    def _quantize(self, vectors: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        if self.quantization == "int8":
+            scales = np.abs(vectors).max(axis=1) / 127.0
+            scales[scales == 0] = 1.0
+            quantized = np.clip(np.rint(vectors / scales[:, None]), -127, 127).astype(np.int8)
+            return quantized, scales.astype(np.float32)
+
+        quantized = np.packbits(vectors > 0, axis=1)
+        return quantized, np.ones(len(vectors), dtype=np.float32)
+
+    def _approximate_scores(self, query: np.ndarray, rows: np.ndarray) -> np.ndarray:
+        """양자화 벡터로 근사 유사도를 계산합니다. (클수록 유사)"""
+        scores = np.empty(len(rows), dtype=np.float32)
+
+        if self.quantization == "binary":
+            query_bits = np.packbits(query > 0)
+
+        for start in range(0, len(rows), SCAN_BLOCK_ROWS):
+            block_rows = rows[start:start + SCAN_BLOCK_ROWS]
+            block = self._quantized_vectors[block_rows]
+            if self.quantization == "int8":
+                block_scores = block.astype(np.float32) @ query
+                block_scores *= self._scales[block_rows]
+            else:
+                hamming = _POPCOUNT_TABLE[np.bitwise_xor(block, query_bits)].sum(axis=1, dtype=np.int32)
+                block_scores = -hamming.astype(np.float32)
+            scores[start:start + len(block_rows)] = block_scores
+
+        return scores
+
+    # ------------------------------------------------------------------
+    # 추가 / 삭제 / 조회
+    # ------------------------------------------------------------------
+
+    def add_embeddings(
+        self,
+        texts: List[str],
+        embeddings: Iterable[List[float]],
+        metadatas: Optional[List[Dict[str, Any]]] = None,
+        ids: Optional[List[str]] = None,
+        persist: bool = True,
+    ) -> List[str]:
+        """
+        미리 계산된 임베딩을 추가합니다. 같은 id가 이미 있으면 교체(upsert)합니다.
+
+        Args:
+            texts: 문서 본문 목록
+            embeddings: 문서별 임베딩
+            metadatas: 문서별 메타데이터
+            ids: 문서 id 목록 (없으면 uuid 생성)
+            persist: 추가 후 즉시 manifest 를 갱신해 확정할지 여부
+                (False 면 파일 끝에만 덧붙이고 다음 persist/delete 때 함께 확정)
+
+        Returns:
+            List[str]: 추가된 문서 id 목록
+        """
+        texts = list(texts)
+        if not texts:
+            return []
+
+        ids = list(ids) if ids else [str(uuid.uuid4()) for _ in texts]
+        metadatas = list(metadatas) if metadatas else [{} for _ in texts]
+
+        vectors = self._prepare(np.asarray(list(embeddings), dtype=np.float32))
+        quantized, scales = self._quantize(vectors)
+        records = [
+            {"id": id_, "document": text, "metadata": dict(metadata or {})}
+            for id_, text, metadata in zip(ids, texts, metadatas)
+        ]
+
+        with self._lock:
+            base = len(self._ids)
+            self._append({"float": vectors, "quantized": quantized, "scales": scales}, records)
+            self._extend_alive(len(records))
+            for offset, record in enumerate(records):
+                self._replay(record)
+                if self._metadata_index is not None:
+                    self._index_metadata(base + offset, record["metadata"])
+
+            if persist:
+                self._commit()
+                self._maybe_compact()
+        return ids
+
+    def add_texts(
+        self,
+        texts: Iterable[str],
+        metadatas: Optional[List[dict]] = None,
+        ids: Optional[List[str]] = None,
+        **kwargs: Any,
+    ) -> List[str]:
+        texts = list(texts)
+        if not texts:
+            return []
+        embeddings = self._embedding_function.embed_documents(texts)
+        return self.add_embeddings(texts, embeddings, metadatas=metadatas, ids=ids)
+
+    def delete(self, ids: Optional[List[str]] = None, **kwargs: Any) -> Optional[bool]:
+        if not ids:
+            return False
+        with self._lock:
+            rows = [self._id_to_row.pop(id_) for id_ in ids if id_ in self._id_to_row]
+            if rows:
+                self._alive[rows] = False
+                self._append({}, [{"deleted": rows}])
+                self._commit()
+                self._maybe_compact()
+        return True
+
+    def _index_metadata(self, row: int, metadata: Dict[str, Any]) -> None:
+        for key, value in metadata.items():
+            if isinstance(value, str):
+                self._metadata_index.setdefault(key, {}).setdefault(value, []).append(row)
+
+    def _get_metadata_index(self) -> Dict[str, Dict[str, List[int]]]:
+        if self._metadata_index is None:
+            self._metadata_index = {}
+            for row, metadata in enumerate(self._metadatas):
+                self._index_metadata(row, metadata)
+        return self._metadata_index
+
+    def _indexed_rows(self, where: Dict[str, Any]) -> Tuple[Optional[np.ndarray], bool]:
+        """
+        메타데이터 역색인으로 where 를 만족할 수 있는 행 후보를 찾습니다. (삭제된 행 포함)
+
+        Returns:
+            Tuple[Optional[np.ndarray], bool]: (정렬된 후보 행, 후보가 모두 where 를 만족하는지).
+                역색인으로 좁힐 수 있는 조건이 없으면 후보는 None
+        """
+        index = self._get_metadata_index()
+        candidates: Optional[np.ndarray] = None
+        exact = True
+
+        for key, condition in where.items():
+            if key in ("$and", "$or"):
+                parts = [self._indexed_rows(sub) for sub in condition]
+                if key == "$and":
+                    rows = None
+                    for part_rows, _ in parts:
+                        if part_rows is not None:
+                            rows = part_rows if rows is None else np.intersect1d(rows, part_rows, assume_unique=True)
+                    part_exact = all(part_rows is not None and part_exact for part_rows, part_exact in parts)
+                elif parts and all(part_rows is not None for part_rows, _ in parts):
+                    rows = np.unique(np.concatenate([part_rows for part_rows, _ in parts]))
+                    part_exact = all(part_exact for _, part_exact in parts)
+                else:
+                    rows, part_exact = None, False
+            else:
+                values = _equality_values(condition)
+                if values is None:
+                    rows, part_exact = None, False
+                else:
+                    by_value = index.get(key, {})
+                    rows = np.unique(np.fromiter(
+                        (row for value in values for row in by_value.get(value, ())), dtype=np.int64
+                    ))
+                    part_exact = True
+
+            if rows is None:
+                exact = False
+                continue
+            candidates = rows if candidates is None else np.intersect1d(candidates, rows, assume_unique=True)
+            exact = exact and part_exact
+
+        return candidates, exact
+
+    def _candidate_rows(self, where: Optional[Dict[str, Any]] = None) -> np.ndarray:
+        """
+        where 를 만족하는 살아 있는 행을 반환합니다.
+        문자열 동등 비교($eq, $in, $and, $or 조합)는 역색인으로 후보를 좁혀 전체 행을 훑지 않습니다.
+        """
+        if not where:
+            return np.flatnonzero(self._alive)
+
+        rows, exact = self._indexed_rows(where)
+        if rows is None:
+            rows = np.flatnonzero(self._alive)
+        else:
+            rows = rows[self._alive[rows]]
+        if not exact:
+            rows = np.array([row for row in rows if _match_where(self._metadatas[row], where)], dtype=np.int64)
+        return rows
+
+    def get(
+        self,
+        ids: Optional[List[str]] = None,
+        where: Optional[Dict[str, Any]] = None,
+        include: Optional[List[str]] = None,
+        limit: Optional[int] = None,
+        offset: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """
+        Chroma Collection.get 과 같은 형식으로 저장된 문서를 조회합니다.
+        """
+        with self._lock:
+            include = ["documents", "metadatas"] if include is None else include
+            if ids is not None:
+                rows = [self._id_to_row[id_] for id_ in ids if id_ in self._id_to_row]
+                rows = [row for row in rows if _match_where(self._metadatas[row], where)]
+            else:
+                rows = self._candidate_rows(where).tolist()
+
+            start = offset or 0
+            rows = rows[start:start + limit] if limit is not None else rows[start:]
+
+            result: Dict[str, Any] = {"ids": [self._ids[row] for row in rows]}
+            if "documents" in include:
+                result["documents"] = [self._documents[row] for row in rows]
+            if "metadatas" in include:
+                result["metadatas"] = [self._metadatas[row] for row in rows]
+            if "embeddings" in include:
+                result["embeddings"] = [np.asarray(self._float_vectors[row]).tolist() for row in rows]
+            return result
+
+    def count(self) -> int:
+        with self._lock:
+            return int(self._alive.sum())
+
+    # ------------------------------------------------------------------
+    # 검색
+    # ------------------------------------------------------------------
+
+    def similarity_search_by_vector_with_score(
+        self,
+        embedding: List[float],
+        k: int = 4,
+        filter: Optional[Dict[str, Any]] = None,
+    ) -> List[Tuple[Document, float]]:
+        """
+        양자화 1차 검색 후 float32 재정렬로 상위 k개 문서를 반환합니다.
+
+        Returns:
+            List[Tuple[Document, float]]: (문서, 제곱 L2 거리) 목록. 작을수록 유사합니다.
+        """
+        with self._lock:
+            rows = self._candidate_rows(filter)
+            if len(rows) == 0:
+                return []
+
+            query = self._prepare(np.asarray(embedding, dtype=np.float32))[0]
+
+            # 1차: 양자화 벡터로 재정렬 후보 선택
+            n_candidates = min(len(rows), k * self.rerank_factor)
+            if n_candidates < len(rows):
+                approximate = self._approximate_scores(query, rows)
+                candidates = rows[np.argpartition(-approximate, n_candidates - 1)[:n_candidates]]
+            else:
+                candidates = rows
+
+            return self._rerank(query, candidates, k)
+
+    def _rerank(self, query: np.ndarray, candidates: np.ndarray, k: int) -> List[Tuple[Document, float]]:
+        """float32 원본 벡터로 후보를 정확히 재정렬합니다."""
+        candidates = np.sort(candidates)
+        exact = np.asarray(self._float_vectors[candidates]) @ query
+        order = np.argsort(-exact)[:k]
+
+        results = []
+        for index in order:
+            row = candidates[index]
+            distance = float(max(0.0, 2.0 - 2.0 * exact[index]))
+            document = Document(
+                id=self._ids[row],
+                page_content=self._documents[row],
+                metadata=dict(self._metadatas[row]),
+            )
+            results.append((document, distance))
+        return results
+
+    def batch_similarity_search_by_vector_with_score(
+        self,
+        embeddings: List[List[float]],
+        k: int = 4,
+        filter: Optional[Dict[str, Any]] = None,
+    ) -> List[List[Tuple[Document, float]]]:
+        """
+        여러 질의 벡터를 한 번에 검색합니다.
+        int8 양자화는 블록별 역양자화 비용을 모든 질의가 공유하도록 행렬 곱으로 계산합니다.
+
+        Returns:
+            List[List[Tuple[Document, float]]]: 질의별 (문서, 제곱 L2 거리) 목록
+        """
+        if self.quantization != "int8" or len(embeddings) <= 1:
+            return [self.similarity_search_by_vector_with_score(embedding, k=k, filter=filter) for embedding in embeddings]
+
+        with self._lock:
+            rows = self._candidate_rows(filter)
+            if len(rows) == 0:
+                return [[] for _ in embeddings]
+
+            queries = self._prepare(np.asarray(embeddings, dtype=np.float32))
+            n_candidates = min(len(rows), k * self.rerank_factor)
+
+            # 1차: (행, 질의) 근사 점수 행렬
+            approximate = np.empty((len(rows), len(queries)), dtype=np.float32)
+            for start in range(0, len(rows), SCAN_BLOCK_ROWS):
+                block_rows = rows[start:start + SCAN_BLOCK_ROWS]
+                block_scores = self._quantized_vectors[block_rows].astype(np.float32) @ queries.T
+                block_scores *= self._scales[block_rows][:, None]
+                approximate[start:start + len(block_rows)] = block_scores
+
+            results = []
+            for index, query in enumerate(queries):
+                if n_candidates < len(rows):
+                    candidates = rows[np.argpartition(-approximate[:, index], n_candidates - 1)[:n_candidates]]
+                else:
+                    candidates = rows
+                results.append(self._rerank(query, candidates, k))
+            return results
+
+    def similarity_search_with_score(
+        self,
+        query: str,
+        k: int = 4,
+        filter: Optional[Dict[str, Any]] = None,
+        **kwargs: Any,
+    ) -> List[Tuple[Document, float]]:
+        embedding = self._embedding_function.embed_query(query)
+        return self.similarity_search_by_vector_with_score(embedding, k=k, filter=filter)
+
+    def similarity_search(
+        self,
+        query: str,
+        k: int = 4,
+        filter: Optional[Dict[str, Any]] = None,
+        **kwargs: Any,
+    ) -> List[Document]:
+        return [doc for doc, _ in self.similarity_search_with_score(query, k=k, filter=filter)]
+
+    def similarity_search_by_vector(
+        self,
+        embedding: List[float],
+        k: int = 4,
+        filter: Optional[Dict[str, Any]] = None,
+        **kwargs: Any,
+    ) -> List[Document]:
+        return [doc for doc, _ in self.similarity_search_by_vector_with_score(embedding, k=k, filter=filter)]
+
+    def _select_relevance_score_fn(self) -> Callable[[float], float]:
+        # Chroma 기본(l2) 컬렉션과 같은 relevance 변환을 사용
+        return self._euclidean_relevance_score_fn
+
+    @classmethod
+    def from_texts(
+        cls,
+        texts: List[str],
+        embedding: Embeddings,
+        metadatas: Optional[List[dict]] = None,
+        ids: Optional[List[str]] = None,
+        collection_name: str = "langchain",
+        persist_directory: str = "quantized_db",
+        **kwargs: Any,
+    ) -> "QuantizedVectorStore":
+        store = cls(
+            collection_name=collection_name,
+            embedding_function=embedding,
+            persist_directory=persist_directory,
+            **kwargs,
+        )
+        store.add_texts(texts, metadatas=metadatas, ids=ids)
+        return store
@@ -0,0 +1,139 @@
+import functools
+import os
+import threading
+import time
+from typing import Iterable, Optional
+
+from src.config.log_config import Logger
+from src.config.metrics_config import Metrics
+from src.utils.token_utils import count_tokens
+
+logger = Logger()
+metrics = Metrics()
+
+# 프로세스 전체에서 공유하는 외부 API 사용량 한도 (0 이하이면 제한 없음)
+# GitHub 인증 토큰의 REST API 한도는 시간당 5000 요청
+# 버스트 기본값은 시간당 한도 전체라 한도 안의 수집은 기다리지 않고, 한도를 다 쓴 뒤에만 시간당 속도로 나눠 보냄
+GITHUB_REQUESTS_PER_HOUR: int = int(os.getenv("GITHUB_REQUESTS_PER_HOUR", "5000"))
+GITHUB_REQUEST_BURST: int = int(os.getenv("GITHUB_REQUEST_BURST", str(max(GITHUB_REQUESTS_PER_HOUR, 1))))
+# GitHub GraphQL API 는 REST 와 별도로 시간당 5000 포인트 (요청마다 rateLimit.cost 만큼 차감)
+GITHUB_GRAPHQL_POINTS_PER_HOUR: int = int(os.getenv("GITHUB_GRAPHQL_POINTS_PER_HOUR", "5000"))
+GITHUB_GRAPHQL_BURST: int = int(os.getenv("GITHUB_GRAPHQL_BURST", str(max(GITHUB_GRAPHQL_POINTS_PER_HOUR, 1))))
+# 임베딩과 가설 질문 생성(LLM)이 함께 사용하는 OpenAI 토큰 한도
+OPENAI_TOKENS_PER_MINUTE: int = int(os.getenv("OPENAI_TOKENS_PER_MINUTE", "1000000"))
+OPENAI_TOKEN_BURST: int = int(os.getenv("OPENAI_TOKEN_BURST", str(max(OPENAI_TOKENS_PER_MINUTE // 6, 1))))
+
+
+class RateBudget:
+    """
+    여러 수집 작업이 함께 사용하는 토큰 버킷
+
+    초당 rate 만큼 채워지고 최대 capacity 까지 모입니다. acquire 는 필요한 양이 모일 때까지 기다린 뒤 차감하며,
+    capacity 보다 큰 요청은 capacity 만큼 모이면 허용하고 부족분은 이후 요청이 기다리도록 빚으로 남깁니다.
+    GitHub 가 rate limit 초과로 응답하면 pause_until 로 모든 작업을 초기화 시각까지 멈춥니다.
+    """
+
+    def __init__(self, name: str, rate: float, capacity: float):
+        """
+        Args:
+            name: 메트릭/로그에 사용할 이름
+            rate: 초당 채워지는 양 (0 이하이면 제한 없음)
+            capacity: 최대로 모을 수 있는 양
+        """
+        self.name = name
+        self.rate = rate
+        self.capacity = max(capacity, 1)
+        self._tokens = self.capacity
+        self._updated_at = time.monotonic()
+        self._paused_until = 0.0
+        self._condition = threading.Condition()
+
+    @property
+    def enabled(self) -> bool:
+        return self.rate > 0
+
+    def _refill(self, now: float) -> None:
+        # 멈춘 동안에는 채우지 않음
+        start = max(self._updated_at, self._paused_until)
+        if now > start:
+            self._tokens = min(self.capacity, self._tokens + (now - start) * self.rate)
+        self._updated_at = now
+
+    def acquire(self, amount: float = 1, timeout: Optional[float] = None) -> bool:
+        """
+        사용량을 차감합니다. 부족하면 채워질 때까지 기다립니다.
+
+        Args:
+            amount: 사용할 양
+            timeout: 최대 대기 시간 (초, None 이면 무제한)
+
+        Returns:
+            bool: 차감했으면 True, timeout 안에 채워지지 않았으면 False
+        """
+        if not self.enabled or amount <= 0:
+            return True
+
+        needed = min(amount, self.capacity)
+        deadline = None if timeout is None else time.monotonic() + timeout
+        waited = 0.0
+        with self._condition:
+            while True:
+                now = time.monotonic()
+                self._refill(now)
+                if now >= self._paused_until and self._tokens >= needed:
+                    self._tokens -= amount
+                    break
+
+                wait = max(self._paused_until - now, (needed - self._tokens) / self.rate, 0.001)
+                if deadline is not None:
+                    if now >= deadline:
+                        return False
+                    wait = min(wait, deadline - now)
+                self._condition.wait(wait)
+                waited += time.monotonic() - now
+
+        metrics.inc("rate_budget_acquired_total", amount, budget=self.name)
+        if waited:
+            metrics.inc("rate_budget_wait_seconds_total", waited, budget=self.name)
+        return True
+
+    def pause_until(self, wall_clock_time: float) -> None:
+        """
+        지정한 시각(time.time 기준)까지 모든 acquire 를 멈춥니다.
+
+        Args:
+            wall_clock_time: 재개 시각 (epoch 초, 예: GitHub X-RateLimit-Reset)
+        """
+        delay = wall_clock_time - time.time()
+        if delay <= 0:
+            return
+        with self._condition:
+            paused_until = time.monotonic() + delay
+            if paused_until > self._paused_until:
+                self._paused_until = paused_until
+                self._tokens = 0
+                logger.warning(f"{self.name} 한도 초과: {delay:.0f}초 동안 요청을 멈춥니다.")
+            self._condition.notify_all()
+
+
+def estimate_tokens(texts: Iterable[str]) -> int:
+    """요청 전 한도 차감용 OpenAI 토큰 수 (임베딩 모델 토크나이저 기준, 캐시된 count_tokens 사용)"""
+    return sum(count_tokens(text) for text in texts)
+
+
+@functools.lru_cache(maxsize=1)
+def get_github_budget() -> RateBudget:
+    """모든 수집 작업이 공유하는 GitHub 요청 한도"""
+    return RateBudget("github_requests", GITHUB_REQUESTS_PER_HOUR / 3600, GITHUB_REQUEST_BURST)
+
+
+@functools.lru_cache(maxsize=1)
+def get_github_graphql_budget() -> RateBudget:
+    """모든 수집 작업이 공유하는 GitHub GraphQL 포인트 한도"""
+    return RateBudget("github_graphql_points", GITHUB_GRAPHQL_POINTS_PER_HOUR / 3600, GITHUB_GRAPHQL_BURST)
+
+
+@functools.lru_cache(maxsize=1)
+def get_openai_budget() -> RateBudget:
+    """모든 수집 작업의 임베딩 / 가설 질문 생성이 공유하는 OpenAI 토큰 한도"""
+    return RateBudget("openai_tokens", OPENAI_TOKENS_PER_MINUTE / 60, OPENAI_TOKEN_BURST)
@@ -0,0 +1,105 @@
+import os
+from typing import Any, Dict, List, Optional
+from urllib.parse import urlparse
+
+from src.models.search_scope import SearchScope
+
+# 경로 접두사 필터용으로 저장할 상위 디렉토리 깊이 (dir_1 ~ dir_N)
+# 더 깊은 접두사는 dir_N 으로 벡터 검색 범위를 좁힌 뒤 결과를 file_path 로 다시 거릅니다.
+PATH_PREFIX_MAX_DEPTH: int = int(os.getenv("PATH_PREFIX_MAX_DEPTH", "8"))
+
+
+def repo_slug(repo: str) -> str:
+    """
+    저장소 URL 또는 owner/name 을 소문자 owner/name 으로 정규화합니다.
+
+    Args:
+        repo: 저장소 URL (https://github.com/owner/name[.git]) 또는 owner/name
+
+    Returns:
+        str: owner/name
+    """
+    repo = repo.strip().rstrip('/')
+    if repo.endswith('.git'):
+        repo = repo[:-4]
+    path = urlparse(repo).path if "://" in repo else repo
+    parts = [part for part in path.split('/') if part]
+    return "/".join(parts[-2:]).lower()
+
+
+def normalize_path(path: str) -> str:
+    """앞뒤 '/' 와 './' 를 제거한 저장소 기준 상대 경로"""
+    path = path.strip().strip('/')
+    while path.startswith('./'):
+        path = path[2:]
+    return path
+
+
+def scope_metadata(repo_url: str, file_path: str) -> Dict[str, str]:
+    """
+    범위 필터에 사용할 파일 메타데이터를 만듭니다.
+    Chroma 메타데이터 필터는 접두사 비교를 지원하지 않으므로 상위 디렉토리를 깊이별 키로 저장해
+    경로 접두사 조건을 동등 비교로 바꿉니다. (src/utils/a.py → dir_1=src, dir_2=src/utils)
+
+    Args:
+        repo_url: 저장소 URL
+        file_path: 저장소 기준 파일 경로
+
+    Returns:
+        Dict[str, str]: repo, dir_1 ~ dir_N 메타데이터
+    """
+    metadata = {"repo": repo_slug(repo_url)}
+    directories = normalize_path(file_path).split('/')[:-1]
+    for depth in range(1, min(len(directories), PATH_PREFIX_MAX_DEPTH) + 1):
+        metadata[f"dir_{depth}"] = "/".join(directories[:depth])
+    return metadata
+
+
+def build_scope_filter(scope: Optional[SearchScope]) -> Optional[Dict[str, Any]]:
+    """
+    검색 범위를 Chroma where 필터로 변환합니다.
+
+    Args:
+        scope: 검색 범위
+
+    Returns:
+        Optional[Dict[str, Any]]: where 필터 (조건이 없으면 None)
+    """
+    if scope is None:
+        return None
+
+    conditions: List[Dict[str, Any]] = []
+    if scope.repo:
+        conditions.append({"repo": repo_slug(scope.repo)})
+    if scope.ref:
+        conditions.append({"ref": scope.ref})
+    if scope.language:
+        conditions.append({"language": scope.language.upper()})
+    if scope.extension:
+        conditions.append({"extension": scope.extension.lstrip('.').lower()})
+
+    path_prefix = normalize_path(scope.path_prefix or "")
+    if path_prefix:
+        parts = path_prefix.split('/')
+        if len(parts) <= PATH_PREFIX_MAX_DEPTH:
+            # 디렉토리이거나 파일 경로 자체
+            conditions.append({"$or": [{f"dir_{len(parts)}": path_prefix}, {"file_path": path_prefix}]})
+        else:
+            conditions.append({f"dir_{PATH_PREFIX_MAX_DEPTH}": "/".join(parts[:PATH_PREFIX_MAX_DEPTH])})
+
+    if not conditions:
+        return None
+    return conditions[0] if len(conditions) == 1 else {"$and": conditions}
+
+
+def needs_path_post_filter(scope: Optional[SearchScope]) -> bool:
+    """경로 접두사가 PATH_PREFIX_MAX_DEPTH 보다 깊어 검색 결과를 다시 걸러야 하는지 여부"""
+    path_prefix = normalize_path(scope.path_prefix or "") if scope else ""
+    return bool(path_prefix) and len(path_prefix.split('/')) > PATH_PREFIX_MAX_DEPTH
+
+
+def matches_path_prefix(metadata: Dict[str, Any], path_prefix: str) -> bool:
+    """문서의 file_path 가 경로 접두사(디렉토리 단위) 아래에 있는지 확인합니다."""
+    path_prefix = normalize_path(path_prefix)
+    file_path = normalize_path(metadata.get("file_path") or "")
+    return file_path == path_prefix or file_path.startswith(path_prefix + '/')
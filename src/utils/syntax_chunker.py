@@ -0,0 +1,249 @@
+"""
+구문 트리 기반 청크 분할 (CHUNKING_MODE=syntax)
+
+파일의 최상위 정의(함수, 클래스 등)를 경계로 청크를 나눕니다.
+- 작은 정의는 앞뒤 정의와 청크 크기 안에서 하나로 묶습니다.
+- 청크 크기를 넘는 정의는 내부 문장 경계에서 다시 나눕니다.
+- 더 나눌 문장이 없는 경우에만 언어별 문자 분할기를 사용합니다.
+
+정의 사이의 주석, import 와 데코레이터는 뒤따르는 정의의 청크에 포함되고, 청크끼리 겹치지 않습니다.
+Python 은 표준 ast 모듈을 사용하고, 그 외 언어는 tree_sitter_languages 가 설치되어 있을 때만 지원합니다.
+"""
+
+import ast
+import functools
+import os
+import re
+from dataclasses import dataclass, field
+from typing import Any, Callable, List, Optional
+
+from langchain_core.documents import Document
+from langchain_text_splitters import RecursiveCharacterTextSplitter
+
+from src.config.log_config import Logger
+from src.utils.language_registry import get_spec
+
+logger = Logger()
+
+# recursive: 파서 결과를 문자 수 기준 분할기로 나눔 (기존 방식)
+# syntax: 파일 전체를 구문 트리의 정의 경계로 나눔
+CHUNKING_MODE: str = os.getenv("CHUNKING_MODE", "recursive").lower()
+
+_LEADING_BLANK_LINES = re.compile(r"(?:[ \t]*\r?\n)+")
+# 내부 문장으로 다시 나눌 때 사용하는 Python 복합문 필드
+_PYTHON_BODY_FIELDS = ("body", "handlers", "orelse", "finalbody", "cases")
+
+
+@dataclass
+class _Node:
+    """정의/문장 하나 (0부터 시작하는 줄 번호, last_line 포함)"""
+    first_line: int
+    last_line: int
+    symbol: Optional[str] = None
+    children: List["_Node"] = field(default_factory=list)
+
+
+@dataclass
+class _Span:
+    """청크 후보 (줄 범위, end_line 미포함)"""
+    start_line: int
+    end_line: int
+    size: int
+    symbols: List[str] = field(default_factory=list)
+    # 내부 문장이 없어 문자 분할기로 나눠야 하는 큰 구간
+    oversized: bool = False
+
+
+def _python_nodes(text: str) -> Optional[List[_Node]]:
+    try:
+        tree = ast.parse(text)
+    except (SyntaxError, ValueError):
+        return None
+
+    def convert(node: ast.AST, prefix: str) -> _Node:
+        symbol = None
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+            symbol = f"{prefix}{node.name}"
+        decorators = getattr(node, "decorator_list", [])
+        first_line = min([node.lineno] + [decorator.lineno for decorator in decorators]) - 1
+        children: List[ast.AST] = []
+        for name in _PYTHON_BODY_FIELDS:
+            children.extend(getattr(node, name, None) or [])
+        child_prefix = f"{symbol}." if symbol else prefix
+        return _Node(
+            first_line=first_line,
+            last_line=(node.end_lineno or node.lineno) - 1,
+            symbol=symbol,
+            children=[convert(child, child_prefix) for child in children if hasattr(child, "lineno")],
+        )
+
+    return [convert(node, "") for node in tree.body]
+
+
+@functools.lru_cache(maxsize=None)
+def _tree_sitter_parser(name: str) -> Any:
+    try:
+        from tree_sitter_languages import get_parser
+        return get_parser(name)
+    except Exception as e:
+        logger.warning(f"tree-sitter {name} 파서를 사용할 수 없어 문자 수 기준 분할기를 사용합니다: {e}")
+        return None
+
+
+def _tree_sitter_nodes(text: str, name: str) -> Optional[List[_Node]]:
+    parser = _tree_sitter_parser(name)
+    if parser is None:
+        return None
+    tree = parser.parse(text.encode("utf-8"))
+    if tree.root_node.has_error:
+        return None
+
+    def convert(node: Any, prefix: str) -> _Node:
+        name_node = node.child_by_field_name("name")
+        symbol = f"{prefix}{name_node.text.decode('utf-8', 'replace')}" if name_node is not None else None
+        body = node.child_by_field_name("body")
+        children = body.named_children if body is not None else []
+        child_prefix = f"{symbol}." if symbol else prefix
+        return _Node(
+            first_line=node.start_point[0],
+            last_line=node.end_point[0],
+            symbol=symbol,
+            # 한 줄짜리 문장은 더 나눌 수 없으므로 변환하지 않음
+            children=[convert(child, child_prefix) for child in children if child.end_point[0] > child.start_point[0]]
+            if node.end_point[0] > node.start_point[0] else [],
+        )
+
+    return [convert(child, "") for child in tree.root_node.named_children]
+
+
+def _syntax_nodes(text: str, language: str) -> Optional[List[_Node]]:
+    if language == "PYTHON":
+        return _python_nodes(text)
+    tree_sitter_language = get_spec(language).tree_sitter_language
+    if tree_sitter_language is None:
+        return None
+    return _tree_sitter_nodes(text, tree_sitter_language)
+
+
+def _pack(
+    nodes: List[_Node], start_line: int, end_line: int, max_size: int, measure: Callable[[int, int], int]
+) -> List[_Span]:
+    """
+    [start_line, end_line) 구간을 노드 경계로 나눈 뒤 이웃한 구간을 max_size 안에서 묶습니다.
+    각 구간은 이전 노드의 끝 다음 줄부터 노드의 마지막 줄까지이므로 노드 앞의 주석/빈 줄과
+    (클래스를 나눌 때) 클래스 선언부는 첫 노드의 구간에 포함됩니다.
+    """
+    units: List[tuple] = []
+    cursor = start_line
+    for node in sorted(nodes, key=lambda item: item.first_line):
+        # 한 줄에 여러 문장이 있으면 앞 문장 구간에 이미 포함됨
+        if node.last_line < cursor:
+            continue
+        units.append([cursor, node.last_line + 1, node])
+        cursor = node.last_line + 1
+    if cursor < end_line:
+        if units:
+            units[-1][1] = end_line
+        else:
+            units.append([cursor, end_line, None])
+
+    spans: List[_Span] = []
+    current: Optional[_Span] = None
+    for unit_start, unit_end, node in units:
+        size = measure(unit_start, unit_end)
+        symbols = [node.symbol] if node is not None and node.symbol else []
+        if size > max_size:
+            if node is None or not node.children:
+                if current is not None:
+                    spans.append(current)
+                spans.append(_Span(unit_start, unit_end, size, symbols, oversized=True))
+                current = None
+                continue
+
+            inner = _pack(node.children, unit_start, unit_end, max_size, measure)
+            # 내부 청크에도 바깥 정의 이름을 남겨 어느 정의의 일부인지 알 수 있게 함
+            for span in inner:
+                if node.symbol and node.symbol not in span.symbols:
+                    span.symbols.insert(0, node.symbol)
+            # 나눈 정의의 첫/마지막 청크도 앞뒤 구간과 묶을 수 있음
+            first = inner[0]
+            if current is not None and not first.oversized and current.size + first.size <= max_size:
+                current.end_line = first.end_line
+                current.size += first.size
+                current.symbols.extend(symbol for symbol in first.symbols if symbol not in current.symbols)
+                inner = inner[1:]
+                if not inner:
+                    continue
+            if current is not None:
+                spans.append(current)
+            spans.extend(inner[:-1])
+            current = inner[-1] if not inner[-1].oversized else None
+            if current is None:
+                spans.append(inner[-1])
+            continue
+
+        if current is not None and current.size + size <= max_size:
+            current.end_line = unit_end
+            current.size += size
+            current.symbols.extend(symbols)
+        else:
+            if current is not None:
+                spans.append(current)
+            current = _Span(unit_start, unit_end, size, symbols)
+    if current is not None:
+        spans.append(current)
+    return spans
+
+
+def split_by_syntax(
+    document: Document, language: str, splitter: RecursiveCharacterTextSplitter
+) -> Optional[List[Document]]:
+    """
+    문서를 구문 트리의 정의 경계로 분할합니다.
+
+    Args:
+        document: 파일 전체 문서
+        language: 언어 이름 (language_registry)
+        splitter: 청크 크기/길이 함수와, 나눌 문장이 없는 큰 구간에 사용할 언어별 분할기
+
+    Returns:
+        Optional[List[Document]]: 분할된 문서 (metadata 에 start_index, symbols 포함)
+            구문 분석을 지원하지 않거나 실패하면 None
+    """
+    text = document.page_content
+    nodes = _syntax_nodes(text, language)
+    if not nodes:
+        return None
+
+    line_offsets = [0] + [match.end() for match in re.finditer("\n", text)]
+    if line_offsets[-1] != len(text):
+        line_offsets.append(len(text))
+    line_count = len(line_offsets) - 1
+    length_function = splitter._length_function
+
+    def measure(start_line: int, end_line: int) -> int:
+        return length_function(text[line_offsets[start_line]:line_offsets[min(end_line, line_count)]])
+
+    chunks: List[Document] = []
+    for span in _pack(nodes, 0, line_count, splitter._chunk_size, measure):
+        start = line_offsets[span.start_line]
+        content = text[start:line_offsets[min(span.end_line, line_count)]]
+        # 앞쪽 빈 줄과 뒤쪽 공백은 제외 (start_index 는 실제 내용 시작 위치)
+        blank = _LEADING_BLANK_LINES.match(content)
+        if blank:
+            start += blank.end()
+            content = content[blank.end():]
+        content = content.rstrip()
+        if not content:
+            continue
+
+        metadata = {**document.metadata, "symbols": ",".join(span.symbols)}
+        if span.oversized:
+            for piece in splitter.split_documents([Document(page_content=content)]):
+                chunks.append(Document(
+                    page_content=piece.page_content,
+                    metadata={**metadata, "start_index": start + piece.metadata.get("start_index", 0)},
+                ))
+        else:
+            chunks.append(Document(page_content=content, metadata={**metadata, "start_index": start}))
+    return chunks
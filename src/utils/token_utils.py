@@ -0,0 +1,120 @@
+"""
+임베딩 모델 토크나이저 기준의 토큰 수 계산
+
+청크 크기(CHUNK_LENGTH_UNIT=tokens), 임베딩 배치, 가설 질문 프롬프트, 컨텍스트 예산, OpenAI 사용량 한도가
+모두 같은 토큰 수를 사용합니다. 같은 청크를 분할, 배치 구성, 한도 차감에서 여러 번 세므로 결과를 캐시합니다.
+"""
+
+import functools
+import os
+from typing import Callable, Iterator, List, Optional, Sequence, Tuple, TypeVar
+
+from src.config.log_config import Logger
+
+logger = Logger()
+
+T = TypeVar("T")
+
+# 청크 크기 단위: chars(문자 수, 기본값) | tokens(임베딩 모델 토큰 수)
+CHUNK_LENGTH_UNIT: str = os.getenv("CHUNK_LENGTH_UNIT", "chars").lower()
+# 토크나이저를 고를 임베딩 모델 (chroma_utils 의 EMBEDDING_MODEL 과 같은 환경 변수)
+TOKENIZER_MODEL: str = os.getenv("EMBEDDING_MODEL", "text-embedding-3-small")
+# tiktoken 인코딩 파일을 받을 수 없는 환경에서 사용하는 토큰당 글자 수 추정치 (문자 단위 크기를 토큰으로 바꿀 때도 사용)
+CHARS_PER_TOKEN: int = 4
+# 토큰 수를 기억해 둘 텍스트 수와, 캐시하지 않을 긴 텍스트 기준 (파일 전체처럼 한 번만 세는 텍스트)
+TOKEN_COUNT_CACHE_SIZE: int = int(os.getenv("TOKEN_COUNT_CACHE_SIZE", "65536"))
+TOKEN_COUNT_CACHE_MAX_CHARS: int = 16 * 1024
+
+
+@functools.lru_cache(maxsize=1)
+def get_encoding():
+    """
+    임베딩 모델의 tiktoken 인코딩 (모델을 모르면 cl100k_base)
+    인코딩 파일을 받을 수 없으면 한 번만 경고하고 None 을 반환합니다.
+    """
+    try:
+        import tiktoken
+        try:
+            return tiktoken.encoding_for_model(TOKENIZER_MODEL)
+        except KeyError:
+            return tiktoken.get_encoding("cl100k_base")
+    except Exception as e:
+        logger.warning(f"tiktoken 인코딩을 불러오지 못해 {CHARS_PER_TOKEN}글자당 1토큰으로 추정합니다: {e}")
+        return None
+
+
+def _count(text: str) -> int:
+    encoding = get_encoding()
+    if encoding is None:
+        return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+    return len(encoding.encode_ordinary(text))
+
+
+_cached_count = functools.lru_cache(maxsize=TOKEN_COUNT_CACHE_SIZE)(_count)
+
+
+def count_tokens(text: str) -> int:
+    """
+    텍스트의 토큰 수 (짧은 텍스트는 결과를 캐시)
+
+    Args:
+        text: 텍스트
+
+    Returns:
+        int: 토큰 수 (tiktoken 을 사용할 수 없으면 추정치)
+    """
+    if len(text) > TOKEN_COUNT_CACHE_MAX_CHARS:
+        return _count(text)
+    return _cached_count(text)
+
+
+def truncate_to_tokens(text: str, max_tokens: int) -> str:
+    """
+    텍스트를 앞에서부터 max_tokens 토큰까지 자릅니다.
+
+    Args:
+        text: 텍스트
+        max_tokens: 최대 토큰 수
+
+    Returns:
+        str: 잘린 텍스트 (이미 짧으면 그대로)
+    """
+    if max_tokens <= 0:
+        return ""
+    if count_tokens(text) <= max_tokens:
+        return text
+    encoding = get_encoding()
+    if encoding is None:
+        return text[:max_tokens * CHARS_PER_TOKEN]
+    # 토큰 경계에서 잘린 멀티바이트 문자는 제외
+    return encoding.decode(encoding.encode_ordinary(text)[:max_tokens]).rstrip("\ufffd")
+
+
+def batch_by_tokens(
+    items: Sequence[T], text_of: Callable[[T], str], max_tokens: int, max_items: Optional[int] = None
+) -> Iterator[Tuple[List[T], int]]:
+    """
+    항목을 순서대로 토큰 합이 max_tokens 이하가 되도록 묶습니다. (한 항목이 max_tokens 를 넘으면 단독 배치)
+
+    Args:
+        items: 항목 목록
+        text_of: 항목의 텍스트
+        max_tokens: 배치당 최대 토큰 수 (0 이하이면 토큰 제한 없음)
+        max_items: 배치당 최대 항목 수
+
+    Yields:
+        Tuple[List[T], int]: (배치, 배치의 토큰 수)
+    """
+    batch: List[T] = []
+    tokens = 0
+    for item in items:
+        item_tokens = count_tokens(text_of(item))
+        if batch and (
+            (max_tokens > 0 and tokens + item_tokens > max_tokens) or (max_items and len(batch) >= max_items)
+        ):
+            yield batch, tokens
+            batch, tokens = [], 0
+        batch.append(item)
+        tokens += item_tokens
+    if batch:
+        yield batch, tokens
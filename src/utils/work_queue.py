@@ -0,0 +1,350 @@
+"""
+여러 프로세스/호스트의 작업자가 함께 사용하는 SQLite 작업 큐
+
+작업은 임대(lease) 방식으로 가져갑니다.
+- 작업자는 처리 중 주기적으로 heartbeat 를 보내 임대를 연장합니다.
+- 작업자가 죽거나 멈춰 임대가 만료되면 다른 작업자가 가져갑니다. (시도 횟수 증가)
+- 실패한 작업은 WORK_MAX_ATTEMPTS 번까지 지수 백오프 후 다시 대기열에 들어갑니다.
+- 대기 중인 작업이 없을 때 WORK_STEAL_AFTER_SECONDS 보다 오래 처리 중인 작업이 있으면, 쉬는 작업자가
+  같은 작업을 한 번 더 실행합니다. (먼저 끝난 쪽의 결과를 사용하므로 작업은 멱등이어야 함)
+
+같은 호스트의 프로세스끼리는 WAL 모드로 사용합니다. 다른 호스트의 작업자와 공유할 때는 POSIX 잠금을 지원하는
+공유 볼륨에 두고 WORK_QUEUE_JOURNAL_MODE=DELETE 로 설정해야 합니다. (WAL 은 공유 메모리를 사용해 네트워크
+파일 시스템에서 동작하지 않음)
+
+테이블:
+    work_tasks(task_id, job_id, payload, status, attempts, available_at, result, error, created_at, updated_at)
+    work_leases(task_id, owner, started_at, expires_at)
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from src.config.log_config import Logger
+from src.config.metrics_config import Metrics
+
+logger = Logger()
+metrics = Metrics()
+
+WORK_QUEUE_PATH: str = os.getenv("WORK_QUEUE_PATH", os.path.join("chroma_db", "work_queue.sqlite3"))
+WORK_QUEUE_JOURNAL_MODE: str = os.getenv("WORK_QUEUE_JOURNAL_MODE", "WAL").upper()
+# 임대 시간 (초, 작업자는 이 시간의 1/3 마다 heartbeat)
+WORK_LEASE_SECONDS: float = float(os.getenv("WORK_LEASE_SECONDS", "60"))
+# 작업당 최대 시도 횟수 (임대 만료 포함)
+WORK_MAX_ATTEMPTS: int = int(os.getenv("WORK_MAX_ATTEMPTS", "3"))
+# 실패한 작업을 다시 가져갈 수 있을 때까지의 대기 시간 (초, 시도마다 두 배)
+WORK_RETRY_BACKOFF_SECONDS: float = float(os.getenv("WORK_RETRY_BACKOFF_SECONDS", "5"))
+# 이 시간보다 오래 처리 중인 작업은 쉬는 작업자가 중복 실행 (초, 0 이면 사용 안 함)
+WORK_STEAL_AFTER_SECONDS: float = float(os.getenv("WORK_STEAL_AFTER_SECONDS", "120"))
+
+# 작업 상태
+PENDING, RUNNING, DONE, FAILED = "pending", "running", "done", "failed"
+
+
+class WorkQueue:
+    """
+    SQLite 기반 작업 큐
+
+    Args:
+        path: 큐 파일 경로 (기본값 WORK_QUEUE_PATH)
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or WORK_QUEUE_PATH
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._lock = threading.Lock()
+        # 트랜잭션은 BEGIN IMMEDIATE 로 직접 관리 (다른 프로세스와 동시에 같은 작업을 가져가지 않도록)
+        self._connection = sqlite3.connect(self.path, timeout=30, isolation_level=None, check_same_thread=False)
+        self._connection.execute(f"PRAGMA journal_mode={WORK_QUEUE_JOURNAL_MODE}")
+        self._connection.execute("PRAGMA busy_timeout=30000")
+        self._connection.executescript("""
+            CREATE TABLE IF NOT EXISTS work_tasks (
+                task_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                job_id TEXT NOT NULL,
+                payload TEXT NOT NULL,
+                status TEXT NOT NULL,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                available_at REAL NOT NULL,
+                result TEXT,
+                error TEXT,
+                created_at REAL NOT NULL,
+                updated_at REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS work_tasks_job_status ON work_tasks (job_id, status);
+            CREATE TABLE IF NOT EXISTS work_leases (
+                task_id INTEGER NOT NULL,
+                owner TEXT NOT NULL,
+                started_at REAL NOT NULL,
+                expires_at REAL NOT NULL,
+                PRIMARY KEY (task_id, owner)
+            );
+        """)
+
+    def _transaction(self):
+        return _Transaction(self._connection, self._lock)
+
+    def enqueue(self, job_id: str, payloads: Iterable[Dict[str, Any]]) -> List[int]:
+        """
+        작업을 대기열에 추가합니다. (먼저 추가한 작업부터 처리)
+
+        Args:
+            job_id: 작업 묶음 ID
+            payloads: 작업 내용 목록 (JSON 직렬화 가능)
+
+        Returns:
+            List[int]: 작업 ID 목록
+        """
+        now = time.time()
+        task_ids = []
+        with self._transaction() as connection:
+            for payload in payloads:
+                cursor = connection.execute(
+                    "INSERT INTO work_tasks (job_id, payload, status, available_at, created_at, updated_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (job_id, json.dumps(payload, ensure_ascii=False), PENDING, now, now, now),
+                )
+                task_ids.append(cursor.lastrowid)
+        return task_ids
+
+    def claim(
+        self, owner: str, job_id: Optional[str] = None, lease_seconds: Optional[float] = None
+    ) -> Optional[Tuple[int, Dict[str, Any]]]:
+        """
+        처리할 작업 하나를 임대합니다.
+        대기 중인 작업을 먼저 가져가고, 없으면 WORK_STEAL_AFTER_SECONDS 보다 오래 처리 중인 작업을 중복 실행합니다.
+
+        Args:
+            owner: 작업자 ID (호스트/프로세스마다 고유)
+            job_id: 이 작업 묶음의 작업만 가져옴 (None 이면 전체)
+            lease_seconds: 임대 시간 (기본값 WORK_LEASE_SECONDS)
+
+        Returns:
+            Optional[Tuple[int, Dict[str, Any]]]: (작업 ID, 작업 내용), 가져갈 작업이 없으면 None
+        """
+        lease_seconds = lease_seconds or WORK_LEASE_SECONDS
+        job_filter, job_args = ("AND job_id = ?", (job_id,)) if job_id else ("", ())
+        with self._transaction() as connection:
+            now = time.time()
+            self._expire_leases(connection, now)
+
+            row = connection.execute(
+                f"SELECT task_id, payload FROM work_tasks WHERE status = ? AND available_at <= ? {job_filter} "
+                "ORDER BY task_id LIMIT 1",
+                (PENDING, now, *job_args),
+            ).fetchone()
+            if row is not None:
+                connection.execute(
+                    "UPDATE work_tasks SET status = ?, attempts = attempts + 1, updated_at = ? WHERE task_id = ?",
+                    (RUNNING, now, row[0]),
+                )
+            elif WORK_STEAL_AFTER_SECONDS > 0 and not connection.execute(
+                f"SELECT 1 FROM work_tasks WHERE status = ? {job_filter} LIMIT 1", (PENDING, *job_args)
+            ).fetchone():
+                # 재시도 대기 중인 작업도 없을 때만, 다른 작업자 하나가 오래 처리 중인 작업을 중복 실행
+                row = connection.execute(
+                    f"SELECT t.task_id, t.payload FROM work_tasks t JOIN work_leases l ON l.task_id = t.task_id "
+                    f"WHERE t.status = ? {job_filter.replace('job_id', 't.job_id')} "
+                    "GROUP BY t.task_id HAVING COUNT(*) = 1 AND MIN(l.started_at) <= ? AND MAX(l.owner) != ? "
+                    "ORDER BY MIN(l.started_at) LIMIT 1",
+                    (RUNNING, *job_args, now - WORK_STEAL_AFTER_SECONDS, owner),
+                ).fetchone()
+                if row is not None:
+                    metrics.inc("work_queue_steals_total")
+                    logger.info("오래 걸리는 작업을 중복 실행합니다: task=%s, worker=%s", row[0], owner)
+            if row is None:
+                return None
+
+            connection.execute(
+                "INSERT OR REPLACE INTO work_leases (task_id, owner, started_at, expires_at) VALUES (?, ?, ?, ?)",
+                (row[0], owner, now, now + lease_seconds),
+            )
+        return row[0], json.loads(row[1])
+
+    @staticmethod
+    def _expire_leases(connection: sqlite3.Connection, now: float) -> None:
+        """만료된 임대를 지우고, 임대가 남지 않은 처리 중 작업을 다시 대기열에 넣거나 실패 처리합니다."""
+        expired = connection.execute("SELECT task_id, owner FROM work_leases WHERE expires_at < ?", (now,)).fetchall()
+        if not expired:
+            return
+        connection.execute("DELETE FROM work_leases WHERE expires_at < ?", (now,))
+        for task_id, owner in expired:
+            logger.warning("작업 임대 만료: task=%s, worker=%s", task_id, owner)
+            metrics.inc("work_queue_lease_expired_total")
+            _release(connection, task_id, f"임대 만료 (worker={owner})", now)
+
+    def heartbeat(self, task_id: int, owner: str, lease_seconds: Optional[float] = None) -> bool:
+        """
+        임대를 연장합니다.
+
+        Returns:
+            bool: 계속 처리해야 하면 True (임대를 잃었거나 다른 작업자가 먼저 끝냈으면 False)
+        """
+        now = time.time()
+        with self._transaction() as connection:
+            cursor = connection.execute(
+                "UPDATE work_leases SET expires_at = ? WHERE task_id = ? AND owner = ? "
+                "AND EXISTS (SELECT 1 FROM work_tasks WHERE task_id = ? AND status = ?)",
+                (now + (lease_seconds or WORK_LEASE_SECONDS), task_id, owner, task_id, RUNNING),
+            )
+            return cursor.rowcount > 0
+
+    def complete(self, task_id: int, owner: str, result: Optional[Dict[str, Any]] = None) -> bool:
+        """
+        작업을 완료 처리합니다. 임대가 만료된 뒤에 끝났더라도 결과가 있으면 완료로 기록합니다.
+
+        Returns:
+            bool: 이 호출로 완료되었으면 True (중복 실행한 다른 작업자가 먼저 끝냈으면 False)
+        """
+        now = time.time()
+        with self._transaction() as connection:
+            cursor = connection.execute(
+                "UPDATE work_tasks SET status = ?, result = ?, error = NULL, updated_at = ? "
+                "WHERE task_id = ? AND status IN (?, ?)",
+                (DONE, json.dumps(result, ensure_ascii=False), now, task_id, PENDING, RUNNING),
+            )
+            connection.execute("DELETE FROM work_leases WHERE task_id = ?", (task_id,))
+        if cursor.rowcount == 0:
+            logger.debug("이미 완료된 작업: task=%s, worker=%s", task_id, owner)
+            return False
+        metrics.inc("work_queue_tasks_total", result="done")
+        return True
+
+    def fail(self, task_id: int, owner: str, error: str) -> None:
+        """
+        작업 실패를 기록합니다. 중복 실행 중인 다른 작업자가 없으면 백오프 후 다시 대기열에 넣고,
+        WORK_MAX_ATTEMPTS 번 실패하면 failed 로 남깁니다.
+        """
+        now = time.time()
+        with self._transaction() as connection:
+            connection.execute("DELETE FROM work_leases WHERE task_id = ? AND owner = ?", (task_id, owner))
+            _release(connection, task_id, error, now)
+
+    def stats(self, job_id: Optional[str] = None) -> Dict[str, int]:
+        """
+        상태별 작업 수
+
+        Returns:
+            Dict[str, int]: pending, running, done, failed 작업 수
+        """
+        job_filter, job_args = ("WHERE job_id = ?", (job_id,)) if job_id else ("", ())
+        with self._lock:
+            rows = self._connection.execute(
+                f"SELECT status, COUNT(*) FROM work_tasks {job_filter} GROUP BY status", job_args
+            ).fetchall()
+        counts = dict.fromkeys((PENDING, RUNNING, DONE, FAILED), 0)
+        counts.update(rows)
+        return counts
+
+    def tasks(self, job_id: str) -> List[Dict[str, Any]]:
+        """
+        작업 묶음의 작업 목록 (작업 ID 순서)
+
+        Returns:
+            List[Dict[str, Any]]: task_id, status, attempts, payload, result, error
+        """
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT task_id, status, attempts, payload, result, error FROM work_tasks WHERE job_id = ? "
+                "ORDER BY task_id",
+                (job_id,),
+            ).fetchall()
+        return [
+            {
+                "task_id": task_id,
+                "status": status,
+                "attempts": attempts,
+                "payload": json.loads(payload),
+                "result": json.loads(result) if result is not None else None,
+                "error": error,
+            }
+            for task_id, status, attempts, payload, result, error in rows
+        ]
+
+    def retry_failed(self, job_id: str) -> int:
+        """
+        failed 작업의 시도 횟수를 초기화해 다시 대기열에 넣습니다.
+
+        Returns:
+            int: 다시 넣은 작업 수
+        """
+        now = time.time()
+        with self._transaction() as connection:
+            cursor = connection.execute(
+                "UPDATE work_tasks SET status = ?, attempts = 0, available_at = ?, updated_at = ? "
+                "WHERE job_id = ? AND status = ?",
+                (PENDING, now, now, job_id, FAILED),
+            )
+        return cursor.rowcount
+
+    def clear(self, job_id: str) -> None:
+        """작업 묶음의 작업과 임대를 삭제합니다."""
+        with self._transaction() as connection:
+            connection.execute(
+                "DELETE FROM work_leases WHERE task_id IN (SELECT task_id FROM work_tasks WHERE job_id = ?)", (job_id,)
+            )
+            connection.execute("DELETE FROM work_tasks WHERE job_id = ?", (job_id,))
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
+
+
+class _Transaction:
+    """BEGIN IMMEDIATE 트랜잭션 (쓰기 잠금을 먼저 잡아 다른 프로세스와의 경쟁을 막음)"""
+
+    def __init__(self, connection: sqlite3.Connection, lock: threading.Lock):
+        self._connection = connection
+        self._lock = lock
+
+    def __enter__(self) -> sqlite3.Connection:
+        self._lock.acquire()
+        try:
+            self._connection.execute("BEGIN IMMEDIATE")
+        except Exception:
+            self._lock.release()
+            raise
+        return self._connection
+
+    def __exit__(self, exc_type, exc, traceback) -> None:
+        try:
+            self._connection.execute("COMMIT" if exc_type is None else "ROLLBACK")
+        finally:
+            self._lock.release()
+
+
+def _release(connection: sqlite3.Connection, task_id: int, error: str, now: float) -> None:
+    """
+    임대가 하나도 남지 않은 처리 중 작업을 다시 대기열에 넣거나, 시도 횟수를 다 쓴 경우 실패로 기록합니다.
+    (중복 실행 중인 작업자가 남아 있으면 오류만 기록)
+    """
+    remaining = connection.execute("SELECT COUNT(*) FROM work_leases WHERE task_id = ?", (task_id,)).fetchone()[0]
+    row = connection.execute("SELECT status, attempts FROM work_tasks WHERE task_id = ?", (task_id,)).fetchone()
+    if row is None or row[0] != RUNNING or remaining:
+        connection.execute("UPDATE work_tasks SET error = ?, updated_at = ? WHERE task_id = ?", (error, now, task_id))
+        return
+
+    attempts = row[1]
+    if attempts >= WORK_MAX_ATTEMPTS:
+        connection.execute(
+            "UPDATE work_tasks SET status = ?, error = ?, updated_at = ? WHERE task_id = ?",
+            (FAILED, error, now, task_id),
+        )
+        metrics.inc("work_queue_tasks_total", result="failed")
+        logger.error("작업 실패 (%d회 시도): task=%s (%s)", attempts, task_id, error, exc_info=False)
+        return
+
+    delay = WORK_RETRY_BACKOFF_SECONDS * (2 ** (attempts - 1))
+    connection.execute(
+        "UPDATE work_tasks SET status = ?, error = ?, available_at = ?, updated_at = ? WHERE task_id = ?",
+        (PENDING, error, now + delay, now, task_id),
+    )
+    metrics.inc("work_queue_retries_total")
+    logger.warning("작업 재시도 예약 (%d/%d회 시도, %.0f초 후): task=%s (%s)",
+                   attempts, WORK_MAX_ATTEMPTS, delay, task_id, error)
@@ -0,0 +1,40 @@
+from src.llm_workflows.adapters.blob import GitHubBlobLoader
+from src.models.git_repository import CodeMetadata, ParsedCode
+
+
+def _parsed(path: str, **fields) -> ParsedCode:
+    return ParsedCode(
+        path=path,
+        name=path.rsplit("/", 1)[-1],
+        type="file",
+        metadata=CodeMetadata(repo_url="https://github.com/owner/repo", ref="main", path=path, extension="py"),
+        **fields,
+    )
+
+
+def test_unreadable_file_is_skipped_and_recorded(tmp_path):
+    broken = tmp_path / "broken.spool"
+    broken.write_bytes(b"x = '\xff'\n")
+    failures = []
+    loader = GitHubBlobLoader(
+        [
+            _parsed("src/ok.py", text="x = 1\n"),
+            _parsed("src/broken.py", spool_path=str(broken)),
+            _parsed("src/missing.py", spool_path=str(tmp_path / "missing.spool")),
+        ],
+        failures,
+    )
+
+    blobs = list(loader.yield_blobs())
+
+    assert [blob.path for blob in blobs] == ["src/ok.py"]
+    assert [failure.split(":")[0] for failure in failures] == ["load src/broken.py", "load src/missing.py"]
+
+
+def test_spooled_file_is_read_when_yielded(tmp_path):
+    spooled = tmp_path / "big.spool"
+    spooled.write_text("def big():\n    pass\n", encoding="utf-8")
+
+    (blob,) = GitHubBlobLoader([_parsed("src/big.py", spool_path=str(spooled))]).yield_blobs()
+    assert blob.as_string() == "def big():\n    pass\n"
+    assert blob.metadata["file_path"] == "src/big.py"
@@ -0,0 +1,92 @@
+import pytest
+from langchain_core.documents import Document
+
+from src.llm_workflows.nodes import context_assembler
+from src.llm_workflows.nodes.context_assembler import _fit_budget, _merge_spans
+
+
+@pytest.fixture(autouse=True)
+def word_tokens(monkeypatch):
+    # tiktoken 인코딩 파일 유무와 관계없이 결과가 같도록 공백 단위로 셈
+    monkeypatch.setattr(context_assembler, "count_tokens", lambda text: len(text.split()))
+    monkeypatch.setattr(
+        context_assembler, "truncate_to_tokens", lambda text, max_tokens: " ".join(text.split()[:max_tokens])
+    )
+
+
+def _chunk(text: str, start: int, score: float, file_path: str = "src/app.py", chunk_id: str = None) -> Document:
+    return Document(
+        page_content=text,
+        metadata={"repo_url": "repo", "ref": "main", "file_path": file_path, "start_index": start,
+                  "score": score, "chunk_id": chunk_id or f"{file_path}:{start}"},
+    )
+
+
+def test_merge_overlapping_and_adjacent_chunks():
+    source = "0123456789abcdefghij"
+    chunks = [_chunk(source[10:20], 10, 0.2), _chunk(source[0:6], 0, 0.5), _chunk(source[4:10], 4, 0.9)]
+
+    (span,) = _merge_spans(chunks)
+    assert span.page_content == source
+    assert span.metadata["end_index"] == 20
+    assert span.metadata["score"] == 0.9
+    assert span.metadata["merged_chunks"] == 3
+    assert span.metadata["chunk_ids"] == ["src/app.py:0", "src/app.py:4", "src/app.py:10"]
+
+
+def test_contained_chunk_does_not_duplicate_text():
+    spans = _merge_spans([_chunk("abcdef", 0, 0.1), _chunk("cd", 2, 0.3)])
+    assert [span.page_content for span in spans] == ["abcdef"]
+
+
+def test_separate_files_and_gaps_are_not_merged():
+    spans = _merge_spans([
+        _chunk("aaaa", 0, 0.1),
+        _chunk("bbbb", 10, 0.1),
+        _chunk("cccc", 0, 0.1, file_path="src/other.py"),
+    ])
+    assert sorted(span.page_content for span in spans) == ["aaaa", "bbbb", "cccc"]
+
+
+def test_unknown_start_is_kept_as_is():
+    chunk = _chunk("abc", -1, 0.4)
+    (span,) = _merge_spans([chunk])
+    assert span is chunk
+
+
+def test_merge_does_not_modify_inputs():
+    first, second = _chunk("abcd", 0, 0.1), _chunk("cdef", 2, 0.2)
+    _merge_spans([first, second])
+    assert first.page_content == "abcd"
+    assert "merged_chunks" not in first.metadata
+
+
+def test_fit_budget_keeps_highest_scores_and_skips_large_ones():
+    documents = [
+        Document(page_content="one two three four five", metadata={"score": 0.9}),
+        Document(page_content="a b c d e f g h", metadata={"score": 0.8}),
+        Document(page_content="x y", metadata={"score": 0.1}),
+    ]
+    selected, used = _fit_budget(documents, 8)
+
+    assert [document.page_content for document in selected] == ["one two three four five", "x y"]
+    assert used == 7
+
+
+def test_fit_budget_without_budget_sorts_only():
+    documents = [Document(page_content="a", metadata={"score": 0.1}), Document(page_content="b", metadata={"score": 0.5})]
+    selected, used = _fit_budget(documents, None)
+
+    assert [document.page_content for document in selected] == ["b", "a"]
+    assert used == 0
+
+
+def test_fit_budget_truncates_top_document_when_nothing_fits():
+    documents = [Document(page_content="a b c d e f", metadata={"score": 0.9})]
+
+    selected, used = _fit_budget(documents, 3)
+    assert selected[0].page_content == "a b c"
+    assert selected[0].metadata["truncated"] is True
+    assert used == 3
+
+    assert _fit_budget(documents, 3, truncate=False) == ([], 0)
@@ -0,0 +1,57 @@
+import os
+
+from src.llm_workflows.distributed_ingest import SHARD_FILE_OVERHEAD_BYTES, plan_shards
+
+
+def _files(layout):
+    return [{"path": path, "size": size} for path, size in layout.items()]
+
+
+def _weight(shard):
+    return sum(item["size"] + SHARD_FILE_OVERHEAD_BYTES for item in shard)
+
+
+def test_empty_repository_has_no_shards():
+    assert plan_shards([], 4) == []
+
+
+def test_every_file_is_assigned_exactly_once():
+    files = _files({f"pkg{d}/mod{f}.py": 1000 * (d + f + 1) for d in range(5) for f in range(7)})
+    shards = plan_shards(files, 4)
+
+    assert len(shards) == 4
+    assert sorted(item["path"] for shard in shards for item in shard) == sorted(item["path"] for item in files)
+
+
+def test_shard_count_is_capped_by_file_count():
+    shards = plan_shards(_files({"a.py": 10, "b.py": 10}), 8)
+    assert len(shards) == 2
+
+
+def test_small_directories_stay_together():
+    files = _files({
+        **{f"big/part{i}/file{j}.py": 10_000 for i in range(4) for j in range(4)},
+        "small/a.py": 100,
+        "small/b.py": 100,
+    })
+    shards = plan_shards(files, 4)
+
+    directories = [{os.path.dirname(item["path"]) for item in shard} for shard in shards]
+    assert sum("small" in shard for shard in directories) == 1
+    for part in range(4):
+        assert sum(f"big/part{part}" in shard for shard in directories) == 1
+
+
+def test_flat_directory_is_split_and_balanced():
+    files = _files({f"flat/file{i:03}.py": 1000 for i in range(100)})
+    shards = plan_shards(files, 4)
+
+    weights = [_weight(shard) for shard in shards]
+    assert len(shards) == 4
+    assert max(weights) <= 1.1 * min(weights)
+
+
+def test_largest_shard_first():
+    files = _files({"a/x.py": 50_000, "b/y.py": 10_000, "c/z.py": 30_000})
+    weights = [_weight(shard) for shard in plan_shards(files, 3)]
+    assert weights == sorted(weights, reverse=True)
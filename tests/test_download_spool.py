@@ -0,0 +1,49 @@
+import os
+
+import pytest
+
+from src.utils import download_spool
+from src.utils.download_spool import SpooledFile, read_spooled_text, spool_chunks
+
+
+@pytest.fixture(autouse=True)
+def small_spool(tmp_path, monkeypatch):
+    monkeypatch.setattr(download_spool, "SPOOL_THRESHOLD_BYTES", 16)
+    monkeypatch.setattr(download_spool, "DOWNLOAD_SPOOL_DIR", str(tmp_path))
+
+
+def test_small_file_is_returned_as_text():
+    assert spool_chunks([b"x = 1\n"], "small.py") == "x = 1\n"
+
+
+def test_large_file_is_spooled(tmp_path):
+    spooled = spool_chunks([b"x = 1\n" * 4, b"y = 2\n" * 4], "large.py")
+
+    assert isinstance(spooled, SpooledFile)
+    assert spooled.size == 48
+    assert read_spooled_text(spooled.path) == "x = 1\n" * 4 + "y = 2\n" * 4
+    download_spool.remove(spooled.path)
+
+
+def test_multibyte_character_split_across_chunks():
+    spooled = spool_chunks([b"s = '\xc3", b"\xa9'\n" + b"x = 1\n" * 4], "accent.py")
+
+    assert read_spooled_text(spooled.path).startswith("s = 'é'\n")
+    download_spool.remove(spooled.path)
+
+
+@pytest.mark.parametrize("tail", [b"y = '\xff'\n", b"\xc3"])
+def test_invalid_utf8_after_first_chunk_is_rejected(tmp_path, tail):
+    assert spool_chunks([b"x = 1\n" * 4, tail], "broken.py") is None
+    # 쓰던 임시 파일은 삭제
+    assert os.listdir(tmp_path) == []
+
+
+def test_binary_head_is_rejected():
+    assert spool_chunks([b"\x89PNG\0\0\0"], "image.png") is None
+
+
+def test_too_large_file_is_rejected(tmp_path, monkeypatch):
+    monkeypatch.setattr(download_spool, "MAX_FILE_BYTES", 32)
+    assert spool_chunks([b"x = 1\n" * 4, b"y = 2\n" * 4], "huge.py") is None
+    assert os.listdir(tmp_path) == []
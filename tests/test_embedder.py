@@ -0,0 +1,34 @@
+from src.llm_workflows.nodes import embedder
+from src.llm_workflows.state import RepositoryToVectorDBState
+from src.models.git_repository import RepositoryInfo
+
+
+def _state(**fields) -> RepositoryToVectorDBState:
+    return RepositoryToVectorDBState(repo_info=RepositoryInfo(repo_url="https://github.com/o/r", branch="main"), **fields)
+
+
+def _record_prunes(monkeypatch):
+    calls = []
+    monkeypatch.setattr(
+        embedder, "delete_stale_documents",
+        lambda repo_info, code_ids, question_ids: calls.append((code_ids, question_ids)) or (0, 0),
+    )
+    return calls
+
+
+def test_empty_load_without_failures_prunes_everything(monkeypatch):
+    calls = _record_prunes(monkeypatch)
+
+    state = embedder.add_code_documents(_state())
+    embedder.add_documents(state)
+
+    # 코드 청크는 먼저 정리했으므로 두 번째에는 가설 질문만 정리
+    assert calls == [([], None), (None, [])]
+
+
+def test_empty_load_with_failures_keeps_previous_documents(monkeypatch):
+    calls = _record_prunes(monkeypatch)
+
+    embedder.add_documents(_state(failures=["src/app.py: 읽기 실패"]))
+
+    assert calls == []
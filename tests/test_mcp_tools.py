@@ -0,0 +1,17 @@
+import pytest
+
+from src.llm_workflows.mcp import tools
+
+
+def test_same_job_cannot_run_twice():
+    with tools._exclusive_job("https://github.com/o/r@main"):
+        with pytest.raises(RuntimeError):
+            with tools._exclusive_job("https://github.com/o/r@main"):
+                pass
+        # 다른 브랜치는 별도 작업
+        with tools._exclusive_job("https://github.com/o/r@dev"):
+            pass
+
+    # 끝난(또는 실패한) 작업은 다시 수집할 수 있음
+    with tools._exclusive_job("https://github.com/o/r@main"):
+        pass
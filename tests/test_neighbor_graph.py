@@ -0,0 +1,112 @@
+import threading
+
+from langchain_core.documents import Document
+
+from src.utils import neighbor_graph
+from src.utils.neighbor_graph import EDGE_WEIGHTS, build_edges
+
+
+def _chunk(file_path: str, start: int, text: str, **metadata) -> Document:
+    return Document(
+        page_content=text,
+        metadata={"chunk_id": f"{file_path}:{start}", "file_path": file_path, "start_index": start,
+                  "language": "PYTHON", **metadata},
+    )
+
+
+def _edges(documents):
+    return {(source, target): (kind, weight) for source, target, kind, weight in build_edges(documents)}
+
+
+def test_adjacent_chunks_link_both_ways():
+    edges = _edges([_chunk("a.txt", 10, "second"), _chunk("a.txt", 0, "first"), _chunk("a.txt", 20, "third")])
+
+    assert edges[("a.txt:0", "a.txt:10")] == ("adjacent", EDGE_WEIGHTS["adjacent"])
+    assert edges[("a.txt:10", "a.txt:0")] == ("adjacent", EDGE_WEIGHTS["adjacent"])
+    assert ("a.txt:0", "a.txt:20") not in edges
+
+
+def test_python_import_points_to_defining_chunk():
+    edges = _edges([
+        _chunk("src/pkg/util.py", 0, "def helper_one():\n    pass\n"),
+        _chunk("src/pkg/util.py", 30, "def helper_two():\n    pass\n"),
+        _chunk("src/app.py", 0, "from pkg.util import helper_two\n"),
+    ])
+
+    # 가져온 이름도 본문에 나오므로 가중치가 더 높은 references 간선이 남음
+    assert edges[("src/app.py:0", "src/pkg/util.py:30")][0] == "references"
+    assert ("src/app.py:0", "src/pkg/util.py:0") not in edges
+
+
+def test_module_import_points_to_first_chunk():
+    edges = _edges([
+        _chunk("pkg/util.py", 0, "VALUE = 1\n"),
+        _chunk("pkg/util.py", 20, "OTHER = 2\n"),
+        _chunk("pkg/app.py", 0, "from . import util\n"),
+    ])
+    assert edges[("pkg/app.py:0", "pkg/util.py:0")] == ("imports", EDGE_WEIGHTS["imports"])
+
+
+def test_relative_js_import():
+    edges = _edges([
+        _chunk("web/lib/format.ts", 0, "export const x = 1\n", language="TS"),
+        _chunk("web/main.ts", 0, "import { x } from './lib/format'\n", language="TS"),
+    ])
+    assert edges[("web/main.ts:0", "web/lib/format.ts:0")] == ("imports", EDGE_WEIGHTS["imports"])
+
+
+def test_references_use_symbols_metadata_and_link_back():
+    edges = _edges([
+        _chunk("models.py", 0, "...", symbols="Repository.save_all"),
+        _chunk("service.py", 0, "repo.save_all(items)"),
+    ])
+
+    assert edges[("service.py:0", "models.py:0")] == ("references", EDGE_WEIGHTS["references"])
+    assert edges[("models.py:0", "service.py:0")] == ("referenced_by", EDGE_WEIGHTS["referenced_by"])
+
+
+def test_ambiguous_and_dunder_names_are_skipped(monkeypatch):
+    monkeypatch.setattr(neighbor_graph, "NEIGHBOR_MAX_DEFINITIONS", 1)
+    edges = _edges([
+        _chunk("a.py", 0, "def run():\n    pass\n"),
+        _chunk("b.py", 0, "def run():\n    pass\n"),
+        _chunk("c.py", 0, "class __meta__:\n    pass\n"),
+        _chunk("main.py", 0, "run()\n__meta__\n"),
+    ])
+    assert not [key for key in edges if key[0] == "main.py:0"]
+
+
+def test_prose_chunks_define_nothing():
+    edges = _edges([
+        _chunk("README.md", 0, "type something here", language="MARKDOWN"),
+        _chunk("main.py", 0, "something()\n"),
+    ])
+    assert ("main.py:0", "README.md:0") not in edges
+
+
+def test_edges_per_chunk_are_capped(monkeypatch):
+    monkeypatch.setattr(neighbor_graph, "NEIGHBOR_MAX_EDGES", 2)
+    definitions = [_chunk(f"defs{i}.py", 0, f"def helper_{i}():\n    pass\n") for i in range(5)]
+    caller = _chunk("main.py", 0, "\n".join(f"helper_{i}()" for i in range(5)))
+
+    sources = [source for source, _, _, _ in build_edges(definitions + [caller])]
+    assert sources.count("main.py:0") == 2
+
+
+def _graph(tmp_path):
+    graph = object.__new__(neighbor_graph.NeighborGraph)
+    graph._lock = threading.Lock()
+    graph._open(str(tmp_path / "graph.sqlite3"))
+    return graph
+
+
+def test_merge_keeps_edges_that_replace_drops(tmp_path):
+    graph = _graph(tmp_path)
+    graph.replace("repo", "main", [("a:0", "b:0", "adjacent", 1.0), ("c:0", "d:0", "imports", 2.0)])
+
+    # 일부 파일을 불러오지 못한 수집: 빠진 파일(c)의 간선은 남아 있어야 함
+    graph.merge("repo", "main", [("a:0", "b:0", "references", 3.0)])
+    assert sorted(graph.edges("repo", "main")) == [("a:0", "b:0", "references", 3.0), ("c:0", "d:0", "imports", 2.0)]
+
+    graph.replace("repo", "main", [("a:0", "b:0", "adjacent", 1.0)])
+    assert graph.edges("repo", "main") == [("a:0", "b:0", "adjacent", 1.0)]
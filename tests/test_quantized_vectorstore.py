@@ -0,0 +1,184 @@
+import threading
+
+import numpy as np
+import pytest
+from langchain_core.embeddings import FakeEmbeddings
+
+from src.utils import quantized_vectorstore
+from src.utils.quantized_vectorstore import QuantizedVectorStore
+
+DIMENSIONS = 16
+
+
+def _vectors(count: int, seed: int = 0) -> np.ndarray:
+    return np.random.default_rng(seed).normal(size=(count, DIMENSIONS)).astype(np.float32)
+
+
+def _open(directory, quantization: str = "int8") -> QuantizedVectorStore:
+    return QuantizedVectorStore(
+        collection_name="test",
+        embedding_function=FakeEmbeddings(size=DIMENSIONS),
+        persist_directory=str(directory),
+        dimensions=DIMENSIONS,
+        quantization=quantization,
+    )
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = _open(tmp_path)
+    vectors = _vectors(10)
+    store.add_embeddings(
+        [f"doc{i}" for i in range(10)],
+        vectors,
+        metadatas=[{"repo_url": "a" if i < 5 else "b", "line": i} for i in range(10)],
+        ids=[f"id{i}" for i in range(10)],
+    )
+    return store
+
+
+@pytest.mark.parametrize("quantization", QuantizedVectorStore.QUANTIZATIONS)
+def test_add_and_search_returns_nearest(tmp_path, quantization):
+    store = _open(tmp_path, quantization)
+    vectors = _vectors(50)
+    store.add_embeddings([str(i) for i in range(50)], vectors, ids=[str(i) for i in range(50)])
+
+    document, distance = store.similarity_search_by_vector_with_score(vectors[7].tolist(), k=1)[0]
+    assert document.id == "7"
+    assert distance == pytest.approx(0.0, abs=1e-5)
+
+
+def test_upsert_replaces_previous_row(store):
+    store.add_embeddings(["new3"], _vectors(1, seed=1), metadatas=[{"repo_url": "b"}], ids=["id3"])
+
+    assert store.count() == 10
+    assert store.get(ids=["id3"])["documents"] == ["new3"]
+    assert "id3" not in store.get(where={"repo_url": "a"})["ids"]
+
+
+def test_delete_removes_documents(store):
+    store.delete(["id0", "id1", "missing"])
+
+    assert store.count() == 8
+    assert store.get(ids=["id0", "id2"])["ids"] == ["id2"]
+    assert store.get(where={"repo_url": "a"})["ids"] == ["id2", "id3", "id4"]
+
+
+def test_reload_keeps_committed_state(store, tmp_path):
+    store.add_embeddings(["new3"], _vectors(1, seed=1), metadatas=[{"repo_url": "b"}], ids=["id3"])
+    store.delete(["id0"])
+
+    reopened = _open(tmp_path)
+    assert reopened.count() == 9
+    assert reopened.get(ids=["id3"])["documents"] == ["new3"]
+    assert reopened.get(ids=["id0"])["ids"] == []
+
+
+def test_reload_drops_uncommitted_tail(store, tmp_path):
+    store.add_embeddings(["tail"], _vectors(1, seed=2), ids=["tail"], persist=False)
+
+    assert store.count() == 11
+    assert _open(tmp_path).count() == 10
+    store.persist()
+    assert _open(tmp_path).get(ids=["tail"])["documents"] == ["tail"]
+
+
+def test_persist_compacts_into_new_generation(store, tmp_path):
+    store.delete([f"id{i}" for i in range(6)])
+    store.persist()
+
+    assert sorted(path.name for path in tmp_path.iterdir()) == [
+        "manifest.json", "records.1.jsonl", "scales.f32.1.bin", "vectors.f32.1.bin", "vectors.q.1.bin",
+    ]
+    reopened = _open(tmp_path)
+    assert reopened.get()["ids"] == ["id6", "id7", "id8", "id9"]
+
+
+def test_auto_compacts_when_dead_rows_dominate(tmp_path, monkeypatch):
+    monkeypatch.setattr(quantized_vectorstore, "COMPACT_MIN_DEAD_ROWS", 0)
+    store = _open(tmp_path)
+    store.add_embeddings(["a", "b", "c"], _vectors(3), ids=["a", "b", "c"])
+    store.delete(["a", "b"])
+
+    assert len(store._ids) == 1
+    assert _open(tmp_path).get()["ids"] == ["c"]
+
+
+def test_alive_mask_grows_geometrically(tmp_path, monkeypatch):
+    monkeypatch.setattr(quantized_vectorstore, "ALIVE_MIN_CAPACITY", 4)
+    store = _open(tmp_path)
+    capacities = set()
+    for index in range(20):
+        store.add_embeddings([str(index)], _vectors(1, seed=index), ids=[str(index)])
+        capacities.add(len(store._alive_buffer))
+    store.delete(["3"])
+
+    assert capacities == {4, 8, 16, 32}
+    assert store.count() == 19
+    assert _open(tmp_path).count() == 19
+
+
+def test_filter_search(store):
+    vectors = _vectors(10)
+    results = store.similarity_search_by_vector_with_score(vectors[2].tolist(), k=3, filter={"repo_url": "b"})
+    assert {document.metadata["repo_url"] for document, _ in results} == {"b"}
+
+    results = store.similarity_search_by_vector_with_score(
+        vectors[2].tolist(), k=10, filter={"$and": [{"repo_url": "a"}, {"line": {"$gte": 3}}]}
+    )
+    assert sorted(document.id for document, _ in results) == ["id3", "id4"]
+
+
+def test_filter_index_follows_upsert(store):
+    # 역색인을 먼저 만든 뒤 추가/교체해도 필터 결과가 맞아야 함
+    assert len(store.get(where={"repo_url": "b"})["ids"]) == 5
+    store.add_embeddings(["moved"], _vectors(1, seed=3), metadatas=[{"repo_url": "b"}], ids=["id0"])
+
+    assert len(store.get(where={"repo_url": "b"})["ids"]) == 6
+    assert len(store.get(where={"repo_url": "a"})["ids"]) == 4
+
+
+def test_batch_search_matches_single_search(store):
+    queries = _vectors(3, seed=4).tolist()
+    batch = store.batch_similarity_search_by_vector_with_score(queries, k=3)
+    single = [store.similarity_search_by_vector_with_score(query, k=3) for query in queries]
+
+    assert [[document.id for document, _ in results] for results in batch] == [
+        [document.id for document, _ in results] for results in single
+    ]
+
+
+def test_dimension_mismatch_is_rejected(store, tmp_path):
+    with pytest.raises(ValueError):
+        QuantizedVectorStore("test", FakeEmbeddings(size=8), str(tmp_path), dimensions=8)
+
+
+def test_concurrent_add_and_search(tmp_path):
+    store = _open(tmp_path)
+    errors = []
+
+    def write(worker: int) -> None:
+        try:
+            for index in range(20):
+                store.add_embeddings(["x"], _vectors(1, seed=worker * 100 + index), ids=[f"{worker}-{index}"])
+        except Exception as e:
+            errors.append(e)
+
+    def read() -> None:
+        try:
+            for _ in range(50):
+                for document, _ in store.similarity_search_by_vector_with_score(_vectors(1)[0].tolist(), k=3):
+                    assert document.page_content == "x"
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=write, args=(worker,)) for worker in range(4)]
+    threads += [threading.Thread(target=read) for _ in range(2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert store.count() == 80
+    assert _open(tmp_path).count() == 80
@@ -0,0 +1,44 @@
+import pytest
+
+from src.utils import token_utils
+from src.utils.token_utils import batch_by_tokens
+
+
+@pytest.fixture(autouse=True)
+def word_tokens(monkeypatch):
+    # tiktoken 인코딩 파일 유무와 관계없이 결과가 같도록 공백 단위로 셈
+    monkeypatch.setattr(token_utils, "count_tokens", lambda text: len(text.split()))
+
+
+def _words(*counts):
+    return [" ".join(["w"] * count) for count in counts]
+
+
+def test_batches_stay_within_token_limit():
+    batches = list(batch_by_tokens(_words(3, 4, 2, 5, 1), lambda text: text, max_tokens=7))
+    assert [(len(batch), tokens) for batch, tokens in batches] == [(2, 7), (2, 7), (1, 1)]
+
+
+def test_oversized_item_gets_its_own_batch():
+    batches = list(batch_by_tokens(_words(2, 10, 2), lambda text: text, max_tokens=5))
+    assert [tokens for _, tokens in batches] == [2, 10, 2]
+
+
+def test_max_items_limits_batch_size():
+    batches = list(batch_by_tokens(_words(1, 1, 1, 1, 1), lambda text: text, max_tokens=100, max_items=2))
+    assert [len(batch) for batch, _ in batches] == [2, 2, 1]
+
+
+def test_non_positive_limit_disables_token_limit():
+    batches = list(batch_by_tokens(_words(50, 50), lambda text: text, max_tokens=0))
+    assert [tokens for _, tokens in batches] == [100]
+
+
+def test_order_is_preserved_and_text_of_is_used():
+    items = [{"id": index, "text": text} for index, text in enumerate(_words(3, 3, 3))]
+    batches = list(batch_by_tokens(items, lambda item: item["text"], max_tokens=6))
+    assert [[item["id"] for item in batch] for batch, _ in batches] == [[0, 1], [2]]
+
+
+def test_empty_input_yields_nothing():
+    assert list(batch_by_tokens([], lambda text: text, max_tokens=10)) == []
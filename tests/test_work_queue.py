@@ -0,0 +1,119 @@
+import time
+
+import pytest
+
+from src.utils import work_queue
+from src.utils.work_queue import DONE, FAILED, PENDING, RUNNING, WorkQueue
+
+
+@pytest.fixture
+def queue(tmp_path, monkeypatch):
+    monkeypatch.setattr(work_queue, "WORK_RETRY_BACKOFF_SECONDS", 0)
+    monkeypatch.setattr(work_queue, "WORK_MAX_ATTEMPTS", 2)
+    monkeypatch.setattr(work_queue, "WORK_STEAL_AFTER_SECONDS", 0)
+    queue = WorkQueue(str(tmp_path / "queue.sqlite3"))
+    yield queue
+    queue.close()
+
+
+def test_claims_in_order_and_completes(queue):
+    first, second = queue.enqueue("job", [{"shard": 0}, {"shard": 1}])
+
+    assert queue.claim("w1", job_id="job") == (first, {"shard": 0})
+    assert queue.claim("w2", job_id="job") == (second, {"shard": 1})
+    assert queue.claim("w3", job_id="job") is None
+
+    assert queue.complete(first, "w1", {"chunks": 3})
+    assert queue.stats("job") == {PENDING: 0, RUNNING: 1, DONE: 1, FAILED: 0}
+    assert queue.tasks("job")[0]["result"] == {"chunks": 3}
+
+
+def test_claim_filters_by_job(queue):
+    queue.enqueue("other", [{}])
+    assert queue.claim("w1", job_id="job") is None
+
+
+def test_expired_lease_is_reclaimed(queue):
+    (task_id,) = queue.enqueue("job", [{}])
+    queue.claim("w1", job_id="job", lease_seconds=0.01)
+    time.sleep(0.05)
+
+    assert queue.claim("w2", job_id="job") == (task_id, {})
+    assert queue.tasks("job")[0]["attempts"] == 2
+    # 임대를 잃은 작업자는 heartbeat 로 알 수 있음
+    assert not queue.heartbeat(task_id, "w1")
+    assert queue.heartbeat(task_id, "w2")
+
+
+def test_expired_lease_counts_as_attempt(queue):
+    queue.enqueue("job", [{}])
+    for owner in ("w1", "w2"):
+        queue.claim(owner, job_id="job", lease_seconds=0.01)
+        time.sleep(0.05)
+
+    assert queue.claim("w3", job_id="job") is None
+    assert queue.stats("job")[FAILED] == 1
+
+
+def test_failed_task_is_retried_until_max_attempts(queue):
+    (task_id,) = queue.enqueue("job", [{}])
+
+    queue.claim("w1", job_id="job")
+    queue.fail(task_id, "w1", "boom")
+    assert queue.tasks("job")[0]["status"] == PENDING
+
+    assert queue.claim("w1", job_id="job") == (task_id, {})
+    queue.fail(task_id, "w1", "boom again")
+    task = queue.tasks("job")[0]
+    assert (task["status"], task["attempts"], task["error"]) == (FAILED, 2, "boom again")
+
+    assert queue.retry_failed("job") == 1
+    assert queue.claim("w1", job_id="job") == (task_id, {})
+
+
+def test_retry_waits_for_backoff(queue, monkeypatch):
+    monkeypatch.setattr(work_queue, "WORK_RETRY_BACKOFF_SECONDS", 60)
+    (task_id,) = queue.enqueue("job", [{}])
+    queue.claim("w1", job_id="job")
+    queue.fail(task_id, "w1", "boom")
+
+    assert queue.claim("w1", job_id="job") is None
+
+
+def test_idle_worker_steals_long_running_task(queue, monkeypatch):
+    monkeypatch.setattr(work_queue, "WORK_STEAL_AFTER_SECONDS", 0.01)
+    (task_id,) = queue.enqueue("job", [{}])
+    queue.claim("w1", job_id="job")
+    time.sleep(0.05)
+
+    # 자기 작업은 다시 가져가지 않음
+    assert queue.claim("w1", job_id="job") is None
+    assert queue.claim("w2", job_id="job") == (task_id, {})
+    # 이미 중복 실행 중인 작업은 한 번 더 가져가지 않음
+    assert queue.claim("w3", job_id="job") is None
+
+    # 먼저 끝난 쪽만 완료로 기록되고, 늦게 끝난 쪽은 계속할 필요가 없음
+    assert queue.complete(task_id, "w2", {"by": "w2"})
+    assert not queue.complete(task_id, "w1", {"by": "w1"})
+    assert not queue.heartbeat(task_id, "w1")
+    assert queue.tasks("job")[0]["result"] == {"by": "w2"}
+
+
+def test_failure_while_stolen_copy_runs_keeps_task_running(queue, monkeypatch):
+    monkeypatch.setattr(work_queue, "WORK_STEAL_AFTER_SECONDS", 0.01)
+    (task_id,) = queue.enqueue("job", [{}])
+    queue.claim("w1", job_id="job")
+    time.sleep(0.05)
+    queue.claim("w2", job_id="job")
+
+    queue.fail(task_id, "w1", "boom")
+    task = queue.tasks("job")[0]
+    assert (task["status"], task["error"]) == (RUNNING, "boom")
+
+
+def test_clear_removes_job(queue):
+    queue.enqueue("job", [{}, {}])
+    queue.claim("w1", job_id="job")
+    queue.clear("job")
+
+    assert queue.stats("job") == {PENDING: 0, RUNNING: 0, DONE: 0, FAILED: 0}